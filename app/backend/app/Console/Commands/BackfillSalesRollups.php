@@ -0,0 +1,74 @@
+<?php
+
+namespace App\Console\Commands;
+
+use App\Services\SalesRollupService;
+use Carbon\Carbon;
+use Illuminate\Console\Command;
+use Illuminate\Support\Facades\DB;
+
+class BackfillSalesRollups extends Command
+{
+    /**
+     * The name and signature of the console command.
+     *
+     * @var string
+     */
+    protected $signature = 'sales:rollup
+                            {--from= : First day to rebuild (Y-m-d, default: first paid order)}
+                            {--to= : Last day to rebuild (Y-m-d, default: today)}
+                            {--days= : Rebuild only the last N days (e.g. 2 for yesterday and today)}
+                            {--business= : Only rebuild this business}';
+
+    /**
+     * The console command description.
+     *
+     * @var string
+     */
+    protected $description = 'Backfill or rebuild the daily_sales_rollups table from orders';
+
+    /**
+     * Execute the console command.
+     */
+    public function handle(SalesRollupService $rollups)
+    {
+        $businessId = $this->option('business');
+        $to = $this->option('to') ? Carbon::parse($this->option('to')) : now();
+
+        if ($this->option('days')) {
+            $from = now()->subDays(max(1, (int) $this->option('days')) - 1);
+        } elseif ($this->option('from')) {
+            $from = Carbon::parse($this->option('from'));
+        } else {
+            $first = DB::table('orders')
+                ->where('payment_status', 'paid')
+                ->when($businessId, fn ($q) => $q->where('business_id', $businessId))
+                ->min('created_at');
+
+            if (!$first) {
+                $this->info('No paid orders found, nothing to roll up.');
+                return 0;
+            }
+
+            $from = Carbon::parse($first);
+        }
+
+        $from = $from->startOfDay();
+        $to = $to->endOfDay();
+
+        $this->info("Rebuilding sales rollups from {$from->toDateString()} to {$to->toDateString()}" . ($businessId ? " for business #{$businessId}" : '') . '...');
+
+        $bar = $this->output->createProgressBar((int) $from->diffInDays($to) + 1);
+        $bar->start();
+
+        $orders = $rollups->rebuild($from, $to, $businessId, function () use ($bar) {
+            $bar->advance();
+        });
+
+        $bar->finish();
+        $this->newLine();
+        $this->info("✅ Rolled up {$orders} paid order(s).");
+
+        return 0;
+    }
+}
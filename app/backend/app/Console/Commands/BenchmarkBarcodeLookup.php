@@ -0,0 +1,181 @@
+<?php
+
+namespace App\Console\Commands;
+
+use App\Models\Product;
+use App\Services\ProductLookupService;
+use Database\Factories\BusinessFactory;
+use Database\Factories\UserFactory;
+use Illuminate\Console\Command;
+use Illuminate\Support\Facades\DB;
+
+class BenchmarkBarcodeLookup extends Command
+{
+    /**
+     * The name and signature of the console command.
+     *
+     * @var string
+     */
+    protected $signature = 'benchmark:barcode-lookup
+                            {--products=50000 : Number of products in the generated catalog}
+                            {--scans=10000 : Number of scans resolved by the lookup index}
+                            {--search-scans=200 : Number of scans resolved by the previous LIKE search (slow)}
+                            {--seed=20260120 : Random seed for the scanned codes}';
+
+    /**
+     * The console command description.
+     *
+     * @var string
+     */
+    protected $description = 'Compare barcode scans via the LIKE product search, the exact lookup index and an in-memory SKU map (rolled back afterwards)';
+
+    /**
+     * Execute the console command.
+     */
+    public function handle(ProductLookupService $lookup)
+    {
+        $count = max(1, (int) $this->option('products'));
+        $scans = max(1, (int) $this->option('scans'));
+        $searchScans = max(0, (int) $this->option('search-scans'));
+
+        mt_srand((int) $this->option('seed'));
+
+        $queries = 0;
+        DB::listen(function () use (&$queries) {
+            $queries++;
+        });
+
+        // Everything happens in one transaction that is rolled back at the end
+        DB::beginTransaction();
+
+        try {
+            $this->info("Generating a catalog of {$count} products...");
+            $businessId = $this->seedCatalog($count);
+
+            // Every scan hits: half SKUs, half extra barcodes
+            $codes = [];
+            for ($i = 0; $i < $scans; $i++) {
+                $number = mt_rand(1, $count);
+                $codes[] = $i % 2 === 0 ? sprintf('SKU-%08d', $number) : sprintf('899%010d', $number);
+            }
+
+            $rows = [];
+            $misses = 0;
+
+            // Previous scan handling: LIKE search on name/sku/description, first page
+            if ($searchScans > 0) {
+                $queries = 0;
+                $startedAt = microtime(true);
+                foreach (array_slice($codes, 0, $searchScans) as $code) {
+                    Product::where('business_id', $businessId)
+                        ->where('is_active', true)
+                        ->where(function ($query) use ($code) {
+                            $query->where('name', 'LIKE', "%{$code}%")
+                                ->orWhere('sku', 'LIKE', "%{$code}%")
+                                ->orWhere('description', 'LIKE', "%{$code}%");
+                        })
+                        ->limit(10)
+                        ->get(['id', 'sku']);
+                }
+                $rows[] = $this->row('LIKE search', $searchScans, $queries, microtime(true) - $startedAt);
+            }
+
+            // Exact lookup endpoint
+            $queries = 0;
+            $startedAt = microtime(true);
+            foreach ($codes as $code) {
+                if (!$lookup->find($businessId, $code)) {
+                    $misses++;
+                }
+            }
+            $rows[] = $this->row('lookup index', $scans, $queries, microtime(true) - $startedAt);
+
+            // Client-side map built once from the catalog (what the POS does offline)
+            $queries = 0;
+            $startedAt = microtime(true);
+            $map = [];
+            foreach (DB::table('products')->where('business_id', $businessId)->where('is_active', true)->get(['id', 'sku']) as $product) {
+                $map[strtolower($product->sku)] = $product->id;
+            }
+            foreach (DB::table('product_barcodes')->where('business_id', $businessId)->get(['product_id', 'barcode']) as $barcode) {
+                $map[strtolower($barcode->barcode)] = $barcode->product_id;
+            }
+            $builtIn = microtime(true) - $startedAt;
+
+            $startedAt = microtime(true);
+            foreach ($codes as $code) {
+                if (!isset($map[strtolower($code)])) {
+                    $misses++;
+                }
+            }
+            $rows[] = $this->row('in-memory map', $scans, 0, microtime(true) - $startedAt);
+
+            $this->table(['Engine', 'Scans', 'Queries', 'Seconds', 'ms/scan'], $rows);
+            $this->line(sprintf('In-memory map built in %.3fs (%d queries, %d codes)', $builtIn, $queries, count($map)));
+        } finally {
+            DB::rollBack();
+        }
+
+        if ($misses > 0) {
+            $this->error("❌ {$misses} scan(s) did not resolve.");
+            return 1;
+        }
+
+        $this->info('✅ All scans resolved.');
+        return 0;
+    }
+
+    private function row($engine, $scans, $queries, $seconds)
+    {
+        return [$engine, $scans, $queries, round($seconds, 3), round($seconds * 1000 / $scans, 4)];
+    }
+
+    /**
+     * Business with one category, N active products (SKU-00000001...) and one
+     * extra EAN-style barcode per product (899...)
+     */
+    private function seedCatalog(int $count)
+    {
+        $owner = UserFactory::new()->create(['role' => 'owner']);
+        $business = BusinessFactory::new()->create(['owner_id' => $owner->id]);
+        $now = now();
+
+        $categoryId = DB::table('categories')->insertGetId([
+            'business_id' => $business->id,
+            'name' => 'Benchmark',
+            'slug' => 'benchmark-' . $business->id,
+            'created_at' => $now,
+            'updated_at' => $now,
+        ]);
+
+        foreach (array_chunk(range(1, $count), 1000) as $numbers) {
+            DB::table('products')->insert(array_map(fn ($number) => [
+                'business_id' => $business->id,
+                'category_id' => $categoryId,
+                'name' => 'Produk ' . $number,
+                'slug' => 'produk-' . $number,
+                'sku' => sprintf('SKU-%08d', $number),
+                'description' => 'Produk benchmark nomor ' . $number,
+                'price' => mt_rand(5, 100) * 1000,
+                'stock' => mt_rand(0, 100),
+                'is_active' => true,
+                'created_at' => $now,
+                'updated_at' => $now,
+            ], $numbers));
+        }
+
+        $productIds = DB::table('products')->where('business_id', $business->id)->orderBy('id')->pluck('id', 'sku');
+
+        foreach ($productIds->chunk(1000) as $chunk) {
+            DB::table('product_barcodes')->insert($chunk->map(fn ($productId, $sku) => [
+                'business_id' => $business->id,
+                'product_id' => $productId,
+                'barcode' => sprintf('899%010d', (int) substr($sku, 4)),
+                'created_at' => $now,
+                'updated_at' => $now,
+            ])->values()->all());
+        }
+
+        return $business->id;
+    }
+}
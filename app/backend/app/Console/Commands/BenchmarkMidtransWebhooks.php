@@ -0,0 +1,245 @@
+<?php
+
+namespace App\Console\Commands;
+
+use App\Models\AppNotification;
+use App\Models\MidtransEvent;
+use App\Models\Order;
+use App\Models\Outlet;
+use App\Models\Payment;
+use App\Models\WhatsappMessage;
+use App\Services\MidtransWebhookService;
+use Illuminate\Console\Command;
+use Illuminate\Support\Facades\Artisan;
+use Illuminate\Support\Facades\Http;
+use Illuminate\Support\Str;
+
+class BenchmarkMidtransWebhooks extends Command
+{
+    /**
+     * The name and signature of the console command.
+     *
+     * @var string
+     */
+    protected $signature = 'benchmark:midtrans-webhooks
+                            {--orders=500 : Number of QRIS payments to settle}
+                            {--duplicates=2 : Times Midtrans delivers each callback (retries)}
+                            {--outlet= : Outlet used for the temporary orders (default: first outlet)}
+                            {--url= : Post to a running app (e.g. http://127.0.0.1:8000) instead of ingesting in-process}
+                            {--concurrency=50 : Parallel requests with --url}';
+
+    /**
+     * The console command description.
+     *
+     * @var string
+     */
+    protected $description = 'Push simulated, signed Midtrans callbacks (out of order, with retries) through webhook ingestion and the payments worker';
+
+    /**
+     * Execute the console command.
+     */
+    public function handle(MidtransWebhookService $service)
+    {
+        if (app()->environment('production')) {
+            $this->error('Refusing to create benchmark orders in production.');
+            return 1;
+        }
+
+        $orderCount = max(1, (int) $this->option('orders'));
+        $duplicates = max(1, (int) $this->option('duplicates'));
+        $url = $this->option('url') ? rtrim($this->option('url'), '/') : null;
+
+        $outlet = $this->option('outlet') ? Outlet::find($this->option('outlet')) : Outlet::orderBy('id')->first();
+        if (!$outlet) {
+            $this->error('No outlet found. Seed a business/outlet first.');
+            return 1;
+        }
+
+        if (config('queue.default') === 'sync') {
+            $this->warn('QUEUE_CONNECTION=sync runs jobs inline; using the database connection for this benchmark.');
+            config(['queue.default' => 'database']);
+        }
+
+        $serverKey = $outlet->getMidtransConfig()['server_key'] ?? null;
+        if (!$serverKey) {
+            if ($url) {
+                $this->error('The outlet has no Midtrans server key; the running app could not verify the signatures.');
+                return 1;
+            }
+            $serverKey = 'SB-Mid-server-benchmark';
+            config(['midtrans.server_key' => $serverKey]);
+        }
+
+        $run = 'BENCH-' . Str::upper(Str::random(6));
+        $this->info("Creating {$orderCount} temporary orders ({$run}) in outlet #{$outlet->id}...");
+        $payments = $this->createPayments($outlet, $run, $orderCount);
+
+        // pending + settlement per payment, each delivered $duplicates times, shuffled
+        // so settlements often arrive before their pending callback
+        $callbacks = [];
+        foreach ($payments as $payment) {
+            foreach (['pending', 'settlement'] as $status) {
+                $callback = $this->callback($payment, $status, $serverKey);
+                for ($i = 0; $i < $duplicates; $i++) {
+                    $callbacks[] = $callback;
+                }
+            }
+        }
+        shuffle($callbacks);
+
+        try {
+            $start = hrtime(true);
+            [$timings, $responses] = $url
+                ? $this->postCallbacks($url, $callbacks)
+                : $this->ingestCallbacks($service, $callbacks);
+            $ingestMs = (hrtime(true) - $start) / 1e6;
+
+            $start = hrtime(true);
+            Artisan::call('queue:work', [
+                '--queue' => config('midtrans.webhook.queue', 'payments'),
+                '--stop-when-empty' => true,
+            ]);
+            $workerMs = (hrtime(true) - $start) / 1e6;
+
+            $orderIds = $payments->pluck('order_id');
+            $events = MidtransEvent::where('midtrans_order_id', 'like', "{$run}-%")
+                ->selectRaw('status, COUNT(*) as total')
+                ->groupBy('status')
+                ->pluck('total', 'status');
+            $paid = Order::whereIn('id', $orderIds)->where('payment_status', 'paid')->count();
+            $notifications = AppNotification::where('resource_type', 'order')
+                ->whereIn('resource_id', $orderIds)
+                ->where('type', 'order.paid')
+                ->count();
+
+            sort($timings);
+            $percentile = fn ($p) => $timings ? $timings[(int) floor((count($timings) - 1) * $p)] : 0;
+
+            $this->table(['Metric', 'Value'], [
+                ['Mode', $url ? "HTTP {$url} (concurrency {$this->option('concurrency')})" : 'in-process ingest'],
+                ['Callbacks sent', count($callbacks)],
+                ['Responses', collect($responses)->map(fn ($total, $status) => "{$status}: {$total}")->implode(', ')],
+                ['Ingest throughput (callbacks/s)', round(count($callbacks) / max($ingestMs / 1000, 0.001))],
+                ['Ingest p50 / p95 (ms)', round($percentile(0.5), 2) . ' / ' . round($percentile(0.95), 2)],
+                ['Stored events (unique)', $events->sum() . ' of ' . ($orderCount * 2)],
+                ['Events by status', $events->map(fn ($total, $status) => "{$status}: {$total}")->implode(', ')],
+                ['Worker drain (ms)', round($workerMs, 1)],
+                ['Orders paid', "{$paid} of {$orderCount}"],
+                ['order.paid notifications', "{$notifications} (expected {$orderCount})"],
+            ]);
+
+            $ok = $paid === $orderCount
+                && $notifications === $orderCount
+                && (int) $events->sum() === $orderCount * 2
+                && (int) ($events['pending'] ?? 0) === 0;
+
+            if (!$ok) {
+                $this->error('❌ Callbacks were lost or applied more than once.');
+                return 1;
+            }
+
+            $this->info('✅ Every payment settled exactly once despite retries and out-of-order callbacks.');
+            return 0;
+        } finally {
+            $this->cleanup($run, $payments->pluck('order_id'));
+        }
+    }
+
+    private function createPayments(Outlet $outlet, string $run, int $count)
+    {
+        $payments = collect();
+
+        for ($i = 1; $i <= $count; $i++) {
+            $order = Order::create([
+                'order_number' => "{$run}-{$i}",
+                'business_id' => $outlet->business_id,
+                'outlet_id' => $outlet->id,
+                'type' => 'takeaway',
+                'status' => 'pending',
+                'subtotal' => 10000,
+                'total' => 10000,
+                'payment_status' => 'pending',
+                'ordered_at' => now(),
+            ]);
+
+            $payments->push(Payment::create([
+                'order_id' => $order->id,
+                'payment_method' => 'qris',
+                'amount' => 10000,
+                'reference_number' => "{$run}-{$i}",
+                'status' => 'pending',
+            ]));
+        }
+
+        return $payments;
+    }
+
+    private function callback(Payment $payment, string $transactionStatus, string $serverKey)
+    {
+        $payload = [
+            'transaction_time' => now()->toDateTimeString(),
+            'transaction_status' => $transactionStatus,
+            'transaction_id' => md5($payment->reference_number), // One transaction per payment, as Midtrans does
+            'status_code' => $transactionStatus === 'settlement' ? '200' : '201',
+            'payment_type' => 'qris',
+            'order_id' => $payment->reference_number,
+            'merchant_id' => 'BENCHMARK',
+            'gross_amount' => '10000.00',
+            'fraud_status' => 'accept',
+            'currency' => 'IDR',
+        ];
+        $payload['signature_key'] = MidtransWebhookService::signature($payload, $serverKey);
+
+        return $payload;
+    }
+
+    private function ingestCallbacks(MidtransWebhookService $service, array $callbacks)
+    {
+        $timings = [];
+        $responses = [];
+
+        foreach ($callbacks as $payload) {
+            $start = hrtime(true);
+            $result = $service->ingest($payload, MidtransEvent::TYPE_ORDER);
+            $timings[] = (hrtime(true) - $start) / 1e6;
+            $responses[$result['status']] = ($responses[$result['status']] ?? 0) + 1;
+        }
+
+        return [$timings, $responses];
+    }
+
+    private function postCallbacks(string $url, array $callbacks)
+    {
+        $timings = [];
+        $responses = [];
+        $endpoint = $url . '/api/v1/payments/midtrans/order-notification';
+
+        foreach (array_chunk($callbacks, max(1, (int) $this->option('concurrency'))) as $chunk) {
+            $results = Http::pool(fn ($pool) => array_map(
+                fn ($payload) => $pool->acceptJson()->timeout(30)->post($endpoint, $payload),
+                $chunk
+            ));
+
+            foreach ($results as $response) {
+                $status = $response instanceof \Illuminate\Http\Client\Response ? $response->status() : 'error';
+                if ($status !== 'error') {
+                    $timings[] = ($response->transferStats?->getTransferTime() ?? 0) * 1000;
+                }
+                $responses[$status] = ($responses[$status] ?? 0) + 1;
+            }
+        }
+
+        return [$timings, $responses];
+    }
+
+    private function cleanup(string $run, $orderIds)
+    {
+        AppNotification::where('resource_type', 'order')->whereIn('resource_id', $orderIds)->delete();
+        WhatsappMessage::whereIn('order_id', $orderIds)->delete();
+        MidtransEvent::where('midtrans_order_id', 'like', "{$run}-%")->delete();
+        Payment::whereIn('order_id', $orderIds)->delete();
+
+        // forceDelete also removes the orders from the sales rollups (OrderObserver)
+        Order::withTrashed()->whereIn('id', $orderIds)->get()->each->forceDelete();
+    }
+}
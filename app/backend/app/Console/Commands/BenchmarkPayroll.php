@@ -0,0 +1,204 @@
+<?php
+
+namespace App\Console\Commands;
+
+use App\Models\Payroll;
+use App\Services\PayrollService;
+use Carbon\Carbon;
+use Database\Factories\BusinessFactory;
+use Database\Factories\UserFactory;
+use Illuminate\Console\Command;
+use Illuminate\Support\Facades\DB;
+
+class BenchmarkPayroll extends Command
+{
+    /**
+     * The name and signature of the console command.
+     *
+     * @var string
+     */
+    protected $signature = 'benchmark:payroll
+                            {--employees=500 : Number of active employees}
+                            {--month= : Payroll period (Y-m, default: last month)}
+                            {--seed=20260120 : Random seed for the generated attendance}';
+
+    /**
+     * The console command description.
+     *
+     * @var string
+     */
+    protected $description = 'Compare per-employee payroll generation with the bulk engine on a generated business (rolled back afterwards)';
+
+    /**
+     * Execute the console command.
+     */
+    public function handle()
+    {
+        $count = max(1, (int) $this->option('employees'));
+        $period = $this->option('month')
+            ? Carbon::createFromFormat('Y-m', $this->option('month'))->startOfMonth()
+            : now()->subMonthNoOverflow()->startOfMonth();
+        $year = $period->year;
+        $month = $period->month;
+
+        mt_srand((int) $this->option('seed'));
+
+        $payrolls = app(PayrollService::class);
+        $queries = 0;
+        DB::listen(function () use (&$queries) {
+            $queries++;
+        });
+
+        // Everything happens in one transaction that is rolled back at the end
+        DB::beginTransaction();
+
+        try {
+            $this->info("Generating {$count} employees with attendance for {$period->format('Y-m')}...");
+            $business = $this->seedBusiness($count, $period);
+            $employeeIds = DB::table('employees')->where('business_id', $business->id)->orderBy('id')->pluck('id');
+
+            // Per employee (the previous generatePayrollsForAll)
+            $queries = 0;
+            $startedAt = microtime(true);
+            $legacy = [];
+            foreach ($employeeIds as $employeeId) {
+                $payroll = $payrolls->generatePayroll($employeeId, $year, $month);
+                $legacy[$employeeId] = [(float) $payroll->net_salary, $payroll->items->count()];
+            }
+            $legacySeconds = microtime(true) - $startedAt;
+            $legacyQueries = $queries;
+
+            // Bulk engine (updates the same payrolls)
+            $queries = 0;
+            $startedAt = microtime(true);
+            $payrollIds = $payrolls->generateBulk($business->id, $year, $month);
+            $bulkSeconds = microtime(true) - $startedAt;
+            $bulkQueries = $queries;
+
+            $bulk = Payroll::withCount('items')
+                ->whereIn('id', $payrollIds)
+                ->get()
+                ->mapWithKeys(fn ($payroll) => [$payroll->employee_id => [(float) $payroll->net_salary, $payroll->items_count]]);
+
+            $mismatches = collect($legacy)->filter(function ($values, $employeeId) use ($bulk) {
+                $other = $bulk->get($employeeId);
+                return !$other || abs($values[0] - $other[0]) > 0.01 || $values[1] !== $other[1];
+            })->count();
+
+            $this->table(['Engine', 'Payrolls', 'Queries', 'Seconds', 'Employees/sec'], [
+                ['per employee', count($legacy), $legacyQueries, round($legacySeconds, 3), $legacySeconds > 0 ? round(count($legacy) / $legacySeconds, 1) : '-'],
+                ['bulk', count($payrollIds), $bulkQueries, round($bulkSeconds, 3), $bulkSeconds > 0 ? round(count($payrollIds) / $bulkSeconds, 1) : '-'],
+            ]);
+
+            if ($bulkSeconds > 0) {
+                $this->info(sprintf('Speedup: %.1fx', $legacySeconds / $bulkSeconds));
+            }
+        } finally {
+            DB::rollBack();
+        }
+
+        if ($mismatches > 0 || count($payrollIds) !== count($legacy)) {
+            $this->error("❌ {$mismatches} payroll(s) differ between the two engines.");
+            return 1;
+        }
+
+        $this->info('✅ Both engines produced identical payrolls.');
+        return 0;
+    }
+
+    /**
+     * Business with one outlet, N active employees and a month of shifts
+     */
+    private function seedBusiness(int $count, Carbon $period)
+    {
+        $owner = UserFactory::new()->create(['role' => 'owner']);
+
+        // The observer adds the default outlet
+        $business = BusinessFactory::new()->create(['owner_id' => $owner->id]);
+        $outletId = $business->outlets()->value('id');
+        DB::table('outlets')->where('id', $outletId)->update(['working_days' => json_encode([1, 2, 3, 4, 5, 6])]);
+
+        $now = now();
+        $prefix = 'payroll-bench-' . $business->id . '-';
+
+        foreach (array_chunk(range(1, $count), 500) as $numbers) {
+            DB::table('users')->insert(array_map(fn ($number) => UserFactory::new()->raw([
+                'email' => "{$prefix}{$number}@benchmark.test",
+                'role' => 'kasir',
+                'created_at' => $now,
+                'updated_at' => $now,
+            ]), $numbers));
+        }
+
+        $userIds = DB::table('users')->where('email', 'like', $prefix . '%')->orderBy('id')->pluck('id');
+
+        foreach ($userIds->chunk(500) as $chunk) {
+            DB::table('employees')->insert($chunk->values()->map(fn ($userId) => [
+                'business_id' => $business->id,
+                'user_id' => $userId,
+                'employee_code' => 'PB-' . $userId,
+                'name' => 'Payroll Bench ' . $userId,
+                'email' => "{$prefix}{$userId}@benchmark.test",
+                'salary' => mt_rand(30, 80) * 100000,
+                'commission_rate' => mt_rand(0, 3) === 0 ? mt_rand(1, 5) : 0,
+                'is_active' => true,
+                'hired_at' => $period->copy()->subYear(),
+                'created_at' => $now,
+                'updated_at' => $now,
+            ])->all());
+
+            DB::table('employee_outlets')->insert($chunk->map(fn ($userId) => [
+                'user_id' => $userId,
+                'outlet_id' => $outletId,
+                'business_id' => $business->id,
+                'is_primary' => true,
+                'created_at' => $now,
+                'updated_at' => $now,
+            ])->values()->all());
+        }
+
+        $shifts = [];
+        $day = $period->copy();
+        while ($day->month === $period->month) {
+            if ($day->dayOfWeek !== Carbon::SUNDAY) {
+                foreach ($userIds as $userId) {
+                    $roll = mt_rand(1, 100);
+                    if ($roll > 95) {
+                        continue; // no shift at all
+                    }
+
+                    $status = $roll > 90 ? 'absent' : ($roll > 80 ? 'late' : 'completed');
+                    $clockIn = $status === 'absent' ? null : ($status === 'late' ? '08:' . mt_rand(10, 59) . ':00' : '07:5' . mt_rand(0, 9) . ':00');
+                    // Some shifts were never clocked out
+                    $clockOut = $clockIn && mt_rand(1, 20) > 1 ? sprintf('%02d:%02d:00', mt_rand(16, 19), mt_rand(0, 59)) : null;
+
+                    $shifts[] = [
+                        'business_id' => $business->id,
+                        'outlet_id' => $outletId,
+                        'user_id' => $userId,
+                        'shift_date' => $day->toDateString(),
+                        'start_time' => '08:00:00',
+                        'end_time' => '16:00:00',
+                        'clock_in' => $clockIn,
+                        'clock_out' => $clockOut,
+                        'status' => $status,
+                        'created_at' => $now,
+                        'updated_at' => $now,
+                    ];
+
+                    if (count($shifts) >= 1000) {
+                        DB::table('employee_shifts')->insert($shifts);
+                        $shifts = [];
+                    }
+                }
+            }
+            $day->addDay();
+        }
+
+        if (!empty($shifts)) {
+            DB::table('employee_shifts')->insert($shifts);
+        }
+
+        return $business;
+    }
+}
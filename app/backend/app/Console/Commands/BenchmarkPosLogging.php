@@ -0,0 +1,156 @@
+<?php
+
+namespace App\Console\Commands;
+
+use App\Http\Controllers\Api\POSController;
+use App\Logging\RequestLog;
+use Database\Factories\BusinessFactory;
+use Database\Factories\CategoryFactory;
+use Database\Factories\OutletFactory;
+use Database\Factories\ProductFactory;
+use Database\Factories\UserFactory;
+use Illuminate\Console\Command;
+use Illuminate\Http\Request;
+use Illuminate\Support\Facades\Auth;
+use Illuminate\Support\Facades\Context;
+use Illuminate\Support\Facades\DB;
+use Illuminate\Support\Facades\Log;
+use Illuminate\Support\Str;
+
+class BenchmarkPosLogging extends Command
+{
+    /**
+     * The name and signature of the console command.
+     *
+     * @var string
+     */
+    protected $signature = 'benchmark:pos-logging
+                            {--orders=500 : Number of POS checkouts (POST /orders) per run}
+                            {--items=3 : Cart lines per order}';
+
+    /**
+     * The console command description.
+     *
+     * @var string
+     */
+    protected $description = 'Compare POS checkout logging: synchronous debug payload logging vs buffered, sampled request logging (rolled back afterwards)';
+
+    /**
+     * Execute the console command.
+     */
+    public function handle(RequestLog $requestLog)
+    {
+        $orders = max(1, (int) $this->option('orders'));
+        $items = max(1, (int) $this->option('items'));
+
+        $runs = [
+            // Previous behaviour: every line and payload, one write per record
+            'before' => [
+                'channel' => ['driver' => 'single', 'level' => 'debug', 'replace_placeholders' => true],
+                'request' => ['buffer' => false, 'sample_rate' => 1.0, 'sample_routes' => []],
+            ],
+            // Defaults of config/logging.php
+            'after' => [
+                'channel' => config('logging.channels.pos'),
+                'request' => config('logging.request'),
+            ],
+        ];
+
+        $rows = [];
+
+        // Everything happens in one transaction that is rolled back at the end
+        DB::beginTransaction();
+
+        try {
+            [$owner, $businessId, $outletId, $productIds] = $this->seed();
+            Auth::setUser($owner);
+
+            foreach ($runs as $name => $run) {
+                $path = storage_path("logs/benchmark-pos-logging-{$name}.log");
+                @unlink($path);
+
+                config([
+                    'logging.channels.pos' => ['path' => $path] + $run['channel'],
+                    'logging.request' => $run['request'] + config('logging.request'),
+                ]);
+                Log::forgetChannel('pos');
+
+                $this->info("Run '{$name}': {$orders} checkouts...");
+                $failed = 0;
+                $startedAt = microtime(true);
+
+                for ($i = 0; $i < $orders; $i++) {
+                    $request = $this->checkoutRequest($businessId, $outletId, $productIds, $items);
+
+                    app()->instance('request', $request);
+                    $requestLog->start($request);
+
+                    $response = app(POSController::class)->createOrder($request);
+                    if ($response->getStatusCode() !== 201) {
+                        $failed++;
+                    }
+
+                    // What AssignRequestContext::terminate() does after the response
+                    $requestLog->flush();
+                    Context::flush();
+                }
+
+                $seconds = microtime(true) - $startedAt;
+                $lines = is_file($path) ? count(file($path)) : 0;
+                $bytes = is_file($path) ? filesize($path) : 0;
+
+                $rows[] = [$name, $orders, $failed, round($seconds, 3), round($seconds * 1000 / $orders, 3), $lines, round($bytes / 1024, 1)];
+
+                @unlink($path);
+            }
+        } finally {
+            DB::rollBack();
+            Log::forgetChannel('pos');
+        }
+
+        $this->table(['Run', 'Checkouts', 'Failed', 'Seconds', 'ms/checkout', 'Log lines', 'Log KB'], $rows);
+
+        return 0;
+    }
+
+    private function checkoutRequest($businessId, $outletId, array $productIds, int $items)
+    {
+        $cart = [];
+        foreach ((array) array_rand(array_flip($productIds), min($items, count($productIds))) as $productId) {
+            $cart[] = ['product_id' => $productId, 'quantity' => mt_rand(1, 3), 'price' => 15000, 'notes' => null];
+        }
+
+        return Request::create('/api/v1/orders', 'POST', [
+            'client_uuid' => (string) Str::uuid(),
+            'items' => $cart,
+            'discount' => 0,
+            'tax' => 0,
+            'notes' => 'Walk-in Customer',
+            'deferred_payment' => false,
+        ], [], [], [
+            'HTTP_X_BUSINESS_ID' => $businessId,
+            'HTTP_X_OUTLET_ID' => $outletId,
+        ]);
+    }
+
+    /**
+     * Owner (no shift needed), business, outlet and 20 tracked products with plenty of stock
+     */
+    private function seed()
+    {
+        $owner = UserFactory::new()->create(['role' => 'owner']);
+        $business = BusinessFactory::new()->create(['owner_id' => $owner->id]);
+        $outlet = OutletFactory::new()->create(['business_id' => $business->id]);
+        $category = CategoryFactory::new()->create(['business_id' => $business->id]);
+
+        $productIds = ProductFactory::new()->count(20)->create([
+            'business_id' => $business->id,
+            'category_id' => $category->id,
+            'stock' => 1000000,
+            'stock_type' => 'tracked',
+            'is_active' => true,
+        ])->pluck('id')->all();
+
+        return [$owner, $business->id, $outlet->id, $productIds];
+    }
+}
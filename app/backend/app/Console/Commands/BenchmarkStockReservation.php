@@ -0,0 +1,220 @@
+<?php
+
+namespace App\Console\Commands;
+
+use App\Exceptions\InsufficientStockException;
+use App\Models\Business;
+use App\Models\InventoryMovement;
+use App\Models\Order;
+use App\Models\OrderItem;
+use App\Models\Product;
+use App\Services\StockReservationService;
+use Illuminate\Console\Command;
+use Illuminate\Support\Facades\DB;
+use Illuminate\Support\Facades\Process;
+use Illuminate\Support\Str;
+
+class BenchmarkStockReservation extends Command
+{
+    /**
+     * The name and signature of the console command.
+     *
+     * @var string
+     */
+    protected $signature = 'benchmark:stock-reservation
+                            {--business= : Business ID to run the benchmark in (default: first business)}
+                            {--tills=8 : Number of parallel tills (processes)}
+                            {--stock=100 : Initial stock of the benchmark product}
+                            {--attempts=50 : Sales attempted by each till}
+                            {--quantity=1 : Units sold per sale}
+                            {--worker : Internal: run as a single till}
+                            {--product= : Internal: product ID used by a worker}';
+
+    /**
+     * The console command description.
+     *
+     * @var string
+     */
+    protected $description = 'Run N parallel tills against one product and verify stock is never oversold';
+
+    /**
+     * Execute the console command.
+     */
+    public function handle()
+    {
+        if ($this->option('worker')) {
+            return $this->runWorker();
+        }
+
+        $business = $this->option('business')
+            ? Business::find($this->option('business'))
+            : Business::first();
+
+        if (!$business || !$business->outlets()->exists()) {
+            $this->error('Business with at least one outlet not found.');
+            return 1;
+        }
+
+        $tills = (int) $this->option('tills');
+        $initialStock = (int) $this->option('stock');
+        $attempts = (int) $this->option('attempts');
+        $quantity = (int) $this->option('quantity');
+
+        $product = Product::create([
+            'business_id' => $business->id,
+            'name' => 'Benchmark Stock ' . Str::upper(Str::random(6)),
+            'slug' => 'benchmark-stock-' . Str::lower(Str::random(10)),
+            'sku' => 'BENCH-' . Str::upper(Str::random(8)),
+            'price' => 1000,
+            'cost' => 0,
+            'stock' => $initialStock,
+            'min_stock' => 0,
+            'stock_type' => 'tracked',
+            'is_active' => true,
+        ]);
+
+        $this->info("Running {$tills} tills x {$attempts} sales of {$quantity} unit(s) against stock {$initialStock}...");
+
+        $startedAt = microtime(true);
+
+        $results = Process::pool(function ($pool) use ($tills, $product, $attempts, $quantity) {
+            for ($i = 0; $i < $tills; $i++) {
+                $pool->path(base_path())->timeout(600)->command([
+                    PHP_BINARY, 'artisan', 'benchmark:stock-reservation', '--worker',
+                    '--product=' . $product->id,
+                    '--attempts=' . $attempts,
+                    '--quantity=' . $quantity,
+                ]);
+            }
+        })->start()->wait();
+
+        $elapsed = microtime(true) - $startedAt;
+
+        $sold = 0;
+        $rejected = 0;
+        $errors = 0;
+        $failedTills = 0;
+        foreach ($results as $result) {
+            $summary = json_decode(trim($result->output()), true);
+            if (!$result->successful() || !is_array($summary)) {
+                $this->error('Till failed: ' . $result->errorOutput());
+                $failedTills++;
+                continue;
+            }
+            $sold += $summary['sold'];
+            $rejected += $summary['rejected'];
+            $errors += $summary['errors'];
+            foreach ($summary['error_messages'] as $message) {
+                $this->error('Till error: ' . $message);
+            }
+        }
+
+        $product->refresh();
+        $orderIds = Order::where('notes', 'benchmark:' . $product->id)->pluck('id');
+        $movementUnits = (int) InventoryMovement::where('product_id', $product->id)->sum('quantity');
+
+        $this->table(['Metric', 'Value'], [
+            ['Tills', $tills],
+            ['Sales committed', $sold],
+            ['Sales rejected (out of stock)', $rejected],
+            ['Sales failed (other errors)', $errors],
+            ['Tills failed', $failedTills],
+            ['Units sold', $sold * $quantity],
+            ['Final stock', $product->stock],
+            ['Units in inventory movements', $movementUnits],
+            ['Elapsed (s)', round($elapsed, 3)],
+            ['Sales/sec', $elapsed > 0 ? round($sold / $elapsed, 1) : 0],
+        ]);
+
+        $oversold = $product->stock < 0
+            || ($sold * $quantity) > $initialStock
+            || ($initialStock - $product->stock) !== $movementUnits;
+
+        // Cleanup benchmark data
+        OrderItem::whereIn('order_id', $orderIds)->delete();
+        InventoryMovement::where('product_id', $product->id)->delete();
+        Order::whereIn('id', $orderIds)->delete();
+        $product->forceDelete();
+
+        if ($oversold) {
+            $this->error('❌ Stock was oversold or movements do not match stock changes.');
+            return 1;
+        }
+
+        // Deadlocks, lock wait timeouts, connection errors... must not hide as rejections
+        if ($errors > 0 || $failedTills > 0) {
+            $this->error("❌ {$errors} sale(s) and {$failedTills} till(s) failed for reasons other than stock.");
+            return 1;
+        }
+
+        $this->info('✅ No overselling detected.');
+        return 0;
+    }
+
+    /**
+     * Sell the benchmark product repeatedly from a single till and print a JSON summary.
+     */
+    private function runWorker()
+    {
+        $product = Product::findOrFail($this->option('product'));
+        $outlet = $product->business->outlets()->first();
+        $quantity = (int) $this->option('quantity');
+        $reservations = app(StockReservationService::class);
+
+        $sold = 0;
+        $rejected = 0;
+        $errors = 0;
+        $errorMessages = [];
+
+        for ($i = 0; $i < (int) $this->option('attempts'); $i++) {
+            DB::beginTransaction();
+
+            try {
+                $order = Order::create([
+                    'business_id' => $product->business_id,
+                    'outlet_id' => $outlet->id,
+                    'order_number' => 'ORD-' . strtoupper(Str::random(8)),
+                    'type' => 'dine_in',
+                    'status' => 'pending',
+                    'subtotal' => $product->price * $quantity,
+                    'tax_amount' => 0,
+                    'discount_amount' => 0,
+                    'service_charge' => 0,
+                    'delivery_fee' => 0,
+                    'total' => $product->price * $quantity,
+                    'paid_amount' => 0,
+                    'change_amount' => 0,
+                    'payment_status' => 'pending',
+                    'notes' => 'benchmark:' . $product->id,
+                    'ordered_at' => now(),
+                ]);
+
+                $reservations->reserve($order, [[
+                    'product_id' => $product->id,
+                    'quantity' => $quantity,
+                    'price' => $product->price,
+                ]]);
+
+                DB::commit();
+                $sold++;
+            } catch (InsufficientStockException $e) {
+                DB::rollBack();
+                $rejected++;
+            } catch (\Throwable $e) {
+                DB::rollBack();
+                $errors++;
+                // Distinct messages only, the summary is a single JSON line
+                $errorMessages[$e->getMessage()] = true;
+            }
+        }
+
+        $this->line(json_encode([
+            'sold' => $sold,
+            'rejected' => $rejected,
+            'errors' => $errors,
+            'error_messages' => array_slice(array_keys($errorMessages), 0, 5),
+        ]));
+
+        return 0;
+    }
+}
@@ -0,0 +1,111 @@
+<?php
+
+namespace App\Console\Commands;
+
+use App\Models\WhatsappMessage;
+use App\Services\WhatsAppService;
+use Illuminate\Console\Command;
+use Illuminate\Support\Facades\Artisan;
+use Illuminate\Support\Facades\Http;
+
+class BenchmarkWhatsAppQueue extends Command
+{
+    /**
+     * The name and signature of the console command.
+     *
+     * @var string
+     */
+    protected $signature = 'benchmark:whatsapp-queue
+                            {--latency=2000 : Simulated provider latency in ms (ignored with --url)}
+                            {--messages=10 : Number of receipts to queue}
+                            {--url= : Send to a running fake provider (tests/Fixtures/fake-whatsapp-provider.php) instead of an in-process fake}';
+
+    /**
+     * The console command description.
+     *
+     * @var string
+     */
+    protected $description = 'Show that queuing a WhatsApp receipt (payment path) does not depend on provider latency';
+
+    /**
+     * Execute the console command.
+     */
+    public function handle()
+    {
+        $latency = max(0, (int) $this->option('latency'));
+        $count = max(1, (int) $this->option('messages'));
+        $url = $this->option('url');
+
+        if (config('queue.default') === 'sync') {
+            $this->warn('QUEUE_CONNECTION=sync runs jobs inline; using the database connection for this benchmark.');
+            config(['queue.default' => 'database']);
+        }
+
+        config([
+            'whatsapp.enabled' => true,
+            'whatsapp.provider' => 'fonnte',
+            'whatsapp.api_key' => 'benchmark',
+            'whatsapp.providers.fonnte.url' => $url ?: 'https://fake-provider.test/send',
+            'whatsapp.failover.enabled' => false,
+            'whatsapp.queue.per_outlet_per_minute' => $count + 10,
+        ]);
+
+        if (!$url) {
+            Http::fake([
+                'fake-provider.test/*' => function () use ($latency) {
+                    usleep($latency * 1000);
+                    return Http::response(['status' => 'success', 'id' => 'fake-' . uniqid()]);
+                },
+            ]);
+        }
+
+        $service = new WhatsAppService(null);
+        $phone = '6280000000000';
+
+        // Before: provider call inside the payment request
+        $start = hrtime(true);
+        $syncResult = $service->sendMessage($phone, 'Benchmark receipt (synchronous)');
+        $syncMs = (hrtime(true) - $start) / 1e6;
+
+        // After: payment request only queues the message
+        $ids = [];
+        $start = hrtime(true);
+        for ($i = 0; $i < $count; $i++) {
+            $ids[] = $service->queueMessage($phone, "Benchmark receipt #{$i}", ['type' => 'benchmark'])->id;
+        }
+        $queueAvgMs = (hrtime(true) - $start) / 1e6 / $count;
+
+        // Worker drains the queue (same process, so the in-process fake applies)
+        $start = hrtime(true);
+        Artisan::call('queue:work', [
+            '--queue' => config('whatsapp.queue.name', 'whatsapp'),
+            '--stop-when-empty' => true,
+            '--tries' => 1,
+        ]);
+        $workerMs = (hrtime(true) - $start) / 1e6;
+
+        $statuses = WhatsappMessage::whereIn('id', $ids)
+            ->selectRaw('status, COUNT(*) as total')
+            ->groupBy('status')
+            ->pluck('total', 'status');
+
+        WhatsappMessage::whereIn('id', $ids)->delete();
+
+        $this->table(['Metric', 'Value'], [
+            ['Provider', $url ?: "in-process fake ({$latency} ms)"],
+            ['Synchronous send (ms)', round($syncMs, 1) . (($syncResult['success'] ?? false) ? '' : ' (failed)')],
+            ['Queue receipt avg (ms) - payment path', round($queueAvgMs, 2)],
+            ['Worker drain total (ms)', round($workerMs, 1)],
+            ['Messages sent', $statuses['sent'] ?? 0],
+            ['Messages not sent', $count - ($statuses['sent'] ?? 0)],
+        ]);
+
+        if ($queueAvgMs >= $syncMs / 10) {
+            $this->error('❌ Queuing is not clearly cheaper than a synchronous provider call.');
+            return 1;
+        }
+
+        $this->info('✅ Payment path no longer waits for the WhatsApp provider.');
+        return 0;
+    }
+}
@@ -0,0 +1,35 @@
+<?php
+
+namespace App\Console\Commands;
+
+use App\Services\PublicMenuService;
+use Illuminate\Console\Command;
+
+class FlushTableScans extends Command
+{
+    /**
+     * The name and signature of the console command.
+     *
+     * @var string
+     */
+    protected $signature = 'selfservice:flush-scans';
+
+    /**
+     * The console command description.
+     *
+     * @var string
+     */
+    protected $description = 'Write buffered QR menu scans to tables.scan_count / last_scan_at';
+
+    /**
+     * Execute the console command.
+     */
+    public function handle(PublicMenuService $menu)
+    {
+        $updated = $menu->flushScans();
+
+        $this->info("✅ Flushed scans of {$updated} table(s).");
+
+        return 0;
+    }
+}
@@ -0,0 +1,35 @@
+<?php
+
+namespace App\Console\Commands;
+
+use App\Services\ReportExportService;
+use Illuminate\Console\Command;
+
+class PruneReportExports extends Command
+{
+    /**
+     * The name and signature of the console command.
+     *
+     * @var string
+     */
+    protected $signature = 'reports:prune-exports';
+
+    /**
+     * The console command description.
+     *
+     * @var string
+     */
+    protected $description = 'Delete expired background report exports and their stored artifacts';
+
+    /**
+     * Execute the console command.
+     */
+    public function handle(ReportExportService $exports)
+    {
+        $removed = $exports->prune();
+
+        $this->info("✅ Removed {$removed} expired report export(s).");
+
+        return 0;
+    }
+}
@@ -0,0 +1,64 @@
+<?php
+
+namespace App\Console\Commands;
+
+use App\Services\NotificationService;
+use Illuminate\Console\Command;
+
+class PushMetrics extends Command
+{
+    /**
+     * The name and signature of the console command.
+     *
+     * @var string
+     */
+    protected $signature = 'push:metrics
+                            {--minutes=15 : Number of recent minutes to show}
+                            {--json : Output as JSON (for monitoring scrapers)}';
+
+    /**
+     * The console command description.
+     *
+     * @var string
+     */
+    protected $description = 'Show Web Push delivery throughput (pushes/sec), failures, pruned endpoints and coalesced notifications per minute';
+
+    /**
+     * Execute the console command.
+     */
+    public function handle(NotificationService $notifications)
+    {
+        $minutes = max(1, (int) $this->option('minutes'));
+        $rows = $notifications->metrics($minutes);
+
+        $totals = ['sent' => 0, 'failed' => 0, 'expired' => 0, 'coalesced' => 0, 'duration_ms' => 0];
+        foreach ($rows as $row) {
+            foreach ($totals as $metric => $value) {
+                $totals[$metric] += $row[$metric];
+            }
+        }
+        $totals['pushes_per_second'] = $totals['duration_ms'] > 0
+            ? round($totals['sent'] / ($totals['duration_ms'] / 1000), 1)
+            : 0;
+        $attempted = $totals['sent'] + $totals['failed'];
+        $totals['failure_rate'] = $attempted > 0 ? round($totals['failed'] / $attempted * 100, 2) : 0;
+
+        if ($this->option('json')) {
+            $this->line(json_encode(['minutes' => $rows, 'totals' => $totals]));
+            return 0;
+        }
+
+        $this->table(
+            ['Minute', 'Sent', 'Failed', 'Expired (pruned)', 'Coalesced', 'Send time (ms)', 'Pushes/sec'],
+            array_map(fn ($row) => [
+                $row['minute'], $row['sent'], $row['failed'], $row['expired'],
+                $row['coalesced'], $row['duration_ms'], $row['pushes_per_second'],
+            ], $rows)
+        );
+
+        $this->info("Last {$minutes} minute(s): {$totals['sent']} sent, {$totals['failed']} failed ({$totals['failure_rate']}%), "
+            . "{$totals['expired']} expired endpoints pruned, {$totals['coalesced']} coalesced, {$totals['pushes_per_second']} pushes/sec.");
+
+        return 0;
+    }
+}
@@ -0,0 +1,115 @@
+<?php
+
+namespace App\Console\Commands;
+
+use App\Models\CashierShift;
+use App\Services\ShiftLedgerService;
+use Illuminate\Console\Command;
+
+class ReconcileShiftLedger extends Command
+{
+    /**
+     * The name and signature of the console command.
+     *
+     * @var string
+     */
+    protected $signature = 'shift:reconcile
+                            {--shift=* : Shift ID(s) to reconcile (default: all open shifts)}
+                            {--fix : Rebuild the ledger and counters of shifts that differ}
+                            {--rebuild-all : Rebuild the ledger and counters of every shift, open and closed (backfill of shifts from before the ledger)}';
+
+    /**
+     * The console command description.
+     *
+     * @var string
+     */
+    protected $description = 'Recompute cashier shift totals from orders in bulk SQL and diff them against the shift ledger';
+
+    /**
+     * Execute the console command.
+     */
+    public function handle(ShiftLedgerService $ledger)
+    {
+        $shiftIds = $this->option('shift');
+
+        if ($this->option('rebuild-all')) {
+            return $this->rebuildAll($ledger, $shiftIds);
+        }
+
+        $query = $shiftIds
+            ? CashierShift::whereIn('id', $shiftIds)
+            : CashierShift::open();
+
+        $checked = 0;
+        $mismatched = [];
+
+        $query->orderBy('id')->chunkById(500, function ($shifts) use ($ledger, &$checked, &$mismatched) {
+            $recomputed = $ledger->recomputeFromOrders($shifts->pluck('id')->all());
+
+            foreach ($shifts as $shift) {
+                $checked++;
+                $expected = $recomputed->get($shift->id);
+
+                $diffs = [];
+                $this->compare($diffs, 'total_transactions', $shift->total_transactions, $expected->total_transactions ?? 0);
+                $this->compare($diffs, 'expected_total', $shift->expected_total, $expected->expected_total ?? 0);
+                $this->compare($diffs, 'expected_cash', $shift->expected_cash, $shift->opening_balance + ($expected->cash ?? 0));
+                foreach (['card', 'transfer', 'qris'] as $method) {
+                    $this->compare($diffs, "expected_{$method}", $shift->{"expected_{$method}"}, $expected->{$method} ?? 0);
+                }
+                foreach (ShiftLedgerService::METHODS as $method) {
+                    $column = "{$method}_transactions";
+                    $this->compare($diffs, $column, $shift->{$column}, $expected->{$column} ?? 0);
+                }
+
+                if (!empty($diffs)) {
+                    $mismatched[] = $shift->id;
+                    $this->warn("Shift #{$shift->id} ({$shift->status}) differs:");
+                    $this->table(['Column', 'Ledger', 'Recomputed'], $diffs);
+                }
+            }
+        });
+
+        $this->info("Checked {$checked} shift(s), " . count($mismatched) . ' mismatched.');
+
+        if ($this->option('fix') && !empty($mismatched)) {
+            foreach (array_chunk($mismatched, 500) as $chunk) {
+                $ledger->rebuild($chunk);
+            }
+            $this->info('✅ Rebuilt ledger for ' . count($mismatched) . ' shift(s).');
+            return 0;
+        }
+
+        return empty($mismatched) ? 0 : 1;
+    }
+
+    /**
+     * Write ledger entries for every (selected) shift, whether or not its counters differ
+     */
+    private function rebuildAll(ShiftLedgerService $ledger, array $shiftIds)
+    {
+        $query = $shiftIds
+            ? CashierShift::whereIn('id', $shiftIds)
+            : CashierShift::query();
+
+        $rebuilt = 0;
+
+        $query->select('id')->chunkById(500, function ($shifts) use ($ledger, &$rebuilt) {
+            $ledger->rebuild($shifts->pluck('id')->all());
+            $rebuilt += $shifts->count();
+
+            $this->line("Rebuilt {$rebuilt} shift(s)...");
+        });
+
+        $this->info("✅ Rebuilt ledger for {$rebuilt} shift(s).");
+
+        return 0;
+    }
+
+    private function compare(array &$diffs, $column, $actual, $expected)
+    {
+        if (abs((float) $actual - (float) $expected) > 0.009) {
+            $diffs[] = [$column, $actual, $expected];
+        }
+    }
+}
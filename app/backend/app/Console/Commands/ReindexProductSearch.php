@@ -0,0 +1,40 @@
+<?php
+
+namespace App\Console\Commands;
+
+use App\Services\ProductSearchService;
+use Illuminate\Console\Command;
+
+class ReindexProductSearch extends Command
+{
+    /**
+     * The name and signature of the console command.
+     *
+     * @var string
+     */
+    protected $signature = 'search:reindex-products
+                            {--business= : Only reindex the products of this business}';
+
+    /**
+     * The console command description.
+     *
+     * @var string
+     */
+    protected $description = 'Rebuild the product search index (after imports or bulk updates outside Eloquent)';
+
+    /**
+     * Execute the console command.
+     */
+    public function handle(ProductSearchService $search)
+    {
+        $this->info('Driver: ' . class_basename($search->driver()));
+
+        $count = $search->rebuild($this->option('business') ?: null, function ($count) {
+            $this->line("  {$count} product(s) indexed...");
+        });
+
+        $this->info("✅ Indexed {$count} product(s).");
+
+        return 0;
+    }
+}
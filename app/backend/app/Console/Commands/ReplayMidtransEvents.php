@@ -0,0 +1,110 @@
+<?php
+
+namespace App\Console\Commands;
+
+use App\Jobs\ProcessMidtransEvents;
+use App\Models\MidtransEvent;
+use App\Services\MidtransWebhookService;
+use Illuminate\Console\Command;
+
+class ReplayMidtransEvents extends Command
+{
+    /**
+     * The name and signature of the console command.
+     *
+     * @var string
+     */
+    protected $signature = 'midtrans:replay
+                            {ids?* : Event ids to replay}
+                            {--order= : Midtrans order_id (all its events)}
+                            {--status=failed : Replay events with this status (failed, ignored, processed, pending)}
+                            {--since= : Only events received after this date/time}
+                            {--limit=500 : Maximum number of events}
+                            {--sync : Apply in this process instead of queueing}
+                            {--dry-run : Only list the events}';
+
+    /**
+     * The console command description.
+     *
+     * @var string
+     */
+    protected $description = 'Re-apply stored Midtrans callbacks (events are idempotent, settled payments are never downgraded)';
+
+    /**
+     * Execute the console command.
+     */
+    public function handle(MidtransWebhookService $service)
+    {
+        $query = MidtransEvent::query()->orderBy('id');
+
+        if ($ids = $this->argument('ids')) {
+            $query->whereIn('id', $ids);
+        } else {
+            $query->where('status', $this->option('status'));
+        }
+
+        if ($order = $this->option('order')) {
+            $query->where('midtrans_order_id', $order);
+        }
+
+        if ($since = $this->option('since')) {
+            $query->where('created_at', '>=', $since);
+        }
+
+        $events = $query->limit(max(1, (int) $this->option('limit')))->get();
+
+        if ($events->isEmpty()) {
+            $this->info('No Midtrans events to replay.');
+            return 0;
+        }
+
+        $this->table(
+            ['ID', 'Type', 'Order ID', 'Transaction status', 'Status', 'Attempts', 'Last error'],
+            $events->map(fn ($event) => [
+                $event->id,
+                $event->type,
+                $event->midtrans_order_id,
+                $event->transaction_status,
+                $event->status,
+                $event->attempts,
+                mb_strimwidth((string) $event->last_error, 0, 60, '...'),
+            ])
+        );
+
+        if ($this->option('dry-run')) {
+            return 0;
+        }
+
+        MidtransEvent::whereIn('id', $events->pluck('id'))->update([
+            'status' => 'pending',
+            'attempts' => 0,
+            'last_error' => null,
+            'processed_at' => null,
+        ]);
+
+        $orderKeys = $events->pluck('order_key')->unique()->values();
+
+        foreach ($orderKeys as $orderKey) {
+            if ($this->option('sync')) {
+                ProcessMidtransEvents::dispatchSync($orderKey);
+            } else {
+                $service->dispatch($orderKey);
+            }
+        }
+
+        $statuses = MidtransEvent::whereIn('id', $events->pluck('id'))
+            ->selectRaw('status, COUNT(*) as total')
+            ->groupBy('status')
+            ->pluck('total', 'status');
+
+        $this->info(sprintf(
+            '✅ %d event(s) of %d order(s) %s. %s',
+            $events->count(),
+            $orderKeys->count(),
+            $this->option('sync') ? 'replayed' : 'queued on ' . config('midtrans.webhook.queue', 'payments'),
+            $statuses->map(fn ($total, $status) => "{$status}: {$total}")->implode(', ')
+        ));
+
+        return 0;
+    }
+}
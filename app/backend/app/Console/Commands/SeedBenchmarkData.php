@@ -0,0 +1,81 @@
+<?php
+
+namespace App\Console\Commands;
+
+use Database\Seeders\BenchmarkSeeder;
+use Illuminate\Console\Command;
+
+class SeedBenchmarkData extends Command
+{
+    /**
+     * The name and signature of the console command.
+     *
+     * @var string
+     */
+    protected $signature = 'benchmark:seed
+                            {--profile=small : Size profile (small, medium, large)}
+                            {--seed=20260120 : Random seed; the same profile and seed produce the same data}
+                            {--until= : Last day with orders (Y-m-d, default: today)}
+                            {--chunk=1000 : Rows per bulk insert}
+                            {--fresh : Delete the data of this seed first}
+                            {--force : Allow running in production}';
+
+    /**
+     * The console command description.
+     *
+     * @var string
+     */
+    protected $description = 'Generate a reproducible large dataset (businesses, outlets, products, orders, payments, shifts, stock movements) for benchmarks';
+
+    /**
+     * Execute the console command.
+     */
+    public function handle()
+    {
+        $profile = $this->option('profile');
+
+        if (!array_key_exists($profile, BenchmarkSeeder::PROFILES)) {
+            $this->error('Unknown profile. Available: ' . implode(', ', array_keys(BenchmarkSeeder::PROFILES)));
+            return 1;
+        }
+
+        if (app()->isProduction() && !$this->option('force')) {
+            $this->error('Refusing to seed benchmark data in production (use --force).');
+            return 1;
+        }
+
+        $seeder = new BenchmarkSeeder(
+            $profile,
+            (int) $this->option('seed'),
+            $this->option('until'),
+            max(100, (int) $this->option('chunk')),
+        );
+        $seeder->setContainer(app())->setCommand($this);
+
+        if ($this->option('fresh')) {
+            $this->info('Deleted ' . $seeder->purge() . ' benchmark business(es) of seed ' . $this->option('seed'));
+        } elseif ($seeder->exists()) {
+            $this->error('Benchmark data of seed ' . $this->option('seed') . ' already exists (use --fresh or another --seed).');
+            return 1;
+        }
+
+        $this->table(['Setting', 'Value'], collect(BenchmarkSeeder::PROFILES[$profile])
+            ->map(fn ($value, $key) => [$key, $value])
+            ->values()
+            ->all());
+
+        $startedAt = microtime(true);
+        $seeder->__invoke();
+        $elapsed = microtime(true) - $startedAt;
+
+        $this->table(['Table', 'Rows'], collect($seeder->counts())
+            ->map(fn ($rows, $table) => [$table, number_format($rows)])
+            ->values()
+            ->all());
+
+        $this->info(sprintf('Done in %.1fs. Log in as owner1.s%d@%s / %s',
+            $elapsed, $this->option('seed'), BenchmarkSeeder::EMAIL_DOMAIN, BenchmarkSeeder::PASSWORD));
+
+        return 0;
+    }
+}
@@ -0,0 +1,10 @@
+<?php
+
+namespace App\Exceptions;
+
+/**
+ * A tracked product does not have enough stock for a sale (StockReservationService)
+ */
+class InsufficientStockException extends \Exception
+{
+}
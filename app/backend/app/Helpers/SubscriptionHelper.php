@@ -57,6 +57,144 @@ public static function getActiveSubscription(User $user): ?UserSubscription
         });
     }
 
+    /**
+     * Seconds an entitlement snapshot stays cached (non-active states use a shorter TTL)
+     */
+    public const ENTITLEMENT_TTL = 300;
+    public const ENTITLEMENT_INACTIVE_TTL = 30;
+
+    /**
+     * Get cached entitlement snapshot used by CheckSubscriptionStatus middleware.
+     *
+     * Snapshot shape: ['state' => active|employee_unassigned|owner_missing|owner_expired|pending|required,
+     * 'owner_id' => int|null, 'ends_at' => unix timestamp|null, 'valid_until' => unix timestamp|null,
+     * 'warn_expiry' => bool]. A cached "active" snapshot whose valid_until has passed is re-resolved,
+     * so expiry never depends on the TTL.
+     */
+    public static function getEntitlement(User $user): array
+    {
+        $cacheKey = self::entitlementCacheKey($user->id);
+        $snapshot = Cache::get($cacheKey);
+
+        if (is_array($snapshot) && ($snapshot['state'] !== 'active' || $snapshot['valid_until'] > time())) {
+            return $snapshot;
+        }
+
+        $snapshot = self::resolveEntitlement($user);
+        Cache::put(
+            $cacheKey,
+            $snapshot,
+            $snapshot['state'] === 'active' ? self::ENTITLEMENT_TTL : self::ENTITLEMENT_INACTIVE_TTL
+        );
+
+        return $snapshot;
+    }
+
+    /**
+     * Forget entitlement snapshots of an owner and every employee of the owner's businesses
+     */
+    public static function forgetEntitlement($ownerId): void
+    {
+        Cache::forget(self::entitlementCacheKey($ownerId));
+        Cache::forget("subscription:user:{$ownerId}");
+
+        $employeeUserIds = Employee::whereHas('business', function ($query) use ($ownerId) {
+            $query->where('owner_id', $ownerId);
+        })->pluck('user_id');
+
+        foreach ($employeeUserIds as $employeeUserId) {
+            Cache::forget(self::entitlementCacheKey($employeeUserId));
+        }
+    }
+
+    public static function entitlementCacheKey($userId): string
+    {
+        return "subscription:entitlement:{$userId}";
+    }
+
+    /**
+     * Resolve entitlement from the database (same rules the middleware always applied)
+     */
+    private static function resolveEntitlement(User $user): array
+    {
+        $snapshot = [
+            'state' => 'required',
+            'owner_id' => $user->id,
+            'ends_at' => null,
+            'valid_until' => null,
+            'warn_expiry' => false,
+        ];
+
+        // Employee roles need to check their business owner's subscription
+        if (in_array($user->role, ['kasir', 'kitchen', 'waiter', 'admin'])) {
+            $ownerId = Employee::where('employees.user_id', $user->id)
+                ->where('employees.is_active', true)
+                ->join('businesses', 'businesses.id', '=', 'employees.business_id')
+                ->value('businesses.owner_id');
+
+            if (!$ownerId) {
+                return array_merge($snapshot, ['state' => 'employee_unassigned', 'owner_id' => null]);
+            }
+
+            if (!User::whereKey($ownerId)->exists()) {
+                return array_merge($snapshot, ['state' => 'owner_missing', 'owner_id' => $ownerId]);
+            }
+
+            $endsAt = UserSubscription::where('user_id', $ownerId)
+                ->where('status', 'active')
+                ->where('ends_at', '>', Carbon::now())
+                ->max('ends_at');
+
+            if (!$endsAt) {
+                return array_merge($snapshot, ['state' => 'owner_expired', 'owner_id' => $ownerId]);
+            }
+
+            $endsAt = Carbon::parse($endsAt)->getTimestamp();
+
+            return array_merge($snapshot, [
+                'state' => 'active',
+                'owner_id' => $ownerId,
+                'ends_at' => $endsAt,
+                'valid_until' => $endsAt,
+            ]);
+        }
+
+        // For owner/super_admin roles, check their own subscription
+        $activeSubscription = UserSubscription::where('user_id', $user->id)
+            ->where('status', 'active')
+            ->where('ends_at', '>', Carbon::now())
+            ->first();
+
+        $validUntil = $activeSubscription?->ends_at;
+
+        // During upgrade/payment (pending_payment), allow a subscription that expired
+        // within the last 7 days (grace period)
+        $hasPendingPayment = UserSubscription::where('user_id', $user->id)
+            ->where('status', 'pending_payment')
+            ->exists();
+
+        if (!$activeSubscription && $hasPendingPayment) {
+            $activeSubscription = UserSubscription::where('user_id', $user->id)
+                ->where('status', 'active')
+                ->where('ends_at', '>', Carbon::now()->subDays(7))
+                ->orderBy('ends_at', 'desc')
+                ->first();
+
+            $validUntil = $activeSubscription?->ends_at?->copy()->addDays(7);
+        }
+
+        if (!$activeSubscription) {
+            return array_merge($snapshot, ['state' => $hasPendingPayment ? 'pending' : 'required']);
+        }
+
+        return array_merge($snapshot, [
+            'state' => 'active',
+            'ends_at' => $activeSubscription->ends_at->getTimestamp(),
+            'valid_until' => $validUntil->getTimestamp(),
+            'warn_expiry' => true,
+        ]);
+    }
+
     /**
      * Check if user has access to advanced reports
      * ✅ FIX: Check has_reports_access first (configurable from Filament), fallback to has_advanced_reports
@@ -282,11 +282,9 @@ public function resendVerificationEmail(Request $request)
 
     public function login(Request $request)
     {
-        // ✅ FIX: Log request data for debugging
-        Log::info('Login request received', [
+        // Request details only with LOG_AUTH_LEVEL=debug (never anything about the password)
+        Log::channel('auth')->debug('Login request received', [
             'email' => $request->email,
-            'has_password' => !empty($request->password),
-            'password_length' => strlen($request->password ?? ''),
             'device_name' => $request->device_name,
         ]);
 
@@ -297,7 +295,7 @@ public function login(Request $request)
                 'device_name' => 'nullable|string|max:255', // ✅ FIX: Optional device name for token flexibility
             ]);
         } catch (ValidationException $e) {
-            Log::warning('Login validation failed', [
+            Log::channel('auth')->warning('Login validation failed', [
                 'email' => $request->email,
                 'errors' => $e->errors(),
             ]);
@@ -316,17 +314,16 @@ public function login(Request $request)
             ->whereRaw('LOWER(email) = ?', [$normalizedEmail])
             ->first();
         
-        Log::info('User lookup result', [
+        Log::channel('auth')->debug('User lookup result', [
             'email' => $request->email,
             'user_found' => $user ? 'yes' : 'no',
             'user_id' => $user?->id,
             'user_role' => $user?->role,
             'is_active' => $user?->is_active,
-            'deleted_at' => $user?->deleted_at,
         ]);
         
         if (!$user) {
-            Log::warning('Login attempt failed: User not found or soft deleted', [
+            Log::channel('auth')->warning('Login attempt failed: User not found or soft deleted', [
                 'email' => $request->email,
             ]);
             throw ValidationException::withMessages([
@@ -336,7 +333,7 @@ public function login(Request $request)
 
         // ✅ FIX: Check if user is active
         if (isset($user->is_active) && $user->is_active === false) {
-            Log::warning('Login attempt failed: User is inactive', [
+            Log::channel('auth')->warning('Login attempt failed: User is inactive', [
                 'email' => $request->email,
                 'user_id' => $user->id,
                 'role' => $user->role,
@@ -348,7 +345,7 @@ public function login(Request $request)
 
         // ✅ FIX: Verify password manually (since Auth::attempt() might not work with soft deletes)
         if (!Hash::check($request->password, $user->password)) {
-            Log::warning('Login attempt failed: Invalid password', [
+            Log::channel('auth')->warning('Login attempt failed: Invalid password', [
                 'email' => $request->email,
                 'user_id' => $user->id,
                 'role' => $user->role,
@@ -365,13 +362,10 @@ public function login(Request $request)
         $deviceName = $request->device_name ?? 'Web Browser';
         $token = $user->createToken($deviceName)->plainTextToken;
 
-        // Debug logging
-        Log::info('Login attempt', [
-            'email' => $request->email,
+        Log::channel('auth')->info('Login succeeded', [
             'user_id' => $user->id,
-            'user_name' => $user->name,
-            'user_email' => $user->email,
-            'user_role' => $user->role
+            'user_role' => $user->role,
+            'device_name' => $deviceName,
         ]);
 
         // Check if user is an employee and get their business
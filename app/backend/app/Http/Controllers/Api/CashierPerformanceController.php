@@ -4,8 +4,9 @@
 
 use App\Http\Controllers\Controller;
 use App\Models\Order;
-use App\Models\User;
 use App\Models\CashierShift;
+use App\Services\CashierPerformanceService;
+use App\Services\ShiftLedgerService;
 use Carbon\Carbon;
 use Illuminate\Http\Request;
 use Illuminate\Http\JsonResponse;
@@ -68,194 +69,10 @@ public function getPerformanceAnalytics(Request $request): JsonResponse
                 'end_date' => $endDate->format('Y-m-d H:i:s'),
             ]);
 
-            // Get all cashiers for this business
-            // ✅ FIX: User table doesn't have business_id column, get from employees table
-            // Get user IDs from employees table for this business
-            $employeeUserIds = \App\Models\Employee::where('business_id', $businessId)
-                ->pluck('user_id')
-                ->toArray();
-            
-            // If no employees found, return empty result
-            if (empty($employeeUserIds)) {
-                Log::info('CashierPerformance - No employees found for business', [
-                    'business_id' => $businessId,
-                ]);
-                $cashiers = collect([]);
-            } else {
-                // Build query for cashiers
-                $cashiersQuery = User::whereIn('id', $employeeUserIds)
-                    ->where('role', 'kasir');
-                
-                // If outlet filter is needed, try to filter by employee outlet assignments
-                if ($outletId) {
-                    // ✅ FIX: employee_outlets table uses user_id, not employee_id
-                    // Get user IDs directly from employee_outlets table
-                    $outletUserIds = DB::table('employee_outlets')
-                        ->where('outlet_id', $outletId)
-                        ->where('business_id', $businessId)
-                        ->pluck('user_id')
-                        ->toArray();
-                    
-                    if (!empty($outletUserIds)) {
-                        // Intersect with employee user IDs
-                        $filteredUserIds = array_intersect($employeeUserIds, $outletUserIds);
-                        if (!empty($filteredUserIds)) {
-                            $cashiersQuery->whereIn('id', $filteredUserIds);
-                        } else {
-                            // No cashiers for this outlet
-                            $cashiers = collect([]);
-                        }
-                    } else {
-                        // No users found for this outlet
-                        Log::info('CashierPerformance - No users found for outlet', [
-                            'outlet_id' => $outletId,
-                            'business_id' => $businessId,
-                        ]);
-                        $cashiers = collect([]);
-                    }
-                }
-                
-                // Only get if cashiers hasn't been set to empty collection
-                if (!isset($cashiers)) {
-                    $cashiers = $cashiersQuery->get();
-                }
-            }
-
-            $performanceData = [];
-
-            // ✅ FIX: Check if cashiers is empty before processing
-            if ($cashiers->isEmpty()) {
-                Log::info('CashierPerformance getPerformanceAnalytics - No cashiers found', [
-                    'business_id' => $businessId,
-                    'outlet_id' => $outletId,
-                ]);
-            }
-
-            foreach ($cashiers as $cashier) {
-                // Get employee_id for this user/cashier
-                $employee = \App\Models\Employee::where('user_id', $cashier->id)
-                    ->where('business_id', $businessId)
-                    ->first();
-
-                if (!$employee) {
-                    continue; // Skip if no employee record found
-                }
-
-                // Get orders handled by this cashier
-                $orders = Order::where('business_id', $businessId)
-                    ->where('employee_id', $employee->id)
-                    ->whereBetween('created_at', [$startDate, $endDate])
-                    ->whereIn('status', ['completed', 'confirmed', 'preparing', 'ready'])
-                    ->whereNull('deleted_at') // Handle soft deletes
-                    ->when($outletId, function ($query) use ($outletId) {
-                        return $query->where('outlet_id', $outletId);
-                    });
-
-                $totalOrders = $orders->count();
-                $totalRevenue = $orders->sum('total') ?? 0;
-                $avgOrderValue = $totalOrders > 0 && $totalRevenue > 0 ? $totalRevenue / $totalOrders : 0;
-
-                // Get session data
-                $sessions = CashierShift::where('business_id', $businessId)
-                    ->where('user_id', $cashier->id)
-                    ->whereBetween('opened_at', [$startDate, $endDate])
-                    ->whereNull('deleted_at') // Handle soft deletes
-                    ->when($outletId, function ($query) use ($outletId) {
-                        return $query->where('outlet_id', $outletId);
-                    });
-
-                $totalSessions = $sessions->count();
-                $totalSessionHours = 0;
-                try {
-                    $totalSessionHours = $sessions->get()->sum(function ($session) {
-                        if (!$session->opened_at) {
-                            return 0;
-                        }
-                        $closedAt = $session->closed_at ?? Carbon::now();
-                        return $session->opened_at->diffInHours($closedAt);
-                    });
-                } catch (\Exception $e) {
-                    Log::warning('Error calculating session hours', [
-                        'cashier_id' => $cashier->id,
-                        'error' => $e->getMessage(),
-                    ]);
-                    $totalSessionHours = 0;
-                }
-
-                // ✅ FIX: Calculate performance metrics
-                // If no session hours, use default 1 hour to calculate orders per hour (avoid division by zero)
-                // This ensures we still get a score even if there are no recorded sessions
-                $effectiveSessionHours = $totalSessionHours > 0 ? $totalSessionHours : 1;
-                $ordersPerHour = $totalOrders / $effectiveSessionHours;
-                $revenuePerHour = $totalRevenue / $effectiveSessionHours;
-
-                // Log for debugging (only in development)
-                if (config('app.debug')) {
-                    Log::info('CashierPerformance - Metrics calculation', [
-                        'cashier_id' => $cashier->id,
-                        'cashier_name' => $cashier->name,
-                        'total_orders' => $totalOrders,
-                        'total_revenue' => $totalRevenue,
-                        'total_sessions' => $totalSessions,
-                        'total_session_hours' => $totalSessionHours,
-                        'effective_session_hours' => $effectiveSessionHours,
-                        'orders_per_hour' => $ordersPerHour,
-                        'revenue_per_hour' => $revenuePerHour,
-                    ]);
-                }
-
-                // Get today's performance
-                $todayOrders = Order::where('business_id', $businessId)
-                    ->where('employee_id', $employee->id)
-                    ->whereDate('created_at', today())
-                    ->whereIn('status', ['completed', 'confirmed', 'preparing', 'ready'])
-                    ->whereNull('deleted_at') // Handle soft deletes
-                    ->when($outletId, function ($query) use ($outletId) {
-                        return $query->where('outlet_id', $outletId);
-                    })
-                    ->count();
-
-                $todayRevenue = Order::where('business_id', $businessId)
-                    ->where('employee_id', $employee->id)
-                    ->whereDate('created_at', today())
-                    ->whereIn('status', ['completed', 'confirmed', 'preparing', 'ready'])
-                    ->whereNull('deleted_at') // Handle soft deletes
-                    ->when($outletId, function ($query) use ($outletId) {
-                        return $query->where('outlet_id', $outletId);
-                    })
-                    ->sum('total') ?? 0;
-
-                $performanceData[] = [
-                    'cashier_id' => $cashier->id,
-                    'cashier_name' => $cashier->name,
-                    'cashier_email' => $cashier->email,
-                    'total_orders' => $totalOrders,
-                    'total_revenue' => $totalRevenue,
-                    'avg_order_value' => round($avgOrderValue, 2),
-                    'total_sessions' => $totalSessions,
-                    'total_session_hours' => round($totalSessionHours, 2),
-                    'orders_per_hour' => round($ordersPerHour, 2),
-                    'revenue_per_hour' => round($revenuePerHour, 2),
-                    'today_orders' => $todayOrders,
-                    'today_revenue' => $todayRevenue,
-                    'performance_score' => $this->calculatePerformanceScore($totalOrders, $totalRevenue, $ordersPerHour),
-                ];
-            }
-
-            // Sort by performance score
-            usort($performanceData, function ($a, $b) {
-                return $b['performance_score'] <=> $a['performance_score'];
-            });
-
-            // Get summary statistics
-            $summary = [
-                'total_cashiers' => count($performanceData), // Use performanceData count, not cashiers
-                'total_orders' => array_sum(array_column($performanceData, 'total_orders')) ?? 0,
-                'total_revenue' => array_sum(array_column($performanceData, 'total_revenue')) ?? 0,
-                'avg_performance_score' => count($performanceData) > 0 ?
-                    round(array_sum(array_column($performanceData, 'performance_score')) / count($performanceData), 2) : 0,
-                'top_performer' => count($performanceData) > 0 ? $performanceData[0]['cashier_name'] : null,
-            ];
+            // ✅ Semua kasir dihitung sekaligus (GROUP BY), bukan beberapa query per kasir
+            $performance = app(CashierPerformanceService::class);
+            $performanceData = $performance->analytics($businessId, $startDate, $endDate, $outletId);
+            $summary = $performance->summary($performanceData);
 
             // Log results for debugging
             Log::info('CashierPerformance getPerformanceAnalytics - Results', [
@@ -385,11 +202,9 @@ public function getCashierDetail(Request $request, $cashierId): JsonResponse
                 $endDate = $range['end'];
             }
 
-            // Verify cashier belongs to business
-            $cashier = User::where('id', $cashierId)
-                ->where('business_id', $businessId)
-                ->where('role', 'kasir')
-                ->first();
+            // Verify cashier belongs to business (employee record with role kasir)
+            $performance = app(CashierPerformanceService::class);
+            $cashier = $performance->cashiers($businessId, null, $cashierId)->first();
 
             if (!$cashier) {
                 return response()->json([
@@ -398,34 +213,19 @@ public function getCashierDetail(Request $request, $cashierId): JsonResponse
                 ], 404);
             }
 
-            // Get employee record for this cashier
-            $employee = \App\Models\Employee::where('user_id', $cashierId)
-                ->where('business_id', $businessId)
-                ->first();
+            $metrics = $performance->analytics($businessId, $startDate, $endDate, $outletId, $cashierId)[0];
 
-            if (!$employee) {
-                return response()->json([
-                    'success' => false,
-                    'message' => 'Employee record not found for this cashier'
-                ], 404);
-            }
-
-            // Get detailed performance metrics
-            $orders = Order::where('business_id', $businessId)
-                ->where('employee_id', $employee->id)
-                ->whereBetween('created_at', [$startDate, $endDate])
-                ->whereIn('status', ['completed', 'confirmed', 'preparing', 'ready'])
-                ->whereNull('deleted_at') // Handle soft deletes
+            // Each breakdown gets its own query (a shared builder would accumulate selects and groups)
+            $orders = fn () => Order::where('orders.business_id', $businessId)
+                ->where('orders.employee_id', $cashier->employee_id)
+                ->whereBetween('orders.created_at', [$startDate, $endDate])
+                ->whereIn('orders.status', CashierPerformanceService::ORDER_STATUSES)
                 ->when($outletId, function ($query) use ($outletId) {
-                    return $query->where('outlet_id', $outletId);
+                    return $query->where('orders.outlet_id', $outletId);
                 });
 
-            $totalOrders = $orders->count();
-            $totalRevenue = $orders->sum('total');
-            $avgOrderValue = $totalOrders > 0 ? $totalRevenue / $totalOrders : 0;
-
             // Get hourly performance
-            $hourlyPerformance = $orders->selectRaw('
+            $hourlyPerformance = $orders()->selectRaw('
                 HOUR(created_at) as hour,
                 COUNT(*) as order_count,
                 SUM(total) as revenue
@@ -435,7 +235,7 @@ public function getCashierDetail(Request $request, $cashierId): JsonResponse
             ->get();
 
             // Get daily performance
-            $dailyPerformance = $orders->selectRaw('
+            $dailyPerformance = $orders()->selectRaw('
                 DATE(created_at) as date,
                 COUNT(*) as order_count,
                 SUM(total) as revenue
@@ -444,27 +244,34 @@ public function getCashierDetail(Request $request, $cashierId): JsonResponse
             ->orderBy('date')
             ->get();
 
-            // Get payment method breakdown
-            $paymentMethods = $orders->selectRaw('
-                payment_method,
-                COUNT(*) as order_count,
-                SUM(total) as revenue
-            ')
-            ->groupBy('payment_method')
-            ->get();
+            // Get payment method breakdown (orders have no payment_method column, use their valid payments)
+            $paymentMethods = $orders()
+                ->join('payments', 'payments.order_id', '=', 'orders.id')
+                ->whereIn('payments.status', ShiftLedgerService::VALID_PAYMENT_STATUSES)
+                ->selectRaw('
+                    payments.payment_method,
+                    COUNT(DISTINCT orders.id) as order_count,
+                    SUM(payments.amount) as revenue
+                ')
+                ->groupBy('payments.payment_method')
+                ->get();
 
             return response()->json([
                 'success' => true,
                 'data' => [
                     'cashier' => [
-                        'id' => $cashier->id,
+                        'id' => $cashier->user_id,
                         'name' => $cashier->name,
                         'email' => $cashier->email,
                     ],
                     'summary' => [
-                        'total_orders' => $totalOrders,
-                        'total_revenue' => $totalRevenue,
-                        'avg_order_value' => round($avgOrderValue, 2),
+                        'total_orders' => $metrics['total_orders'],
+                        'total_revenue' => $metrics['total_revenue'],
+                        'avg_order_value' => $metrics['avg_order_value'],
+                        'total_sessions' => $metrics['total_sessions'],
+                        'total_session_hours' => $metrics['total_session_hours'],
+                        'orders_per_hour' => $metrics['orders_per_hour'],
+                        'performance_score' => $metrics['performance_score'],
                     ],
                     'hourly_performance' => $hourlyPerformance,
                     'daily_performance' => $dailyPerformance,
@@ -484,41 +291,6 @@ public function getCashierDetail(Request $request, $cashierId): JsonResponse
         }
     }
 
-    /**
-     * Calculate performance score
-     * 
-     * Skor dihitung dari 3 komponen:
-     * 1. Order Score: Jumlah order (max 50 poin) - setiap 10 order = 1 poin
-     * 2. Revenue Score: Total revenue (max 30 poin) - setiap 1 juta = 3 poin
-     * 3. Efficiency Score: Order per jam (max 20 poin) - setiap 1 order/jam = 2 poin
-     * 
-     * Total maksimal: 100 poin
-     */
-    private function calculatePerformanceScore($totalOrders, $totalRevenue, $ordersPerHour)
-    {
-        // Calculate scores
-        $orderScore = min($totalOrders * 0.1, 50); // Max 50 points: 10 orders = 1 point
-        $revenueScore = min($totalRevenue / 1000000 * 30, 30); // Max 30 points: 1M = 3 points
-        $efficiencyScore = min($ordersPerHour * 2, 20); // Max 20 points: 1 order/hour = 2 points
-
-        $totalScore = round($orderScore + $revenueScore + $efficiencyScore, 2);
-
-        // Log for debugging (only in development)
-        if (config('app.debug')) {
-            Log::info('CashierPerformance calculatePerformanceScore', [
-                'total_orders' => $totalOrders,
-                'total_revenue' => $totalRevenue,
-                'orders_per_hour' => $ordersPerHour,
-                'order_score' => $orderScore,
-                'revenue_score' => $revenueScore,
-                'efficiency_score' => $efficiencyScore,
-                'total_score' => $totalScore,
-            ]);
-        }
-
-        return $totalScore;
-    }
-
     /**
      * Get date range based on request parameter
      */
@@ -7,6 +7,7 @@
 use App\Models\CashierShift;
 use App\Models\Employee;
 use App\Models\EmployeeShift;
+use App\Services\ShiftLedgerService;
 use Illuminate\Http\Request;
 use Illuminate\Support\Facades\DB;
 use Illuminate\Support\Facades\Log;
@@ -108,10 +109,11 @@ public function getActiveShift(Request $request)
         $requestWantsRecalculate = $request->query('recalculate', false);
 
         if ($requestWantsRecalculate) {
-            // Jika diminta recalculate, lakukan perhitungan lengkap
+            // Jika diminta recalculate: assign self-service orders, then refresh from the shift ledger
             $shiftData = \Illuminate\Support\Facades\Cache::remember($cacheKey, 30, function() use ($activeShift) {
-                $activeShift->calculateExpectedTotals();
-                $activeShift->refresh();
+                $ledger = app(ShiftLedgerService::class);
+                $ledger->assignSelfServiceOrders($activeShift);
+                $ledger->refreshFromLedger($activeShift);
 
                 $data = $activeShift->toArray();
                 $data['cash_sales'] = $activeShift->cash_sales;
@@ -260,6 +262,8 @@ public function openShift(Request $request)
                 'shift_name' => $shiftName,
                 'opened_at' => now(),
                 'opening_balance' => $request->opening_balance,
+                // Expected cash starts at the opening balance, sales are added by the shift ledger
+                'expected_cash' => $request->opening_balance,
                 'opening_notes' => $request->opening_notes,
                 'status' => 'open',
             ]);
@@ -473,35 +477,6 @@ public function getShiftDetail($shiftId)
             }
         ])->find($shiftId);
 
-        // ✅ NEW: Jika shift masih open, cari dan assign order self-service yang sudah dibayar tapi belum punya shift_id
-        // Ini memastikan order self-service yang sudah dibayar via Midtrans masuk ke shift
-        if ($shift && $shift->status === 'open') {
-            $selfServiceOrders = \App\Models\Order::where('business_id', $shift->business_id)
-                ->where('outlet_id', $shift->outlet_id)
-                ->where('type', 'self_service')
-                ->where('payment_status', 'paid')
-                ->whereNull('shift_id')
-                ->whereBetween('created_at', [$shift->opened_at, now()])
-                ->get();
-
-            if ($selfServiceOrders->count() > 0) {
-                foreach ($selfServiceOrders as $selfServiceOrder) {
-                    $selfServiceOrder->shift_id = $shift->id;
-                    $selfServiceOrder->save();
-                    Log::info("CashierShiftController: Assigned shift_id to self-service order (getShiftDetail)", [
-                        'order_id' => $selfServiceOrder->id,
-                        'order_number' => $selfServiceOrder->order_number,
-                        'shift_id' => $shift->id,
-                        'reason' => 'Self-service order paid via Midtrans, assigned to active shift'
-                    ]);
-                }
-                // Reload orders relation setelah assign
-                $shift->load(['orders' => function($query) {
-                    $query->with(['orderItems.product', 'payments', 'customer']);
-                }]);
-            }
-        }
-
         if (!$shift) {
             return response()->json([
                 'success' => false,
@@ -518,19 +493,22 @@ public function getShiftDetail($shiftId)
             ], 403);
         }
 
-        // Recalculate to ensure data is up to date
+        // ✅ Jika shift masih open, assign order self-service yang sudah dibayar tapi belum punya shift_id
+        // (via the shift ledger); expected totals are kept up to date by the ledger, no order re-scan
         if ($shift->status === 'open') {
-            $shift->calculateExpectedTotals();
-            $shift->refresh();
-            // ✅ NEW: Reload orders relation setelah calculateExpectedTotals
-            // Ini memastikan order self-service yang baru di-assign juga ter-load
-            $shift->load(['orders' => function($query) {
-                $query->with(['orderItems.product', 'payments', 'customer']);
-            }]);
+            $ledger = app(ShiftLedgerService::class);
+
+            if ($ledger->assignSelfServiceOrders($shift) > 0) {
+                // Reload orders relation setelah assign
+                $shift->load(['orders' => function($query) {
+                    $query->with(['orderItems.product', 'payments', 'customer']);
+                }]);
+            }
+
+            $ledger->refreshFromLedger($shift);
         }
 
         // ✅ FIX: Transform orders untuk memastikan format konsisten dengan getOrders API
-        // Orders dari shift->orders sudah di-filter payment_status = 'paid' di calculateExpectedTotals
         // ✅ NEW: Order self-service yang sudah dibayar via Midtrans juga sudah di-assign shift_id
         $transformedOrders = $shift->orders->map(function ($order) {
             // Ambil payment method dari payments
@@ -641,8 +619,7 @@ public function getShiftDetail($shiftId)
      */
     public function getShiftClosingReport(Request $request, $shiftId)
     {
-        $shift = CashierShift::with(['user', 'outlet', 'orders.orderItems.product', 'orders.payments'])
-            ->find($shiftId);
+        $shift = CashierShift::with(['user', 'outlet'])->find($shiftId);
 
         if (!$shift) {
             return response()->json([
@@ -660,40 +637,41 @@ public function getShiftClosingReport(Request $request, $shiftId)
             ], 403);
         }
 
-        // Get all sold items from orders in this shift
-        $soldItems = [];
-        $orderItems = \App\Models\OrderItem::whereHas('order', function ($query) use ($shiftId) {
-            $query->where('shift_id', $shiftId);
-        })
-        ->with('product')
-        ->get();
-
-        // Group by product
-        $itemsGrouped = $orderItems->groupBy(function ($item) {
-            return $item->product_id . '-' . ($item->variant_name ?? 'default');
-        });
-
-        foreach ($itemsGrouped as $group => $items) {
-            $firstItem = $items->first();
-            $totalQuantity = $items->sum('quantity');
-            $totalRevenue = $items->sum('subtotal');
-
-            $soldItems[] = [
-                'product_id' => $firstItem->product_id,
-                'product_name' => $firstItem->product_name ?? $firstItem->product->name ?? 'Unknown',
-                'variant_name' => $firstItem->variant_name,
-                'quantity' => $totalQuantity,
-                'unit_price' => $firstItem->price,
-                'total_revenue' => $totalRevenue,
-            ];
-        }
+        // Get all sold items from orders in this shift, grouped by product in SQL
+        $soldItems = \App\Models\OrderItem::query()
+            ->join('orders', 'orders.id', '=', 'order_items.order_id')
+            ->leftJoin('products', 'products.id', '=', 'order_items.product_id')
+            ->where('orders.shift_id', $shiftId)
+            ->whereNull('orders.deleted_at')
+            ->groupBy('order_items.product_id', 'order_items.variant_name')
+            ->selectRaw('
+                order_items.product_id,
+                MAX(COALESCE(order_items.product_name, products.name)) as product_name,
+                order_items.variant_name,
+                SUM(order_items.quantity) as quantity,
+                MIN(order_items.price) as unit_price,
+                SUM(order_items.subtotal) as total_revenue
+            ')
+            ->toBase()
+            ->get()
+            ->map(function ($item) {
+                return [
+                    'product_id' => $item->product_id,
+                    'product_name' => $item->product_name ?? 'Unknown',
+                    'variant_name' => $item->variant_name,
+                    'quantity' => (int) $item->quantity,
+                    'unit_price' => $item->unit_price,
+                    'total_revenue' => (float) $item->total_revenue,
+                ];
+            })
+            ->all();
 
         // Sort by product name
         usort($soldItems, function ($a, $b) {
             return strcmp($a['product_name'], $b['product_name']);
         });
 
-        // Calculate payment breakdown
+        // Payment breakdown comes straight from the shift ledger counters
         $totalCash = $shift->expected_cash - $shift->opening_balance; // Cash sales only
         $cashOut = 0; // Will be calculated from expenses if available
 
@@ -810,8 +788,8 @@ public function recalculateShift(Request $request, $shiftId)
         }
 
         try {
-            // Recalculate expected totals
-            $shift->calculateExpectedTotals();
+            // Refresh expected totals from the shift ledger (no order re-scan)
+            app(ShiftLedgerService::class)->refreshFromLedger($shift);
 
             \Log::info('Shift recalculated', [
                 'shift_id' => $shift->id,
@@ -7,6 +7,7 @@
 use App\Models\Category;
 use App\Models\Business;
 use App\Models\Outlet;
+use App\Services\SalesRollupService;
 use Illuminate\Http\Request;
 use Illuminate\Support\Facades\Auth;
 use Illuminate\Support\Facades\DB;
@@ -311,35 +312,23 @@ public function getTopProducts(Request $request)
                 'dateRange' => $dateRange,
             ]);
 
-            // ✅ FIX: Use subtotal instead of total_price (field doesn't exist)
-            $topProducts = DB::table('order_items')
-                ->join('orders', 'order_items.order_id', '=', 'orders.id')
-                ->where('orders.business_id', $businessId)
-                ->when($outletId, function($query) use ($outletId) {
-                    $query->where('orders.outlet_id', $outletId);
-                })
-                ->whereBetween('orders.created_at', [$dateFilter['start'], $dateFilter['end']])
-                ->whereIn('orders.status', ['completed', 'confirmed', 'preparing', 'ready'])
-                ->selectRaw('
-                    order_items.product_name,
-                    order_items.product_id,
-                    SUM(order_items.quantity) as total_quantity,
-                    SUM(order_items.subtotal) as total_revenue,
-                    COUNT(DISTINCT orders.id) as order_count
-                ')
-                ->groupBy('order_items.product_id', 'order_items.product_name')
-                ->orderBy('total_revenue', 'desc')
-                ->limit($limit)
-                ->get()
+            // Past days come from daily_sales_rollups, today is aggregated live.
+            // Same basis as the sales reports: only paid sales count, dated by
+            // recognized_at (payment time), so unpaid/open orders are not ranked here.
+            $topProducts = app(SalesRollupService::class)
+                ->aggregate('product', ['product_id'], $businessId, $outletId, $dateFilter['start'], $dateFilter['end'])
+                ->sortByDesc('total')
+                ->take((int) $limit)
                 ->map(function ($item) {
                     return [
-                        'product_id' => $item->product_id,
-                        'product_name' => $item->product_name,
-                        'total_quantity' => (int) $item->total_quantity,
-                        'total_revenue' => (float) $item->total_revenue,
-                        'order_count' => (int) $item->order_count,
+                        'product_id' => (int) $item['product_id'],
+                        'product_name' => $item['product_name'],
+                        'total_quantity' => (int) $item['quantity'],
+                        'total_revenue' => (float) $item['total'],
+                        'order_count' => (int) $item['orders_count'],
                     ];
-                });
+                })
+                ->values();
 
             Log::info('getTopProducts success', [
                 'count' => $topProducts->count(),
@@ -56,29 +56,6 @@ public function getFinancialSummary(Request $request)
             $requestStartDate = \Carbon\Carbon::parse($startDate)->startOfDay();
             $requestEndDate = \Carbon\Carbon::parse($endDate)->endOfDay();
 
-            // ✅ FIX: Calculate income based on payment date, not order creation date
-            // This ensures orders paid today are counted, even if created yesterday
-            $incomeForRange = Order::where('business_id', $businessId)
-                ->where('payment_status', 'paid')
-                ->where(function ($q) use ($requestStartDate, $requestEndDate) {
-                    // 1) Order dibuat dalam rentang tanggal
-                    $q->whereBetween('created_at', [$requestStartDate, $requestEndDate])
-                      // 2) Order yang sudah dibayar dalam rentang tanggal
-                      ->orWhere(function ($qq) use ($requestStartDate, $requestEndDate) {
-                          $qq->where('payment_status', 'paid')
-                             ->whereBetween('updated_at', [$requestStartDate, $requestEndDate]);
-                      })
-                      // 3) Order yang dibayar dalam rentang tanggal (dari payments table)
-                      ->orWhereHas('payments', function ($p) use ($requestStartDate, $requestEndDate) {
-                          $p->whereIn('status', ['success', 'paid', 'settlement', 'capture'])
-                            ->whereBetween(DB::raw('COALESCE(paid_at, created_at)'), [$requestStartDate, $requestEndDate]);
-                      });
-                })
-                ->when($outletId, function($q) use ($outletId) {
-                    return $q->where('outlet_id', $outletId);
-                })
-                ->sum('total');
-
             $expenseForRange = Expense::where('business_id', $businessId)
                 ->whereBetween('expense_date', [$requestStartDate, $requestEndDate])
                 ->when($outletId, function($q) use ($outletId) {
@@ -91,82 +68,40 @@ public function getFinancialSummary(Request $request)
             $todayEnd = now()->endOfDay();
             $weekStart = now()->startOfWeek();
             $monthStart = now()->startOfMonth();
-
-            // ✅ FIX: Income calculations based on payment date, not order creation date
-            $incomeToday = Order::where('business_id', $businessId)
-                ->where('payment_status', 'paid')
-                ->where(function ($q) use ($todayStart, $todayEnd) {
-                    $q->whereBetween('created_at', [$todayStart, $todayEnd])
-                      ->orWhere(function ($qq) use ($todayStart, $todayEnd) {
-                          $qq->where('payment_status', 'paid')
-                             ->whereBetween('updated_at', [$todayStart, $todayEnd]);
-                      })
-                      ->orWhereHas('payments', function ($p) use ($todayStart, $todayEnd) {
-                          $p->whereIn('status', ['success', 'paid', 'settlement', 'capture'])
-                            ->whereBetween(DB::raw('COALESCE(paid_at, created_at)'), [$todayStart, $todayEnd]);
-                      });
-                })
-                ->when($outletId, function($q) use ($outletId) {
-                    return $q->where('outlet_id', $outletId);
-                })
-                ->sum('total');
-
-            $incomeWeek = Order::where('business_id', $businessId)
-                ->where('payment_status', 'paid')
-                ->where(function ($q) use ($weekStart) {
-                    $q->whereBetween('created_at', [$weekStart, now()])
-                      ->orWhere(function ($qq) use ($weekStart) {
-                          $qq->where('payment_status', 'paid')
-                             ->whereBetween('updated_at', [$weekStart, now()]);
-                      })
-                      ->orWhereHas('payments', function ($p) use ($weekStart) {
-                          $p->whereIn('status', ['success', 'paid', 'settlement', 'capture'])
-                            ->whereBetween(DB::raw('COALESCE(paid_at, created_at)'), [$weekStart, now()]);
-                      });
-                })
-                ->when($outletId, function($q) use ($outletId) {
-                    return $q->where('outlet_id', $outletId);
-                })
-                ->sum('total');
-
-            $incomeMonth = Order::where('business_id', $businessId)
-                ->where('payment_status', 'paid')
-                ->where(function ($q) use ($monthStart) {
-                    $q->whereBetween('created_at', [$monthStart, now()])
-                      ->orWhere(function ($qq) use ($monthStart) {
-                          $qq->where('payment_status', 'paid')
-                             ->whereBetween('updated_at', [$monthStart, now()]);
-                      })
-                      ->orWhereHas('payments', function ($p) use ($monthStart) {
-                          $p->whereIn('status', ['success', 'paid', 'settlement', 'capture'])
-                            ->whereBetween(DB::raw('COALESCE(paid_at, created_at)'), [$monthStart, now()]);
-                      });
-                })
-                ->when($outletId, function($q) use ($outletId) {
-                    return $q->where('outlet_id', $outletId);
-                })
-                ->sum('total');
-
-            // Previous period for growth calculation
             $yesterdayStart = now()->subDay()->startOfDay();
             $yesterdayEnd = now()->subDay()->endOfDay();
-            $incomeYesterday = Order::where('business_id', $businessId)
+
+            // ✅ Income by payment date (orders.recognized_at = first valid payment, else created_at),
+            // all periods in one pass over the recognized_at index instead of one OR/EXISTS query each
+            $periods = [
+                'income_range' => [$requestStartDate, $requestEndDate],
+                'income_today' => [$todayStart, $todayEnd],
+                'income_week' => [$weekStart, now()],
+                'income_month' => [$monthStart, now()],
+                'income_yesterday' => [$yesterdayStart, $yesterdayEnd],
+            ];
+
+            $income = Order::where('business_id', $businessId)
                 ->where('payment_status', 'paid')
-                ->where(function ($q) use ($yesterdayStart, $yesterdayEnd) {
-                    $q->whereBetween('created_at', [$yesterdayStart, $yesterdayEnd])
-                      ->orWhere(function ($qq) use ($yesterdayStart, $yesterdayEnd) {
-                          $qq->where('payment_status', 'paid')
-                             ->whereBetween('updated_at', [$yesterdayStart, $yesterdayEnd]);
-                      })
-                      ->orWhereHas('payments', function ($p) use ($yesterdayStart, $yesterdayEnd) {
-                          $p->whereIn('status', ['success', 'paid', 'settlement', 'capture'])
-                            ->whereBetween(DB::raw('COALESCE(paid_at, created_at)'), [$yesterdayStart, $yesterdayEnd]);
-                      });
-                })
                 ->when($outletId, function($q) use ($outletId) {
                     return $q->where('outlet_id', $outletId);
                 })
-                ->sum('total');
+                ->recognizedBetween(
+                    collect($periods)->pluck(0)->min(),
+                    collect($periods)->pluck(1)->max()
+                )
+                ->selectRaw(collect($periods)
+                    ->keys()
+                    ->map(fn ($alias) => "COALESCE(SUM(CASE WHEN recognized_at BETWEEN ? AND ? THEN total ELSE 0 END), 0) as {$alias}")
+                    ->implode(', '), collect($periods)->flatten()->all())
+                ->toBase()
+                ->first();
+
+            $incomeForRange = (float) $income->income_range;
+            $incomeToday = (float) $income->income_today;
+            $incomeWeek = (float) $income->income_week;
+            $incomeMonth = (float) $income->income_month;
+            $incomeYesterday = (float) $income->income_yesterday;
 
             $incomeGrowth = $incomeYesterday > 0
                 ? (($incomeToday - $incomeYesterday) / $incomeYesterday) * 100
@@ -432,20 +367,13 @@ public function getCashFlow(Request $request)
             $startDate = $request->input('start_date', now()->startOfMonth()->toDateString());
             $endDate = $request->input('end_date', now()->endOfDay()->toDateString());
 
-            // ✅ FIX: Cash In based on payment date, not order creation date
+            // ✅ FIX: Cash In based on payment date (orders.recognized_at), not order creation date
             $cashInQuery = Order::where('business_id', $businessId)
                 ->where('payment_status', 'paid')
-                ->where(function ($q) use ($startDate, $endDate) {
-                    $q->whereBetween('created_at', [$startDate, $endDate])
-                      ->orWhere(function ($qq) use ($startDate, $endDate) {
-                          $qq->where('payment_status', 'paid')
-                             ->whereBetween('updated_at', [$startDate, $endDate]);
-                      })
-                      ->orWhereHas('payments', function ($p) use ($startDate, $endDate) {
-                          $p->whereIn('status', ['success', 'paid', 'settlement', 'capture'])
-                            ->whereBetween(DB::raw('COALESCE(paid_at, created_at)'), [$startDate, $endDate]);
-                      });
-                });
+                ->recognizedBetween(
+                    \Carbon\Carbon::parse($startDate)->startOfDay(),
+                    \Carbon\Carbon::parse($endDate)->endOfDay()
+                );
 
             if ($outletId) {
                 $cashInQuery->where('outlet_id', $outletId);
@@ -511,20 +439,13 @@ public function getProfitLoss(Request $request)
             $startDate = $request->input('start_date', now()->startOfMonth()->toDateString());
             $endDate = $request->input('end_date', now()->endOfDay()->toDateString());
 
-            // ✅ FIX: Revenue based on payment date, not order creation date
+            // ✅ FIX: Revenue based on payment date (orders.recognized_at), not order creation date
             $revenue = Order::where('business_id', $businessId)
                 ->where('payment_status', 'paid')
-                ->where(function ($q) use ($startDate, $endDate) {
-                    $q->whereBetween('created_at', [$startDate, $endDate])
-                      ->orWhere(function ($qq) use ($startDate, $endDate) {
-                          $qq->where('payment_status', 'paid')
-                             ->whereBetween('updated_at', [$startDate, $endDate]);
-                      })
-                      ->orWhereHas('payments', function ($p) use ($startDate, $endDate) {
-                          $p->whereIn('status', ['success', 'paid', 'settlement', 'capture'])
-                            ->whereBetween(DB::raw('COALESCE(paid_at, created_at)'), [$startDate, $endDate]);
-                      });
-                })
+                ->recognizedBetween(
+                    \Carbon\Carbon::parse($startDate)->startOfDay(),
+                    \Carbon\Carbon::parse($endDate)->endOfDay()
+                )
                 ->when($outletId, function ($query) use ($outletId) {
                     return $query->where('outlet_id', $outletId);
                 })
@@ -6,6 +6,7 @@
 use App\Models\Product;
 use App\Models\InventoryMovement;
 use App\Models\Category;
+use App\Services\ProductSearchService;
 use Illuminate\Http\Request;
 use Illuminate\Support\Facades\DB;
 use Illuminate\Support\Facades\Log;
@@ -69,11 +70,11 @@ public function getInventoryStatus(Request $request)
             });
         }
 
-        // Search filter
+        // Search filter (product search index, plus category name)
+        $matches = $search ? app(ProductSearchService::class)->search($businessId, $search) : [];
         if ($search) {
-            $query->where(function($q) use ($search) {
-                $q->where('products.name', 'like', "%{$search}%")
-                  ->orWhere('products.sku', 'like', "%{$search}%")
+            $query->where(function($q) use ($search, $matches) {
+                $q->whereIn('products.id', $matches)
                   ->orWhere('categories.name', 'like', "%{$search}%");
             });
         }
@@ -123,9 +124,8 @@ public function getInventoryStatus(Request $request)
             });
         }
         if ($search) {
-            $summaryQuery->where(function($q) use ($search) {
-                $q->where('products.name', 'like', "%{$search}%")
-                  ->orWhere('products.sku', 'like', "%{$search}%")
+            $summaryQuery->where(function($q) use ($search, $matches) {
+                $q->whereIn('products.id', $matches)
                   ->orWhere('categories.name', 'like', "%{$search}%");
             });
         }
@@ -161,8 +161,13 @@ public function getInventoryStatus(Request $request)
         $countQuery = clone $query;
         $totalCount = $countQuery->count('products.id');
 
-        // Sort and paginate
-        $query->orderBy('products.' . $sortBy, $sortOrder);
+        // Sort and paginate (searches without an explicit sort_by follow relevance; id keeps pages stable)
+        if ($search && !$request->filled('sort_by')) {
+            app(ProductSearchService::class)->orderByRelevance($query, $matches);
+        } else {
+            $query->orderBy('products.' . $sortBy, $sortOrder);
+        }
+        $query->orderBy('products.id');
         $products = $query->skip(($page - 1) * $perPage)->take($perPage)->get();
         
         Log::info('Inventory Status Query Result', [
@@ -5,6 +5,9 @@
 use App\Http\Controllers\Controller;
 use App\Models\Order;
 use App\Helpers\SubscriptionHelper;
+use App\Services\KitchenQueueService;
+use App\Services\OrderEventService;
+use Carbon\Carbon;
 use Illuminate\Http\Request;
 use Illuminate\Support\Facades\Auth;
 
@@ -37,81 +40,22 @@ public function getOrders(Request $request)
             return $accessCheck;
         }
         
-        $outletId = $request->header('X-Outlet-Id');
-        $businessId = $request->header('X-Business-Id');
-
-        $query = Order::with(['orderItems.product', 'table', 'customer'])
-            ->where(function ($q) {
-                // Show orders that are confirmed, preparing, or ready
-                $q->whereIn('status', ['confirmed', 'preparing', 'ready'])
-                  // OR show pending orders (regardless of payment status)
-                  // ✅ FIX: Untuk dine-in, order bisa masuk dapur meskipun belum dibayar
-                  // - Dine-in: makan dulu baru bayar (payment_status = 'pending' tetap masuk dapur)
-                  // - Online/Takeaway/Self-Service: bisa sudah bayar atau belum (pending yang sudah paid untuk konfirmasi manual)
-                  ->orWhere(function ($subQ) {
-                      $subQ->where('status', 'pending')
-                           ->where(function ($typeQ) {
-                               // Dine-in orders masuk dapur meskipun belum dibayar
-                               $typeQ->where('type', 'dine_in')
-                                    // Self-service dengan pay_later juga masuk dapur meskipun belum dibayar
-                                    ->orWhere(function ($selfServiceQ) {
-                                        $selfServiceQ->where('type', 'self_service')
-                                                     ->where('payment_status', 'pending');
-                                    })
-                                    // Online/Takeaway yang sudah dibayar masuk untuk konfirmasi manual
-                                    ->orWhere(function ($paidQ) {
-                                        $paidQ->whereIn('type', ['takeaway', 'delivery', 'online'])
-                                             ->where('payment_status', 'paid');
-                                    })
-                                    // Self-service yang sudah dibayar masuk untuk konfirmasi manual
-                                    ->orWhere(function ($selfServicePaidQ) {
-                                        $selfServicePaidQ->where('type', 'self_service')
-                                                         ->where('payment_status', 'paid');
-                                    });
-                           });
-                  });
-            });
-
-        // Filter by outlet if provided and user is not super admin/owner
-        if ($outletId && !in_array($user->role, ['super_admin', 'owner'])) {
-            $query->where('outlet_id', $outletId);
-        }
+        [$queue, $changes] = $this->kitchenQueue($request, $user);
 
-        // Filter by business if provided
-        if ($businessId) {
-            $query->where('business_id', $businessId);
-        }
-
-        $orders = $query->orderBy('created_at', 'asc')->get();
-
-        // ✅ NEW: Group orders by status for better frontend handling
-        $groupedOrders = [
-            // Pending orders yang perlu konfirmasi (sudah dibayar tapi belum confirmed)
-            'pending_paid' => $orders->where('status', 'pending')
-                ->where('payment_status', 'paid')
-                ->whereIn('type', ['takeaway', 'delivery', 'online', 'self_service'])
-                ->values(),
-            // Pending dine-in orders (belum dibayar, langsung masuk dapur)
-            'pending_dine_in' => $orders->where('status', 'pending')
-                ->where('type', 'dine_in')
-                ->values(),
-            // Pending self-service orders (belum dibayar, langsung masuk dapur - untuk pay_later)
-            'pending_self_service' => $orders->where('status', 'pending')
-                ->where('type', 'self_service')
-                ->where('payment_status', 'pending')
-                ->values(),
-            'confirmed' => $orders->where('status', 'confirmed')->values(),
-            'preparing' => $orders->where('status', 'preparing')->values(),
-            'ready' => $orders->where('status', 'ready')->values(),
-        ];
+        $orders = $changes ? $changes['orders'] : $queue['orders'];
+        $groupedOrders = $this->groupOrders($orders);
+        $pending = $this->groupOrders($queue['orders']);
 
-        return response()->json([
+        return response()->json(array_filter([
             'orders' => $orders,
             'grouped' => $groupedOrders,
-            'pending_count' => $groupedOrders['pending_paid']->count() + 
-                              $groupedOrders['pending_dine_in']->count() + 
-                              $groupedOrders['pending_self_service']->count(),
-        ]);
+            // Always the full queue, also for updated_since polls
+            'pending_count' => $pending['pending_paid']->count() + 
+                              $pending['pending_dine_in']->count() + 
+                              $pending['pending_self_service']->count(),
+            'removed' => $changes ? $changes['removed'] : null,
+            'cursor' => $queue['generated_at']->toIso8601String(),
+        ], fn ($value) => $value !== null));
     }
 
     public function updateStatus(Request $request, Order $order)
@@ -139,6 +83,10 @@ public function updateStatus(Request $request, Order $order)
         $order->status = $request->status;
         $order->save();
 
+        app(OrderEventService::class)->publish($order, OrderEventService::STATUS_CHANGED, [
+            'previous_status' => $previousStatus,
+        ]);
+
         // ✅ SECURITY: Send notification when order status changes
         try {
             $roleTargets = ['kasir', 'owner', 'admin']; // Always notify these roles
@@ -243,6 +191,10 @@ public function confirmOrder(Request $request, Order $order)
         }
         $order->save();
 
+        app(OrderEventService::class)->publish($order, OrderEventService::STATUS_CHANGED, [
+            'previous_status' => 'pending',
+        ]);
+
         // Reload with relationships
         $order->load(['orderItems.product', 'table', 'customer']);
 
@@ -262,50 +214,24 @@ public function confirmOrder(Request $request, Order $order)
     public function getPendingOrders(Request $request)
     {
         $user = Auth::user();
-        $outletId = $request->header('X-Outlet-Id');
-        $businessId = $request->header('X-Business-Id');
 
         // ✅ UPDATED: Get confirmed orders AND pending orders (dine-in, self-service pay_later, atau yang sudah paid)
-        $query = Order::with(['orderItems.product', 'table', 'customer'])
-            ->where(function ($q) {
-                $q->where('status', 'confirmed')
-                  ->orWhere(function ($subQ) {
-                      $subQ->where('status', 'pending')
-                           ->where(function ($typeQ) {
-                               // Dine-in orders masuk meskipun belum dibayar
-                               $typeQ->where('type', 'dine_in')
-                                    // Self-service dengan pay_later juga masuk meskipun belum dibayar
-                                    ->orWhere(function ($selfServiceQ) {
-                                        $selfServiceQ->where('type', 'self_service')
-                                                     ->where('payment_status', 'pending');
-                                    })
-                                    // Online/Takeaway yang sudah dibayar
-                                    ->orWhere(function ($paidQ) {
-                                        $paidQ->whereIn('type', ['takeaway', 'delivery', 'online'])
-                                             ->where('payment_status', 'paid');
-                                    })
-                                    // Self-service yang sudah dibayar
-                                    ->orWhere(function ($selfServicePaidQ) {
-                                        $selfServicePaidQ->where('type', 'self_service')
-                                                         ->where('payment_status', 'paid');
-                                    });
-                           });
-                  });
-            });
+        [$queue, $changes] = $this->kitchenQueue($request, $user);
 
-        // Filter by outlet if provided and user is not super admin/owner
-        if ($outletId && !in_array($user->role, ['super_admin', 'owner'])) {
-            $query->where('outlet_id', $outletId);
-        }
+        $orders = ($changes ? $changes['orders'] : $queue['orders'])
+            ->whereIn('kitchen_state', ['pending', 'confirmed'])
+            ->values();
+        $cursor = $queue['generated_at']->toIso8601String();
 
-        // Filter by business if provided
-        if ($businessId) {
-            $query->where('business_id', $businessId);
+        if ($changes) {
+            return response()->json([
+                'orders' => $orders,
+                'removed' => $changes['removed'],
+                'cursor' => $cursor,
+            ]);
         }
 
-        $orders = $query->orderBy('created_at', 'asc')->get();
-
-        return response()->json($orders);
+        return response()->json($orders)->header('X-Kitchen-Cursor', $cursor);
     }
 
     /**
@@ -317,46 +243,81 @@ public function getPendingOrders(Request $request)
     public function getNewOrderNotifications(Request $request)
     {
         $user = Auth::user();
-        $outletId = $request->header('X-Outlet-Id');
-        $businessId = $request->header('X-Business-Id');
 
-        $query = Order::where('status', 'pending')
-            ->where(function ($q) {
-                // Dine-in orders (belum dibayar, langsung masuk dapur)
-                $q->where(function ($dineInQ) {
-                    $dineInQ->where('type', 'dine_in');
-                })
-                // Self-service dengan pay_later (belum dibayar, langsung masuk dapur)
-                ->orWhere(function ($selfServiceQ) {
-                    $selfServiceQ->where('type', 'self_service')
-                                 ->where('payment_status', 'pending');
-                })
-                // Online/Takeaway/Self-Service orders yang sudah dibayar (perlu konfirmasi manual)
-                ->orWhere(function ($paidQ) {
-                    $paidQ->whereIn('type', ['takeaway', 'delivery', 'online', 'self_service'])
-                         ->where('payment_status', 'paid');
-                });
-            });
+        [$queue, $changes] = $this->kitchenQueue($request, $user);
 
-        // Filter by outlet if provided and user is not super admin/owner
-        if ($outletId && !in_array($user->role, ['super_admin', 'owner'])) {
-            $query->where('outlet_id', $outletId);
-        }
-
-        // Filter by business if provided
-        if ($businessId) {
-            $query->where('business_id', $businessId);
-        }
+        $pending = $queue['orders']->where('kitchen_state', 'pending');
+        $count = $pending->count();
 
-        $count = $query->count();
-        $recentOrders = $query->orderBy('created_at', 'desc')
-            ->limit(5)
-            ->get(['id', 'order_number', 'total', 'created_at']);
+        // With updated_since only orders that arrived or changed since the last poll
+        $recentOrders = ($changes ? $changes['orders']->where('kitchen_state', 'pending') : $pending)
+            ->sortByDesc('created_at')
+            ->take(5)
+            ->map(fn ($order) => $order->only(['id', 'order_number', 'total', 'created_at']))
+            ->values();
 
         return response()->json([
             'count' => $count,
             'recent_orders' => $recentOrders,
             'has_new_orders' => $count > 0,
+            'cursor' => $queue['generated_at']->toIso8601String(),
         ]);
     }
+
+    /**
+     * Shared kitchen queue of the request scope, plus the changes since
+     * ?updated_since= (cursor of the previous response) when given.
+     */
+    private function kitchenQueue(Request $request, $user)
+    {
+        $businessId = $request->header('X-Business-Id');
+        $outletId = $request->header('X-Outlet-Id');
+
+        // Filter by outlet if provided and user is not super admin/owner
+        if (in_array($user->role, ['super_admin', 'owner'])) {
+            $outletId = null;
+        }
+
+        $kitchen = app(KitchenQueueService::class);
+        $queue = $kitchen->queue($businessId, $outletId);
+
+        $changes = null;
+        if ($request->filled('updated_since')) {
+            try {
+                $since = Carbon::parse($request->query('updated_since'));
+                $changes = $kitchen->changes($queue, $businessId, $outletId, $since);
+            } catch (\Exception $e) {
+                // Unparseable cursor: answer with the full queue
+                $changes = null;
+            }
+        }
+
+        return [$queue, $changes];
+    }
+
+    /**
+     * Kitchen orders grouped for the frontend
+     */
+    private function groupOrders($orders)
+    {
+        return [
+            // Pending orders yang perlu konfirmasi (sudah dibayar tapi belum confirmed)
+            'pending_paid' => $orders->where('status', 'pending')
+                ->where('payment_status', 'paid')
+                ->whereIn('type', ['takeaway', 'delivery', 'online', 'self_service'])
+                ->values(),
+            // Pending dine-in orders (belum dibayar, langsung masuk dapur)
+            'pending_dine_in' => $orders->where('status', 'pending')
+                ->where('type', 'dine_in')
+                ->values(),
+            // Pending self-service orders (belum dibayar, langsung masuk dapur - untuk pay_later)
+            'pending_self_service' => $orders->where('status', 'pending')
+                ->where('type', 'self_service')
+                ->where('payment_status', 'pending')
+                ->values(),
+            'confirmed' => $orders->where('status', 'confirmed')->values(),
+            'preparing' => $orders->where('status', 'preparing')->values(),
+            'ready' => $orders->where('status', 'ready')->values(),
+        ];
+    }
 }
@@ -6,6 +6,7 @@
 use App\Models\Order;
 use App\Models\Payment;
 use App\Services\MidtransService;
+use App\Services\PaymentStatusService;
 use Illuminate\Http\Request;
 use Illuminate\Support\Facades\Log;
 use Illuminate\Support\Facades\Validator;
@@ -136,13 +137,19 @@ public function updateStatus(Request $request, Order $order)
 
             $order->status = $newStatus;
             $order->save();
+
+            if ($newStatus !== $oldStatus) {
+                app(\App\Services\OrderEventService::class)->publish($order, \App\Services\OrderEventService::STATUS_CHANGED, [
+                    'previous_status' => $oldStatus,
+                ]);
+            }
             
             // ✅ FIX: Update shift statistics jika status berubah
             if ($shiftId && $newStatus !== $oldStatus) {
                 $shift = \App\Models\CashierShift::find($shiftId);
                 if ($shift && $shift->status === 'open') {
-                    // Recalculate shift statistics setelah perubahan status
-                    $shift->calculateExpectedTotals();
+                    // Update shift ledger setelah perubahan status (delta, tanpa re-scan semua order)
+                    app(\App\Services\ShiftLedgerService::class)->syncOrder($order);
                     Log::info('OrderController: Shift statistics updated after status update', [
                         'order_id' => $order->id,
                         'shift_id' => $shiftId,
@@ -277,9 +284,8 @@ public function update(Request $request, Order $order)
                         $product->stock = $stockBefore - $item['quantity'];
                         $product->save();
 
-                        // Clear products cache after stock change
+                        // Clear product stats after stock change (POS catalog gets a stock delta via ProductObserver)
                         $businessId = $order->business_id;
-                        \Illuminate\Support\Facades\Cache::forget("products_pos:business:{$businessId}");
                         \Illuminate\Support\Facades\Cache::forget("products_stats:business:{$businessId}");
 
                         Log::info('OrderController: Deducted stock for order update', [
@@ -315,8 +321,8 @@ public function update(Request $request, Order $order)
             if ($shiftId && ($statusChanged || $paymentStatusChanged)) {
                 $shift = \App\Models\CashierShift::find($shiftId);
                 if ($shift && $shift->status === 'open') {
-                    // Recalculate shift statistics setelah perubahan status
-                    $shift->calculateExpectedTotals();
+                    // Update shift ledger setelah perubahan status (delta, tanpa re-scan semua order)
+                    app(\App\Services\ShiftLedgerService::class)->syncOrder($order);
                     Log::info('OrderController: Shift statistics updated after order status change', [
                         'order_id' => $order->id,
                         'shift_id' => $shiftId,
@@ -428,9 +434,8 @@ public function addItems(Request $request, Order $order)
                     $product->stock = $stockBefore - $itemData['quantity'];
                     $product->save();
 
-                    // Clear products cache
+                    // Clear product stats (POS catalog gets a stock delta via ProductObserver)
                     $businessId = $order->business_id;
-                    \Illuminate\Support\Facades\Cache::forget("products_pos:business:{$businessId}");
                     \Illuminate\Support\Facades\Cache::forget("products_stats:business:{$businessId}");
 
                     Log::info('OrderController: Added item to order', [
@@ -611,8 +616,8 @@ public function destroy(Order $order)
             if ($shiftId) {
                 $shift = \App\Models\CashierShift::find($shiftId);
                 if ($shift && $shift->status === 'open') {
-                    // Recalculate shift statistics setelah delete
-                    $shift->calculateExpectedTotals();
+                    // Update shift ledger setelah delete (delta, tanpa re-scan semua order)
+                    app(\App\Services\ShiftLedgerService::class)->removeOrder($orderId);
                     Log::info('OrderController: Shift statistics updated after delete', [
                         'order_id' => $orderId,
                         'shift_id' => $shiftId,
@@ -680,13 +685,16 @@ public function cancel(Order $order)
 
             $order->status = 'cancelled';
             $order->save();
+
+            // Published after commit (no event if the cancel is rolled back)
+            app(\App\Services\OrderEventService::class)->publish($order, \App\Services\OrderEventService::STATUS_CHANGED);
             
             // ✅ FIX: Update shift statistics jika order punya shift_id
             if ($shiftId) {
                 $shift = \App\Models\CashierShift::find($shiftId);
                 if ($shift && $shift->status === 'open') {
-                    // Recalculate shift statistics setelah cancel
-                    $shift->calculateExpectedTotals();
+                    // Update shift ledger setelah cancel (delta, tanpa re-scan semua order)
+                    app(\App\Services\ShiftLedgerService::class)->syncOrder($order);
                     Log::info('OrderController: Shift statistics updated after cancel', [
                         'order_id' => $order->id,
                         'shift_id' => $shiftId,
@@ -762,8 +770,8 @@ public function refund(Order $order)
             if ($shiftId) {
                 $shift = \App\Models\CashierShift::find($shiftId);
                 if ($shift && $shift->status === 'open') {
-                    // Recalculate shift statistics setelah refund
-                    $shift->calculateExpectedTotals();
+                    // Update shift ledger setelah refund (delta, tanpa re-scan semua order)
+                    app(\App\Services\ShiftLedgerService::class)->syncOrder($order);
                     Log::info('OrderController: Shift statistics updated after refund', [
                         'order_id' => $order->id,
                         'shift_id' => $shiftId,
@@ -803,6 +811,8 @@ public function refund(Order $order)
     /**
      * ✅ NEW: Sync payment status from Midtrans for an order
      * Useful when webhook doesn't trigger or payment status is out of sync
+     * ✅ Concurrent syncs of one payment share a single Midtrans call; a settled
+     * transaction is applied through the webhook pipeline (same side effects, once)
      */
     public function syncPaymentStatus(Request $request, Order $order)
     {
@@ -821,132 +831,58 @@ public function syncPaymentStatus(Request $request, Order $order)
                 ], 404);
             }
 
-            // Get transaction status from Midtrans using business-specific config
-            try {
-                // ✅ Get MidtransService dengan outlet config (fallback ke business lalu global)
-                $midtransService = MidtransService::forOutlet($order->outlet);
-                $transactionStatus = $midtransService->getTransactionStatus($payment->reference_number);
+            $statuses = app(PaymentStatusService::class);
+            $transactionStatus = $statuses->reconcile($payment);
 
-                Log::info('OrderController: Syncing payment status from Midtrans', [
+            if (!$transactionStatus || empty($transactionStatus['transaction_status'])) {
+                Log::error('OrderController: Failed to sync payment status from Midtrans', [
                     'order_id' => $order->id,
                     'order_number' => $order->order_number,
-                    'payment_id' => $payment->id,
-                    'reference_number' => $payment->reference_number,
-                    'transaction_status' => $transactionStatus->transaction_status,
+                    'error' => $transactionStatus['error'] ?? 'Status check in progress',
                 ]);
 
-                // Update payment status if transaction is settled
-                if ($transactionStatus->transaction_status === 'settlement' || 
-                    $transactionStatus->transaction_status === 'capture') {
-                    
-                    DB::beginTransaction();
-                    try {
-                        $payment->update([
-                            'status' => 'success',
-                            'paid_at' => now(),
-                            'payment_data' => array_merge(
-                                $payment->payment_data ?? [],
-                                [
-                                    'transaction_id' => $transactionStatus->transaction_id ?? null,
-                                    'transaction_status' => $transactionStatus->transaction_status,
-                                    'payment_type' => $transactionStatus->payment_type ?? null,
-                                    'transaction_time' => $transactionStatus->transaction_time ?? null,
-                                ]
-                            ),
-                        ]);
-
-                        // Update order status
-                        $business = $order->business;
-                        $settings = $business->settings ?? [];
-                        $autoConfirm = $settings['kitchen_auto_confirm'] ?? true;
-
-                        $newStatus = $order->status;
-                        if ($order->status === 'pending') {
-                            $newStatus = $autoConfirm ? 'confirmed' : 'pending';
-                        }
-
-                        // ✅ NEW: Assign shift_id untuk order self-service yang sudah dibayar via Midtrans
-                        // Ini memastikan order muncul di transaksi kasir
-                        if ($order->type === 'self_service' && !$order->shift_id) {
-                            // Cari shift aktif di outlet yang sama
-                            $activeShift = \App\Models\CashierShift::where('outlet_id', $order->outlet_id)
-                                ->where('status', 'open')
-                                ->orderBy('opened_at', 'desc')
-                                ->first();
-
-                            if ($activeShift) {
-                                $order->shift_id = $activeShift->id;
-                                Log::info('OrderController: Assigning shift_id to self-service order (syncPaymentStatus)', [
-                                    'order_id' => $order->id,
-                                    'shift_id' => $activeShift->id,
-                                    'outlet_id' => $order->outlet_id,
-                                    'reason' => 'Self-service order paid via Midtrans, assigned to active shift'
-                                ]);
-                            } else {
-                                Log::info('OrderController: No active shift found for self-service order (syncPaymentStatus)', [
-                                    'order_id' => $order->id,
-                                    'outlet_id' => $order->outlet_id,
-                                    'note' => 'Order will appear as Self-Service Payment without shift'
-                                ]);
-                            }
-                        }
-
-                        $order->update([
-                            'payment_status' => 'paid',
-                            'status' => $newStatus,
-                        ]);
+                return response()->json([
+                    'success' => false,
+                    'message' => 'Gagal sync payment status dari Midtrans: ' . ($transactionStatus['error'] ?? 'coba lagi sebentar'),
+                    'error' => $transactionStatus['error'] ?? null,
+                ], 500);
+            }
 
-                        DB::commit();
+            Log::info('OrderController: Syncing payment status from Midtrans', [
+                'order_id' => $order->id,
+                'order_number' => $order->order_number,
+                'payment_id' => $payment->id,
+                'reference_number' => $payment->reference_number,
+                'transaction_status' => $transactionStatus['transaction_status'],
+            ]);
 
-                        Log::info('OrderController: Payment status synced successfully', [
-                            'order_id' => $order->id,
-                            'order_number' => $order->order_number,
-                            'new_payment_status' => 'paid',
-                            'new_order_status' => $newStatus,
-                        ]);
+            $payment->refresh();
+            $order->refresh();
 
-                        // Reload order to get updated data
-                        $order->refresh();
-                        $order->load(['orderItems.product', 'table', 'outlet', 'discount', 'payments']);
-
-                        return response()->json([
-                            'success' => true,
-                            'message' => 'Payment status berhasil di-sync dari Midtrans',
-                            'data' => [
-                                'order' => $order,
-                                'payment' => $payment,
-                                'transaction_status' => $transactionStatus->transaction_status,
-                            ],
-                        ]);
-                    } catch (\Exception $e) {
-                        DB::rollBack();
-                        throw $e;
-                    }
-                } else {
-                    // Payment still pending
-                    return response()->json([
-                        'success' => true,
-                        'message' => 'Payment masih pending di Midtrans',
-                        'data' => [
-                            'order' => $order,
-                            'payment' => $payment,
-                            'transaction_status' => $transactionStatus->transaction_status,
-                        ],
-                    ]);
-                }
-            } catch (\Exception $e) {
-                Log::error('OrderController: Failed to sync payment status from Midtrans', [
-                    'order_id' => $order->id,
-                    'order_number' => $order->order_number,
-                    'error' => $e->getMessage(),
-                ]);
+            if ($payment->status === 'success') {
+                $order->load(['orderItems.product', 'table', 'outlet', 'discount', 'payments']);
 
                 return response()->json([
-                    'success' => false,
-                    'message' => 'Gagal sync payment status dari Midtrans: ' . $e->getMessage(),
-                    'error' => $e->getMessage(),
-                ], 500);
+                    'success' => true,
+                    'message' => 'Payment status berhasil di-sync dari Midtrans',
+                    'data' => [
+                        'order' => $order,
+                        'payment' => $payment,
+                        'transaction_status' => $transactionStatus['transaction_status'],
+                    ],
+                ]);
             }
+
+            // Payment still pending (or being applied by the payments worker)
+            return response()->json([
+                'success' => true,
+                'message' => 'Payment masih pending di Midtrans',
+                'data' => [
+                    'order' => $order,
+                    'payment' => $payment,
+                    'transaction_status' => $transactionStatus['transaction_status'],
+                ],
+            ]);
         } catch (\Exception $e) {
             Log::error('OrderController: Sync payment status failed', [
                 'order_id' => $order->id,
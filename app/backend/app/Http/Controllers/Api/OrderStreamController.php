@@ -0,0 +1,146 @@
+<?php
+
+namespace App\Http\Controllers\Api;
+
+use App\Http\Controllers\Controller;
+use App\Models\Outlet;
+use App\Services\OrderEventService;
+use Illuminate\Http\Request;
+
+class OrderStreamController extends Controller
+{
+    /**
+     * Seconds a single SSE connection stays open; clients reconnect with Last-Event-ID.
+     * Kept below common proxy/PHP-FPM timeouts so a worker is never held indefinitely.
+     */
+    private const STREAM_SECONDS = 55;
+
+    private const HEARTBEAT_SECONDS = 15;
+
+    private const POLL_INTERVAL_MICROSECONDS = 1000000;
+
+    public function __construct(private OrderEventService $events)
+    {
+    }
+
+    /**
+     * Server-Sent Events stream of order events for the current outlet
+     */
+    public function stream(Request $request)
+    {
+        $outletId = $this->resolveOutletId($request);
+        if (!$outletId) {
+            return $this->outletRequired();
+        }
+
+        $cursor = (int) ($request->header('Last-Event-ID') ?? $request->query('since', 0));
+        if ($cursor <= 0) {
+            // New subscriber: the client loads the current orders itself, only push what happens next
+            $cursor = $this->events->latestCursor($outletId);
+        }
+
+        return response()->stream(function () use ($outletId, $cursor) {
+            @set_time_limit(self::STREAM_SECONDS + 10);
+
+            $deadline = microtime(true) + self::STREAM_SECONDS;
+            $lastWrite = microtime(true);
+
+            echo "retry: 3000\n";
+            echo 'event: ready' . "\n" . 'data: ' . json_encode(['cursor' => $cursor]) . "\n\n";
+            $this->flush();
+
+            while (microtime(true) < $deadline && !connection_aborted()) {
+                // Cached cursor check: idle outlets don't query order_events at all
+                if ($this->events->latestCursor($outletId) > $cursor) {
+                    foreach ($this->events->since($outletId, $cursor) as $event) {
+                        echo "id: {$event['id']}\n";
+                        echo "event: {$event['event']}\n";
+                        echo 'data: ' . json_encode($event) . "\n\n";
+                        $cursor = $event['id'];
+                    }
+                    $this->flush();
+                    $lastWrite = microtime(true);
+                } elseif (microtime(true) - $lastWrite >= self::HEARTBEAT_SECONDS) {
+                    echo ": ping\n\n";
+                    $this->flush();
+                    $lastWrite = microtime(true);
+                }
+
+                usleep(self::POLL_INTERVAL_MICROSECONDS);
+            }
+        }, 200, [
+            'Content-Type' => 'text/event-stream',
+            'Cache-Control' => 'no-cache, no-store',
+            'Connection' => 'keep-alive',
+            'X-Accel-Buffering' => 'no',
+        ]);
+    }
+
+    /**
+     * Polling fallback: events after the `since` cursor
+     */
+    public function events(Request $request)
+    {
+        $outletId = $this->resolveOutletId($request);
+        if (!$outletId) {
+            return $this->outletRequired();
+        }
+
+        $since = (int) $request->query('since', 0);
+        $latest = $this->events->latestCursor($outletId);
+
+        // First poll only returns the cursor; an expired cursor tells the client to refetch everything
+        if ($since <= 0 || $this->events->isExpired($since)) {
+            return response()->json([
+                'success' => true,
+                'data' => [],
+                'cursor' => $latest,
+                'reset' => $since > 0,
+            ]);
+        }
+
+        $events = $since < $latest
+            ? $this->events->since($outletId, $since, min((int) $request->query('limit', 100), 500))
+            : collect();
+
+        return response()->json([
+            'success' => true,
+            'data' => $events->values(),
+            'cursor' => $events->isNotEmpty() ? $events->last()['id'] : $since,
+            'reset' => false,
+        ]);
+    }
+
+    private function resolveOutletId(Request $request)
+    {
+        $outletId = $request->header('X-Outlet-Id');
+        $businessId = $request->header('X-Business-Id');
+
+        if (!$outletId) {
+            return null;
+        }
+
+        // outlet.access only verifies business ownership for owners, make sure the outlet belongs to it
+        if ($businessId && !Outlet::where('id', $outletId)->where('business_id', $businessId)->exists()) {
+            return null;
+        }
+
+        return (int) $outletId;
+    }
+
+    private function outletRequired()
+    {
+        return response()->json([
+            'success' => false,
+            'message' => 'X-Outlet-Id header is required',
+        ], 400);
+    }
+
+    private function flush()
+    {
+        if (ob_get_level() > 0) {
+            @ob_flush();
+        }
+        flush();
+    }
+}
@@ -6,6 +6,8 @@
 use App\Models\Order;
 use App\Models\OrderItem;
 use App\Models\Payment;
+use App\Services\PosOrderService;
+use Illuminate\Database\UniqueConstraintViolationException;
 use Illuminate\Http\Request;
 use Illuminate\Support\Facades\DB;
 use Illuminate\Support\Facades\Log;
@@ -18,324 +20,69 @@ public function createOrder(Request $request)
         $businessId = $request->header('X-Business-Id');
 
         if (!$businessId) {
-            \Log::error('POSController: Business ID required');
+            Log::channel('pos')->warning('POSController: Business ID required');
             return response()->json(['error' => 'Business ID required'], 400);
         }
 
-        \Log::info('POSController: Creating order', [
-            'business_id' => $businessId,
-            'items_count' => count($request->items ?? []),
-            'customer_id' => $request->customer_id
+        // Payload only with LOG_POS_LEVEL=debug
+        Log::channel('pos')->debug('POSController: Creating order', [
+            'client_uuid' => $request->client_uuid,
+            'customer_id' => $request->customer_id,
+            'items' => $request->items,
         ]);
 
         $validator = Validator::make($request->all(), [
             'customer_id' => 'nullable|exists:customers,id',
             'table_id' => 'nullable|exists:tables,id',
-            'queue_number' => 'nullable|string|max:20',
-            'items' => 'required|array|min:1',
             'items.*.product_id' => 'required|exists:products,id',
-            'items.*.quantity' => 'required|integer|min:1',
-            'items.*.price' => 'required|numeric|min:0',
-            'discount' => 'nullable|numeric|min:0',
-            'coupon_code' => 'nullable|string',
-            'tax' => 'nullable|numeric|min:0',
-            'notes' => 'nullable|string',
-        ]);
+        ] + PosOrderService::RULES);
 
         if ($validator->fails()) {
-            \Log::error('POSController: Validation failed', ['errors' => $validator->errors()]);
+            Log::channel('pos')->warning('POSController: Validation failed', ['errors' => $validator->errors()->toArray()]);
             return response()->json(['errors' => $validator->errors()], 422);
         }
 
-        // Get outlet ID from header (required by middleware)
-        $outletId = $request->header('X-Outlet-Id');
+        $orders = app(PosOrderService::class);
 
-        // Check for active shift
-        $user = auth()->user();
-        $shiftId = null;
-
-        // For kasir: MUST have active shift (waiter no longer required)
-        if (in_array($user->role, ['kasir'])) {
-            $activeShift = \App\Models\CashierShift::where('user_id', $user->id)
-                ->where('outlet_id', $outletId)
-                ->where('status', 'open')
-                ->first();
-
-            if (!$activeShift) {
-                \Log::error('POSController: No active shift found for kasir', [
-                    'user_id' => $user->id,
-                    'outlet_id' => $outletId
-                ]);
-                return response()->json([
-                    'error' => 'Anda harus membuka shift terlebih dahulu sebelum melakukan transaksi',
-                    'requires_shift' => true
-                ], 400);
-            }
-
-            $shiftId = $activeShift->id;
-            \Log::info('POSController: Active shift found for kasir', ['shift_id' => $shiftId]);
+        // ✅ Idempotent: a retried request (lost response) returns the order created the first time
+        if ($existing = $orders->findByClientUuid($businessId, $request->client_uuid)) {
+            return $this->orderCreatedResponse($existing, 200);
         }
-        // For other roles (owner/admin): Try to find any active shift in this outlet
-        else {
-            // Get employee record for this user
-            $employee = \App\Models\Employee::where('user_id', auth()->id())
-                ->where('business_id', $businessId)
-                ->first();
 
-            // If this user is also an employee with active shift, use it
-            if ($employee) {
-                $activeShift = \App\Models\CashierShift::where('employee_id', $employee->id)
-                    ->where('outlet_id', $outletId)
-                    ->where('status', 'open')
-                    ->first();
-
-                if ($activeShift) {
-                    $shiftId = $activeShift->id;
-                    \Log::info('POSController: Active shift found for employee', [
-                        'employee_id' => $employee->id,
-                        'shift_id' => $shiftId
-                    ]);
-                }
-            }
+        $context = $orders->context($businessId, $request->header('X-Outlet-Id'), auth()->user());
 
-            // If still no shift found, log it but continue (don't block owner/admin)
-            if (!$shiftId) {
-                \Log::warning('POSController: No active shift for owner/admin, order will be created without shift_id', [
-                    'user_id' => $user->id,
-                    'outlet_id' => $outletId
-                ]);
-            }
+        if (isset($context['error'])) {
+            return response()->json(array_filter([
+                'error' => $context['error'],
+                'requires_shift' => $context['requires_shift'],
+            ]), 400);
         }
 
-        DB::beginTransaction();
-
         try {
-            $subtotal = 0;
-            foreach ($request->items as $item) {
-                $subtotal += $item['quantity'] * $item['price'];
-            }
-
-            $taxAmount = $request->tax ?? 0;
-            $discountAmount = $request->discount ?? 0;
-            $total = $subtotal + $taxAmount - $discountAmount;
-
-            // Get outlet (use from header if available, otherwise find from business)
-            $outlet = $outletId
-                ? \App\Models\Outlet::find($outletId)
-                : \App\Models\Outlet::where('business_id', $businessId)->first();
-
-            if (!$outlet) {
-                \Log::error('POSController: No outlet found for business');
-                return response()->json(['error' => 'No outlet configured for this business'], 400);
-            }
-
-            // Resolve employee for this business and user to ensure correct cashier on receipt
-            $employee = \App\Models\Employee::where('user_id', auth()->id())
-                ->where('business_id', $businessId)
-                ->first();
-
-            // Check if deferred payment (for laundry business)
-            // Handle both boolean true and string "true"
-            $isDeferredPayment = $request->has('deferred_payment') && (
-                $request->deferred_payment === true ||
-                $request->deferred_payment === 'true' ||
-                $request->deferred_payment === 1
-            );
-
-            \Log::info('POSController: Deferred payment check', [
-                'has_deferred_payment' => $request->has('deferred_payment'),
-                'deferred_payment_value' => $request->input('deferred_payment'),
-                'is_deferred_payment' => $isDeferredPayment,
-            ]);
-
-            // Get business type to determine initial status
-            $business = \App\Models\Business::find($businessId);
-            $businessType = $business->businessType;
-
-            // Set initial status based on business type and payment type
-            $initialStatus = 'pending';
-            if ($isDeferredPayment && $businessType && $businessType->code === 'laundry') {
-                // Untuk laundry dengan deferred payment, status awal adalah 'received'
-                $initialStatus = 'received';
-                \Log::info('POSController: Setting status to "received" for deferred laundry order');
-            } elseif ($businessType && in_array($businessType->code, ['laundry'])) {
-                // Untuk laundry, jika bukan deferred, tetap pending (akan diupdate saat payment)
-                $initialStatus = 'pending';
-            }
-
-            $orderData = [
-                'business_id' => $businessId,
-                'outlet_id' => $outlet->id,
-                'customer_id' => $request->customer_id,
-                'table_id' => $request->table_id ?? null,
-                'queue_number' => $request->queue_number ?? null,
-                // Store employee_id, not user_id, so relations (employee.user) resolve correctly
-                'employee_id' => $employee?->id ?? null,
-                'shift_id' => $shiftId, // ← TAMBAHKAN SHIFT ID
-                'order_number' => 'ORD-' . strtoupper(\Illuminate\Support\Str::random(8)),
-                'type' => 'dine_in', // Default type for POS
-                'status' => $initialStatus,
-                'subtotal' => $subtotal,
-                'tax_amount' => $taxAmount,
-                'discount_amount' => $discountAmount,
-                'coupon_code' => $request->coupon_code,
-                'service_charge' => 0,
-                'delivery_fee' => 0,
-                'total' => $total,
-                'paid_amount' => 0,
-                'change_amount' => 0,
-                'payment_status' => 'pending', // Always pending for deferred payment
-                'notes' => $request->notes,
-                'ordered_at' => now(),
-            ];
+            $order = DB::transaction(fn () => $orders->create($request->all(), $context));
 
-            \Log::info('POSController: Order data prepared', [
-                'order_data' => $orderData,
-                'is_deferred_payment' => $isDeferredPayment,
-            ]);
-
-            $order = Order::create($orderData);
-
-            \Log::info('POSController: Order created successfully', [
+            Log::channel('pos')->info('POSController: Order created', [
                 'order_id' => $order->id,
                 'order_number' => $order->order_number,
                 'status' => $order->status,
-                'payment_status' => $order->payment_status,
-                'is_deferred_payment' => $isDeferredPayment,
+                'items_count' => count($request->items),
             ]);
 
-            // If linked to a table, mark the table as occupied
-            if ($order->table_id) {
-                try {
-                    $table = \App\Models\Table::find($order->table_id);
-                    if ($table && $table->status !== 'occupied') {
-                        $table->status = 'occupied';
-                        $table->save();
-                    }
-                } catch (\Exception $e) {
-                    \Log::warning('POSController: Failed updating table status to occupied', [
-                        'table_id' => $order->table_id,
-                        'error' => $e->getMessage(),
-                    ]);
-                }
-            }
+            $orders->announce($order);
 
-            \Log::info('POSController: Order created', ['order_id' => $order->id]);
-
-            foreach ($request->items as $item) {
-                $product = \App\Models\Product::findOrFail($item['product_id']);
-
-                // ✅ FIX: Check stock availability - skip for untracked products (unlimited stock)
-                // Only check stock for tracked products
-                if ($product->stock_type !== 'untracked' && $product->stock < $item['quantity']) {
-                    throw new \Exception("Stok produk '{$product->name}' tidak mencukupi. Stok tersedia: {$product->stock}");
-                }
-
-                // Create order item
-                OrderItem::create([
-                    'order_id' => $order->id,
-                    'product_id' => $item['product_id'],
-                    'product_name' => $product->name,
-                    'product_variant_id' => $item['product_variant_id'] ?? null,
-                    'variant_name' => $item['variant_name'] ?? null,
-                    'quantity' => $item['quantity'],
-                    'price' => $item['price'],
-                    'subtotal' => $item['quantity'] * $item['price'],
-                    'notes' => $item['notes'] ?? null,
-                ]);
-
-                // ✅ FIX: Update product stock - skip for untracked products (unlimited stock)
-                // Only update stock for tracked products
-                if ($product->stock_type !== 'untracked') {
-                    $stockBefore = $product->stock;
-                    $product->stock = $stockBefore - $item['quantity'];
-                    $product->save();
-                } else {
-                    // For untracked products, stock remains 0 (no tracking)
-                    $stockBefore = 0;
-                }
-
-                // ✅ Clear products cache setelah stock berubah (untuk POS yang cache products)
-                \Illuminate\Support\Facades\Cache::forget("products_pos:business:{$businessId}");
-                \Illuminate\Support\Facades\Cache::forget("products_stats:business:{$businessId}");
-
-                // ✅ FIX: Create inventory movement record - skip for untracked products
-                // Only create movement for tracked products
-                if ($product->stock_type !== 'untracked') {
-                    \App\Models\InventoryMovement::create([
-                        'product_id' => $product->id,
-                        'type' => 'out',
-                        'reason' => 'sale',
-                        'quantity' => $item['quantity'],
-                        'stock_before' => $stockBefore,
-                        'stock_after' => $product->stock,
-                        'reference_type' => 'order',
-                        'reference_id' => $order->id,
-                        'notes' => "Penjualan order #{$order->order_number}",
-                    ]);
-                }
+            return $this->orderCreatedResponse($order, 201);
+        } catch (UniqueConstraintViolationException $e) {
+            // Same client_uuid sent twice at the same time
+            $existing = $orders->findByClientUuid($businessId, $request->client_uuid);
+            if ($existing) {
+                return $this->orderCreatedResponse($existing, 200);
             }
 
-            DB::commit();
-
-            \Log::info('POSController: Order created successfully', ['order_id' => $order->id]);
-
-            $itemCount = $order->orderItems->count();
-            $itemsText = $itemCount > 1 ? "{$itemCount} item" : "{$itemCount} item";
-
-            // ✅ SECURITY: Persist notification for new order with role-based targeting
-            try {
-                // Determine role targets based on order type
-                $roleTargets = ['kitchen', 'owner', 'admin']; // Always notify kitchen, owner, admin
-                
-                // Add waiter if dine-in order
-                if ($order->type === 'dine_in') {
-                    $roleTargets[] = 'waiter';
-                }
-                
-                // Add kasir if payment is pending (kasir needs to process payment)
-                if ($order->payment_status === 'pending') {
-                    $roleTargets[] = 'kasir';
-                }
-
-                \App\Models\AppNotification::create([
-                    'business_id' => $order->business_id,
-                    'outlet_id' => $order->outlet_id,
-                    'user_id' => null,
-                    'role_targets' => array_unique($roleTargets), // Remove duplicates
-                    'type' => 'order.created',
-                    'title' => 'Order Baru: ' . $order->order_number,
-                    'message' => "{$itemsText} - Total: Rp " . number_format($order->total, 0, ',', '.'),
-                    'severity' => 'info',
-                    'resource_type' => 'order',
-                    'resource_id' => $order->id,
-                    'meta' => [
-                        'order_number' => $order->order_number,
-                        'table_id' => $order->table_id,
-                        'payment_status' => $order->payment_status,
-                        'status' => $order->status,
-                        'order_type' => $order->type,
-                    ],
-                ]);
-            } catch (\Exception $e) {
-                \Log::warning('POSController: Failed to create order notification', ['error' => $e->getMessage()]);
-            }
-
-            return response()->json([
-                'success' => true,
-                'data' => $order->load('orderItems.product'),
-                'toast' => [
-                    'type' => 'success',
-                    'title' => 'Order Dibuat',
-                    'message' => "Order #{$order->order_number} berhasil dibuat dengan {$itemsText}. Total: Rp " . number_format($order->total, 0, ',', '.'),
-                    'duration' => 3000
-                ]
-            ], 201);
+            throw $e;
         } catch (\Exception $e) {
-            DB::rollback();
-            \Log::error('POSController: Failed to create order', [
+            Log::channel('pos')->error('POSController: Failed to create order', [
                 'error' => $e->getMessage(),
-                'trace' => $e->getTraceAsString()
+                'exception' => $e,
             ]);
             return response()->json([
                 'success' => false,
@@ -351,9 +98,83 @@ public function createOrder(Request $request)
         }
     }
 
+    /**
+     * Sync orders queued offline by the POS.
+     *
+     * Every order needs a client_uuid; orders already synced are reported as
+     * duplicate, so the queue can be replayed safely after a lost response.
+     * Returns one result per order (created|duplicate|failed) in request order.
+     */
+    public function batchOrders(Request $request)
+    {
+        $businessId = $request->header('X-Business-Id');
+
+        if (!$businessId) {
+            return response()->json(['error' => 'Business ID required'], 400);
+        }
+
+        $validator = Validator::make($request->all(), [
+            'orders' => 'required|array|min:1|max:' . PosOrderService::BATCH_LIMIT,
+            'orders.*' => 'array',
+        ]);
+
+        if ($validator->fails()) {
+            return response()->json(['errors' => $validator->errors()], 422);
+        }
+
+        $orders = app(PosOrderService::class);
+        $context = $orders->context($businessId, $request->header('X-Outlet-Id'), auth()->user());
+
+        if (isset($context['error'])) {
+            return response()->json(array_filter([
+                'error' => $context['error'],
+                'requires_shift' => $context['requires_shift'],
+            ]), 400);
+        }
+
+        $startedAt = microtime(true);
+        $results = $orders->createBatch($request->input('orders'), $context);
+        $counts = array_count_values(array_column($results, 'status')) + ['created' => 0, 'duplicate' => 0, 'failed' => 0];
+
+        Log::channel('pos')->info('POSController: Order batch synced', [
+            'business_id' => $businessId,
+            'orders' => count($results),
+            'counts' => $counts,
+            'duration_ms' => round((microtime(true) - $startedAt) * 1000),
+        ]);
+
+        return response()->json([
+            'success' => $counts['failed'] === 0,
+            'data' => [
+                'results' => $results,
+                'created' => $counts['created'],
+                'duplicate' => $counts['duplicate'],
+                'failed' => $counts['failed'],
+            ],
+        ]);
+    }
+
+    private function orderCreatedResponse(Order $order, $status)
+    {
+        $order->load('orderItems.product');
+        $itemsText = $order->orderItems->count() . ' item';
+
+        return response()->json([
+            'success' => true,
+            'data' => $order,
+            'duplicate' => $status === 200,
+            'toast' => [
+                'type' => 'success',
+                'title' => 'Order Dibuat',
+                'message' => "Order #{$order->order_number} berhasil dibuat dengan {$itemsText}. Total: Rp " . number_format($order->total, 0, ',', '.'),
+                'duration' => 3000
+            ]
+        ], $status);
+    }
+
     public function processPayment(Request $request, Order $order)
     {
-        \Log::info('POSController: Processing payment', [
+        Log::channel('pos')->debug('POSController: Processing payment', [
             'order_id' => $order->id,
             'amount' => $request->amount
         ]);
@@ -365,7 +186,7 @@ public function processPayment(Request $request, Order $order)
         ]);
 
         if ($validator->fails()) {
-            \Log::error('POSController: Payment validation failed', ['errors' => $validator->errors()]);
+            Log::channel('pos')->warning('POSController: Payment validation failed', ['errors' => $validator->errors()->toArray()]);
             return response()->json(['errors' => $validator->errors()], 422);
         }
 
@@ -421,13 +242,13 @@ public function processPayment(Request $request, Order $order)
                 if ($shiftId) {
                     $order->shift_id = $shiftId;
                     $order->save(); // ✅ Simpan shift_id sebelum processing payment
-                    \Log::info('POSController: Assigning shift_id to waiter order', [
+                    Log::channel('pos')->debug('POSController: Assigning shift_id to waiter order', [
                         'order_id' => $order->id,
                         'shift_id' => $shiftId,
                         'user_role' => $user->role
                     ]);
                 } else {
-                    \Log::warning('POSController: No active shift found for waiter order payment', [
+                    Log::channel('pos')->warning('POSController: No active shift found for waiter order payment', [
                         'order_id' => $order->id,
                         'user_role' => $user->role,
                         'outlet_id' => $outletId
@@ -470,7 +291,7 @@ public function processPayment(Request $request, Order $order)
                     ],
                 ];
 
-                \Log::info('POSController: Creating Midtrans payment', [
+                Log::channel('pos')->debug('POSController: Creating Midtrans payment', [
                     'order_id' => $order->id,
                     'payment_reference' => $paymentReference,
                     'enabled_payments' => $params['enabled_payments'],
@@ -504,7 +325,7 @@ public function processPayment(Request $request, Order $order)
                 // Ini memastikan transaksi muncul di daftar transaksi kasir yang memproses
                 if ($employee && $employee->id) {
                     $order->employee_id = $employee->id;
-                    \Log::info('POSController: Updating order employee_id to QRIS processor', [
+                    Log::channel('pos')->debug('POSController: Updating order employee_id to QRIS processor', [
                         'order_id' => $order->id,
                         'old_employee_id' => $order->getOriginal('employee_id'),
                         'new_employee_id' => $employee->id,
@@ -516,7 +337,7 @@ public function processPayment(Request $request, Order $order)
                 $order->payment_status = 'pending';
                 $order->save();
 
-                \Log::info('POSController: QRIS payment created', [
+                Log::channel('pos')->info('POSController: QRIS payment created', [
                     'order_id' => $order->id,
                     'payment_id' => $payment->id,
                     'payment_reference' => $paymentReference,
@@ -556,7 +377,7 @@ public function processPayment(Request $request, Order $order)
                 'processed_by_employee_id' => $employee?->id ?? null,
             ]);
             
-            \Log::info('POSController: Payment created with reference number', [
+            Log::channel('pos')->debug('POSController: Payment created with reference number', [
                 'payment_id' => $payment->id,
                 'order_id' => $order->id,
                 'payment_method' => $request->input('method'),
@@ -567,7 +388,7 @@ public function processPayment(Request $request, Order $order)
             // Ini memastikan transaksi muncul di daftar transaksi kasir yang menerima uang
             if ($employee && $employee->id) {
                 $order->employee_id = $employee->id;
-                \Log::info('POSController: Updating order employee_id to payment processor', [
+                Log::channel('pos')->debug('POSController: Updating order employee_id to payment processor', [
                     'order_id' => $order->id,
                     'old_employee_id' => $order->getOriginal('employee_id'),
                     'new_employee_id' => $employee->id,
@@ -579,7 +400,7 @@ public function processPayment(Request $request, Order $order)
             $totalPaid = $order->paid_amount + $request->amount;
             $change = $totalPaid - $order->total;
 
-            \Log::info('POSController: Payment calculation debug', [
+            Log::channel('pos')->debug('POSController: Payment calculation debug', [
                 'order_id' => $order->id,
                 'order_total' => $order->total,
                 'previous_paid' => $order->paid_amount,
@@ -625,20 +446,25 @@ public function processPayment(Request $request, Order $order)
                         ],
                     ]);
                 } catch (\Exception $e) {
-                    \Log::warning('POSController: Failed to create payment notification', ['error' => $e->getMessage()]);
+                    Log::channel('pos')->warning('POSController: Failed to create payment notification', ['error' => $e->getMessage()]);
                 }
             }
 
-            // If order is completed and has shift_id, update shift statistics
-            if ($order->status === 'completed' && $order->shift_id) {
-                $this->updateShiftStatistics($order->shift_id);
+            // If order has shift_id, apply this payment to the shift ledger
+            if ($order->shift_id) {
+                app(\App\Services\ShiftLedgerService::class)->syncOrder($order);
             }
 
-            \Log::info('POSController: Payment processed successfully', [
+            Log::channel('pos')->info('POSController: Payment processed successfully', [
                 'order_id' => $order->id,
                 'payment_id' => $payment->id
             ]);
 
+            app(\App\Services\OrderEventService::class)->publish(
+                $order,
+                $order->payment_status === 'paid' ? \App\Services\OrderEventService::PAID : \App\Services\OrderEventService::STATUS_CHANGED
+            );
+
             // ✅ Send WhatsApp notification if payment is fully paid and outlet setting is enabled
             if ($totalPaid >= $order->total) {
                 $order->load(['orderItems.product', 'customer', 'business', 'outlet', 'payments']);
@@ -647,21 +473,23 @@ public function processPayment(Request $request, Order $order)
                 if ($order->outlet && $order->outlet->isSendReceiptViaWAEnabled()) {
                     try {
                         // Pass outlet to WhatsAppService to use outlet-specific API key
+                        // ✅ Queued: provider latency never delays the payment response
                         $whatsappService = new \App\Services\WhatsAppService($order->outlet);
-                        $whatsappService->sendPaymentReceipt($order);
-                        \Log::info('POSController: WhatsApp receipt sent', [
+                        $queued = $whatsappService->queuePaymentReceipt($order);
+                        Log::channel('pos')->info('POSController: WhatsApp receipt queued', [
                             'order_id' => $order->id,
-                            'outlet_id' => $order->outlet->id
+                            'outlet_id' => $order->outlet->id,
+                            'whatsapp_message_id' => $queued->id ?? null
                         ]);
                     } catch (\Exception $e) {
-                        \Log::warning('POSController: Failed to send WhatsApp notification', [
+                        Log::channel('pos')->warning('POSController: Failed to queue WhatsApp notification', [
                             'order_id' => $order->id,
                             'error' => $e->getMessage()
                         ]);
                         // Don't fail the payment if WhatsApp fails
                     }
                 } else {
-                    \Log::info('POSController: WhatsApp receipt not sent - setting disabled', [
+                    Log::channel('pos')->debug('POSController: WhatsApp receipt not sent - setting disabled', [
                         'order_id' => $order->id,
                         'outlet_id' => $order->outlet->id ?? null,
                         'setting_enabled' => $order->outlet ? $order->outlet->isSendReceiptViaWAEnabled() : false
@@ -703,13 +531,13 @@ public function processPayment(Request $request, Order $order)
                             );
                         }
 
-                        \Log::info('Invoice email sent successfully', [
+                        Log::channel('pos')->info('Invoice email sent successfully', [
                             'order_id' => $order->id,
                             'email' => $customerEmail
                         ]);
                     }
                 } catch (\Exception $e) {
-                    \Log::warning('POSController: Failed to send invoice email', [
+                    Log::channel('pos')->warning('POSController: Failed to send invoice email', [
                         'order_id' => $order->id,
                         'error' => $e->getMessage()
                     ]);
@@ -743,7 +571,7 @@ public function processPayment(Request $request, Order $order)
                     ],
                 ]);
             } catch (\Exception $e) {
-                \Log::warning('POSController: Failed to create payment notification', ['error' => $e->getMessage()]);
+                Log::channel('pos')->warning('POSController: Failed to create payment notification', ['error' => $e->getMessage()]);
             }
 
             return response()->json([
@@ -757,7 +585,7 @@ public function processPayment(Request $request, Order $order)
                 ]
             ]);
         } catch (\Exception $e) {
-            \Log::error('POSController: Payment processing failed', [
+            Log::channel('pos')->error('POSController: Payment processing failed', [
                 'error' => $e->getMessage()
             ]);
             return response()->json([
@@ -789,13 +617,8 @@ public function printReceipt(Order $order)
 
             // Get custom footer message from outlet setting
             $footerMessage = '';
-            if ($order->outlet_id) {
-                $footerSetting = \App\Models\OutletSetting::where('outlet_id', $order->outlet_id)
-                    ->where('setting_key', 'receipt_footer_message')
-                    ->first();
-                if ($footerSetting) {
-                    $footerMessage = $footerSetting->setting_value;
-                }
+            if ($order->outlet) {
+                $footerMessage = (string) $order->outlet->getSetting('receipt_footer_message', '');
             }
 
             // Generate comprehensive receipt data
@@ -871,7 +694,7 @@ public function printReceipt(Order $order)
                 'custom_footer_message' => $footerMessage
             ];
 
-            \Log::info('POSController: Print receipt data generated', [
+            Log::channel('pos')->debug('POSController: Print receipt data generated', [
                 'order_id' => $order->id,
                 'receipt_data' => $receipt
             ]);
@@ -881,7 +704,7 @@ public function printReceipt(Order $order)
                 'data' => $receipt
             ]);
         } catch (\Exception $e) {
-            \Log::error('POSController: Print receipt failed', [
+            Log::channel('pos')->error('POSController: Print receipt failed', [
                 'order_id' => $order->id,
                 'error' => $e->getMessage()
             ]);
@@ -892,87 +715,4 @@ public function printReceipt(Order $order)
             ], 500);
         }
     }
-
-    /**
-     * Update shift statistics when order is completed
-     */
-    private function updateShiftStatistics($shiftId)
-    {
-        try {
-            $shift = \App\Models\CashierShift::find($shiftId);
-            if (!$shift) {
-                \Log::warning('POSController: Shift not found for statistics update', ['shift_id' => $shiftId]);
-                return;
-            }
-
-            // Get all completed orders for this shift
-            $completedOrders = Order::where('shift_id', $shiftId)
-                ->where('status', 'completed')
-                ->with('payments')
-                ->get();
-
-            $totalTransactions = $completedOrders->count();
-            $expectedTotal = $completedOrders->sum('total');
-
-            // Calculate payment method breakdown
-            $cashTotal = 0;
-            $cashCount = 0;
-            $cardTotal = 0;
-            $cardCount = 0;
-            $transferTotal = 0;
-            $transferCount = 0;
-            $qrisTotal = 0;
-            $qrisCount = 0;
-
-            foreach ($completedOrders as $order) {
-                $payment = $order->payments->first(); // Get primary payment method
-                if ($payment) {
-                    switch ($payment->payment_method) {
-                        case 'cash':
-                            $cashTotal += $order->total;
-                            $cashCount++;
-                            break;
-                        case 'card':
-                            $cardTotal += $order->total;
-                            $cardCount++;
-                            break;
-                        case 'transfer':
-                            $transferTotal += $order->total;
-                            $transferCount++;
-                            break;
-                        case 'qris':
-                            $qrisTotal += $order->total;
-                            $qrisCount++;
-                            break;
-                    }
-                }
-            }
-
-            // Update shift record
-            $shift->update([
-                'total_transactions' => $totalTransactions,
-                'expected_total' => $expectedTotal,
-                'expected_cash' => $cashTotal,
-                'expected_card' => $cardTotal,
-                'expected_transfer' => $transferTotal,
-                'expected_qris' => $qrisTotal,
-                'cash_transactions' => $cashCount,
-                'card_transactions' => $cardCount,
-                'transfer_transactions' => $transferCount,
-                'qris_transactions' => $qrisCount,
-            ]);
-
-            \Log::info('POSController: Shift statistics updated', [
-                'shift_id' => $shiftId,
-                'total_transactions' => $totalTransactions,
-                'expected_total' => $expectedTotal
-            ]);
-
-        } catch (\Exception $e) {
-            \Log::error('POSController: Failed to update shift statistics', [
-                'shift_id' => $shiftId,
-                'error' => $e->getMessage()
-            ]);
-        }
-    }
 }
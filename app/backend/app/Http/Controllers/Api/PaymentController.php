@@ -5,7 +5,9 @@
 use App\Http\Controllers\Controller;
 use App\Models\UserSubscription;
 use App\Models\SubscriptionPayment;
+use App\Models\MidtransEvent;
 use App\Services\MidtransService;
+use App\Services\MidtransWebhookService;
 use Illuminate\Http\Request;
 use Illuminate\Support\Facades\Auth;
 use Illuminate\Support\Facades\Cache;
@@ -20,148 +22,17 @@ class PaymentController extends Controller
 
     /**
      * Handle Midtrans notification webhook
+     * ✅ Verified + stored once, applied by the payments queue worker (MidtransWebhookService)
      */
     public function handleMidtransNotification(Request $request)
     {
         try {
-            // Get notification (temporary - will get business-specific after finding subscription)
-            $tempNotification = new \Midtrans\Notification();
-            $orderId = $tempNotification->order_id;
-            $subscriptionCode = $orderId;
+            $result = app(MidtransWebhookService::class)->ingest($request->all(), MidtransEvent::TYPE_SUBSCRIPTION);
 
-            // ✅ FIX: Extract subscription code from order_id
-            // Format bisa: SUB-XXXXX atau SUB-XXXXX-TIMESTAMP atau SUB-XXXXX-TIMESTAMP-RANDOM
-            if (strpos($orderId, '-') !== false) {
-                $parts = explode('-', $orderId);
-                // Subscription code selalu format: SUB-XXXXX (2 bagian pertama)
-                // Jika ada timestamp/random di akhir, ambil hanya 2 bagian pertama
-                if (count($parts) >= 2) {
-                    // Always use first 2 parts (SUB-XXXXX) as subscription code
-                    $subscriptionCode = $parts[0] . '-' . $parts[1];
-                } else {
-                    $subscriptionCode = $orderId;
-                }
-            }
-
-            Log::info('Extracting subscription code from order_id', [
-                'order_id' => $orderId,
-                'extracted_subscription_code' => $subscriptionCode,
-            ]);
-
-            // Find subscription by subscription_code
-            $subscription = UserSubscription::with('user.ownedBusinesses')
-                ->where('subscription_code', $subscriptionCode)
-                ->first();
-
-            if (!$subscription) {
-                Log::error('Subscription not found for notification', [
-                    'order_id' => $orderId,
-                    'subscription_code' => $subscriptionCode,
-                ]);
-
-                return response()->json([
-                    'success' => false,
-                    'message' => 'Subscription not found',
-                ], 404);
-            }
-
-            // ✅ FIX: Get business from user (prefer owned business, fallback to first business)
-            // Business is optional - user might not have created business yet
-            $business = $subscription->user->ownedBusinesses()->first() 
-                ?? $subscription->user->businesses()->first();
-
-            // ✅ FIX: Business is not required for webhook processing
-            // User can have active subscription without business (they'll create it later)
-            if (!$business) {
-                Log::info('No business found for subscription in webhook, using default Midtrans config', [
-                    'subscription_id' => $subscription->id,
-                    'user_id' => $subscription->user_id,
-                    'subscription_code' => $subscriptionCode,
-                ]);
-                // Use default MidtransService (no business-specific config)
-                $midtransService = new MidtransService();
-            } else {
-                // ✅ Get MidtransService dengan business config
-                $midtransService = MidtransService::forBusiness($business);
-            }
-
-            // Get notification data dengan config yang benar
-            $notification = $midtransService->handleNotification();
-
-            Log::info('Processing Midtrans notification', [
-                'order_id' => $notification['order_id'],
-                'payment_status' => $notification['payment_status'],
-            ]);
-
-            DB::beginTransaction();
-            try {
-                // Update or create payment record
-                $payment = SubscriptionPayment::updateOrCreate(
-                    [
-                        'user_subscription_id' => $subscription->id,
-                        'payment_code' => $notification['order_id'],
-                    ],
-                    [
-                        'payment_method' => $notification['payment_type'],
-                        'payment_gateway' => 'midtrans',
-                        'gateway_payment_id' => $notification['raw_notification']->transaction_id ?? $notification['order_id'],
-                        'amount' => $notification['gross_amount'],
-                        'status' => $notification['payment_status'] === 'success' ? 'paid' : ($notification['payment_status'] === 'failed' ? 'failed' : 'pending'),
-                        'paid_at' => $notification['payment_status'] === 'success' ? Carbon::parse($notification['transaction_time']) : null,
-                        'payment_data' => json_encode($notification['raw_notification']),
-                    ]
-                );
-
-                // Update subscription status based on payment status
-                if ($notification['payment_status'] === 'success') {
-                    $subscription->update([
-                        'status' => 'active',
-                        'notes' => ($subscription->notes ?? '') . ' | Payment confirmed via ' . $notification['payment_type'],
-                    ]);
-
-                    // ✅ FIX: Update business to use new subscription (for upgrade scenario)
-                    if ($business) {
-                        $business->update([
-                            'current_subscription_id' => $subscription->id,
-                            'subscription_expires_at' => $subscription->ends_at,
-                        ]);
-                        
-                        Log::info('Business updated with new subscription', [
-                            'business_id' => $business->id,
-                            'subscription_id' => $subscription->id,
-                        ]);
-                    }
-
-                    Log::info('Subscription activated', [
-                        'subscription_id' => $subscription->id,
-                        'subscription_code' => $subscription->subscription_code,
-                    ]);
-
-                    // Fire SubscriptionPaid event
-                    event(new \App\Events\SubscriptionPaid($payment));
-
-                } elseif ($notification['payment_status'] === 'failed') {
-                    $subscription->update([
-                        'status' => 'cancelled',
-                        'notes' => ($subscription->notes ?? '') . ' | Payment failed',
-                    ]);
-
-                    Log::info('Subscription cancelled due to failed payment', [
-                        'subscription_id' => $subscription->id,
-                    ]);
-                }
-
-                DB::commit();
-
-                return response()->json([
-                    'success' => true,
-                    'message' => 'Notification processed successfully',
-                ]);
-
-            } catch (\Exception $e) {
-                DB::rollBack();
-                throw $e;
-            }
+            return response()->json([
+                'success' => $result['success'],
+                'message' => $result['message'],
+            ], $result['status']);
 
         } catch (\Exception $e) {
             Log::error('Failed to process Midtrans notification', [
@@ -3,12 +3,14 @@
 namespace App\Http\Controllers\Api;
 
 use App\Http\Controllers\Controller;
+use App\Jobs\GeneratePayrolls;
 use App\Models\Payroll;
 use App\Models\Employee;
 use App\Services\PayrollService;
 use Illuminate\Http\Request;
 use Illuminate\Support\Facades\Validator;
 use Illuminate\Support\Facades\Auth;
+use Illuminate\Support\Facades\Cache;
 use Illuminate\Support\Facades\Log;
 use Carbon\Carbon;
 
@@ -241,6 +243,7 @@ public function generateAll(Request $request)
             'late_penalty_per_occurrence' => 'nullable|numeric|min:0',
             'absent_penalty_per_day' => 'nullable|numeric|min:0',
             'overtime_rate' => 'nullable|numeric|min:0',
+            'queue' => 'nullable|boolean',
         ]);
 
         if ($validator->fails()) {
@@ -268,6 +271,18 @@ public function generateAll(Request $request)
                 'overtime_rate' => $request->overtime_rate,
             ];
 
+            // ✅ Large businesses: run in the background, progress via GET /payrolls/generate-all/status
+            if ($request->boolean('queue')) {
+                GeneratePayrolls::markQueued($businessId, (int) $request->year, (int) $request->month);
+                GeneratePayrolls::dispatch((int) $businessId, (int) $request->year, (int) $request->month, $options);
+
+                return response()->json([
+                    'success' => true,
+                    'message' => 'Payroll generation queued',
+                    'data' => Cache::get(GeneratePayrolls::progressKey($businessId, $request->year, $request->month)),
+                ], 202);
+            }
+
             $payrolls = $this->payrollService->generatePayrollsForAll(
                 $businessId,
                 $request->year,
@@ -290,6 +305,42 @@ public function generateAll(Request $request)
         }
     }
 
+    /**
+     * Progress of a queued generate-all run
+     */
+    public function generateAllStatus(Request $request)
+    {
+        $validator = Validator::make($request->all(), [
+            'year' => 'required|integer|min:2020|max:2100',
+            'month' => 'required|integer|min:1|max:12',
+        ]);
+
+        if ($validator->fails()) {
+            return response()->json([
+                'success' => false,
+                'errors' => $validator->errors()
+            ], 422);
+        }
+
+        $progress = Cache::get(GeneratePayrolls::progressKey(
+            $request->header('X-Business-Id'),
+            (int) $request->year,
+            (int) $request->month
+        ));
+
+        if (!$progress) {
+            return response()->json([
+                'success' => false,
+                'message' => 'No payroll generation found for this period'
+            ], 404);
+        }
+
+        return response()->json([
+            'success' => true,
+            'data' => $progress
+        ]);
+    }
+
     /**
      * Get payroll detail
      */
@@ -5,6 +5,9 @@
 use App\Http\Controllers\Controller;
 use App\Models\Product;
 use App\Services\ImageOptimizationService;
+use App\Services\ProductCatalogService;
+use App\Services\ProductLookupService;
+use App\Services\ProductSearchService;
 use Illuminate\Http\Request;
 use Illuminate\Support\Facades\DB;
 use Illuminate\Support\Facades\Validator;
@@ -61,29 +64,18 @@ public function getInitialData(Request $request)
             ->where('is_active', true);
 
         // Apply filters jika ada
+        // ✅ Search index (FULLTEXT / FTS5 / n-gram) instead of LIKE '%term%'
+        $matches = null;
         if ($request->has('search') && !empty($request->search)) {
-            $searchTerm = $request->search;
-            $query->where(function($q) use ($searchTerm) {
-                $q->where('name', 'LIKE', "%{$searchTerm}%")
-                  ->orWhere('sku', 'LIKE', "%{$searchTerm}%")
-                  ->orWhere('description', 'LIKE', "%{$searchTerm}%");
-            });
+            $matches = app(ProductSearchService::class)->search($businessId, $request->search);
+            $query->whereIn('id', $matches);
         }
 
         if ($request->has('category') && !empty($request->category)) {
             $query->where('category_id', $request->category);
         }
 
-        // Apply sorting
-        $sortField = $request->get('sort_field', 'created_at');
-        $sortDirection = $request->get('sort_direction', 'desc');
-        $allowedSortFields = ['name', 'price', 'stock', 'created_at', 'category_id', 'sku'];
-
-        if (in_array($sortField, $allowedSortFields)) {
-            $query->orderBy($sortField, $sortDirection);
-        } else {
-            $query->orderBy('created_at', 'desc');
-        }
+        $this->applySorting($request, $query, $matches);
 
         $products = $query->paginate($perPage);
 
@@ -140,14 +132,11 @@ public function apiIndex(Request $request)
                 ->where('business_id', $businessId)
                 ->where('is_active', true); // Only active products
 
-            // Apply search filter
+            // Apply search filter (search index, ranked by relevance)
+            $matches = null;
             if ($request->has('search') && !empty($request->search)) {
-                $searchTerm = $request->search;
-                $query->where(function($q) use ($searchTerm) {
-                    $q->where('name', 'LIKE', "%{$searchTerm}%")
-                      ->orWhere('sku', 'LIKE', "%{$searchTerm}%")
-                      ->orWhere('description', 'LIKE', "%{$searchTerm}%");
-                });
+                $matches = app(ProductSearchService::class)->search($businessId, $request->search);
+                $query->whereIn('id', $matches);
             }
 
             // Apply category filter
@@ -155,17 +144,7 @@ public function apiIndex(Request $request)
                 $query->where('category_id', $request->category);
             }
 
-            // Apply sorting
-            $sortField = $request->get('sort_field', 'created_at');
-            $sortDirection = $request->get('sort_direction', 'desc');
-
-            // Validate sort field to prevent SQL injection
-            $allowedSortFields = ['name', 'price', 'stock', 'created_at', 'category_id', 'sku'];
-            if (in_array($sortField, $allowedSortFields)) {
-                $query->orderBy($sortField, $sortDirection);
-            } else {
-                $query->orderBy('created_at', 'desc');
-            }
+            $this->applySorting($request, $query, $matches);
 
             $products = $query->paginate($perPage);
 
@@ -175,21 +154,93 @@ public function apiIndex(Request $request)
 
             return response()->json($response);
         } else {
-            // ✅ OPTIMIZATION: Cache products untuk POS (no pagination) - 1 menit
-            // Products bisa berubah saat transaksi (stock), tapi tidak terlalu sering
-            $cacheKey = "products_pos:business:{$businessId}";
-            $products = \Illuminate\Support\Facades\Cache::remember($cacheKey, 60, function() use ($businessId) {
-                return Product::with('category:id,name')
-                    ->select(['id', 'name', 'sku', 'price', 'cost', 'stock', 'stock_type', 'min_stock', 'image', 'category_id', 'is_active', 'description',
-                             'discount_price', 'discount_percentage', 'discount_start_date', 'discount_end_date'])
-                    ->where('business_id', $businessId)
-                    ->where('is_active', true)
-                    ->orderBy('name', 'asc')
-                    ->get();
-            });
+            // ✅ OPTIMIZATION: Versioned POS catalog (ProductCatalogService)
+            // Cached until a catalog change; stock changes are overlaid, not rebuilt.
+            // If-None-Match with the current version returns 304 after a single PK lookup.
+            $catalog = app(ProductCatalogService::class);
+            $current = $catalog->current($businessId);
+
+            $response = response()->json();
+            $response->setEtag($catalog->etag($businessId, $current['version']), true);
+            $response->headers->set('X-Catalog-Version', $current['version']);
+            $response->setPrivate();
+            $response->headers->addCacheControlDirective('no-cache');
+
+            if ($response->isNotModified($request)) {
+                return $response;
+            }
+
+            return $response->setData($catalog->catalog($businessId, $current));
+        }
+    }
+
+    /**
+     * Delta sync of the POS catalog: GET /products/sync?since={version}
+     *
+     * Returns only products whose price/availability/details changed and a
+     * compact [product_id => stock] map for stock-only changes since the
+     * client's version. `reset: true` means the client must reload the full
+     * list from GET /products.
+     */
+    public function sync(Request $request)
+    {
+        $businessId = $request->header('X-Business-Id');
+
+        if (!$businessId) {
+            return response()->json(['message' => 'Business ID required'], 400);
+        }
+
+        $catalog = app(ProductCatalogService::class);
+        $current = $catalog->current($businessId);
+        $since = (int) $request->query('since', 0);
+
+        $response = response()->json();
+        $response->setEtag($catalog->etag($businessId, $current['version']) . "-since-{$since}", true);
+        $response->headers->set('X-Catalog-Version', $current['version']);
+        $response->setPrivate();
+        $response->headers->addCacheControlDirective('no-cache');
+
+        if ($response->isNotModified($request)) {
+            return $response;
+        }
+
+        return $response->setData($catalog->delta($businessId, $since, $current));
+    }
+
+    /**
+     * Exact barcode / SKU lookup for POS scanning: GET /products/lookup?code=
+     */
+    public function lookup(Request $request)
+    {
+        $businessId = $request->header('X-Business-Id');
+
+        if (!$businessId) {
+            return response()->json(['message' => 'Business ID required'], 400);
+        }
+
+        $validator = Validator::make($request->all(), [
+            'code' => 'required|string|max:' . ProductLookupService::MAX_LENGTH,
+        ]);
+
+        if ($validator->fails()) {
+            return response()->json(['errors' => $validator->errors()], 422);
+        }
+
+        $match = app(ProductLookupService::class)->find($businessId, $request->code);
 
-            return response()->json($products);
+        if (!$match) {
+            return response()->json([
+                'success' => false,
+                'message' => 'Produk tidak ditemukan',
+            ], 404);
         }
+
+        return response()->json([
+            'success' => true,
+            'data' => $match['product'],
+            'variant_id' => $match['variant_id'],
+            'matched' => $match['matched'],
+        ]);
     }
 
     public function store(Request $request)
@@ -241,12 +292,22 @@ public function store(Request $request)
             'discount_percentage' => 'nullable|numeric|min:0|max:100',
             'discount_start_date' => 'nullable|date',
             'discount_end_date' => 'nullable|date|after_or_equal:discount_start_date',
-        ]);
+        ] + app(ProductLookupService::class)->rules());
 
         if ($validator->fails()) {
             return response()->json(['errors' => $validator->errors()], 422);
         }
 
+        // Barcodes must not already belong to another product (barcode or SKU)
+        if ($conflicts = app(ProductLookupService::class)->conflicts($businessId, (array) $request->input('barcodes', []))) {
+            return response()->json(['errors' => ['barcodes' => ['Barcode sudah digunakan: ' . implode(', ', $conflicts)]]], 422);
+        }
+
+        // A new product has no variants yet, so variant barcodes can only be added on update
+        if ($foreign = app(ProductLookupService::class)->foreignVariants((array) $request->input('barcodes', []))) {
+            return response()->json(['errors' => ['barcodes' => ['Varian tidak termasuk produk ini: ' . implode(', ', $foreign)]]], 422);
+        }
+
         // Verify category belongs to the same business
         $category = \App\Models\Category::find($request->category_id);
         if (!$category || $category->business_id != $businessId) {
@@ -261,7 +322,7 @@ public function store(Request $request)
             'all_request' => $request->except(['image']),
         ]);
 
-        $productData = array_merge($request->except('image'), [
+        $productData = array_merge($request->except(['image', 'barcodes']), [
             'business_id' => $businessId,
             'slug' => \Illuminate\Support\Str::slug($request->name),
             'sku' => $request->sku ?? 'SKU-' . strtoupper(\Illuminate\Support\Str::random(8)),
@@ -304,6 +365,10 @@ public function store(Request $request)
 
         $product = Product::create($productData);
 
+        if ($request->filled('barcodes')) {
+            app(ProductLookupService::class)->syncBarcodes($product, $request->input('barcodes'));
+        }
+
         // ✅ Clear cache setelah create
         \Illuminate\Support\Facades\Cache::forget("products_pos:business:{$businessId}");
         \Illuminate\Support\Facades\Cache::forget("products_stats:business:{$businessId}");
@@ -394,7 +459,7 @@ public function update(Request $request, Product $product)
             'discount_percentage' => 'nullable|numeric|min:0|max:100',
             'discount_start_date' => 'nullable|date',
             'discount_end_date' => 'nullable|date|after_or_equal:discount_start_date',
-        ];
+        ] + app(ProductLookupService::class)->rules();
 
         // ✅ FIX: Only validate image if it's actually a file upload (not a URL string)
         // If image is a string URL, it means we're keeping the existing image, so skip validation
@@ -437,6 +502,16 @@ public function update(Request $request, Product $product)
             ], 422);
         }
 
+        // Barcodes must not already belong to another product (barcode or SKU)
+        if ($conflicts = app(ProductLookupService::class)->conflicts($businessId, (array) $request->input('barcodes', []), $product->id)) {
+            return response()->json(['errors' => ['barcodes' => ['Barcode sudah digunakan: ' . implode(', ', $conflicts)]]], 422);
+        }
+
+        // Variant barcodes must point at variants of this product
+        if ($foreign = app(ProductLookupService::class)->foreignVariants((array) $request->input('barcodes', []), $product->id)) {
+            return response()->json(['errors' => ['barcodes' => ['Varian tidak termasuk produk ini: ' . implode(', ', $foreign)]]], 422);
+        }
+
         // Verify category belongs to the same business if updating category
         if ($request->has('category_id')) {
             $category = \App\Models\Category::find($request->category_id);
@@ -450,6 +525,7 @@ public function update(Request $request, Product $product)
         unset($updateData['image']);
         unset($updateData['remove_image']);
         unset($updateData['_method']);
+        unset($updateData['barcodes']);
         if ($request->has('name')) {
             $updateData['slug'] = \Illuminate\Support\Str::slug($request->name);
         }
@@ -571,6 +647,11 @@ public function update(Request $request, Product $product)
         $product->fill($updateData);
         $product->save();
 
+        // Barcodes are only replaced when sent (an empty list removes them)
+        if ($request->has('barcodes')) {
+            app(ProductLookupService::class)->syncBarcodes($product, (array) $request->input('barcodes', []));
+        }
+
         // ✅ DEBUG: Log after update - reload to verify
         $product->refresh();
         \Log::info('Product Update - After save', [
@@ -643,9 +724,8 @@ public function stockAdjustment(Request $request, Product $product)
         $product->stock = $newStock;
         $product->save();
 
-        // ✅ Clear cache setelah stock adjustment
+        // ✅ Clear stats cache setelah stock adjustment (POS catalog dapat stock delta via ProductObserver)
         $businessId = $product->business_id;
-        \Illuminate\Support\Facades\Cache::forget("products_pos:business:{$businessId}");
         \Illuminate\Support\Facades\Cache::forget("products_stats:business:{$businessId}");
 
         // Optionally log the adjustment
@@ -653,4 +733,29 @@ public function stockAdjustment(Request $request, Product $product)
 
         return response()->json($product->load('category'));
     }
+
+    /**
+     * Sort a product list query.
+     *
+     * With a search term and sort_field missing or "relevance", rows follow
+     * the search ranking; the id tiebreak keeps pagination stable.
+     */
+    private function applySorting(Request $request, $query, ?array $matches = null)
+    {
+        $sortField = $request->get('sort_field', $matches !== null ? 'relevance' : 'created_at');
+        $sortDirection = $request->get('sort_direction', 'desc') === 'asc' ? 'asc' : 'desc';
+
+        // Validate sort field to prevent SQL injection
+        $allowedSortFields = ['name', 'price', 'stock', 'created_at', 'category_id', 'sku'];
+
+        if ($sortField === 'relevance' && $matches !== null) {
+            app(ProductSearchService::class)->orderByRelevance($query, $matches, 'id');
+        } elseif (in_array($sortField, $allowedSortFields)) {
+            $query->orderBy($sortField, $sortDirection);
+        } else {
+            $query->orderBy('created_at', 'desc');
+        }
+
+        $query->orderBy('id', $sortDirection);
+    }
 }
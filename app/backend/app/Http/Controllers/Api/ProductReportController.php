@@ -6,6 +6,7 @@
 use App\Models\OrderItem;
 use App\Models\Product;
 use App\Models\Category;
+use App\Services\ProductSearchService;
 use Illuminate\Http\Request;
 use Illuminate\Support\Facades\DB;
 use Carbon\Carbon;
@@ -28,6 +29,8 @@ public function getProductSales(Request $request)
             // Get date range
             $dateRange = $this->getDateRange($request->input('date_range', 'today'));
             $search = $request->input('search', '');
+            // ✅ Product search index instead of LIKE '%term%' on products.name
+            $matches = $search ? app(ProductSearchService::class)->search($businessId, $search) : [];
             $sortBy = $request->input('sort_by', 'total_revenue');
             $sortOrder = $request->input('sort_order', 'desc');
             $page = $request->input('page', 1);
@@ -49,8 +52,8 @@ public function getProductSales(Request $request)
 
             // Search filter
             if ($search) {
-                $baseQuery->where(function($q) use ($search) {
-                    $q->where('products.name', 'like', "%{$search}%")
+                $baseQuery->where(function($q) use ($search, $matches) {
+                    $q->whereIn('products.id', $matches)
                       ->orWhere('categories.name', 'like', "%{$search}%");
                 });
             }
@@ -69,8 +72,8 @@ public function getProductSales(Request $request)
             }
 
             if ($search) {
-                $summaryQuery->where(function($q) use ($search) {
-                    $q->where('products.name', 'like', "%{$search}%")
+                $summaryQuery->where(function($q) use ($search, $matches) {
+                    $q->whereIn('products.id', $matches)
                       ->orWhere('categories.name', 'like', "%{$search}%");
                 });
             }
@@ -96,8 +99,8 @@ public function getProductSales(Request $request)
 
             // Apply search filter to orders that have matching products
             if ($search) {
-                $ordersQuery->whereHas('items.product', function($q) use ($search) {
-                    $q->where('products.name', 'like', "%{$search}%")
+                $ordersQuery->whereHas('items.product', function($q) use ($search, $matches) {
+                    $q->whereIn('products.id', $matches)
                       ->orWhereHas('category', function($catQ) use ($search) {
                           $catQ->where('categories.name', 'like', "%{$search}%");
                       });
@@ -140,8 +143,8 @@ public function getProductSales(Request $request)
             }
 
             if ($search) {
-                $countQuery->where(function($q) use ($search) {
-                    $q->where('products.name', 'like', "%{$search}%")
+                $countQuery->where(function($q) use ($search, $matches) {
+                    $q->whereIn('products.id', $matches)
                       ->orWhere('categories.name', 'like', "%{$search}%");
                 });
             }
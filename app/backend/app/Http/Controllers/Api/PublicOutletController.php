@@ -7,9 +7,12 @@
 use App\Models\Product;
 use App\Models\Order;
 use App\Models\Category;
+use App\Services\PublicMenuService;
 use Illuminate\Http\Request;
+use Illuminate\Pagination\LengthAwarePaginator;
 use Illuminate\Support\Facades\DB;
 use Illuminate\Support\Facades\Validator;
+use Illuminate\Support\Str;
 
 class PublicOutletController extends Controller
 {
@@ -71,32 +74,45 @@ public function getOutletProducts($slug, Request $request)
             ], 404);
         }
 
-        $query = Product::where('business_id', $outlet->business_id)
-            ->where('is_active', true)
-            ->with(['category']);
+        // ✅ Filtered and paginated from the shared public menu snapshot instead of a query per request
+        $menu = app(PublicMenuService::class);
+        $version = $menu->version($outlet);
+        $etag = $menu->etag($version, 'products', $request->getQueryString());
 
-        // Filter by category if provided
-        if ($request->has('category_id') && $request->category_id) {
-            $query->where('category_id', $request->category_id);
-        }
+        return $menu->respond($request, $etag, function () use ($menu, $outlet, $version, $request) {
+            $products = collect($menu->snapshot($outlet, $version)['products']);
 
-        // Search by name
-        if ($request->has('search') && $request->search) {
-            $query->where('name', 'like', '%' . $request->search . '%');
-        }
+            // Filter by category if provided
+            if ($request->has('category_id') && $request->category_id) {
+                $products = $products->where('category_id', $request->category_id);
+            }
 
-        // Sort by
-        $sortBy = $request->get('sort_by', 'name');
-        $sortOrder = $request->get('sort_order', 'asc');
-        $query->orderBy($sortBy, $sortOrder);
+            // Search by name
+            if ($request->has('search') && $request->search) {
+                $products = $products->filter(fn ($product) => Str::contains($product['name'] ?? '', $request->search, true));
+            }
 
-        $perPage = $request->get('per_page', 20);
-        $products = $query->paginate($perPage);
+            // Sort by
+            $sortBy = $request->get('sort_by', 'name');
+            $sortOrder = $request->get('sort_order', 'asc');
+            $products = $products->sortBy($sortBy, SORT_REGULAR, strtolower($sortOrder) === 'desc')->values();
 
-        return response()->json([
-            'success' => true,
-            'data' => $products
-        ]);
+            $perPage = max(1, (int) $request->get('per_page', 20));
+            $page = LengthAwarePaginator::resolveCurrentPage();
+
+            $paginator = new LengthAwarePaginator(
+                $products->forPage($page, $perPage)->values(),
+                $products->count(),
+                $perPage,
+                $page,
+                ['path' => $request->url(), 'query' => $request->query()]
+            );
+
+            return json_encode([
+                'success' => true,
+                'data' => $paginator,
+            ]);
+        });
     }
 
     /**
@@ -4,6 +4,9 @@
 
 use App\Http\Controllers\Controller;
 use App\Models\Outlet;
+use App\Services\CashierPerformanceService;
+use App\Services\ProductSearchService;
+use App\Services\SalesRollupService;
 use App\Helpers\SubscriptionHelper;
 use Illuminate\Http\Request;
 use Illuminate\Support\Facades\DB;
@@ -12,6 +15,11 @@
 
 class ReportController extends Controller
 {
+    /**
+     * First cell of the trailer row written when a streamed export fails midway
+     */
+    public const STREAM_ERROR_MARKER = '#ERROR';
+
     /**
      * Check if user has access to advanced reports
      */
@@ -115,286 +123,109 @@ public function getSalesSummary(Request $request)
                 'end' => $endDate
             ]);
 
-            // ✅ FIX: Use paid_at from payments table instead of created_at
-            $query = DB::table('orders')
-                ->leftJoin('payments', function($join) {
-                    $join->on('orders.id', '=', 'payments.order_id')
-                         ->whereIn('payments.status', ['success', 'paid', 'settlement', 'capture']);
-                })
-                ->where(function($q) use ($startDate, $endDate) {
-                    $q->whereBetween(DB::raw('COALESCE(payments.paid_at, orders.created_at)'), [$startDate, $endDate]);
-                })
-                ->where('orders.payment_status', 'paid') // ✅ FIX: Only count paid orders
-                ->whereIn('orders.status', ['completed', 'confirmed', 'preparing', 'ready']);
-
-            if ($businessId) {
-                $query->where('orders.business_id', $businessId);
-            }
-
-            if ($outletId) {
-                $query->where('orders.outlet_id', $outletId);
-            }
+            // ✅ PERFORMANCE: Past days are read from daily_sales_rollups, today is
+            // aggregated live with the same rules (paid orders, bucketed by payment time)
+            $rollups = app(SalesRollupService::class);
+            $rangeStart = Carbon::parse($startDate);
+            $rangeEnd = Carbon::parse($endDate);
 
             // Get basic stats
-            $stats = $query->selectRaw('
-                COUNT(DISTINCT orders.id) as total_transactions,
-                COALESCE(SUM(orders.subtotal), 0) as total_subtotal,
-                COALESCE(SUM(orders.total), 0) as total_sales,
-                COALESCE(SUM(orders.discount_amount), 0) as total_discount,
-                COALESCE(SUM(orders.tax_amount), 0) as total_tax,
-                COALESCE(AVG(orders.total), 0) as average_transaction
-            ')->first();
-
-            // ✅ FIX: Handle null stats
-            if (!$stats) {
-                $stats = (object) [
-                    'total_transactions' => 0,
-                    'total_subtotal' => 0,
-                    'total_sales' => 0,
-                    'total_discount' => 0,
-                    'total_tax' => 0,
-                    'average_transaction' => 0
-                ];
-            }
+            $totals = $rollups->aggregate('order', [], $businessId, $outletId, $rangeStart, $rangeEnd)->first() ?? [];
+            $totalTransactions = (int) ($totals['orders_count'] ?? 0);
+            $stats = (object) [
+                'total_transactions' => $totalTransactions,
+                'total_subtotal' => (float) ($totals['subtotal'] ?? 0),
+                'total_sales' => (float) ($totals['total'] ?? 0),
+                'total_discount' => (float) ($totals['discount_amount'] ?? 0),
+                'total_tax' => (float) ($totals['tax_amount'] ?? 0),
+                'average_transaction' => $totalTransactions > 0 ? $totals['total'] / $totalTransactions : 0,
+            ];
 
             // ✅ FIX: Calculate net sales correctly
             // orders.total = subtotal + tax - discount (already final amount paid)
-            // Total Sales = subtotal (before tax and discount) - untuk display di frontend
-            // Net Sales = orders.total (subtotal + tax - discount = final amount paid)
-            // Jadi: Total Sales (subtotal) < Net Sales (total yang dibayar)
-            $netSales = ($stats->total_sales ?? 0); // orders.total already = subtotal + tax - discount
-
-            // Get payment methods distribution from payments table
-            // ✅ FIX: Filter only valid payment statuses
-            // ✅ FIX: Use paid_at from payments table instead of created_at
-            $paymentMethodsQuery = DB::table('orders')
-                ->join('payments', 'orders.id', '=', 'payments.order_id')
-                ->where(function($q) use ($startDate, $endDate) {
-                    $q->whereBetween(DB::raw('COALESCE(payments.paid_at, orders.created_at)'), [$startDate, $endDate]);
-                })
-                ->where('orders.payment_status', 'paid') // ✅ FIX: Only paid orders
-                ->whereIn('orders.status', ['completed', 'confirmed', 'preparing', 'ready'])
-                ->whereIn('payments.status', ['success', 'paid', 'settlement', 'capture']); // ✅ FIX: Valid payment statuses
+            $netSales = ($stats->total_sales ?? 0);
 
-            if ($businessId) {
-                $paymentMethodsQuery->where('orders.business_id', $businessId);
-            }
-
-            if ($outletId) {
-                $paymentMethodsQuery->where('orders.outlet_id', $outletId);
-            }
-
-            // ✅ FIX: Handle case where there are no payments
-            $paymentMethods = $paymentMethodsQuery
-                ->selectRaw('payments.payment_method, SUM(payments.amount) as amount, COUNT(DISTINCT orders.id) as count')
-                ->groupBy('payments.payment_method')
-                ->get();
-            
-            // ✅ FIX: Ensure paymentMethods is always a collection
-            if (!$paymentMethods || $paymentMethods->isEmpty()) {
-                $paymentMethods = collect([]);
-            } else {
-                $paymentMethods = $paymentMethods->map(function ($item) use ($stats) {
+            // Get payment methods distribution (valid payments only, latest per method)
+            $paymentMethods = $rollups->aggregate('payment', ['payment_method'], $businessId, $outletId, $rangeStart, $rangeEnd)
+                ->map(function ($item) use ($stats) {
                     return [
-                        'name' => $this->formatPaymentMethod($item->payment_method ?? 'unknown'),
-                        'amount' => (float) ($item->amount ?? 0),
-                        'count' => (int) ($item->count ?? 0),
-                        'percentage' => ($stats->total_sales ?? 0) > 0 ? round((($item->amount ?? 0) / ($stats->total_sales ?? 1)) * 100, 2) : 0
+                        'name' => $this->formatPaymentMethod($item['payment_method'] ?: 'unknown'),
+                        'amount' => (float) $item['total'],
+                        'count' => (int) $item['orders_count'],
+                        'percentage' => $stats->total_sales > 0 ? round(($item['total'] / $stats->total_sales) * 100, 2) : 0
                     ];
                 });
-            }
 
             // Get sales trend based on chart type
             $timezone = 'Asia/Jakarta';
             $dailySales = collect([]);
-            
+
             if ($chartType === 'daily') {
                 // ✅ FIX: For daily chart, show hourly data (00:00 - 23:00)
-                // ✅ FIX: Use paid_at from payments table instead of created_at
-                $hourlySalesQuery = DB::table('orders')
-                    ->leftJoin('payments', function($join) {
-                        $join->on('orders.id', '=', 'payments.order_id')
-                             ->whereIn('payments.status', ['success', 'paid', 'settlement', 'capture']);
-                    })
-                    ->where(function($query) use ($startDate, $endDate) {
-                        $query->whereBetween(DB::raw('COALESCE(payments.paid_at, orders.created_at)'), [$startDate, $endDate]);
-                    })
-                    ->where('orders.payment_status', 'paid')
-                    ->whereIn('orders.status', ['completed', 'confirmed', 'preparing', 'ready'])
-                    ->where('orders.business_id', $businessId);
-                
-                if ($outletId) {
-                    $hourlySalesQuery->where('orders.outlet_id', $outletId);
-                }
-                
-                $hourlySalesRaw = $hourlySalesQuery
-                    ->selectRaw('HOUR(COALESCE(payments.paid_at, orders.created_at)) as hour, SUM(orders.total) as sales, COUNT(DISTINCT orders.id) as transactions')
-                    ->groupBy('hour')
-                    ->orderBy('hour')
-                    ->get();
-                
-                // Fill in all hours (0-23)
-                $hourlySalesMap = [];
-                foreach ($hourlySalesRaw as $item) {
-                    $hourlySalesMap[$item->hour] = [
-                        'date' => sprintf('%02d:00', $item->hour),
-                        'sales' => (float) ($item->sales ?? 0),
-                        'transactions' => (int) ($item->transactions ?? 0)
-                    ];
-                }
-                
-                // Generate all hours
+                $hourlySalesMap = $rollups->aggregate('order', ['hour'], $businessId, $outletId, $rangeStart, $rangeEnd)
+                    ->keyBy('hour');
+
                 for ($hour = 0; $hour < 24; $hour++) {
-                    if (!isset($hourlySalesMap[$hour])) {
-                        $dailySales->push([
-                            'date' => sprintf('%02d:00', $hour),
-                            'sales' => 0,
-                            'transactions' => 0
-                        ]);
-                    } else {
-                        $dailySales->push($hourlySalesMap[$hour]);
-                    }
+                    $item = $hourlySalesMap->get($hour);
+                    $dailySales->push([
+                        'date' => sprintf('%02d:00', $hour),
+                        'sales' => (float) ($item['total'] ?? 0),
+                        'transactions' => (int) ($item['orders_count'] ?? 0)
+                    ]);
                 }
             } else {
                 // ✅ FIX: For weekly/monthly, show daily data
-                // ✅ FIX: Use paid_at from payments table instead of created_at
-                $dailySalesQuery = DB::table('orders')
-                    ->leftJoin('payments', function($join) {
-                        $join->on('orders.id', '=', 'payments.order_id')
-                             ->whereIn('payments.status', ['success', 'paid', 'settlement', 'capture']);
-                    })
-                    ->where(function($query) use ($startDate, $endDate) {
-                        $query->whereBetween(DB::raw('COALESCE(payments.paid_at, orders.created_at)'), [$startDate, $endDate]);
-                    })
-                    ->where('orders.payment_status', 'paid')
-                    ->whereIn('orders.status', ['completed', 'confirmed', 'preparing', 'ready'])
-                    ->where('orders.business_id', $businessId);
-                
-                if ($outletId) {
-                    $dailySalesQuery->where('orders.outlet_id', $outletId);
-                }
-                
-                $dailySalesRaw = $dailySalesQuery
-                    ->selectRaw('DATE(COALESCE(payments.paid_at, orders.created_at)) as date, SUM(orders.total) as sales, COUNT(DISTINCT orders.id) as transactions')
-                    ->groupBy('date')
-                    ->orderBy('date')
-                    ->get();
-                
-                // ✅ FIX: Fill in missing dates in the range
-                $dailySalesMap = [];
-                foreach ($dailySalesRaw as $item) {
-                    $dailySalesMap[$item->date] = [
-                        'date' => $item->date ?? null,
-                        'sales' => (float) ($item->sales ?? 0),
-                        'transactions' => (int) ($item->transactions ?? 0)
-                    ];
-                }
-                
+                $dailySalesMap = $rollups->aggregate('order', ['sale_date'], $businessId, $outletId, $rangeStart, $rangeEnd)
+                    ->keyBy('sale_date');
+
                 // Generate all dates in range
                 $currentDate = \Carbon\Carbon::parse($startDate, $timezone)->copy()->startOfDay();
                 $endDateCarbon = \Carbon\Carbon::parse($endDate, $timezone)->copy()->startOfDay();
-                
+
                 // Loop through all dates from start to end (inclusive)
                 while ($currentDate->lte($endDateCarbon)) {
                     $dateStr = $currentDate->format('Y-m-d');
-                    if (!isset($dailySalesMap[$dateStr])) {
-                        $dailySales->push([
-                            'date' => $dateStr,
-                            'sales' => 0,
-                            'transactions' => 0
-                        ]);
-                    } else {
-                        $dailySales->push($dailySalesMap[$dateStr]);
-                    }
+                    $item = $dailySalesMap->get($dateStr);
+                    $dailySales->push([
+                        'date' => $dateStr,
+                        'sales' => (float) ($item['total'] ?? 0),
+                        'transactions' => (int) ($item['orders_count'] ?? 0)
+                    ]);
                     $currentDate->addDay();
                 }
             }
 
             // Get top products
-            // ✅ FIX: Only count paid orders
-            // ✅ FIX: Use 'subtotal' instead of 'total_price' (correct column name)
-            // ✅ FIX: Use paid_at from payments table instead of created_at
-            $topProducts = DB::table('order_items')
-                ->join('orders', 'order_items.order_id', '=', 'orders.id')
-                ->leftJoin('payments', function($join) {
-                    $join->on('orders.id', '=', 'payments.order_id')
-                         ->whereIn('payments.status', ['success', 'paid', 'settlement', 'capture']);
-                })
-                ->where(function($q) use ($startDate, $endDate) {
-                    $q->whereBetween(DB::raw('COALESCE(payments.paid_at, orders.created_at)'), [$startDate, $endDate]);
-                })
-                ->where('orders.payment_status', 'paid') // ✅ FIX: Only paid orders
-                ->whereIn('orders.status', ['completed', 'confirmed', 'preparing', 'ready'])
-                ->when($businessId, function ($query) use ($businessId) {
-                    return $query->where('orders.business_id', $businessId);
-                })
-                ->when($outletId, function ($query) use ($outletId) {
-                    return $query->where('orders.outlet_id', $outletId);
-                })
-                ->selectRaw('
-                    order_items.product_name,
-                    SUM(order_items.quantity) as total_quantity,
-                    SUM(order_items.subtotal) as total_revenue,
-                    COUNT(DISTINCT orders.id) as order_count
-                ')
-                ->groupBy('order_items.product_name')
-                ->orderBy('total_revenue', 'desc')
-                ->limit(10)
-                ->get();
-            
-            // ✅ FIX: Ensure topProducts is always a collection
-            if (!$topProducts) {
-                $topProducts = collect([]);
-            } else {
-                $topProducts = $topProducts->map(function ($item) {
+            $topProducts = $rollups->aggregate('product', ['product_id'], $businessId, $outletId, $rangeStart, $rangeEnd)
+                ->sortByDesc('total')
+                ->take(10)
+                ->map(function ($item) {
                     return [
-                        'name' => $item->product_name ?? 'Unknown',
-                        'quantity' => (int) ($item->total_quantity ?? 0),
-                        'sales' => (float) ($item->total_revenue ?? 0),
-                        'order_count' => (int) ($item->order_count ?? 0)
+                        'name' => $item['product_name'] ?? 'Unknown',
+                        'quantity' => (int) $item['quantity'],
+                        'sales' => (float) $item['total'],
+                        'order_count' => (int) $item['orders_count']
                     ];
                 });
-            }
 
             // Hitung growth rate sederhana berdasarkan total_sales dibanding periode sebelumnya
             $growthRate = 0;
             try {
-                if (isset($stats, $startDate, $endDate)) {
-                    $currentTotal = (float) ($stats->total_sales ?? 0);
+                $currentTotal = (float) ($stats->total_sales ?? 0);
 
-                    $start = \Carbon\Carbon::parse($startDate);
-                    $end = \Carbon\Carbon::parse($endDate);
-                    $periodLength = $end->diffInDays($start);
+                $start = \Carbon\Carbon::parse($startDate);
+                $end = \Carbon\Carbon::parse($endDate);
+                $periodLength = $end->diffInDays($start);
 
-                    $previousStart = $start->copy()->subDays($periodLength + 1);
-                    $previousEnd = $start->copy()->subDay();
+                $previousStart = $start->copy()->subDays($periodLength + 1);
+                $previousEnd = $start->copy()->subDay();
 
-                    $previousQuery = DB::table('orders')
-                        ->leftJoin('payments', function ($join) {
-                            $join->on('orders.id', '=', 'payments.order_id')
-                                 ->whereIn('payments.status', ['success', 'paid', 'settlement', 'capture']);
-                        })
-                        ->where(function ($q) use ($previousStart, $previousEnd) {
-                            $q->whereBetween(DB::raw('COALESCE(payments.paid_at, orders.created_at)'), [$previousStart, $previousEnd]);
-                        })
-                        ->where('orders.payment_status', 'paid')
-                        ->whereIn('orders.status', ['completed', 'confirmed', 'preparing', 'ready']);
+                $previousTotal = (float) ($rollups->aggregate('order', [], $businessId, $outletId, $previousStart, $previousEnd)->first()['total'] ?? 0);
 
-                    if ($businessId) {
-                        $previousQuery->where('orders.business_id', $businessId);
-                    }
-
-                    if ($outletId) {
-                        $previousQuery->where('orders.outlet_id', $outletId);
-                    }
-
-                    $previousTotal = (float) $previousQuery->sum('orders.total');
-
-                    if ($previousTotal > 0) {
-                        $growthRate = round((($currentTotal - $previousTotal) / $previousTotal) * 100, 2);
-                    } else {
-                        $growthRate = $currentTotal > 0 ? 100.0 : 0.0;
-                    }
+                if ($previousTotal > 0) {
+                    $growthRate = round((($currentTotal - $previousTotal) / $previousTotal) * 100, 2);
+                } else {
+                    $growthRate = $currentTotal > 0 ? 100.0 : 0.0;
                 }
             } catch (\Exception $growthException) {
                 $growthRate = 0;
@@ -487,9 +318,7 @@ public function getSalesDetail(Request $request)
                 ], 400);
             }
 
-            // ✅ FIX: Use paid_at from payments table instead of created_at
-            // First, get orders that match date range (using created_at as fallback)
-            // Then filter by paid_at if exists
+            // ✅ FIX: Filter on payment time (orders.recognized_at) instead of created_at
             $startDate = $dateRange['start'] instanceof Carbon 
                 ? $dateRange['start']->toDateTimeString() 
                 : $dateRange['start'];
@@ -502,19 +331,11 @@ public function getSalesDetail(Request $request)
                 ->leftJoin('users', 'employees.user_id', '=', 'users.id')
                 ->leftJoin('customers', 'orders.customer_id', '=', 'customers.id')
                 ->where('orders.payment_status', 'paid') // Only paid orders
-                ->whereRaw('(
-                    orders.created_at BETWEEN ? AND ?
-                    OR EXISTS (
-                        SELECT 1 FROM payments 
-                        WHERE payments.order_id = orders.id 
-                        AND payments.status IN (\'success\', \'paid\', \'settlement\', \'capture\')
-                        AND payments.paid_at BETWEEN ? AND ?
-                    )
-                )', [$startDate, $endDate, $startDate, $endDate])
+                ->whereBetween('orders.recognized_at', [$startDate, $endDate]) // first valid payment, else created_at
                 ->select([
                     'orders.id',
                     'orders.order_number',
-                    DB::raw('COALESCE((SELECT MAX(paid_at) FROM payments WHERE payments.order_id = orders.id AND payments.status IN (\'success\', \'paid\', \'settlement\', \'capture\')), orders.created_at) as transaction_date'),
+                    'orders.recognized_at as transaction_date',
                     'orders.created_at',
                     'orders.total',
                     'orders.discount_amount',
@@ -559,22 +380,14 @@ public function getSalesDetail(Request $request)
             }
 
             // Get paginated results - order by transaction date (paid_at or created_at)
-            $orders = $query->orderByRaw('COALESCE((SELECT MAX(paid_at) FROM payments WHERE payments.order_id = orders.id AND payments.status IN (\'success\', \'paid\', \'settlement\', \'capture\')), orders.created_at) DESC')
+            $orders = $query->orderByDesc('orders.recognized_at')
                 ->paginate($perPage, ['*'], 'page', $page);
 
             // Get summary stats
-            // ✅ FIX: Use paid_at from payments table instead of created_at
+            // ✅ FIX: Filter on payment time (orders.recognized_at) instead of created_at
             $summaryQuery = DB::table('orders')
                 ->where('orders.payment_status', 'paid') // Only paid orders
-                ->whereRaw('(
-                    orders.created_at BETWEEN ? AND ?
-                    OR EXISTS (
-                        SELECT 1 FROM payments 
-                        WHERE payments.order_id = orders.id 
-                        AND payments.status IN (\'success\', \'paid\', \'settlement\', \'capture\')
-                        AND payments.paid_at BETWEEN ? AND ?
-                    )
-                )', [$startDate, $endDate, $startDate, $endDate]);
+                ->whereBetween('orders.recognized_at', [$startDate, $endDate]);
 
             if ($businessId) {
                 $summaryQuery->where('orders.business_id', $businessId);
@@ -849,15 +662,6 @@ public function exportSales(Request $request, $format = null)
             // Get format from request if not passed as parameter
             $format = $format ?? $request->get('format', 'csv');
             
-            Log::info('Export sales called', [
-                'format' => $format,
-                'params' => $request->all(),
-                'headers' => [
-                    'X-Business-Id' => $request->header('X-Business-Id'),
-                    'X-Outlet-Id' => $request->header('X-Outlet-Id'),
-                ]
-            ]);
-            
             $dateRange = $this->getDateRange($request);
             $businessId = $this->getBusinessIdForUser($user);
             $outletId = $request->header('X-Outlet-Id');
@@ -886,19 +690,11 @@ public function exportSales(Request $request, $format = null)
                 ->leftJoin('users', 'employees.user_id', '=', 'users.id')
                 ->leftJoin('customers', 'orders.customer_id', '=', 'customers.id')
                 ->where('orders.payment_status', 'paid') // Only paid orders
-                ->whereRaw('(
-                    orders.created_at BETWEEN ? AND ?
-                    OR EXISTS (
-                        SELECT 1 FROM payments 
-                        WHERE payments.order_id = orders.id 
-                        AND payments.status IN (\'success\', \'paid\', \'settlement\', \'capture\')
-                        AND payments.paid_at BETWEEN ? AND ?
-                    )
-                )', [$startDateStr, $endDateStr, $startDateStr, $endDateStr])
+                ->whereBetween('orders.recognized_at', [$startDateStr, $endDateStr]) // first valid payment, else created_at
                 ->select([
                     'orders.id',
                     'orders.order_number',
-                    DB::raw('COALESCE((SELECT MAX(paid_at) FROM payments WHERE payments.order_id = orders.id AND payments.status IN (\'success\', \'paid\', \'settlement\', \'capture\')), orders.created_at) as transaction_date'),
+                    'orders.recognized_at as transaction_date',
                     'orders.created_at',
                     'orders.total',
                     'orders.discount_amount',
@@ -948,99 +744,93 @@ public function exportSales(Request $request, $format = null)
                 });
             }
 
-            // ✅ FIX: Execute query with error handling - use same ordering as getSalesDetail
-            try {
-                $orders = $query->orderByRaw('COALESCE((SELECT MAX(paid_at) FROM payments WHERE payments.order_id = orders.id AND payments.status IN (\'success\', \'paid\', \'settlement\', \'capture\')), orders.created_at) DESC')
-                    ->get();
-            } catch (\Exception $queryError) {
-                Log::error('Export sales query error', [
-                    'error' => $queryError->getMessage(),
-                    'file' => $queryError->getFile(),
-                    'line' => $queryError->getLine(),
-                    'sql' => $query->toSql(),
-                    'bindings' => $query->getBindings(),
-                ]);
-                throw new \Exception('Database query failed: ' . $queryError->getMessage());
-            }
+            // Handle CSV and Excel formats: stream rows in keyset chunks so memory
+            // stays flat regardless of the date range
+            if ($format === 'csv' || $format === 'excel') {
+                return $this->streamCsvExport('sales_report', $format, function ($write) use ($query) {
+                    $write("No. Order,Tanggal,Total,Potongan,Pajak,Metode Pembayaran,Status,Kasir,Pelanggan\n");
+
+                    $totalSales = 0;
+                    $totalDiscount = 0;
+                    $totalTax = 0;
+                    $totalTransactions = 0;
+
+                    foreach ($query->lazyByIdDesc(1000, 'orders.id', 'id') as $order) {
+                        // ✅ FIX: Use transaction_date if available, otherwise use created_at
+                        $transactionDate = $order->transaction_date ?? $order->created_at;
+                        $dateFormatted = \Carbon\Carbon::parse($transactionDate)->format('d/m/Y H:i');
+
+                        $write(sprintf(
+                            "%s,%s,%s,%s,%s,%s,%s,%s,%s\n",
+                            $order->order_number,
+                            $dateFormatted,
+                            number_format($order->total, 0, ',', '.'),
+                            number_format($order->discount_amount ?? 0, 0, ',', '.'),
+                            number_format($order->tax_amount ?? 0, 0, ',', '.'),
+                            $this->formatPaymentMethod($order->payment_method ?? 'cash'),
+                            ucfirst($order->status ?? 'completed'),
+                            $order->cashier_name ?? '-',
+                            $order->customer_name ?? '-'
+                        ));
+
+                        $totalSales += $order->total;
+                        $totalDiscount += $order->discount_amount ?? 0;
+                        $totalTax += $order->tax_amount ?? 0;
+                        $totalTransactions++;
+                    }
 
-            // Calculate summary
-            $totalSales = $orders->sum('total');
-            $totalDiscount = $orders->sum('discount_amount');
-            $totalTax = $orders->sum('tax_amount');
-            $totalTransactions = $orders->count();
-            
-            Log::info('Export sales query successful', [
-                'orders_count' => $orders->count(),
-                'total_sales' => $totalSales,
-            ]);
+                    // Add summary row
+                    $write("\n");
+                    $write("RINGKASAN\n");
+                    $write("Total Transaksi," . $totalTransactions . "\n");
+                    $write("Total Penjualan," . number_format($totalSales, 0, ',', '.') . "\n");
+                    $write("Total Potongan," . number_format($totalDiscount, 0, ',', '.') . "\n");
+                    $write("Total Pajak," . number_format($totalTax, 0, ',', '.') . "\n");
+                });
+            }
 
-            // Get outlet data
-            $outlet = null;
-            if ($outletId) {
+            // Handle PDF format
+            if ($format === 'pdf') {
+                // ✅ FIX: Execute query with error handling - use same ordering as getSalesDetail
                 try {
-                    $outlet = Outlet::find($outletId);
-                } catch (\Exception $e) {
-                    Log::warning('Export sales - Failed to load outlet', [
-                        'outlet_id' => $outletId,
-                        'error' => $e->getMessage()
+                    $orders = $query->orderByDesc('orders.recognized_at')
+                        ->get();
+                } catch (\Exception $queryError) {
+                    Log::error('Export sales query error', [
+                        'error' => $queryError->getMessage(),
+                        'file' => $queryError->getFile(),
+                        'line' => $queryError->getLine(),
+                        'sql' => $query->toSql(),
+                        'bindings' => $query->getBindings(),
                     ]);
+                    throw new \Exception('Database query failed: ' . $queryError->getMessage());
+                }
+
+                // Get outlet data
+                $outlet = null;
+                if ($outletId) {
+                    try {
+                        $outlet = Outlet::find($outletId);
+                    } catch (\Exception $e) {
+                        Log::warning('Export sales - Failed to load outlet', [
+                            'outlet_id' => $outletId,
+                            'error' => $e->getMessage()
+                        ]);
+                    }
                 }
-            }
 
-            // Handle PDF format
-            if ($format === 'pdf') {
                 $html = $this->generateSalesPDF($orders, $dateRange, [
-                    'totalSales' => $totalSales,
-                    'totalDiscount' => $totalDiscount,
-                    'totalTax' => $totalTax,
-                    'totalTransactions' => $totalTransactions,
+                    'totalSales' => $orders->sum('total'),
+                    'totalDiscount' => $orders->sum('discount_amount'),
+                    'totalTax' => $orders->sum('tax_amount'),
+                    'totalTransactions' => $orders->count(),
                 ], $outlet);
-                
+
                 return response($html)
                     ->header('Content-Type', 'text/html; charset=UTF-8')
                     ->header('Content-Disposition', 'inline; filename="sales_report_' . date('Y-m-d') . '.html"');
             }
 
-            // Handle CSV and Excel formats
-            if ($format === 'csv' || $format === 'excel') {
-                $csv = "No. Order,Tanggal,Total,Potongan,Pajak,Metode Pembayaran,Status,Kasir,Pelanggan\n";
-                foreach ($orders as $order) {
-                // ✅ FIX: Use transaction_date if available, otherwise use created_at
-                $transactionDate = $order->transaction_date ?? $order->created_at;
-                $dateFormatted = \Carbon\Carbon::parse($transactionDate)->format('d/m/Y H:i');
-                
-                $csv .= sprintf(
-                    "%s,%s,%s,%s,%s,%s,%s,%s,%s\n",
-                    $order->order_number,
-                    $dateFormatted,
-                    number_format($order->total, 0, ',', '.'),
-                    number_format($order->discount_amount ?? 0, 0, ',', '.'),
-                    number_format($order->tax_amount ?? 0, 0, ',', '.'),
-                    $this->formatPaymentMethod($order->payment_method ?? 'cash'),
-                    ucfirst($order->status ?? 'completed'),
-                    $order->cashier_name ?? '-',
-                    $order->customer_name ?? '-'
-                );
-                }
-
-                // Add summary row
-                $csv .= "\n";
-                $csv .= "RINGKASAN\n";
-                $csv .= "Total Transaksi," . $totalTransactions . "\n";
-                $csv .= "Total Penjualan," . number_format($totalSales, 0, ',', '.') . "\n";
-                $csv .= "Total Potongan," . number_format($totalDiscount, 0, ',', '.') . "\n";
-                $csv .= "Total Pajak," . number_format($totalTax, 0, ',', '.') . "\n";
-
-                $extension = $format === 'csv' ? 'csv' : 'xlsx';
-                $contentType = $format === 'csv' 
-                    ? 'text/csv' 
-                    : 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet';
-                
-                return response($csv)
-                    ->header('Content-Type', $contentType)
-                    ->header('Content-Disposition', 'attachment; filename="sales_report_' . date('Y-m-d') . '.' . $extension . '"');
-            }
-
             return response()->json([
                 'success' => false,
                 'message' => 'Format not supported: ' . $format
@@ -1193,8 +983,9 @@ private function generateSalesPDF($orders, $dateRange, $summary, $outlet = null)
     /**
      * Get date range based on request parameters
      * ✅ FIX: Added error handling and timezone support
+     * (public: ReportExportService resolves export ranges with the same rules)
      */
-    private function getDateRange(Request $request)
+    public function getDateRange(Request $request)
     {
         try {
             $dateRange = $request->get('date_range', 'today');
@@ -1322,6 +1113,56 @@ private function getDateRange(Request $request)
         }
     }
 
+    /**
+     * Stream a CSV/Excel export straight to the client.
+     *
+     * The $writeRows callback receives a $write(string $line) function; lines are
+     * flushed every few hundred rows so nothing accumulates in memory. Headers
+     * are already sent when a row fails, so the file ends with an error row
+     * (STREAM_ERROR_MARKER) instead of looking complete.
+     */
+    private function streamCsvExport($filenamePrefix, $format, callable $writeRows)
+    {
+        $extension = $format === 'csv' ? 'csv' : 'xlsx';
+        $contentType = $format === 'csv'
+            ? 'text/csv'
+            : 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet';
+
+        return response()->stream(function () use ($writeRows, $filenamePrefix) {
+            @set_time_limit(0);
+
+            $lines = 0;
+            $write = function ($line) use (&$lines) {
+                echo $line;
+                if (++$lines % 500 === 0) {
+                    if (ob_get_level() > 0) {
+                        ob_flush();
+                    }
+                    flush();
+                }
+            };
+
+            try {
+                $writeRows($write);
+            } catch (\Exception $e) {
+                // Headers are already sent: log it and mark the file as incomplete
+                Log::error('Streaming export failed', [
+                    'export' => $filenamePrefix,
+                    'rows_written' => $lines,
+                    'error' => $e->getMessage(),
+                ]);
+
+                echo "\n" . self::STREAM_ERROR_MARKER . ",Export tidak lengkap: terjadi kesalahan server setelah {$lines} baris\n";
+                flush();
+            }
+        }, 200, [
+            'Content-Type' => $contentType,
+            'Content-Disposition' => 'attachment; filename="' . $filenamePrefix . '_' . date('Y-m-d') . '.' . $extension . '"',
+            'Cache-Control' => 'no-store',
+            'X-Accel-Buffering' => 'no', // Disable nginx buffering so rows reach the client immediately
+        ]);
+    }
+
     /**
      * Get business ID for user
      */
@@ -1557,185 +1398,115 @@ public function getSalesChartData(Request $request)
             $outletId = $request->header('X-Outlet-Id');
             $chartType = $request->get('chart_type', 'daily'); // daily, weekly, monthly, hourly
 
-            // Base query for orders
-            // ✅ FIX: Use paid_at from payments table instead of created_at
-            $query = DB::table('orders')
-                ->leftJoin('payments', function($join) {
-                    $join->on('orders.id', '=', 'payments.order_id')
-                         ->whereIn('payments.status', ['success', 'paid', 'settlement', 'capture']);
-                })
-                ->where(function($q) use ($dateRange) {
-                    $q->whereBetween(DB::raw('COALESCE(payments.paid_at, orders.created_at)'), [$dateRange['start'], $dateRange['end']]);
-                })
-                ->whereIn('orders.status', ['completed', 'confirmed', 'preparing', 'ready']);
-
-            if ($businessId) {
-                $query->where('orders.business_id', $businessId);
-            }
-
-            if ($outletId) {
-                $query->where('orders.outlet_id', $outletId);
-            }
+            // ✅ PERFORMANCE: Past days are read from daily_sales_rollups, today is aggregated live
+            $rollups = app(SalesRollupService::class);
+            $rangeStart = $dateRange['start'];
+            $rangeEnd = $dateRange['end'];
 
             $chartData = collect([]);
 
             switch ($chartType) {
                 case 'hourly':
-                    $chartData = $query->clone()
-                        ->selectRaw('
-                            HOUR(COALESCE(payments.paid_at, orders.created_at)) as period,
-                            DATE(COALESCE(payments.paid_at, orders.created_at)) as date,
-                            SUM(orders.total) as sales,
-                            COUNT(DISTINCT orders.id) as transactions,
-                            AVG(orders.total) as average_transaction
-                        ')
-                        ->groupBy('period', 'date')
-                        ->orderBy('date')
-                        ->orderBy('period')
-                        ->get()
+                    $chartData = $rollups->aggregate('order', ['sale_date', 'hour'], $businessId, $outletId, $rangeStart, $rangeEnd)
+                        ->sortBy(fn ($item) => sprintf('%s %02d', $item['sale_date'], $item['hour']))
                         ->map(function ($item) {
                             return [
-                                'period' => sprintf('%02d:00', $item->period),
-                                'date' => $item->date,
-                                'sales' => (float) $item->sales,
-                                'transactions' => (int) $item->transactions,
-                                'average_transaction' => (float) $item->average_transaction
+                                'period' => sprintf('%02d:00', $item['hour']),
+                                'date' => $item['sale_date'],
+                                'sales' => (float) $item['total'],
+                                'transactions' => (int) $item['orders_count'],
+                                'average_transaction' => $item['orders_count'] > 0 ? (float) ($item['total'] / $item['orders_count']) : 0
                             ];
                         });
                     break;
 
                 case 'weekly':
-                    $chartData = $query->clone()
-                        ->selectRaw('
-                            YEARWEEK(COALESCE(payments.paid_at, orders.created_at), 1) as period,
-                            YEAR(COALESCE(payments.paid_at, orders.created_at)) as year,
-                            WEEK(COALESCE(payments.paid_at, orders.created_at), 1) as week,
-                            SUM(orders.total) as sales,
-                            COUNT(DISTINCT orders.id) as transactions,
-                            AVG(orders.total) as average_transaction
-                        ')
-                        ->groupBy('period')
-                        ->orderBy('period')
-                        ->get()
-                        ->map(function ($item) {
+                    $chartData = $rollups->aggregate('order', ['sale_date'], $businessId, $outletId, $rangeStart, $rangeEnd)
+                        ->groupBy(function ($item) {
+                            $date = Carbon::parse($item['sale_date']);
+                            return sprintf('%04d%02d', $date->isoWeekYear, $date->isoWeek);
+                        })
+                        ->sortKeys()
+                        ->map(function ($days) {
+                            $date = Carbon::parse($days->first()['sale_date']);
+                            $sales = $days->sum('total');
+                            $transactions = (int) $days->sum('orders_count');
                             return [
-                                'period' => "Minggu {$item->week}, {$item->year}",
-                                'year' => $item->year,
-                                'week' => $item->week,
-                                'sales' => (float) $item->sales,
-                                'transactions' => (int) $item->transactions,
-                                'average_transaction' => (float) $item->average_transaction
+                                'period' => "Minggu {$date->isoWeek}, {$date->isoWeekYear}",
+                                'year' => $date->isoWeekYear,
+                                'week' => $date->isoWeek,
+                                'sales' => (float) $sales,
+                                'transactions' => $transactions,
+                                'average_transaction' => $transactions > 0 ? (float) ($sales / $transactions) : 0
                             ];
                         });
                     break;
 
                 case 'monthly':
-                    $chartData = $query->clone()
-                        ->selectRaw('
-                            DATE_FORMAT(COALESCE(payments.paid_at, orders.created_at), "%Y-%m") as period,
-                            YEAR(COALESCE(payments.paid_at, orders.created_at)) as year,
-                            MONTH(COALESCE(payments.paid_at, orders.created_at)) as month,
-                            SUM(orders.total) as sales,
-                            COUNT(DISTINCT orders.id) as transactions,
-                            AVG(orders.total) as average_transaction
-                        ')
-                        ->groupBy('period')
-                        ->orderBy('period')
-                        ->get()
-                        ->map(function ($item) {
-                            $monthNames = [
-                                1 => 'Januari', 2 => 'Februari', 3 => 'Maret', 4 => 'April',
-                                5 => 'Mei', 6 => 'Juni', 7 => 'Juli', 8 => 'Agustus',
-                                9 => 'September', 10 => 'Oktober', 11 => 'November', 12 => 'Desember'
-                            ];
+                    $monthNames = [
+                        1 => 'Januari', 2 => 'Februari', 3 => 'Maret', 4 => 'April',
+                        5 => 'Mei', 6 => 'Juni', 7 => 'Juli', 8 => 'Agustus',
+                        9 => 'September', 10 => 'Oktober', 11 => 'November', 12 => 'Desember'
+                    ];
+                    $chartData = $rollups->aggregate('order', ['sale_date'], $businessId, $outletId, $rangeStart, $rangeEnd)
+                        ->groupBy(fn ($item) => substr($item['sale_date'], 0, 7))
+                        ->sortKeys()
+                        ->map(function ($days, $period) use ($monthNames) {
+                            [$year, $month] = array_map('intval', explode('-', $period));
+                            $sales = $days->sum('total');
+                            $transactions = (int) $days->sum('orders_count');
                             return [
-                                'period' => "{$monthNames[$item->month]} {$item->year}",
-                                'year' => $item->year,
-                                'month' => $item->month,
-                                'sales' => (float) $item->sales,
-                                'transactions' => (int) $item->transactions,
-                                'average_transaction' => (float) $item->average_transaction
+                                'period' => "{$monthNames[$month]} {$year}",
+                                'year' => $year,
+                                'month' => $month,
+                                'sales' => (float) $sales,
+                                'transactions' => $transactions,
+                                'average_transaction' => $transactions > 0 ? (float) ($sales / $transactions) : 0
                             ];
                         });
                     break;
 
                 case 'daily':
                 default:
-                    $chartData = $query->clone()
-                        ->selectRaw('
-                            DATE(COALESCE(payments.paid_at, orders.created_at)) as period,
-                            SUM(orders.total) as sales,
-                            COUNT(DISTINCT orders.id) as transactions,
-                            AVG(orders.total) as average_transaction
-                        ')
-                        ->groupBy('period')
-                        ->orderBy('period')
-                        ->get()
+                    $chartData = $rollups->aggregate('order', ['sale_date'], $businessId, $outletId, $rangeStart, $rangeEnd)
+                        ->sortBy('sale_date')
                         ->map(function ($item) {
                             return [
-                                'period' => $item->period,
-                                'sales' => (float) $item->sales,
-                                'transactions' => (int) $item->transactions,
-                                'average_transaction' => (float) $item->average_transaction
+                                'period' => $item['sale_date'],
+                                'sales' => (float) $item['total'],
+                                'transactions' => (int) $item['orders_count'],
+                                'average_transaction' => $item['orders_count'] > 0 ? (float) ($item['total'] / $item['orders_count']) : 0
                             ];
                         });
                     break;
             }
 
-            // Get category sales data
-            // ✅ FIX: Use paid_at from payments table instead of created_at
-            $categoryData = DB::table('order_items')
-                ->join('orders', 'order_items.order_id', '=', 'orders.id')
-                ->leftJoin('payments', function($join) {
-                    $join->on('orders.id', '=', 'payments.order_id')
-                         ->whereIn('payments.status', ['success', 'paid', 'settlement', 'capture']);
-                })
-                ->join('products', 'order_items.product_id', '=', 'products.id')
-                ->join('categories', 'products.category_id', '=', 'categories.id')
-                ->where(function($q) use ($dateRange) {
-                    $q->whereBetween(DB::raw('COALESCE(payments.paid_at, orders.created_at)'), [$dateRange['start'], $dateRange['end']]);
-                })
-                ->whereIn('orders.status', ['completed', 'confirmed', 'preparing', 'ready'])
-                ->when($businessId, function ($query) use ($businessId) {
-                    return $query->where('orders.business_id', $businessId);
-                })
-                ->when($outletId, function ($query) use ($outletId) {
-                    return $query->where('orders.outlet_id', $outletId);
-                })
-                ->selectRaw('
-                    categories.name as category_name,
-                    SUM(order_items.subtotal) as sales,
-                    SUM(order_items.quantity) as quantity_sold,
-                    COUNT(DISTINCT orders.id) as order_count
-                ')
-                ->groupBy('categories.id', 'categories.name')
-                ->orderBy('sales', 'desc')
-                ->get()
-                ->map(function ($item) {
+            // Get category sales data (order_count = orders per product, summed per category)
+            $categoryRows = $rollups->aggregate('product', ['category_id'], $businessId, $outletId, $rangeStart, $rangeEnd);
+            $categoryNames = DB::table('categories')
+                ->whereIn('id', $categoryRows->pluck('category_id')->filter()->all())
+                ->pluck('name', 'id');
+            $categoryData = $categoryRows
+                ->filter(fn ($item) => isset($categoryNames[$item['category_id']]))
+                ->sortByDesc('total')
+                ->map(function ($item) use ($categoryNames) {
                     return [
-                        'category_name' => $item->category_name,
-                        'sales' => (float) $item->sales,
-                        'quantity_sold' => (int) $item->quantity_sold,
-                        'order_count' => (int) $item->order_count
+                        'category_name' => $categoryNames[$item['category_id']],
+                        'sales' => (float) $item['total'],
+                        'quantity_sold' => (int) $item['quantity'],
+                        'order_count' => (int) $item['orders_count']
                     ];
                 });
 
             // Get payment method distribution
-            $paymentData = $query->clone()
-                ->selectRaw('
-                    payments.payment_method,
-                    SUM(orders.total) as sales,
-                    COUNT(DISTINCT orders.id) as transactions
-                ')
-                ->groupBy('payments.payment_method')
-                ->orderBy('sales', 'desc')
-                ->get()
+            $paymentData = $rollups->aggregate('payment', ['payment_method'], $businessId, $outletId, $rangeStart, $rangeEnd)
+                ->sortByDesc('total')
                 ->map(function ($item) {
                     return [
-                        'payment_method' => $this->formatPaymentMethod($item->payment_method),
-                        'payment_method_raw' => $item->payment_method,
-                        'sales' => (float) $item->sales,
-                        'transactions' => (int) $item->transactions
+                        'payment_method' => $this->formatPaymentMethod($item['payment_method']),
+                        'payment_method_raw' => $item['payment_method'],
+                        'sales' => (float) $item['total'],
+                        'transactions' => (int) $item['orders_count']
                     ];
                 });
 
@@ -1745,52 +1516,21 @@ public function getSalesChartData(Request $request)
 
             // Add percentage to payment data
             $paymentData = $paymentData->map(function ($item) use ($totalSales, $totalTransactions) {
-                // $item is already an array from the previous map, but ensure type safety
-                $itemArray = is_array($item) ? $item : (array) $item;
-                return [
-                    'payment_method' => $itemArray['payment_method'],
-                    'payment_method_raw' => $itemArray['payment_method_raw'],
-                    'sales' => $itemArray['sales'],
-                    'transactions' => $itemArray['transactions'],
-                    'sales_percentage' => $totalSales > 0 ? round(($itemArray['sales'] / $totalSales) * 100, 2) : 0,
-                    'transactions_percentage' => $totalTransactions > 0 ? round(($itemArray['transactions'] / $totalTransactions) * 100, 2) : 0,
-                ];
+                $item['sales_percentage'] = $totalSales > 0 ? round(($item['sales'] / $totalSales) * 100, 2) : 0;
+                $item['transactions_percentage'] = $totalTransactions > 0 ? round(($item['transactions'] / $totalTransactions) * 100, 2) : 0;
+                return $item;
             });
 
             // Get top products
-            // ✅ FIX: Use paid_at from payments table instead of created_at
-            $topProducts = DB::table('order_items')
-                ->join('orders', 'order_items.order_id', '=', 'orders.id')
-                ->leftJoin('payments', function($join) {
-                    $join->on('orders.id', '=', 'payments.order_id')
-                         ->whereIn('payments.status', ['success', 'paid', 'settlement', 'capture']);
-                })
-                ->where(function($q) use ($dateRange) {
-                    $q->whereBetween(DB::raw('COALESCE(payments.paid_at, orders.created_at)'), [$dateRange['start'], $dateRange['end']]);
-                })
-                ->whereIn('orders.status', ['completed', 'confirmed', 'preparing', 'ready'])
-                ->when($businessId, function ($query) use ($businessId) {
-                    return $query->where('orders.business_id', $businessId);
-                })
-                ->when($outletId, function ($query) use ($outletId) {
-                    return $query->where('orders.outlet_id', $outletId);
-                })
-                ->selectRaw('
-                    order_items.product_name,
-                    SUM(order_items.subtotal) as sales,
-                    SUM(order_items.quantity) as quantity_sold,
-                    COUNT(DISTINCT orders.id) as order_count
-                ')
-                ->groupBy('order_items.product_name')
-                ->orderBy('sales', 'desc')
-                ->limit(10)
-                ->get()
+            $topProducts = $rollups->aggregate('product', ['product_id'], $businessId, $outletId, $rangeStart, $rangeEnd)
+                ->sortByDesc('total')
+                ->take(10)
                 ->map(function ($item) {
                     return [
-                        'name' => $item->product_name,
-                        'sales' => (float) $item->sales,
-                        'quantity_sold' => (int) $item->quantity_sold,
-                        'order_count' => (int) $item->order_count
+                        'name' => $item['product_name'],
+                        'sales' => (float) $item['total'],
+                        'quantity_sold' => (int) $item['quantity'],
+                        'order_count' => (int) $item['orders_count']
                     ];
                 });
 
@@ -1840,26 +1580,9 @@ private function calculateGrowthPercentage($currentData, $chartType, $dateRange,
             $previousStart = $dateRange['start']->copy()->subDays($periodLength + 1);
             $previousEnd = $dateRange['start']->copy()->subDay();
 
-            // ✅ FIX: Use paid_at from payments table instead of created_at
-            $previousQuery = DB::table('orders')
-                ->leftJoin('payments', function($join) {
-                    $join->on('orders.id', '=', 'payments.order_id')
-                         ->whereIn('payments.status', ['success', 'paid', 'settlement', 'capture']);
-                })
-                ->where(function($q) use ($previousStart, $previousEnd) {
-                    $q->whereBetween(DB::raw('COALESCE(payments.paid_at, orders.created_at)'), [$previousStart, $previousEnd]);
-                })
-                ->whereIn('orders.status', ['completed', 'confirmed', 'preparing', 'ready']);
-
-            if ($businessId) {
-                $previousQuery->where('orders.business_id', $businessId);
-            }
-
-            if ($outletId) {
-                $previousQuery->where('orders.outlet_id', $outletId);
-            }
-
-            $previousTotal = $previousQuery->sum('orders.total');
+            $previousTotal = (float) (app(SalesRollupService::class)
+                ->aggregate('order', [], $businessId, $outletId, $previousStart, $previousEnd)
+                ->first()['total'] ?? 0);
 
             if ($previousTotal > 0) {
                 return round((($currentTotal - $previousTotal) / $previousTotal) * 100, 2);
@@ -1976,14 +1699,15 @@ public function exportProductSales(Request $request, $format = null)
             }
             
             if ($search) {
-                $query->where(function($q) use ($search) {
-                    $q->where('products.name', 'like', '%' . $search . '%')
+                $matches = app(ProductSearchService::class)->search($businessId, $search);
+                $query->where(function($q) use ($search, $matches) {
+                    $q->whereIn('products.id', $matches)
                       ->orWhere('categories.name', 'like', '%' . $search . '%');
                 });
             }
             
             // Get product sales with grouping
-            $products = $query->select([
+            $query->select([
                     'products.id as product_id',
                     'products.name as product_name',
                     DB::raw('COALESCE(categories.name, "Tanpa Kategori") as category_name'),
@@ -1993,72 +1717,70 @@ public function exportProductSales(Request $request, $format = null)
                     DB::raw('COUNT(DISTINCT order_items.order_id) as order_count')
                 ])
                 ->groupBy('products.id', 'products.name', 'categories.id', 'categories.name')
-                ->orderBy($sortBy, $sortOrder)
-                ->get();
-            
-            // Calculate summary
-            $totalRevenue = $products->sum('total_revenue');
-            $totalQuantity = $products->sum('total_quantity');
-            $totalProducts = $products->count();
-            
-            // Get outlet data
-            $outlet = null;
-            if ($outletId) {
-                try {
-                    $outlet = Outlet::find($outletId);
-                } catch (\Exception $e) {
-                    Log::warning('Export product sales - Failed to load outlet', [
-                        'outlet_id' => $outletId,
-                        'error' => $e->getMessage()
-                    ]);
-                }
+                ->orderBy($sortBy, $sortOrder);
+
+            // Handle CSV and Excel formats: stream grouped rows with a cursor
+            if ($format === 'csv' || $format === 'excel') {
+                return $this->streamCsvExport('product_sales_report', $format, function ($write) use ($query) {
+                    $write("Nama Produk,Kategori,Total Terjual,Total Pendapatan,Rata-rata Harga,Jumlah Order\n");
+
+                    $totalRevenue = 0;
+                    $totalQuantity = 0;
+                    $totalProducts = 0;
+
+                    foreach ($query->cursor() as $product) {
+                        $write(sprintf(
+                            "%s,%s,%s,%s,%s,%s\n",
+                            $product->product_name,
+                            $product->category_name,
+                            number_format($product->total_quantity, 0, ',', '.'),
+                            number_format($product->total_revenue, 0, ',', '.'),
+                            number_format($product->avg_price, 0, ',', '.'),
+                            $product->order_count
+                        ));
+
+                        $totalRevenue += $product->total_revenue;
+                        $totalQuantity += $product->total_quantity;
+                        $totalProducts++;
+                    }
+
+                    // Add summary row
+                    $write("\n");
+                    $write("RINGKASAN\n");
+                    $write("Total Produk," . $totalProducts . "\n");
+                    $write("Total Terjual," . number_format($totalQuantity, 0, ',', '.') . "\n");
+                    $write("Total Pendapatan," . number_format($totalRevenue, 0, ',', '.') . "\n");
+                });
             }
-            
+
             // Handle PDF format
             if ($format === 'pdf') {
+                $products = $query->get();
+
+                // Get outlet data
+                $outlet = null;
+                if ($outletId) {
+                    try {
+                        $outlet = Outlet::find($outletId);
+                    } catch (\Exception $e) {
+                        Log::warning('Export product sales - Failed to load outlet', [
+                            'outlet_id' => $outletId,
+                            'error' => $e->getMessage()
+                        ]);
+                    }
+                }
+
                 $html = $this->generateProductSalesPDF($products, $dateRange, [
-                    'totalProducts' => $totalProducts,
-                    'totalRevenue' => $totalRevenue,
-                    'totalQuantity' => $totalQuantity,
+                    'totalProducts' => $products->count(),
+                    'totalRevenue' => $products->sum('total_revenue'),
+                    'totalQuantity' => $products->sum('total_quantity'),
                 ], $outlet);
-                
+
                 return response($html)
                     ->header('Content-Type', 'text/html; charset=UTF-8')
                     ->header('Content-Disposition', 'inline; filename="product_sales_report_' . date('Y-m-d') . '.html"');
             }
-            
-            // Handle CSV and Excel formats
-            if ($format === 'csv' || $format === 'excel') {
-                $csv = "Nama Produk,Kategori,Total Terjual,Total Pendapatan,Rata-rata Harga,Jumlah Order\n";
-                foreach ($products as $product) {
-                    $csv .= sprintf(
-                        "%s,%s,%s,%s,%s,%s\n",
-                        $product->product_name,
-                        $product->category_name,
-                        number_format($product->total_quantity, 0, ',', '.'),
-                        number_format($product->total_revenue, 0, ',', '.'),
-                        number_format($product->avg_price, 0, ',', '.'),
-                        $product->order_count
-                    );
-                }
-                
-                // Add summary row
-                $csv .= "\n";
-                $csv .= "RINGKASAN\n";
-                $csv .= "Total Produk," . $totalProducts . "\n";
-                $csv .= "Total Terjual," . number_format($totalQuantity, 0, ',', '.') . "\n";
-                $csv .= "Total Pendapatan," . number_format($totalRevenue, 0, ',', '.') . "\n";
-                
-                $extension = $format === 'csv' ? 'csv' : 'xlsx';
-                $contentType = $format === 'csv' 
-                    ? 'text/csv' 
-                    : 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet';
-                
-                return response($csv)
-                    ->header('Content-Type', $contentType)
-                    ->header('Content-Disposition', 'attachment; filename="product_sales_report_' . date('Y-m-d') . '.' . $extension . '"');
-            }
-            
+
             return response()->json([
                 'success' => false,
                 'message' => 'Format not supported: ' . $format
@@ -2265,7 +1987,7 @@ public function exportCategorySales(Request $request, $format = null)
             }
             
             // Get category sales with grouping
-            $categories = $query->select([
+            $query->select([
                     DB::raw('COALESCE(categories.id, 0) as category_id'),
                     DB::raw('COALESCE(categories.name, "Tanpa Kategori") as category_name'),
                     DB::raw('COUNT(DISTINCT products.id) as product_count'),
@@ -2275,75 +1997,74 @@ public function exportCategorySales(Request $request, $format = null)
                     DB::raw('COUNT(DISTINCT order_items.order_id) as order_count')
                 ])
                 ->groupBy('categories.id', 'categories.name')
-                ->orderBy($sortBy, $sortOrder)
-                ->get();
-            
-            // Calculate summary
-            $totalRevenue = $categories->sum('total_revenue');
-            $totalQuantity = $categories->sum('total_quantity');
-            $totalCategories = $categories->count();
-            $totalProducts = $categories->sum('product_count');
-            
-            // Get outlet data
-            $outlet = null;
-            if ($outletId) {
-                try {
-                    $outlet = Outlet::find($outletId);
-                } catch (\Exception $e) {
-                    Log::warning('Export category sales - Failed to load outlet', [
-                        'outlet_id' => $outletId,
-                        'error' => $e->getMessage()
-                    ]);
-                }
+                ->orderBy($sortBy, $sortOrder);
+
+            // Handle CSV and Excel formats: stream grouped rows with a cursor
+            if ($format === 'csv' || $format === 'excel') {
+                return $this->streamCsvExport('category_sales_report', $format, function ($write) use ($query) {
+                    $write("Kategori,Jumlah Produk,Total Terjual,Total Pendapatan,Rata-rata Harga,Jumlah Order\n");
+
+                    $totalRevenue = 0;
+                    $totalQuantity = 0;
+                    $totalCategories = 0;
+                    $totalProducts = 0;
+
+                    foreach ($query->cursor() as $category) {
+                        $write(sprintf(
+                            "%s,%s,%s,%s,%s,%s\n",
+                            $category->category_name,
+                            $category->product_count,
+                            number_format($category->total_quantity, 0, ',', '.'),
+                            number_format($category->total_revenue, 0, ',', '.'),
+                            number_format($category->avg_price, 0, ',', '.'),
+                            $category->order_count
+                        ));
+
+                        $totalRevenue += $category->total_revenue;
+                        $totalQuantity += $category->total_quantity;
+                        $totalProducts += $category->product_count;
+                        $totalCategories++;
+                    }
+
+                    // Add summary row
+                    $write("\n");
+                    $write("RINGKASAN\n");
+                    $write("Total Kategori," . $totalCategories . "\n");
+                    $write("Total Produk," . $totalProducts . "\n");
+                    $write("Total Terjual," . number_format($totalQuantity, 0, ',', '.') . "\n");
+                    $write("Total Pendapatan," . number_format($totalRevenue, 0, ',', '.') . "\n");
+                });
             }
-            
+
             // Handle PDF format
             if ($format === 'pdf') {
+                $categories = $query->get();
+
+                // Get outlet data
+                $outlet = null;
+                if ($outletId) {
+                    try {
+                        $outlet = Outlet::find($outletId);
+                    } catch (\Exception $e) {
+                        Log::warning('Export category sales - Failed to load outlet', [
+                            'outlet_id' => $outletId,
+                            'error' => $e->getMessage()
+                        ]);
+                    }
+                }
+
                 $html = $this->generateCategorySalesPDF($categories, $dateRange, [
-                    'totalCategories' => $totalCategories,
-                    'totalProducts' => $totalProducts,
-                    'totalRevenue' => $totalRevenue,
-                    'totalQuantity' => $totalQuantity,
+                    'totalCategories' => $categories->count(),
+                    'totalProducts' => $categories->sum('product_count'),
+                    'totalRevenue' => $categories->sum('total_revenue'),
+                    'totalQuantity' => $categories->sum('total_quantity'),
                 ], $outlet);
-                
+
                 return response($html)
                     ->header('Content-Type', 'text/html; charset=UTF-8')
                     ->header('Content-Disposition', 'inline; filename="category_sales_report_' . date('Y-m-d') . '.html"');
             }
-            
-            // Handle CSV and Excel formats
-            if ($format === 'csv' || $format === 'excel') {
-                $csv = "Kategori,Jumlah Produk,Total Terjual,Total Pendapatan,Rata-rata Harga,Jumlah Order\n";
-                foreach ($categories as $category) {
-                    $csv .= sprintf(
-                        "%s,%s,%s,%s,%s,%s\n",
-                        $category->category_name,
-                        $category->product_count,
-                        number_format($category->total_quantity, 0, ',', '.'),
-                        number_format($category->total_revenue, 0, ',', '.'),
-                        number_format($category->avg_price, 0, ',', '.'),
-                        $category->order_count
-                    );
-                }
-                
-                // Add summary row
-                $csv .= "\n";
-                $csv .= "RINGKASAN\n";
-                $csv .= "Total Kategori," . $totalCategories . "\n";
-                $csv .= "Total Produk," . $totalProducts . "\n";
-                $csv .= "Total Terjual," . number_format($totalQuantity, 0, ',', '.') . "\n";
-                $csv .= "Total Pendapatan," . number_format($totalRevenue, 0, ',', '.') . "\n";
-                
-                $extension = $format === 'csv' ? 'csv' : 'xlsx';
-                $contentType = $format === 'csv' 
-                    ? 'text/csv' 
-                    : 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet';
-                
-                return response($csv)
-                    ->header('Content-Type', $contentType)
-                    ->header('Content-Disposition', 'attachment; filename="category_sales_report_' . date('Y-m-d') . '.' . $extension . '"');
-            }
-            
+
             return response()->json([
                 'success' => false,
                 'message' => 'Format not supported: ' . $format
@@ -2608,9 +2329,9 @@ public function exportInventoryStatus(Request $request, $format = 'excel')
 
             // Apply filters
             if ($search) {
-                $query->where(function($q) use ($search) {
-                    $q->where('products.name', 'like', "%{$search}%")
-                      ->orWhere('products.sku', 'like', "%{$search}%")
+                $matches = app(ProductSearchService::class)->search($businessId, $search);
+                $query->where(function($q) use ($search, $matches) {
+                    $q->whereIn('products.id', $matches)
                       ->orWhere('categories.name', 'like', "%{$search}%");
                 });
             }
@@ -3089,130 +2810,17 @@ public function exportCashierPerformance(Request $request, $format = null)
                 throw new \Exception('Invalid date range: ' . $dateError->getMessage());
             }
             
-            // Get cashier performance data (similar to CashierPerformanceController)
-            $employeeUserIds = \App\Models\Employee::where('business_id', $businessId)
-                ->pluck('user_id')
-                ->toArray();
-            
-            if (empty($employeeUserIds)) {
-                return response()->json([
-                    'success' => false,
-                    'message' => 'Tidak ada data kasir untuk diekspor'
-                ], 404);
-            }
-            
-            // Build query for cashiers
-            $cashiersQuery = \App\Models\User::whereIn('id', $employeeUserIds)
-                ->where('role', 'kasir');
-            
-            // Filter by outlet if provided
-            if ($outletId) {
-                $outletUserIds = DB::table('employee_outlets')
-                    ->where('outlet_id', $outletId)
-                    ->where('business_id', $businessId)
-                    ->pluck('user_id')
-                    ->toArray();
-                
-                if (!empty($outletUserIds)) {
-                    $filteredUserIds = array_intersect($employeeUserIds, $outletUserIds);
-                    if (!empty($filteredUserIds)) {
-                        $cashiersQuery->whereIn('id', $filteredUserIds);
-                    } else {
-                        return response()->json([
-                            'success' => false,
-                            'message' => 'Tidak ada data kasir untuk diekspor'
-                        ], 404);
-                    }
-                }
-            }
-            
-            $cashiers = $cashiersQuery->get();
-            
-            if ($cashiers->isEmpty()) {
+            // Same aggregation as CashierPerformanceController (constant number of queries)
+            $performanceData = app(CashierPerformanceService::class)
+                ->analytics($businessId, $startDate, $endDate, $outletId);
+
+            if (empty($performanceData)) {
                 return response()->json([
                     'success' => false,
                     'message' => 'Tidak ada data kasir untuk diekspor'
                 ], 404);
             }
             
-            $performanceData = [];
-            
-            foreach ($cashiers as $cashier) {
-                // Get employee_id for this cashier
-                $employee = \App\Models\Employee::where('user_id', $cashier->id)
-                    ->where('business_id', $businessId)
-                    ->first();
-                
-                if (!$employee) {
-                    continue;
-                }
-                
-                // Get orders handled by this cashier
-                $orders = \App\Models\Order::where('business_id', $businessId)
-                    ->where('employee_id', $employee->id)
-                    ->whereBetween('created_at', [$startDate, $endDate])
-                    ->whereIn('status', ['completed', 'confirmed', 'preparing', 'ready'])
-                    ->whereNull('deleted_at')
-                    ->when($outletId, function ($query) use ($outletId) {
-                        return $query->where('outlet_id', $outletId);
-                    });
-                
-                $totalOrders = $orders->count();
-                $totalRevenue = $orders->sum('total') ?? 0;
-                $avgOrderValue = $totalOrders > 0 && $totalRevenue > 0 ? $totalRevenue / $totalOrders : 0;
-                
-                // Get session data
-                $sessions = \App\Models\CashierShift::where('business_id', $businessId)
-                    ->where('user_id', $cashier->id)
-                    ->whereBetween('opened_at', [$startDate, $endDate])
-                    ->whereNull('deleted_at')
-                    ->when($outletId, function ($query) use ($outletId) {
-                        return $query->where('outlet_id', $outletId);
-                    });
-                
-                $totalSessions = $sessions->count();
-                $totalSessionHours = 0;
-                try {
-                    $totalSessionHours = $sessions->get()->sum(function ($session) {
-                        if (!$session->opened_at) {
-                            return 0;
-                        }
-                        $closedAt = $session->closed_at ?? \Carbon\Carbon::now();
-                        return $session->opened_at->diffInHours($closedAt);
-                    });
-                } catch (\Exception $e) {
-                    $totalSessionHours = 0;
-                }
-                
-                $effectiveSessionHours = $totalSessionHours > 0 ? $totalSessionHours : 1;
-                $ordersPerHour = $totalOrders / $effectiveSessionHours;
-                $revenuePerHour = $totalRevenue / $effectiveSessionHours;
-                
-                // Calculate performance score
-                $orderScore = min($totalOrders * 0.1, 50);
-                $revenueScore = min($totalRevenue / 1000000 * 30, 30);
-                $efficiencyScore = min($ordersPerHour * 2, 20);
-                $performanceScore = round($orderScore + $revenueScore + $efficiencyScore, 2);
-                
-                $performanceData[] = [
-                    'cashier_name' => $cashier->name,
-                    'cashier_email' => $cashier->email,
-                    'total_orders' => $totalOrders,
-                    'total_revenue' => $totalRevenue,
-                    'avg_order_value' => round($avgOrderValue, 2),
-                    'total_sessions' => $totalSessions,
-                    'total_session_hours' => round($totalSessionHours, 2),
-                    'orders_per_hour' => round($ordersPerHour, 2),
-                    'revenue_per_hour' => round($revenuePerHour, 2),
-                    'performance_score' => $performanceScore,
-                ];
-            }
-            
-            // Sort by performance score
-            usort($performanceData, function ($a, $b) {
-                return $b['performance_score'] <=> $a['performance_score'];
-            });
-            
             // Generate CSV/Excel content
             if ($format === 'csv' || $format === 'excel') {
                 $csv = "Nama Kasir,Email,Total Order,Total Pendapatan,Rata-rata Order,Total Sesi,Total Jam Sesi,Order per Jam,Pendapatan per Jam,Skor Performa\n";
@@ -3594,40 +3202,35 @@ public function exportCommission(Request $request, $format = null)
                 ->groupBy('employees.id', 'employees.employee_code', 'employees.commission_rate', 'users.name', 'users.email')
                 ->orderBy('total_commission', 'desc');
             
-            $commissionData = $query->get();
-            
-            if ($commissionData->isEmpty()) {
+            if (!(clone $query)->exists()) {
                 return response()->json([
                     'success' => false,
                     'message' => 'Tidak ada data komisi untuk diekspor'
                 ], 404);
             }
             
-            // Generate CSV/Excel content
+            // Stream CSV/Excel content with a cursor
             if ($format === 'csv' || $format === 'excel') {
-                $csv = "Kode Karyawan,Nama Karyawan,Email,Tingkat Komisi (%),Total Order,Total Penjualan,Total Komisi\n";
-                
-                foreach ($commissionData as $data) {
-                    $csv .= sprintf(
-                        "%s,%s,%s,%s,%s,%s,%s\n",
-                        $data->employee_code,
-                        $data->employee_name,
-                        $data->employee_email,
-                        number_format($data->commission_rate, 2, ',', '.'),
-                        $data->total_orders,
-                        number_format($data->total_sales, 0, ',', '.'),
-                        number_format($data->total_commission, 0, ',', '.')
-                    );
-                }
-                
-                $extension = $format === 'csv' ? 'csv' : 'xlsx';
-                $contentType = $format === 'csv' ? 'text/csv' : 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet';
-                
-                return response($csv)
-                    ->header('Content-Type', $contentType)
-                    ->header('Content-Disposition', 'attachment; filename="commission_report_' . date('Y-m-d') . '.' . $extension . '"');
+                return $this->streamCsvExport('commission_report', $format, function ($write) use ($query) {
+                    $write("Kode Karyawan,Nama Karyawan,Email,Tingkat Komisi (%),Total Order,Total Penjualan,Total Komisi\n");
+
+                    foreach ($query->cursor() as $data) {
+                        $write(sprintf(
+                            "%s,%s,%s,%s,%s,%s,%s\n",
+                            $data->employee_code,
+                            $data->employee_name,
+                            $data->employee_email,
+                            number_format($data->commission_rate, 2, ',', '.'),
+                            $data->total_orders,
+                            number_format($data->total_sales, 0, ',', '.'),
+                            number_format($data->total_commission, 0, ',', '.')
+                        ));
+                    }
+                });
             }
             
+            $commissionData = $query->get();
+            
             // Get outlet data
             $outlet = null;
             $outletId = $request->header('X-Outlet-Id');
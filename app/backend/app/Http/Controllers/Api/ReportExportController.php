@@ -0,0 +1,205 @@
+<?php
+
+namespace App\Http\Controllers\Api;
+
+use App\Helpers\SubscriptionHelper;
+use App\Http\Controllers\Controller;
+use App\Models\ReportExport;
+use App\Services\ReportExportService;
+use Illuminate\Http\Request;
+use Illuminate\Support\Facades\DB;
+use Illuminate\Support\Facades\Log;
+use Illuminate\Support\Facades\Validator;
+
+class ReportExportController extends Controller
+{
+    public function __construct(private ReportExportService $exports)
+    {
+    }
+
+    /**
+     * Enqueue a background export (or return the identical one already queued/finished)
+     */
+    public function store(Request $request)
+    {
+        $user = $request->user();
+
+        if (!SubscriptionHelper::hasAdvancedReports($user)) {
+            return response()->json([
+                'success' => false,
+                'message' => 'Akses laporan advanced memerlukan paket Professional atau lebih tinggi. Silakan upgrade paket Anda.',
+                'error' => 'subscription_feature_required',
+                'required_feature' => 'has_advanced_reports',
+                'redirect_to' => '/subscription-plans'
+            ], 403);
+        }
+
+        $validator = Validator::make($request->all(), [
+            'type' => 'required|string|in:' . implode(',', config('reports.exports.types', [])),
+            'format' => 'nullable|string|in:pdf',
+        ]);
+
+        if ($validator->fails()) {
+            return response()->json([
+                'success' => false,
+                'message' => 'Validation failed',
+                'errors' => $validator->errors()
+            ], 422);
+        }
+
+        $businessId = $request->header('X-Business-Id');
+        if (!$businessId) {
+            return response()->json([
+                'success' => false,
+                'message' => 'Business ID is required'
+            ], 400);
+        }
+
+        if (!$this->belongsToBusiness($user, $businessId)) {
+            return response()->json([
+                'success' => false,
+                'message' => 'You do not have access to this business'
+            ], 403);
+        }
+
+        $outletId = $request->header('X-Outlet-Id');
+        if ($outletId && !DB::table('outlets')->where('id', $outletId)->where('business_id', $businessId)->exists()) {
+            return response()->json([
+                'success' => false,
+                'message' => 'Outlet not found for this business'
+            ], 403);
+        }
+
+        try {
+            $export = $this->exports->request(
+                $user,
+                $businessId,
+                $outletId,
+                $request->input('type'),
+                $request->input('format', 'pdf'),
+                $request->except(['type', 'format'])
+            );
+
+            return response()->json([
+                'success' => true,
+                'data' => $this->present($export),
+            ], $export->status === 'completed' ? 200 : 202);
+        } catch (\Exception $e) {
+            Log::error('ReportExportController: Failed to enqueue export', [
+                'type' => $request->input('type'),
+                'error' => $e->getMessage(),
+            ]);
+
+            return response()->json([
+                'success' => false,
+                'message' => 'Gagal membuat export laporan: ' . $e->getMessage()
+            ], 500);
+        }
+    }
+
+    /**
+     * Poll the status of an export
+     */
+    public function show(Request $request, $id)
+    {
+        $export = $this->findExport($request, $id);
+
+        if (!$export) {
+            return response()->json([
+                'success' => false,
+                'message' => 'Export not found'
+            ], 404);
+        }
+
+        return response()->json([
+            'success' => true,
+            'data' => $this->present($export),
+        ]);
+    }
+
+    /**
+     * Download the cached artifact of a completed export
+     */
+    public function download(Request $request, $id)
+    {
+        $export = $this->findExport($request, $id);
+
+        if (!$export) {
+            return response()->json([
+                'success' => false,
+                'message' => 'Export not found'
+            ], 404);
+        }
+
+        if ($export->status === 'completed' && !$export->hasArtifact()) {
+            // Artifact was pruned or lost: generate it again from the stored params
+            $this->exports->requeue($export);
+        }
+
+        if ($export->status !== 'completed') {
+            return response()->json([
+                'success' => $export->status !== 'failed',
+                'message' => $export->status === 'failed' ? ($export->error ?? 'Export failed') : 'Export is not ready yet',
+                'data' => $this->present($export),
+            ], $export->status === 'failed' ? 422 : 202);
+        }
+
+        $filename = str_replace('-', '_', $export->type) . '_report_' . $export->created_at->format('Y-m-d') . '.' . pathinfo($export->file_path, PATHINFO_EXTENSION);
+        $contentType = $export->format === 'pdf' ? 'text/html; charset=UTF-8' : 'text/csv; charset=UTF-8';
+
+        return ReportExport::disk()->response($export->file_path, $filename, [
+            'Content-Type' => $contentType,
+            'Cache-Control' => 'private, max-age=300',
+        ], $export->format === 'pdf' ? 'inline' : 'attachment');
+    }
+
+    /**
+     * Export of the user, or of a business the user owns / works for
+     */
+    private function findExport(Request $request, $id)
+    {
+        $user = $request->user();
+        $businessId = $request->header('X-Business-Id');
+        $memberOf = $businessId && $this->belongsToBusiness($user, $businessId) ? $businessId : null;
+
+        return ReportExport::where('uuid', $id)
+            ->where(function ($q) use ($user, $memberOf) {
+                $q->where('user_id', $user->id);
+                if ($memberOf) {
+                    $q->orWhere('business_id', $memberOf);
+                }
+            })
+            ->first();
+    }
+
+    /**
+     * Whether the user owns the business or is an active employee of it
+     */
+    private function belongsToBusiness($user, $businessId)
+    {
+        if ($user->role === 'super_admin') {
+            return true;
+        }
+
+        if ($user->ownedBusinesses()->where('id', $businessId)->exists()) {
+            return true;
+        }
+
+        return DB::table('employees')
+            ->where('user_id', $user->id)
+            ->where('business_id', $businessId)
+            ->where('is_active', true)
+            ->whereNull('deleted_at')
+            ->exists();
+    }
+
+    private function present(ReportExport $export)
+    {
+        return array_merge($export->toApiArray(), [
+            'status_url' => url("/api/v1/reports/exports/{$export->uuid}"),
+            'download_url' => $export->status === 'completed'
+                ? url("/api/v1/reports/exports/{$export->uuid}/download")
+                : null,
+        ]);
+    }
+}
@@ -9,6 +9,7 @@
 use App\Models\Customer;
 use App\Models\OrderItem;
 use App\Models\Product;
+use App\Services\SalesRollupService;
 use Carbon\Carbon;
 use Illuminate\Support\Facades\DB;
 use Illuminate\Support\Facades\Log;
@@ -267,24 +268,11 @@ public function getStats(Request $request): JsonResponse
 
             // Calculate additional stats for dashboard
             // ✅ FIX: Gunakan logic yang sama dengan calculateStats - hitung berdasarkan waktu pembayaran
-            $totalItems = OrderItem::whereHas('order', function($query) use ($businessId, $startDate, $endDate, $employeeId, $user, $outletId, $activeShift) {
+            // Rollup-backed stats already include the item count
+            $totalItems = $currentStats['total_items'] ?? OrderItem::whereHas('order', function($query) use ($businessId, $startDate, $endDate, $employeeId, $user, $outletId, $activeShift) {
                 $query->where('business_id', $businessId)
                       ->where('payment_status', 'paid') // ✅ Hanya order yang sudah dibayar
-                      ->where(function ($q) use ($startDate, $endDate) {
-                          // 1) Order dibuat dalam rentang tanggal
-                          $q->whereBetween('created_at', [$startDate, $endDate])
-                            // 2) Order yang sudah dibayar dalam rentang tanggal
-                            ->orWhere(function ($qq) use ($startDate, $endDate) {
-                                $qq->where('payment_status', 'paid')
-                                   ->orWhereIn('status', ['completed'])
-                                   ->whereBetween('updated_at', [$startDate, $endDate]);
-                            })
-                            // 3) Order yang dibayar dalam rentang tanggal (dari payments table)
-                            ->orWhereHas('payments', function ($p) use ($startDate, $endDate) {
-                                $p->whereIn('status', ['success', 'paid', 'settlement', 'capture'])
-                                  ->whereBetween(DB::raw('COALESCE(paid_at, created_at)'), [$startDate, $endDate]);
-                            });
-                      })
+                      ->recognizedBetween($startDate, $endDate) // ✅ Waktu pembayaran (orders.recognized_at)
                       ->whereIn('status', ['completed', 'confirmed', 'preparing', 'ready']); // ✅ PERBAIKAN: Include more statuses
 
                 // ✅ Filter outlet jika tersedia
@@ -554,25 +542,8 @@ public function getOrders(Request $request): JsonResponse
 
                 // PERBAIKAN: Jangan hanya pakai created_at. Order yang dibuat kemarin
                 // tetapi dibayar hari ini harus tetap muncul di transaksi "Hari Ini".
-                // Kita gabungkan 3 kriteria tanggal:
-                // 1) created_at di rentang tanggal (default)
-                // 2) updated_at di rentang tanggal untuk order yang sudah paid/completed
-                // 3) paid_at/created_at dari tabel payments di rentang tanggal
-                $start = $dateRange['start'];
-                $end = $dateRange['end'];
-
-                $query->where(function ($q) use ($start, $end) {
-                    $q->whereBetween('created_at', [$start, $end])
-                      ->orWhere(function ($qq) use ($start, $end) {
-                          $qq->where('payment_status', 'paid')
-                             ->orWhereIn('status', ['completed'])
-                             ->whereBetween('updated_at', [$start, $end]);
-                      })
-                      ->orWhereHas('payments', function ($p) use ($start, $end) {
-                          $p->whereIn('status', ['success', 'paid', 'settlement', 'capture'])
-                            ->whereBetween(DB::raw('COALESCE(paid_at, created_at)'), [$start, $end]);
-                      });
-                });
+                // orders.recognized_at = pembayaran valid pertama, atau created_at jika belum ada pembayaran
+                $query->recognizedBetween($dateRange['start'], $dateRange['end']);
             }
 
             // Apply sorting
@@ -1269,6 +1240,19 @@ public function exportData(Request $request, $type): JsonResponse
         }
     }
 
+    /**
+     * Whether stats are limited to the active shift or the logged-in cashier
+     * (same conditions calculateStats uses to filter by shift_id / employee_id)
+     */
+    private function hasCashierScope($user, $employeeId = null, $activeShift = null): bool
+    {
+        if ($activeShift && $activeShift->id && $activeShift->status === 'open') {
+            return true;
+        }
+
+        return in_array($user->role, ['kasir', 'kitchen', 'waiter']) && $employeeId !== null;
+    }
+
     /**
      * Calculate stats for given date range
      */
@@ -1279,26 +1263,27 @@ private function calculateStats(Carbon $startDate, Carbon $endDate, $businessId
             $businessId = $this->getBusinessIdForUser($user);
         }
 
+        // ✅ PERFORMANCE: Tanpa filter shift/kasir, baca dari daily_sales_rollups
+        // (hari sebelumnya dari rollup, hari ini dihitung live dengan aturan yang sama)
+        if (!$this->hasCashierScope($user, $employeeId, $activeShift)) {
+            $totals = app(SalesRollupService::class)->totals($businessId, $outletId, $startDate, $endDate);
+            $ordersCount = (int) $totals['orders_count'];
+
+            return [
+                'total_orders' => $ordersCount,
+                'total_revenue' => (float) $totals['total'],
+                'avg_order_value' => $ordersCount > 0 ? $totals['total'] / $ordersCount : 0,
+                'active_customers' => (int) $totals['customers_count'],
+                'total_items' => (int) $totals['quantity'],
+            ];
+        }
+
         // ✅ FIX: Gunakan waktu pembayaran sebagai kriteria utama untuk statistik
         // Hanya hitung order yang benar-benar dibayar dalam rentang tanggal yang diminta
-        // Prioritas: 1) paid_at dari payments table (paling akurat), 2) created_at jika tidak ada payment record (untuk cash payment)
+        // orders.recognized_at: 1) pembayaran valid pertama (COALESCE(paid_at, created_at) dari payments), 2) created_at jika tidak ada payment record (untuk cash payment)
         $baseQuery = Order::where('business_id', $businessId)
             ->where('payment_status', 'paid') // ✅ Hanya order yang sudah dibayar
-            ->where(function ($q) use ($startDate, $endDate) {
-                // ✅ FIX: Prioritas 1 - Order yang dibayar dalam rentang tanggal (dari payments table - paling akurat)
-                // Ini adalah kriteria utama - jika order punya payment record, gunakan paid_at sebagai waktu pembayaran
-                $q->whereHas('payments', function ($p) use ($startDate, $endDate) {
-                      $p->whereIn('status', ['success', 'paid', 'settlement', 'capture'])
-                        ->whereBetween(DB::raw('COALESCE(paid_at, created_at)'), [$startDate, $endDate]);
-                })
-                // ✅ FIX: Prioritas 2 - Order yang dibuat dalam rentang tanggal DAN sudah dibayar DAN tidak punya payment record
-                // (untuk order cash yang dibayar langsung saat dibuat, tidak ada payment record)
-                ->orWhere(function ($qq) use ($startDate, $endDate) {
-                    $qq->whereBetween('created_at', [$startDate, $endDate])
-                       ->where('payment_status', 'paid')
-                       ->whereDoesntHave('payments'); // ✅ Hanya order yang tidak punya payment record
-                });
-            })
+            ->recognizedBetween($startDate, $endDate)
             ->whereIn('status', ['completed', 'confirmed', 'preparing', 'ready']); // ✅ Hanya status yang dianggap selesai
 
         // ✅ Filter outlet jika tersedia
@@ -11,6 +11,8 @@
 use App\Models\Discount;
 use App\Models\Payment;
 use App\Services\MidtransService;
+use App\Services\OrderEventService;
+use App\Services\PublicMenuService;
 use Illuminate\Http\Request;
 use Illuminate\Support\Facades\Validator;
 use Illuminate\Support\Facades\DB;
@@ -117,13 +119,10 @@ private function getOutletData($order)
         return null;
     }
 
-    public function getMenu($tableQr)
+    public function getMenu(Request $request, $tableQr)
     {
-        // Log the incoming request
-        \Log::info('Self-Service Menu Request', ['qr_code' => $tableQr]);
-
         // Find table by QR code
-        $table = Table::where('qr_code', $tableQr)->first();
+        $table = Table::with('outlet')->where('qr_code', $tableQr)->first();
 
         if (!$table) {
             \Log::warning('Table not found', ['qr_code' => $tableQr]);
@@ -133,33 +132,9 @@ public function getMenu($tableQr)
             ], 404);
         }
 
-        \Log::info('Table found', [
-            'qr_code' => $tableQr,
-            'table_id' => $table->id,
-            'table_name' => $table->name,
-            'status' => $table->status
-        ]);
-
         // Get outlet info
         $outlet = $table->outlet;
 
-        // ✅ NEW: Check if self-service is enabled for this outlet
-        if (!$outlet || !$outlet->self_service_enabled) {
-            \Log::warning('Self-service disabled for outlet', [
-                'outlet_id' => $outlet->id ?? null,
-                'outlet_name' => $outlet->name ?? null,
-                'self_service_enabled' => $outlet->self_service_enabled ?? false,
-            ]);
-            return response()->json([
-                'success' => false,
-                'message' => 'Self Service tidak diaktifkan untuk outlet ini. Silakan hubungi administrator.'
-            ], 403);
-        }
-
-        // ✅ NEW: Track scan setiap kali menu diakses
-        $table->increment('scan_count');
-        $table->update(['last_scan_at' => now()]);
-
         if (!$outlet) {
             \Log::error('Outlet not found for table', ['table_id' => $table->id]);
             return response()->json([
@@ -168,103 +143,31 @@ public function getMenu($tableQr)
             ], 404);
         }
 
-        // Get active products for this business with categories and images
-        $products = Product::with('category')
-            ->where('business_id', $outlet->business_id)
-            ->where('is_active', true)
-            ->get()
-            ->map(function ($product) {
-                // Add image URL (handle both old and new format)
-                if ($product->image) {
-                    // Remove 'storage/' prefix if exists (old format)
-                    $imagePath = str_replace('storage/', '', $product->image);
-                    $product->image_url = asset('storage/' . $imagePath);
-                } else {
-                    $product->image_url = null;
-                }
-                return $product;
-            });
-
-        // Get unique categories
-        $categories = $products->pluck('category')->filter()->unique('id')->values();
-
-        // ✅ NEW: Check if Midtrans is enabled for this outlet
-        $midtransEnabled = false;
-        try {
-            // Method 1: Check outlet custom config
-            if ($outlet->hasCustomMidtransConfig()) {
-                $config = $outlet->payment_gateway_config;
-                if (isset($config['midtrans'])) {
-                    $midtransConfig = $config['midtrans'];
-                    
-                    // Check if enabled
-                    if (isset($midtransConfig['enabled']) && $midtransConfig['enabled'] === true) {
-                        // Try to get server_key (might be encrypted)
-                        $serverKey = $midtransConfig['server_key'] ?? '';
-                        if (!empty($serverKey)) {
-                            // Try to decrypt if encrypted
-                            if (strpos($serverKey, 'eyJpdiI6') === 0) {
-                                try {
-                                    $serverKey = decrypt($serverKey);
-                                } catch (\Exception $e) {
-                                    // If decryption fails, use as is (might be plain text)
-                                    \Log::warning('Failed to decrypt server_key in self-service check', [
-                                        'outlet_id' => $outlet->id
-                                    ]);
-                                }
-                            }
-                            
-                            $clientKey = $midtransConfig['client_key'] ?? '';
-                            
-                            // Check if both keys are present
-                            if (!empty($serverKey) && !empty($clientKey)) {
-                                $midtransEnabled = true;
-                                \Log::info('Midtrans enabled for outlet (custom config)', [
-                                    'outlet_id' => $outlet->id,
-                                    'outlet_name' => $outlet->name
-                                ]);
-                            }
-                        }
-                    }
-                }
-            } else {
-                // Method 2: Check business-level config
-                $business = $outlet->business;
-                if ($business && $business->hasCustomMidtransConfig()) {
-                    $config = $business->midtrans_config;
-                    if (isset($config['enabled']) && $config['enabled'] === true) {
-                        $serverKey = $config['server_key'] ?? '';
-                        $clientKey = $config['client_key'] ?? '';
-                        
-                        if (!empty($serverKey) && !empty($clientKey)) {
-                            $midtransEnabled = true;
-                            \Log::info('Midtrans enabled for outlet (business config)', [
-                                'outlet_id' => $outlet->id,
-                                'business_id' => $business->id
-                            ]);
-                        }
-                    }
-                }
-            }
-        } catch (\Exception $e) {
-            \Log::warning('Error checking Midtrans config in self-service', [
+        // ✅ NEW: Check if self-service is enabled for this outlet
+        if (!$outlet->self_service_enabled) {
+            \Log::warning('Self-service disabled for outlet', [
                 'outlet_id' => $outlet->id,
-                'error' => $e->getMessage(),
-                'trace' => $e->getTraceAsString()
+                'outlet_name' => $outlet->name,
+                'self_service_enabled' => $outlet->self_service_enabled,
             ]);
+            return response()->json([
+                'success' => false,
+                'message' => 'Self Service tidak diaktifkan untuk outlet ini. Silakan hubungi administrator.'
+            ], 403);
         }
 
-        \Log::info('Menu loaded successfully', [
-            'qr_code' => $tableQr,
-            'products_count' => $products->count(),
-            'categories_count' => $categories->count(),
-            'midtrans_enabled' => $midtransEnabled
-        ]);
+        // ✅ Track scan setiap kali menu diakses (buffered, flushed by selfservice:flush-scans)
+        $menu = app(PublicMenuService::class);
+        $menu->recordScan($table->id);
 
-        return response()->json([
-            'success' => true,
-            'message' => 'Menu berhasil dimuat',
-            'data' => [
+        // ✅ Menu snapshot per outlet; revalidated with ETag (no max-age so every scan is counted)
+        $version = $menu->version($outlet);
+        $etag = $menu->etag($version, 'table', $table->id, optional($table->updated_at)->getTimestamp());
+
+        return $menu->respond($request, $etag, function () use ($menu, $outlet, $table, $version) {
+            $snapshot = $menu->snapshot($outlet, $version);
+
+            return $menu->body([
                 'table' => [
                     'id' => $table->id,
                     'name' => $table->name,
@@ -273,16 +176,14 @@ public function getMenu($tableQr)
                     'status' => $table->status,
                 ],
                 'outlet' => [
-                    'id' => $outlet->id,
-                    'name' => $outlet->name,
-                    'tax_rate' => $outlet->getEffectiveTaxRate(),
+                    'id' => $snapshot['outlet']['id'],
+                    'name' => $snapshot['outlet']['name'],
+                    'tax_rate' => $snapshot['outlet']['tax_rate'],
                 ],
                 'outlet_id' => $outlet->id, // ✅ NEW: Include outlet_id for frontend
-                'midtrans_enabled' => $midtransEnabled, // ✅ NEW: Include Midtrans status
-                'products' => $products,
-                'categories' => $categories,
-            ]
-        ]);
+                'midtrans_enabled' => $snapshot['midtrans_enabled'], // ✅ NEW: Include Midtrans status
+            ], $snapshot);
+        }, 0);
     }
 
     public function placeOrder(Request $request, $tableQr)
@@ -488,6 +389,9 @@ public function placeOrder(Request $request, $tableQr)
 
             DB::commit();
 
+            // Push the new order to the outlet's kitchen/waiter/kasir screens
+            app(OrderEventService::class)->publish($order, OrderEventService::CREATED);
+
             return response()->json([
                 'success' => true,
                 'message' => 'Pesanan berhasil dibuat',
@@ -895,10 +799,8 @@ public function getOrderStatus($orderNumber)
     /**
      * Get menu by outlet slug (New user-friendly method)
      */
-    public function getMenuByOutlet($outletSlug)
+    public function getMenuByOutlet(Request $request, $outletSlug)
     {
-        \Log::info('Public Menu Request by Outlet', ['outlet_slug' => $outletSlug]);
-
         // Find outlet by slug
         $outlet = Outlet::where('slug', $outletSlug)
             ->where('is_active', true)
@@ -925,54 +827,15 @@ public function getMenuByOutlet($outletSlug)
             ], 403);
         }
 
-        \Log::info('Outlet found', [
-            'outlet_id' => $outlet->id,
-            'outlet_name' => $outlet->name,
-            'business_id' => $outlet->business_id
-        ]);
+        // ✅ Same menu snapshot as the table QR menu
+        $menu = app(PublicMenuService::class);
+        $version = $menu->version($outlet);
 
-        // Get active products for this business with categories and images
-        $products = Product::with('category')
-            ->where('business_id', $outlet->business_id)
-            ->where('is_active', true)
-            ->get()
-            ->map(function ($product) {
-                // Add image URL (handle both old and new format)
-                if ($product->image) {
-                    // Remove 'storage/' prefix if exists (old format)
-                    $imagePath = str_replace('storage/', '', $product->image);
-                    $product->image_url = asset('storage/' . $imagePath);
-                } else {
-                    $product->image_url = null;
-                }
-                return $product;
-            });
-
-        // Get unique categories
-        $categories = $products->pluck('category')->filter()->unique('id')->values();
-
-        \Log::info('Menu loaded successfully', [
-            'outlet_slug' => $outletSlug,
-            'products_count' => $products->count(),
-            'categories_count' => $categories->count()
-        ]);
+        return $menu->respond($request, $menu->etag($version, 'outlet'), function () use ($menu, $outlet, $version) {
+            $snapshot = $menu->snapshot($outlet, $version);
 
-        return response()->json([
-            'success' => true,
-            'message' => 'Menu berhasil dimuat',
-            'data' => [
-                'outlet' => [
-                    'id' => $outlet->id,
-                    'name' => $outlet->name,
-                    'slug' => $outlet->slug,
-                    'address' => $outlet->address ?? null,
-                    'phone' => $outlet->phone ?? null,
-                    'tax_rate' => $outlet->getEffectiveTaxRate(),
-                ],
-                'products' => $products,
-                'categories' => $categories,
-            ]
-        ]);
+            return $menu->body(['outlet' => $snapshot['outlet']], $snapshot);
+        });
     }
 
     /**
@@ -1182,6 +1045,9 @@ public function placeOrderByOutlet(Request $request, $outletSlug)
 
             DB::commit();
 
+            // Push the new order to the outlet's kitchen/waiter/kasir screens
+            app(OrderEventService::class)->publish($order, OrderEventService::CREATED);
+
             \Log::info('Order created successfully', [
                 'order_number' => $orderNumber,
                 'outlet_slug' => $outletSlug,
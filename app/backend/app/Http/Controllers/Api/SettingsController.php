@@ -107,11 +107,7 @@ public function getReceiptFooterMessage(Request $request)
                 ], 404);
             }
 
-            $setting = OutletSetting::where('outlet_id', $outletId)
-                ->where('setting_key', 'receipt_footer_message')
-                ->first();
-
-            $message = $setting ? $setting->setting_value : '';
+            $message = (string) $outlet->getSetting('receipt_footer_message', '');
 
             return response()->json([
                 'success' => true,
@@ -0,0 +1,35 @@
+<?php
+
+namespace App\Http\Middleware;
+
+use App\Logging\RequestLog;
+use Closure;
+use Illuminate\Http\Request;
+use Symfony\Component\HttpFoundation\Response;
+
+class AssignRequestContext
+{
+    /**
+     * Tag the request's log records (request id, business, outlet, route),
+     * decide sampling and echo the request id back as X-Request-Id.
+     *
+     * @param  \Closure(\Illuminate\Http\Request): (\Symfony\Component\HttpFoundation\Response)  $next
+     */
+    public function handle(Request $request, Closure $next): Response
+    {
+        $requestId = app(RequestLog::class)->start($request);
+
+        $response = $next($request);
+        $response->headers->set('X-Request-Id', $requestId);
+
+        return $response;
+    }
+
+    /**
+     * Write the request's buffered log records once the response has been sent
+     */
+    public function terminate(Request $request, Response $response): void
+    {
+        app(RequestLog::class)->flush();
+    }
+}
@@ -0,0 +1,108 @@
+<?php
+
+namespace App\Jobs;
+
+use App\Services\PayrollService;
+use Illuminate\Bus\Queueable;
+use Illuminate\Contracts\Queue\ShouldQueue;
+use Illuminate\Foundation\Bus\Dispatchable;
+use Illuminate\Queue\InteractsWithQueue;
+use Illuminate\Queue\SerializesModels;
+use Illuminate\Support\Facades\Cache;
+use Illuminate\Support\Facades\Log;
+
+class GeneratePayrolls implements ShouldQueue
+{
+    use Dispatchable, InteractsWithQueue, Queueable, SerializesModels;
+
+    /**
+     * The number of times the job may be attempted (the engine is idempotent per period).
+     */
+    public $tries = 2;
+
+    /**
+     * Month-end runs for large businesses can take a while.
+     */
+    public $timeout = 900;
+
+    /**
+     * Seconds the progress entry is kept
+     */
+    public const PROGRESS_TTL = 86400;
+
+    public function __construct(
+        public int $businessId,
+        public int $year,
+        public int $month,
+        public array $options = [],
+    ) {
+    }
+
+    /**
+     * Cache key of the progress of a business/period
+     */
+    public static function progressKey($businessId, $year, $month)
+    {
+        return "payroll_generation:{$businessId}:{$year}-{$month}";
+    }
+
+    /**
+     * Mark a run as queued (called when dispatching, so the status is visible right away)
+     */
+    public static function markQueued($businessId, $year, $month)
+    {
+        Cache::put(self::progressKey($businessId, $year, $month), [
+            'status' => 'queued',
+            'done' => 0,
+            'total' => null,
+            'count' => 0,
+            'updated_at' => now()->toIso8601String(),
+        ], self::PROGRESS_TTL);
+    }
+
+    public function handle(PayrollService $payrolls)
+    {
+        $key = self::progressKey($this->businessId, $this->year, $this->month);
+
+        $payrollIds = $payrolls->generateBulk(
+            $this->businessId,
+            $this->year,
+            $this->month,
+            $this->options,
+            function ($done, $total) use ($key) {
+                Cache::put($key, [
+                    'status' => 'running',
+                    'done' => $done,
+                    'total' => $total,
+                    'count' => 0,
+                    'updated_at' => now()->toIso8601String(),
+                ], self::PROGRESS_TTL);
+            }
+        );
+
+        $progress = Cache::get($key, []);
+        Cache::put($key, [
+            'status' => 'completed',
+            'done' => $progress['total'] ?? 0,
+            'total' => $progress['total'] ?? 0,
+            'count' => count($payrollIds),
+            'updated_at' => now()->toIso8601String(),
+        ], self::PROGRESS_TTL);
+    }
+
+    public function failed(\Throwable $e)
+    {
+        Log::error('GeneratePayrolls: Payroll generation failed', [
+            'business_id' => $this->businessId,
+            'year' => $this->year,
+            'month' => $this->month,
+            'error' => $e->getMessage(),
+        ]);
+
+        Cache::put(self::progressKey($this->businessId, $this->year, $this->month), [
+            'status' => 'failed',
+            'error' => $e->getMessage(),
+            'updated_at' => now()->toIso8601String(),
+        ], self::PROGRESS_TTL);
+    }
+}
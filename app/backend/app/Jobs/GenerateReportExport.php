@@ -0,0 +1,60 @@
+<?php
+
+namespace App\Jobs;
+
+use App\Models\ReportExport;
+use App\Services\ReportExportService;
+use Illuminate\Bus\Queueable;
+use Illuminate\Contracts\Queue\ShouldQueue;
+use Illuminate\Foundation\Bus\Dispatchable;
+use Illuminate\Queue\InteractsWithQueue;
+use Illuminate\Queue\SerializesModels;
+use Illuminate\Support\Facades\Log;
+
+class GenerateReportExport implements ShouldQueue
+{
+    use Dispatchable, InteractsWithQueue, Queueable, SerializesModels;
+
+    /**
+     * The number of times the job may be attempted.
+     */
+    public $tries = 3;
+
+    /**
+     * Seconds to wait before retrying (large reports may hit transient DB errors).
+     */
+    public $backoff = [30, 120];
+
+    /**
+     * Large PDF reports can take a while to render.
+     */
+    public $timeout = 600;
+
+    public function __construct(public int $exportId)
+    {
+    }
+
+    public function handle(ReportExportService $exports)
+    {
+        $export = ReportExport::find($this->exportId);
+
+        // Pruned or deleted while waiting in the queue
+        if (!$export) {
+            return;
+        }
+
+        $exports->generate($export);
+    }
+
+    public function failed(\Throwable $e)
+    {
+        Log::error('GenerateReportExport: Export failed', [
+            'export_id' => $this->exportId,
+            'error' => $e->getMessage(),
+        ]);
+
+        if ($export = ReportExport::find($this->exportId)) {
+            app(ReportExportService::class)->markFailed($export, $e->getMessage());
+        }
+    }
+}
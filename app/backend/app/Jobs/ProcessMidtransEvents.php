@@ -0,0 +1,74 @@
+<?php
+
+namespace App\Jobs;
+
+use App\Models\MidtransEvent;
+use App\Services\MidtransWebhookService;
+use Illuminate\Bus\Queueable;
+use Illuminate\Contracts\Queue\ShouldQueue;
+use Illuminate\Foundation\Bus\Dispatchable;
+use Illuminate\Queue\InteractsWithQueue;
+use Illuminate\Queue\Middleware\WithoutOverlapping;
+use Illuminate\Queue\SerializesModels;
+use Illuminate\Support\Facades\Log;
+
+class ProcessMidtransEvents implements ShouldQueue
+{
+    use Dispatchable, InteractsWithQueue, Queueable, SerializesModels;
+
+    /**
+     * Apply failures allowed before the job gives up; releases while another
+     * worker holds the order lock do not count (see retryUntil).
+     */
+    public $maxExceptions;
+
+    public $timeout = 120;
+
+    /**
+     * @param string $orderKey MidtransEvent order_key ("order:{id}" / "subscription:{id}")
+     */
+    public function __construct(public string $orderKey)
+    {
+        $this->maxExceptions = (int) config('midtrans.webhook.max_attempts', 5);
+    }
+
+    /**
+     * One worker per order at a time, so events of an order are applied in sequence.
+     */
+    public function middleware()
+    {
+        return [(new WithoutOverlapping($this->orderKey))->releaseAfter(2)->expireAfter(180)];
+    }
+
+    public function backoff()
+    {
+        return [5, 15, 60, 180];
+    }
+
+    public function retryUntil()
+    {
+        return now()->addHours(6);
+    }
+
+    public function handle(MidtransWebhookService $service)
+    {
+        // Pick up every pending event of the order, oldest first: a job
+        // dispatched for a later event may run before the earlier one's job
+        $events = MidtransEvent::where('order_key', $this->orderKey)
+            ->pending()
+            ->orderBy('id')
+            ->get();
+
+        foreach ($events as $event) {
+            $service->apply($event);
+        }
+    }
+
+    public function failed(\Throwable $e)
+    {
+        Log::error('ProcessMidtransEvents: Giving up on order events', [
+            'order_key' => $this->orderKey,
+            'error' => $e->getMessage(),
+        ]);
+    }
+}
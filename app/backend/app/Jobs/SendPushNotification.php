@@ -0,0 +1,62 @@
+<?php
+
+namespace App\Jobs;
+
+use App\Models\AppNotification;
+use App\Services\NotificationService;
+use Illuminate\Bus\Queueable;
+use Illuminate\Contracts\Queue\ShouldQueue;
+use Illuminate\Foundation\Bus\Dispatchable;
+use Illuminate\Queue\InteractsWithQueue;
+use Illuminate\Queue\SerializesModels;
+use Illuminate\Support\Facades\Cache;
+use Illuminate\Support\Facades\Log;
+
+class SendPushNotification implements ShouldQueue
+{
+    use Dispatchable, InteractsWithQueue, Queueable, SerializesModels;
+
+    /**
+     * The number of times the job may be attempted.
+     */
+    public $tries = 3;
+
+    /**
+     * Seconds to wait before retrying (push services may be briefly unavailable).
+     */
+    public $backoff = [10, 60];
+
+    /**
+     * Large outlets can have many devices; pooled sends are bounded by the HTTP timeout.
+     */
+    public $timeout = 120;
+
+    public function __construct(public int $notificationId, public ?string $coalesceKey = null)
+    {
+    }
+
+    public function handle(NotificationService $notifications)
+    {
+        // A newer notification about the same resource replaced this one
+        if ($this->coalesceKey && (int) Cache::get($this->coalesceKey) !== $this->notificationId) {
+            $notifications->recordMetrics(['coalesced' => 1]);
+            return;
+        }
+
+        $notification = AppNotification::find($this->notificationId);
+
+        if (!$notification) {
+            return;
+        }
+
+        $notifications->sendPushNotification($notification);
+    }
+
+    public function failed(\Throwable $e)
+    {
+        Log::error('SendPushNotification: Push delivery failed', [
+            'notification_id' => $this->notificationId,
+            'error' => $e->getMessage(),
+        ]);
+    }
+}
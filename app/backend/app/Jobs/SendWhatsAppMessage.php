@@ -0,0 +1,81 @@
+<?php
+
+namespace App\Jobs;
+
+use App\Models\WhatsappMessage;
+use App\Services\WhatsAppService;
+use Illuminate\Bus\Queueable;
+use Illuminate\Contracts\Queue\ShouldQueue;
+use Illuminate\Foundation\Bus\Dispatchable;
+use Illuminate\Queue\InteractsWithQueue;
+use Illuminate\Queue\Middleware\RateLimited;
+use Illuminate\Queue\SerializesModels;
+use Illuminate\Support\Facades\Log;
+
+class SendWhatsAppMessage implements ShouldQueue
+{
+    use Dispatchable, InteractsWithQueue, Queueable, SerializesModels;
+
+    /**
+     * Provider failures allowed before the message is marked failed.
+     * Releases by the per-outlet rate limiter do not count (see retryUntil).
+     */
+    public $maxExceptions;
+
+    /**
+     * Provider calls are bounded by the HTTP timeout of each failover channel.
+     */
+    public $timeout = 120;
+
+    public function __construct(public int $messageId, public ?int $outletId = null)
+    {
+        $this->maxExceptions = (int) config('whatsapp.queue.max_attempts', 5);
+    }
+
+    /**
+     * Per-outlet rate limit (RateLimiter 'whatsapp' in AppServiceProvider).
+     */
+    public function middleware()
+    {
+        return [new RateLimited('whatsapp')];
+    }
+
+    /**
+     * Exponential backoff between provider failures: base, x3, x9, ...
+     */
+    public function backoff()
+    {
+        $base = max(1, (int) config('whatsapp.queue.backoff_base', 10));
+
+        return array_map(fn ($attempt) => $base * (3 ** $attempt), range(0, 4));
+    }
+
+    public function retryUntil()
+    {
+        return now()->addHours((int) config('whatsapp.queue.retry_hours', 6));
+    }
+
+    public function handle()
+    {
+        $message = WhatsappMessage::with('outlet')->find($this->messageId);
+
+        if (!$message || $message->status === 'sent') {
+            return;
+        }
+
+        (new WhatsAppService($message->outlet))->deliver($message);
+    }
+
+    public function failed(\Throwable $e)
+    {
+        Log::error('SendWhatsAppMessage: Delivery failed', [
+            'whatsapp_message_id' => $this->messageId,
+            'outlet_id' => $this->outletId,
+            'error' => $e->getMessage(),
+        ]);
+
+        WhatsappMessage::where('id', $this->messageId)
+            ->where('status', '!=', 'sent')
+            ->update(['status' => 'failed', 'last_error' => mb_substr($e->getMessage(), 0, 2000)]);
+    }
+}
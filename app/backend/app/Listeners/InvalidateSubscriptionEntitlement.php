@@ -0,0 +1,25 @@
+<?php
+
+namespace App\Listeners;
+
+use App\Events\SubscriptionCreated;
+use App\Events\SubscriptionPaid;
+use App\Helpers\SubscriptionHelper;
+
+class InvalidateSubscriptionEntitlement
+{
+    /**
+     * Drop cached entitlement snapshots as soon as a subscription changes.
+     * Runs synchronously so the next request already sees the new state.
+     */
+    public function handle(SubscriptionCreated|SubscriptionPaid $event): void
+    {
+        $subscription = $event instanceof SubscriptionPaid
+            ? $event->payment->userSubscription
+            : $event->subscription;
+
+        if ($subscription) {
+            SubscriptionHelper::forgetEntitlement($subscription->user_id);
+        }
+    }
+}
@@ -0,0 +1,56 @@
+<?php
+
+namespace App\Logging;
+
+use Monolog\Handler\StreamHandler;
+
+/**
+ * StreamHandler that writes a batch of records (a flushed request buffer)
+ * with a single write instead of one write per record.
+ */
+class BatchStreamHandler extends StreamHandler
+{
+    /**
+     * Same stream, level, formatter and processors as an existing StreamHandler
+     * (null for handlers opened on a resource)
+     */
+    public static function from(StreamHandler $handler): ?self
+    {
+        if ($handler->getUrl() === null) {
+            return null;
+        }
+
+        $batch = new self($handler->getUrl(), $handler->getLevel(), $handler->getBubble(), $handler->filePermission, $handler->useLocking);
+        $batch->setFormatter($handler->getFormatter());
+
+        // pushProcessor() prepends: push in reverse to keep the order
+        foreach (array_reverse($handler->processors) as $processor) {
+            $batch->pushProcessor($processor);
+        }
+
+        return $batch;
+    }
+
+    public function handleBatch(array $records): void
+    {
+        $formatted = '';
+        $last = null;
+
+        foreach ($records as $record) {
+            if (!$this->isHandling($record)) {
+                continue;
+            }
+
+            if (\count($this->processors) > 0) {
+                $record = $this->processRecord($record);
+            }
+
+            $formatted .= $this->getFormatter()->format($record);
+            $last = $record;
+        }
+
+        if ($last !== null) {
+            $this->write($last->with(formatted: $formatted));
+        }
+    }
+}
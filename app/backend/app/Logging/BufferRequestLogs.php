@@ -0,0 +1,41 @@
+<?php
+
+namespace App\Logging;
+
+use Illuminate\Log\Logger;
+use Monolog\Handler\StreamHandler;
+use Monolog\LogRecord;
+
+/**
+ * Channel tap (logging.channels.*.tap): sampling, per-request buffering
+ * (RequestLogHandler) and the authenticated user_id on every record.
+ */
+class BufferRequestLogs
+{
+    public function __invoke(Logger $logger)
+    {
+        $monolog = $logger->getLogger();
+        $limit = (int) config('logging.request.buffer_limit', 200);
+
+        $monolog->setHandlers(array_map(function ($handler) use ($limit) {
+            if ($handler instanceof RequestLogHandler) {
+                return $handler;
+            }
+
+            // Plain file / stream handlers write a flushed buffer at once
+            if (get_class($handler) === StreamHandler::class) {
+                $handler = BatchStreamHandler::from($handler) ?? $handler;
+            }
+
+            return new RequestLogHandler($handler, $limit);
+        }, $monolog->getHandlers()));
+
+        $monolog->pushProcessor(function (LogRecord $record) {
+            if (isset($record->extra['user_id']) || !app()->resolved('auth') || !auth()->hasUser()) {
+                return $record;
+            }
+
+            return $record->with(extra: $record->extra + ['user_id' => auth()->id()]);
+        });
+    }
+}
@@ -0,0 +1,99 @@
+<?php
+
+namespace App\Logging;
+
+use Illuminate\Http\Request;
+use Illuminate\Support\Facades\Context;
+use Illuminate\Support\Str;
+
+/**
+ * Logging state of the current request (scoped: one instance per request / job).
+ *
+ * start() tags every log record of the request with request_id, business_id,
+ * outlet_id and route (Laravel Context, added to the record's extra) and
+ * decides once whether the request is sampled: info/debug records of an
+ * unsampled request are dropped, warnings and errors are always written.
+ * While a request is active, RequestLogHandler buffers its records and
+ * flush() (AssignRequestContext::terminate) writes them in one go.
+ */
+class RequestLog
+{
+    protected $active = false;
+
+    protected $sampled = true;
+
+    protected $requestId;
+
+    /**
+     * Start logging a request. Returns its request id (X-Request-Id, or a new uuid).
+     */
+    public function start(Request $request)
+    {
+        $requestId = (string) $request->header('X-Request-Id');
+        $this->requestId = preg_match('/^[A-Za-z0-9._-]{8,64}$/', $requestId) ? $requestId : (string) Str::uuid();
+
+        $this->active = (bool) config('logging.request.buffer', true);
+        $this->sampled = $this->sample($request);
+
+        Context::add(array_filter([
+            'request_id' => $this->requestId,
+            'business_id' => $request->header('X-Business-Id'),
+            'outlet_id' => $request->header('X-Outlet-Id'),
+            'route' => $request->method() . ' ' . $request->path(),
+        ]));
+
+        return $this->requestId;
+    }
+
+    /**
+     * Whether info/debug records of this request are kept
+     */
+    public function sampled()
+    {
+        return $this->sampled;
+    }
+
+    /**
+     * Whether records are buffered until the end of the request
+     */
+    public function buffering()
+    {
+        return $this->active;
+    }
+
+    public function requestId()
+    {
+        return $this->requestId;
+    }
+
+    /**
+     * Write the buffered records (end of request)
+     */
+    public function flush()
+    {
+        RequestLogHandler::flushAll();
+
+        $this->active = false;
+    }
+
+    /**
+     * Sample rate of the first matching logging.request.sample_routes pattern (else sample_rate)
+     */
+    private function sample(Request $request)
+    {
+        $rate = (float) config('logging.request.sample_rate', 1.0);
+
+        foreach (config('logging.request.sample_routes', []) as $pattern => $routeRate) {
+            if ($request->is($pattern)) {
+                $rate = (float) $routeRate;
+                break;
+            }
+        }
+
+        if ($rate >= 1) {
+            return true;
+        }
+
+        return $rate > 0 && mt_rand() / mt_getrandmax() < $rate;
+    }
+}
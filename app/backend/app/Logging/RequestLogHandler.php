@@ -0,0 +1,72 @@
+<?php
+
+namespace App\Logging;
+
+use Monolog\Handler\AbstractHandler;
+use Monolog\Handler\BufferHandler;
+use Monolog\Handler\HandlerInterface;
+use Monolog\Level;
+use Monolog\LogRecord;
+
+/**
+ * Wraps a channel handler (see BufferRequestLogs):
+ * - drops info/debug records of requests that are not sampled
+ * - buffers records while a request is active and hands them to the wrapped
+ *   handler as one batch when the request ends (or when the buffer is full)
+ * - flushes right away after an error, so it is never held back
+ *
+ * Outside a request (console, queue workers) records are written directly.
+ */
+class RequestLogHandler extends BufferHandler
+{
+    /**
+     * Records from this level on are always written
+     */
+    public const ALWAYS = Level::Warning;
+
+    /**
+     * @var \WeakMap<self, true>
+     */
+    private static $instances;
+
+    public function __construct(HandlerInterface $handler, int $bufferLimit = 200)
+    {
+        $level = $handler instanceof AbstractHandler ? $handler->getLevel() : Level::Debug;
+
+        parent::__construct($handler, $bufferLimit, $level, true, true);
+
+        self::$instances ??= new \WeakMap();
+        self::$instances[$this] = true;
+    }
+
+    public function handle(LogRecord $record): bool
+    {
+        $log = app(RequestLog::class);
+
+        if ($record->level->isLowerThan(self::ALWAYS) && !$log->sampled()) {
+            return false;
+        }
+
+        if (!$log->buffering()) {
+            return $this->handler->isHandling($record) ? $this->handler->handle($record) : false;
+        }
+
+        $handled = parent::handle($record);
+
+        if (!$record->level->isLowerThan(Level::Error)) {
+            $this->flush();
+        }
+
+        return $handled;
+    }
+
+    /**
+     * Flush every buffering handler (end of request)
+     */
+    public static function flushAll()
+    {
+        foreach (self::$instances ?? [] as $handler => $registered) {
+            $handler->flush();
+        }
+    }
+}
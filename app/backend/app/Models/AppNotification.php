@@ -31,7 +31,7 @@ class AppNotification extends Model
     ];
 
     /**
-     * ✅ SECURITY: Auto-send push notification when notification is created
+     * ✅ SECURITY: Auto-queue push notification when notification is created
      * Only if role_targets is specified (not for user-specific notifications)
      */
     protected static function booted()
@@ -40,11 +40,11 @@ protected static function booted()
             // Only send push if role_targets is specified (not user-specific)
             if ($notification->role_targets && is_array($notification->role_targets) && count($notification->role_targets) > 0) {
                 try {
-                    $service = new NotificationService();
-                    $service->sendPushNotification($notification);
+                    // ✅ Delivered by the push queue worker, not inside the request
+                    app(NotificationService::class)->queuePushNotification($notification);
                 } catch (\Exception $e) {
                     // Log error but don't fail notification creation
-                    \Log::error('Failed to send push notification on create', [
+                    \Log::error('Failed to queue push notification on create', [
                         'notification_id' => $notification->id,
                         'error' => $e->getMessage()
                     ]);
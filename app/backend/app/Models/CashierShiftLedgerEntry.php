@@ -0,0 +1,40 @@
+<?php
+
+namespace App\Models;
+
+use Illuminate\Database\Eloquent\Model;
+
+class CashierShiftLedgerEntry extends Model
+{
+    protected $fillable = [
+        'cashier_shift_id',
+        'order_id',
+        'total',
+        'cash',
+        'card',
+        'transfer',
+        'qris',
+        'cash_transactions',
+        'card_transactions',
+        'transfer_transactions',
+        'qris_transactions',
+    ];
+
+    protected $casts = [
+        'total' => 'decimal:2',
+        'cash' => 'decimal:2',
+        'card' => 'decimal:2',
+        'transfer' => 'decimal:2',
+        'qris' => 'decimal:2',
+    ];
+
+    public function shift()
+    {
+        return $this->belongsTo(CashierShift::class, 'cashier_shift_id');
+    }
+
+    public function order()
+    {
+        return $this->belongsTo(Order::class);
+    }
+}
@@ -0,0 +1,40 @@
+<?php
+
+namespace App\Models;
+
+use Illuminate\Database\Eloquent\Model;
+
+class MidtransEvent extends Model
+{
+    public const TYPE_ORDER = 'order';
+    public const TYPE_SUBSCRIPTION = 'subscription';
+
+    protected $fillable = [
+        'event_key',
+        'type',
+        'order_key',
+        'midtrans_order_id',
+        'transaction_id',
+        'transaction_status',
+        'fraud_status',
+        'status_code',
+        'gross_amount',
+        'target_id',
+        'payload',
+        'status',
+        'attempts',
+        'last_error',
+        'processed_at',
+    ];
+
+    protected $casts = [
+        'payload' => 'array',
+        'processed_at' => 'datetime',
+    ];
+
+    // Scopes
+    public function scopePending($query)
+    {
+        return $query->where('status', 'pending');
+    }
+}
@@ -2,8 +2,10 @@
 
 namespace App\Models;
 
+use App\Services\ShiftLedgerService;
 use Illuminate\Database\Eloquent\Model;
 use Illuminate\Database\Eloquent\SoftDeletes;
+use Illuminate\Support\Facades\DB;
 
 class Order extends Model
 {
@@ -12,7 +14,7 @@ class Order extends Model
      use SoftDeletes;
 
     protected $fillable = [
-        'order_number', 'receipt_token', 'business_id', 'outlet_id', 'customer_id',
+        'order_number', 'client_uuid', 'receipt_token', 'business_id', 'outlet_id', 'customer_id',
         'table_id', 'queue_number', 'employee_id', 'shift_id', 'type', 'status', 'subtotal',
         'tax_amount', 'discount_amount', 'discount_id', 'coupon_code', 'service_charge',
         'delivery_fee', 'total', 'paid_amount', 'change_amount',
@@ -30,6 +32,8 @@ class Order extends Model
         'paid_amount' => 'decimal:2',
         'change_amount' => 'decimal:2',
         'ordered_at' => 'datetime',
+        'paid_at' => 'datetime',
+        'recognized_at' => 'datetime',
     ];
 
     public function business()
@@ -95,6 +99,31 @@ public function discount()
         return $this->belongsTo(Discount::class, 'discount_id');
     }
 
+    /**
+     * Orders that count in [start, end]: paid within the range, or created
+     * within it when there is no payment record (recognized_at).
+     */
+    public function scopeRecognizedBetween($query, $start, $end)
+    {
+        return $query->whereBetween($query->qualifyColumn('recognized_at'), [$start, $end]);
+    }
+
+    /**
+     * Recompute paid_at/recognized_at of an order from its valid payments.
+     * Written without touching updated_at or firing order events.
+     */
+    public static function refreshPaidAt($orderId)
+    {
+        $paidAt = Payment::where('order_id', $orderId)
+            ->whereIn('status', ShiftLedgerService::VALID_PAYMENT_STATUSES)
+            ->min(DB::raw('COALESCE(paid_at, created_at)'));
+
+        DB::table('orders')->where('id', $orderId)->update([
+            'paid_at' => $paidAt,
+            'recognized_at' => $paidAt ?? DB::raw('created_at'),
+        ]);
+    }
+
     /**
      * Generate receipt token for public access
      */
@@ -150,11 +150,8 @@ public function getMidtransConfig(): array
         if ($this->payment_gateway_config && isset($this->payment_gateway_config['midtrans'])) {
             $outletConfig = $this->payment_gateway_config['midtrans'];
             
-            \Log::info('Outlet getMidtransConfig: Checking outlet config', [
+            \Log::channel('payment')->debug('Outlet getMidtransConfig: Checking outlet config', [
                 'outlet_id' => $this->id,
-                'outlet_name' => $this->name,
-                'has_payment_gateway_config' => !empty($this->payment_gateway_config),
-                'has_midtrans_config' => isset($this->payment_gateway_config['midtrans']),
                 'enabled' => $outletConfig['enabled'] ?? false,
             ]);
             
@@ -166,9 +163,10 @@ public function getMidtransConfig(): array
                     // Looks like encrypted, try to decrypt
                     try {
                         $serverKey = decrypt($serverKey);
-                        \Log::info('Outlet getMidtransConfig: Server key decrypted successfully');
+                        \Log::channel('payment')->debug('Outlet getMidtransConfig: Server key decrypted successfully');
                     } catch (\Exception $e) {
-                        \Log::warning('Outlet getMidtransConfig: Failed to decrypt server_key', [
+                        \Log::channel('payment')->warning('Outlet getMidtransConfig: Failed to decrypt server_key', [
+                            'outlet_id' => $this->id,
                             'error' => $e->getMessage(),
                         ]);
                         // If decryption fails, use as is (might be plain text)
@@ -177,15 +175,14 @@ public function getMidtransConfig(): array
                 
                 $clientKey = $outletConfig['client_key'] ?? '';
                 
-                \Log::info('Outlet getMidtransConfig: Validating keys', [
+                // Never log key material, only whether the keys are set
+                \Log::channel('payment')->debug('Outlet getMidtransConfig: Validating keys', [
                     'has_server_key' => !empty($serverKey),
                     'has_client_key' => !empty($clientKey),
-                    'server_key_prefix' => substr($serverKey, 0, 15),
-                    'client_key_prefix' => substr($clientKey, 0, 15),
                 ]);
                 
                 if (!empty($serverKey) && !empty($clientKey)) {
-                    \Log::info('Outlet getMidtransConfig: Using outlet custom config');
+                    \Log::channel('payment')->debug('Outlet getMidtransConfig: Using outlet custom config', ['outlet_id' => $this->id]);
                     return [
                         'server_key' => $serverKey,
                         'client_key' => $clientKey,
@@ -194,13 +191,13 @@ public function getMidtransConfig(): array
                         'is_3ds' => $outletConfig['is_3ds'] ?? true,
                     ];
                 } else {
-                    \Log::warning('Outlet getMidtransConfig: Outlet config enabled but keys are empty');
+                    \Log::channel('payment')->warning('Outlet getMidtransConfig: Outlet config enabled but keys are empty', ['outlet_id' => $this->id]);
                 }
             } else {
-                \Log::info('Outlet getMidtransConfig: Outlet config not enabled');
+                \Log::channel('payment')->debug('Outlet getMidtransConfig: Outlet config not enabled');
             }
         } else {
-            \Log::info('Outlet getMidtransConfig: No outlet payment_gateway_config found');
+            \Log::channel('payment')->debug('Outlet getMidtransConfig: No outlet payment_gateway_config found');
         }
 
         // 2. Fallback to business config
@@ -250,18 +247,19 @@ public function hasCustomMidtransConfig(): bool
 
     /**
      * Get outlet setting value
+     * ✅ Served from the outlet settings snapshot (one query per outlet, memoized per request)
      */
     public function getSetting($key, $default = null)
     {
-        $setting = \App\Models\OutletSetting::where('outlet_id', $this->id)
-            ->where('setting_key', $key)
-            ->first();
-        
-        if (!$setting) {
-            return $default;
-        }
-        
-        return $setting->getValueAttribute();
+        return app(\App\Services\OutletSettingsService::class)->get($this->id, $key, $default);
+    }
+
+    /**
+     * Get all outlet settings as [setting_key => value]
+     */
+    public function getSettings()
+    {
+        return app(\App\Services\OutletSettingsService::class)->all($this->id);
     }
 
     /**
@@ -5,6 +5,7 @@
 use Illuminate\Database\Eloquent\Factories\HasFactory;
 use Illuminate\Database\Eloquent\Model;
 use Illuminate\Database\Eloquent\Relations\BelongsTo;
+use App\Services\OutletSettingsService;
 
 class OutletSetting extends Model
 {
@@ -22,6 +23,20 @@ class OutletSetting extends Model
 
     public $timestamps = true;
 
+    /**
+     * Invalidate the outlet settings snapshot on every change
+     */
+    protected static function booted()
+    {
+        static::saved(function ($setting) {
+            app(OutletSettingsService::class)->forget($setting->outlet_id);
+        });
+
+        static::deleted(function ($setting) {
+            app(OutletSettingsService::class)->forget($setting->outlet_id);
+        });
+    }
+
     /**
      * Get the outlet that owns the setting.
      */
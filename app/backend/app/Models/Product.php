@@ -44,6 +44,11 @@ public function variants()
         return $this->hasMany(ProductVariant::class);
     }
 
+    public function barcodes()
+    {
+        return $this->hasMany(ProductBarcode::class);
+    }
+
     public function recipes()
     {
         return $this->hasMany(Recipe::class);
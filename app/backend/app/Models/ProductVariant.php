@@ -24,6 +24,11 @@ public function product()
         return $this->belongsTo(Product::class);
     }
 
+    public function barcodes()
+    {
+        return $this->hasMany(ProductBarcode::class);
+    }
+
     public function orderItems()
     {
         return $this->hasMany(OrderItem::class);
@@ -0,0 +1,114 @@
+<?php
+
+namespace App\Models;
+
+use Illuminate\Database\Eloquent\Model;
+use Illuminate\Support\Facades\Storage;
+
+class ReportExport extends Model
+{
+    protected $fillable = [
+        'uuid',
+        'business_id',
+        'outlet_id',
+        'user_id',
+        'type',
+        'format',
+        'params',
+        'fingerprint',
+        'status',
+        'file_path',
+        'file_size',
+        'attempts',
+        'error',
+        'started_at',
+        'completed_at',
+        'expires_at',
+    ];
+
+    protected $casts = [
+        'params' => 'array',
+        'started_at' => 'datetime',
+        'completed_at' => 'datetime',
+        'expires_at' => 'datetime',
+    ];
+
+    public function business()
+    {
+        return $this->belongsTo(Business::class);
+    }
+
+    public function outlet()
+    {
+        return $this->belongsTo(Outlet::class);
+    }
+
+    public function user()
+    {
+        return $this->belongsTo(User::class);
+    }
+
+    // Scopes
+    public function scopeExpired($query)
+    {
+        return $query->whereNotNull('expires_at')->where('expires_at', '<=', now());
+    }
+
+    /**
+     * Exports that can be reused for an identical request (in progress or still-valid artifact)
+     */
+    public function scopeReusable($query)
+    {
+        return $query->where(function ($q) {
+            $q->whereIn('status', ['pending', 'processing'])
+              ->orWhere(function ($q) {
+                  $q->where('status', 'completed')->where('expires_at', '>', now());
+              });
+        });
+    }
+
+    /**
+     * Build the deduplication fingerprint of an export request (per user: an
+     * export is only shared with the user who requested it)
+     */
+    public static function fingerprint($userId, $businessId, $outletId, $type, $format, array $params)
+    {
+        ksort($params);
+
+        return hash('sha256', json_encode([
+            (int) $userId,
+            (int) $businessId,
+            $outletId ? (int) $outletId : null,
+            $type,
+            $format,
+            $params,
+        ]));
+    }
+
+    public static function disk()
+    {
+        return Storage::disk(config('reports.exports.disk', 'local'));
+    }
+
+    public function hasArtifact()
+    {
+        return $this->status === 'completed'
+            && $this->file_path
+            && self::disk()->exists($this->file_path);
+    }
+
+    public function toApiArray()
+    {
+        return [
+            'id' => $this->uuid,
+            'type' => $this->type,
+            'format' => $this->format,
+            'status' => $this->status,
+            'file_size' => $this->file_size,
+            'error' => $this->error,
+            'created_at' => $this->created_at?->toIso8601String(),
+            'completed_at' => $this->completed_at?->toIso8601String(),
+            'expires_at' => $this->expires_at?->toIso8601String(),
+        ];
+    }
+}
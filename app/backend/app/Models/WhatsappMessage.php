@@ -0,0 +1,46 @@
+<?php
+
+namespace App\Models;
+
+use Illuminate\Database\Eloquent\Model;
+
+class WhatsappMessage extends Model
+{
+    public const TYPE_PAYMENT_RECEIPT = 'payment_receipt';
+    public const TYPE_CUSTOM = 'custom';
+
+    protected $fillable = [
+        'business_id',
+        'outlet_id',
+        'order_id',
+        'type',
+        'phone',
+        'message',
+        'status',
+        'provider',
+        'provider_message_id',
+        'attempts',
+        'last_error',
+        'sent_at',
+    ];
+
+    protected $casts = [
+        'sent_at' => 'datetime',
+    ];
+
+    public function outlet()
+    {
+        return $this->belongsTo(Outlet::class);
+    }
+
+    public function order()
+    {
+        return $this->belongsTo(Order::class);
+    }
+
+    // Scopes
+    public function scopePending($query)
+    {
+        return $query->whereIn('status', ['queued', 'sending']);
+    }
+}
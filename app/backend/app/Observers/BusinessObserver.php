@@ -4,6 +4,7 @@
 
 use App\Models\Business;
 use App\Models\Outlet;
+use App\Services\PublicMenuService;
 use Illuminate\Support\Str;
 
 class BusinessObserver
@@ -70,7 +71,10 @@ public function created(Business $business): void
      */
     public function updated(Business $business): void
     {
-        //
+        // Tax rate and Midtrans keys are part of the public menu snapshots
+        if ($business->wasChanged(['tax_rate', 'midtrans_config'])) {
+            app(PublicMenuService::class)->touch($business->id);
+        }
     }
 
     /**
@@ -0,0 +1,41 @@
+<?php
+
+namespace App\Observers;
+
+use App\Models\Category;
+use App\Services\PublicMenuService;
+
+class CategoryObserver
+{
+    /**
+     * Handle the Category "saved" event.
+     */
+    public function saved(Category $category): void
+    {
+        $this->touchMenu($category);
+    }
+
+    /**
+     * Handle the Category "deleted" event (soft delete).
+     */
+    public function deleted(Category $category): void
+    {
+        $this->touchMenu($category);
+    }
+
+    /**
+     * Handle the Category "restored" event.
+     */
+    public function restored(Category $category): void
+    {
+        $this->touchMenu($category);
+    }
+
+    /**
+     * Categories are embedded in the public menu snapshots of the business
+     */
+    private function touchMenu(Category $category)
+    {
+        app(PublicMenuService::class)->touch($category->business_id);
+    }
+}
@@ -0,0 +1,95 @@
+<?php
+
+namespace App\Observers;
+
+use App\Models\Order;
+use App\Services\KitchenQueueService;
+use App\Services\SalesRollupService;
+use Illuminate\Support\Facades\DB;
+
+class OrderObserver
+{
+    /**
+     * Columns that change what an order contributes to the daily sales rollups
+     */
+    private const ROLLUP_COLUMNS = [
+        'payment_status', 'status', 'total', 'subtotal', 'discount_amount',
+        'tax_amount', 'change_amount', 'customer_id', 'outlet_id',
+    ];
+
+    /**
+     * Handle the Order "creating" event.
+     *
+     * Until a payment lands (Order::refreshPaidAt) an order is dated by its creation.
+     */
+    public function creating(Order $order): void
+    {
+        $order->recognized_at ??= $order->created_at ?? $order->freshTimestamp();
+    }
+
+    /**
+     * Handle the Order "saving" event.
+     */
+    public function saving(Order $order): void
+    {
+        $order->kitchen_state = KitchenQueueService::stateOf($order);
+    }
+
+    /**
+     * Handle the Order "saved" event.
+     */
+    public function saved(Order $order): void
+    {
+        if ($order->wasRecentlyCreated ? $order->payment_status === 'paid' : $order->wasChanged(self::ROLLUP_COLUMNS)) {
+            $this->syncRollups($order);
+        }
+
+        // Any change to an order on (or leaving) the kitchen screens
+        if (($order->wasRecentlyCreated || $order->wasChanged()) && ($order->kitchen_state || $order->wasChanged('kitchen_state'))) {
+            $this->touchKitchen($order);
+        }
+    }
+
+    /**
+     * Handle the Order "deleted" event (soft delete).
+     */
+    public function deleted(Order $order): void
+    {
+        $this->syncRollups($order);
+        $this->touchKitchen($order);
+    }
+
+    /**
+     * Handle the Order "restored" event.
+     */
+    public function restored(Order $order): void
+    {
+        $this->syncRollups($order);
+        $this->touchKitchen($order);
+    }
+
+    /**
+     * Handle the Order "force deleted" event.
+     */
+    public function forceDeleted(Order $order): void
+    {
+        $orderId = $order->id;
+
+        DB::afterCommit(function () use ($orderId) {
+            app(SalesRollupService::class)->removeOrder($orderId);
+        });
+    }
+
+    private function touchKitchen(Order $order): void
+    {
+        app(KitchenQueueService::class)->touch($order->business_id);
+    }
+
+    private function syncRollups(Order $order): void
+    {
+        // After commit so items and payments written in the same transaction are included
+        DB::afterCommit(function () use ($order) {
+            app(SalesRollupService::class)->syncOrder($order);
+        });
+    }
+}
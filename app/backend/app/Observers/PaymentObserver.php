@@ -0,0 +1,53 @@
+<?php
+
+namespace App\Observers;
+
+use App\Models\Order;
+use App\Models\Payment;
+use App\Services\PaymentStatusService;
+use App\Services\SalesRollupService;
+use Illuminate\Support\Facades\DB;
+
+class PaymentObserver
+{
+    /**
+     * Handle the Payment "saved" event.
+     *
+     * Gateway callbacks may settle a payment after the order was already marked
+     * paid; the order's rollup bucket and payment split depend on it.
+     */
+    public function saved(Payment $payment): void
+    {
+        // Wake up checkout screens waiting on this payment (PaymentStatusService::wait)
+        if (!$payment->wasRecentlyCreated && $payment->wasChanged('status')) {
+            app(PaymentStatusService::class)->publish($payment->id);
+        }
+
+        if (!$payment->wasRecentlyCreated && !$payment->wasChanged(['status', 'amount', 'paid_at', 'payment_method'])) {
+            return;
+        }
+
+        $orderId = $payment->order_id;
+
+        // Same transaction as the payment: date filters see both or neither
+        if ($payment->wasRecentlyCreated || $payment->wasChanged(['status', 'paid_at'])) {
+            Order::refreshPaidAt($orderId);
+        }
+
+        DB::afterCommit(function () use ($orderId) {
+            $order = Order::find($orderId);
+
+            if ($order && $order->payment_status === 'paid') {
+                app(SalesRollupService::class)->syncOrder($order);
+            }
+        });
+    }
+
+    /**
+     * Handle the Payment "deleted" event.
+     */
+    public function deleted(Payment $payment): void
+    {
+        Order::refreshPaidAt($payment->order_id);
+    }
+}
@@ -0,0 +1,52 @@
+<?php
+
+namespace App\Observers;
+
+use App\Models\Product;
+use App\Services\ProductCatalogService;
+use App\Services\ProductSearchService;
+
+class ProductObserver
+{
+    /**
+     * Handle the Product "saved" event.
+     */
+    public function saved(Product $product): void
+    {
+        if ($product->wasRecentlyCreated || $product->wasChanged(ProductCatalogService::CATALOG_ATTRIBUTES)) {
+            $this->recordChange($product, true);
+        } elseif ($product->wasChanged('stock')) {
+            $this->recordChange($product, false);
+        }
+
+        // Incremental search indexing (name / sku / description)
+        if ($product->wasRecentlyCreated || $product->wasChanged(ProductSearchService::INDEXED_ATTRIBUTES)) {
+            app(ProductSearchService::class)->index($product);
+        }
+    }
+
+    /**
+     * Handle the Product "deleted" event (soft delete).
+     */
+    public function deleted(Product $product): void
+    {
+        $this->recordChange($product, true);
+
+        app(ProductSearchService::class)->remove([$product->id]);
+    }
+
+    /**
+     * Handle the Product "restored" event.
+     */
+    public function restored(Product $product): void
+    {
+        $this->recordChange($product, true);
+
+        app(ProductSearchService::class)->index($product);
+    }
+
+    private function recordChange(Product $product, bool $catalog)
+    {
+        app(ProductCatalogService::class)->recordChange($product->business_id, [$product->id], $catalog);
+    }
+}
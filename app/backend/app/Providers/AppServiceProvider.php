@@ -2,9 +2,20 @@
 
 namespace App\Providers;
 
+use Illuminate\Cache\RateLimiting\Limit;
+use Illuminate\Http\Request;
+use Illuminate\Support\Facades\RateLimiter;
 use Illuminate\Support\ServiceProvider;
 use App\Models\Business;
+use App\Models\Category;
+use App\Models\Order;
+use App\Models\Payment;
+use App\Models\Product;
 use App\Observers\BusinessObserver;
+use App\Observers\CategoryObserver;
+use App\Observers\OrderObserver;
+use App\Observers\PaymentObserver;
+use App\Observers\ProductObserver;
 
 class AppServiceProvider extends ServiceProvider
 {
@@ -13,7 +24,14 @@ class AppServiceProvider extends ServiceProvider
      */
     public function register(): void
     {
-        //
+        // Outlet settings snapshot is memoized per request / queue job
+        $this->app->scoped(\App\Services\OutletSettingsService::class);
+
+        // Product search driver is resolved once per process
+        $this->app->singleton(\App\Services\ProductSearchService::class);
+
+        // Logging state (request id, sampling, buffering) of the current request
+        $this->app->scoped(\App\Logging\RequestLog::class);
     }
 
     /**
@@ -23,5 +41,27 @@ public function boot(): void
     {
         // Register Business Observer
         Business::observe(BusinessObserver::class);
+
+        // Keep daily sales rollups in sync with paid/refunded orders
+        Order::observe(OrderObserver::class);
+        Payment::observe(PaymentObserver::class);
+
+        // Bump the versioned POS catalog on product / stock changes
+        Product::observe(ProductObserver::class);
+
+        // Invalidate public self-service menu snapshots on category changes
+        Category::observe(CategoryObserver::class);
+
+        // Outbound WhatsApp messages per outlet (SendWhatsAppMessage job middleware)
+        RateLimiter::for('whatsapp', function ($job) {
+            return Limit::perMinute((int) config('whatsapp.queue.per_outlet_per_minute', 20))
+                ->by('outlet:' . ($job->outletId ?? 'global'));
+        });
+
+        // Midtrans callbacks per source IP; ingestion is a cheap insert, so the
+        // limit only guards against floods (retries are deduplicated anyway)
+        RateLimiter::for('midtrans-webhook', function (Request $request) {
+            return Limit::perMinute((int) config('midtrans.webhook.per_minute', 3000))->by($request->ip());
+        });
     }
 }
@@ -4,6 +4,7 @@
 
 use App\Events\SubscriptionCreated;
 use App\Events\SubscriptionPaid;
+use App\Listeners\InvalidateSubscriptionEntitlement;
 use App\Listeners\SendSubscriptionNotification;
 use Illuminate\Foundation\Support\Providers\EventServiceProvider as ServiceProvider;
 
@@ -16,9 +17,11 @@ class EventServiceProvider extends ServiceProvider
      */
     protected $listen = [
         SubscriptionCreated::class => [
+            InvalidateSubscriptionEntitlement::class,
             SendSubscriptionNotification::class,
         ],
         SubscriptionPaid::class => [
+            InvalidateSubscriptionEntitlement::class,
             SendSubscriptionNotification::class,
         ],
     ];
@@ -0,0 +1,193 @@
+<?php
+
+namespace App\Services;
+
+use Carbon\Carbon;
+use Illuminate\Support\Collection;
+use Illuminate\Support\Facades\DB;
+
+class CashierPerformanceService
+{
+    /**
+     * Order statuses handled by a cashier that count towards performance
+     */
+    public const ORDER_STATUSES = ['completed', 'confirmed', 'preparing', 'ready'];
+
+    /**
+     * Performance rows of all cashiers of a business, best score first.
+     *
+     * Always four queries regardless of the number of cashiers: the cashier
+     * list, one GROUP BY over orders (range and today in the same pass), one
+     * GROUP BY over shifts (count and summed duration) and nothing per row.
+     */
+    public function analytics($businessId, Carbon $startDate, Carbon $endDate, $outletId = null, $cashierId = null)
+    {
+        $cashiers = $this->cashiers($businessId, $outletId, $cashierId);
+
+        if ($cashiers->isEmpty()) {
+            return [];
+        }
+
+        $orders = $this->orderTotals($businessId, $cashiers->pluck('employee_id')->all(), $startDate, $endDate, $outletId);
+        $shifts = $this->shiftTotals($businessId, $cashiers->pluck('user_id')->all(), $startDate, $endDate, $outletId);
+
+        $performanceData = $cashiers->map(function ($cashier) use ($orders, $shifts) {
+            $order = $orders->get($cashier->employee_id);
+            $shift = $shifts->get($cashier->user_id);
+
+            $totalOrders = (int) ($order->total_orders ?? 0);
+            $totalRevenue = (float) ($order->total_revenue ?? 0);
+            $totalSessions = (int) ($shift->total_sessions ?? 0);
+            $totalSessionHours = (float) ($shift->total_seconds ?? 0) / 3600;
+
+            // Without recorded sessions count as 1 hour, so a cashier still gets an efficiency score
+            $effectiveSessionHours = $totalSessionHours > 0 ? $totalSessionHours : 1;
+            $ordersPerHour = $totalOrders / $effectiveSessionHours;
+            $revenuePerHour = $totalRevenue / $effectiveSessionHours;
+
+            return [
+                'cashier_id' => $cashier->user_id,
+                'cashier_name' => $cashier->name,
+                'cashier_email' => $cashier->email,
+                'total_orders' => $totalOrders,
+                'total_revenue' => $totalRevenue,
+                'avg_order_value' => $totalOrders > 0 ? round($totalRevenue / $totalOrders, 2) : 0,
+                'total_sessions' => $totalSessions,
+                'total_session_hours' => round($totalSessionHours, 2),
+                'orders_per_hour' => round($ordersPerHour, 2),
+                'revenue_per_hour' => round($revenuePerHour, 2),
+                'today_orders' => (int) ($order->today_orders ?? 0),
+                'today_revenue' => (float) ($order->today_revenue ?? 0),
+                'performance_score' => $this->score($totalOrders, $totalRevenue, $ordersPerHour),
+            ];
+        });
+
+        return $performanceData->sortByDesc('performance_score')->values()->all();
+    }
+
+    /**
+     * Cashiers (role kasir) with an employee record in the business, optionally
+     * limited to the ones assigned to an outlet: user_id, employee_id, name, email.
+     */
+    public function cashiers($businessId, $outletId = null, $userId = null)
+    {
+        return DB::table('employees')
+            ->join('users', 'users.id', '=', 'employees.user_id')
+            ->where('employees.business_id', $businessId)
+            ->whereNull('employees.deleted_at')
+            ->where('users.role', 'kasir')
+            ->when($userId, fn ($query) => $query->where('users.id', $userId))
+            ->when($outletId, fn ($query) => $query->whereExists(function ($exists) use ($businessId, $outletId) {
+                $exists->select(DB::raw(1))
+                    ->from('employee_outlets')
+                    ->whereColumn('employee_outlets.user_id', 'users.id')
+                    ->where('employee_outlets.business_id', $businessId)
+                    ->where('employee_outlets.outlet_id', $outletId);
+            }))
+            ->orderBy('users.name')
+            ->get(['users.id as user_id', 'employees.id as employee_id', 'users.name', 'users.email'])
+            ->unique('user_id')
+            ->values();
+    }
+
+    /**
+     * Orders and revenue per employee_id in the range, plus today's figures, in one grouped query.
+     */
+    public function orderTotals($businessId, array $employeeIds, Carbon $startDate, Carbon $endDate, $outletId = null)
+    {
+        if (empty($employeeIds)) {
+            return collect();
+        }
+
+        $todayStart = now()->startOfDay();
+        $todayEnd = now()->endOfDay();
+
+        return DB::table('orders')
+            ->where('business_id', $businessId)
+            ->whereIn('employee_id', $employeeIds)
+            ->whereIn('status', self::ORDER_STATUSES)
+            ->whereNull('deleted_at')
+            ->when($outletId, fn ($query) => $query->where('outlet_id', $outletId))
+            ->where(function ($query) use ($startDate, $endDate, $todayStart, $todayEnd) {
+                $query->whereBetween('created_at', [$startDate, $endDate])
+                    ->orWhereBetween('created_at', [$todayStart, $todayEnd]);
+            })
+            ->groupBy('employee_id')
+            ->selectRaw('employee_id')
+            ->selectRaw('SUM(CASE WHEN created_at BETWEEN ? AND ? THEN 1 ELSE 0 END) as total_orders', [$startDate, $endDate])
+            ->selectRaw('SUM(CASE WHEN created_at BETWEEN ? AND ? THEN total ELSE 0 END) as total_revenue', [$startDate, $endDate])
+            ->selectRaw('SUM(CASE WHEN created_at BETWEEN ? AND ? THEN 1 ELSE 0 END) as today_orders', [$todayStart, $todayEnd])
+            ->selectRaw('SUM(CASE WHEN created_at BETWEEN ? AND ? THEN total ELSE 0 END) as today_revenue', [$todayStart, $todayEnd])
+            ->get()
+            ->keyBy('employee_id');
+    }
+
+    /**
+     * Shift count and summed shift duration (seconds) per user_id for shifts opened in the range.
+     * Open shifts run until now.
+     */
+    public function shiftTotals($businessId, array $userIds, Carbon $startDate, Carbon $endDate, $outletId = null)
+    {
+        if (empty($userIds)) {
+            return collect();
+        }
+
+        $duration = $this->secondsBetween('opened_at', 'COALESCE(closed_at, ?)');
+
+        return DB::table('cashier_shifts')
+            ->where('business_id', $businessId)
+            ->whereIn('user_id', $userIds)
+            ->whereBetween('opened_at', [$startDate, $endDate])
+            ->whereNull('deleted_at')
+            ->when($outletId, fn ($query) => $query->where('outlet_id', $outletId))
+            ->groupBy('user_id')
+            ->selectRaw('user_id, COUNT(*) as total_sessions')
+            ->selectRaw("SUM(CASE WHEN opened_at IS NULL THEN 0 ELSE {$duration} END) as total_seconds", [now()->toDateTimeString()])
+            ->get()
+            ->keyBy('user_id');
+    }
+
+    /**
+     * Performance score (0-100):
+     * orders max 50 (10 orders = 1 point), revenue max 30 (1 juta = 3 points),
+     * efficiency max 20 (1 order/hour = 2 points).
+     */
+    public function score($totalOrders, $totalRevenue, $ordersPerHour)
+    {
+        $orderScore = min($totalOrders * 0.1, 50);
+        $revenueScore = min($totalRevenue / 1000000 * 30, 30);
+        $efficiencyScore = min($ordersPerHour * 2, 20);
+
+        return round($orderScore + $revenueScore + $efficiencyScore, 2);
+    }
+
+    /**
+     * Summary of performance rows (as returned by analytics())
+     */
+    public function summary(array $performanceData)
+    {
+        $count = count($performanceData);
+
+        return [
+            'total_cashiers' => $count,
+            'total_orders' => array_sum(array_column($performanceData, 'total_orders')),
+            'total_revenue' => array_sum(array_column($performanceData, 'total_revenue')),
+            'avg_performance_score' => $count > 0
+                ? round(array_sum(array_column($performanceData, 'performance_score')) / $count, 2)
+                : 0,
+            'top_performer' => $count > 0 ? $performanceData[0]['cashier_name'] : null,
+        ];
+    }
+
+    /**
+     * SQL for the seconds between two timestamp expressions on the current connection
+     */
+    private function secondsBetween($from, $to)
+    {
+        return match (DB::connection()->getDriverName()) {
+            'sqlite' => "CAST((julianday({$to}) - julianday({$from})) * 86400 AS INTEGER)",
+            'pgsql' => "EXTRACT(EPOCH FROM ({$to} - {$from}))",
+            default => "TIMESTAMPDIFF(SECOND, {$from}, {$to})",
+        };
+    }
+}
@@ -0,0 +1,145 @@
+<?php
+
+namespace App\Services;
+
+use App\Models\Order;
+use Carbon\Carbon;
+use Illuminate\Support\Facades\Cache;
+use Illuminate\Support\Facades\DB;
+
+/**
+ * Orders shown on kitchen screens.
+ *
+ * Whether an order belongs in the kitchen is decided once, when it is saved
+ * (orders.kitchen_state), instead of by an OR tree in every poll. All kitchen
+ * endpoints read the same cached queue per business/outlet; the cache is
+ * keyed on a version that is bumped after any change to a kitchen order.
+ */
+class KitchenQueueService
+{
+    /**
+     * Kitchen states, in the order an order moves through them
+     */
+    public const STATES = ['pending', 'confirmed', 'preparing', 'ready'];
+
+    /**
+     * Relations kitchen screens need
+     */
+    public const RELATIONS = ['orderItems.product', 'table', 'customer'];
+
+    /**
+     * Seconds a cached queue is kept (every change bumps the version anyway)
+     */
+    public const CACHE_TTL = 300;
+
+    /**
+     * updated_since is moved back by this many seconds so an order saved while
+     * a snapshot was built (committed just after) is not skipped. Clients
+     * replace orders by id, so repeats are harmless.
+     */
+    public const CURSOR_GRACE = 5;
+
+    /**
+     * Kitchen state of an order:
+     * - confirmed/preparing/ready: always on the screen
+     * - pending: dine-in (eat first, pay later), self-service (pay later or paid)
+     *   and paid takeaway/delivery/online orders waiting for manual confirmation
+     * - null: not (or no longer) a kitchen order
+     */
+    public static function stateOf(Order $order)
+    {
+        if (in_array($order->status, ['confirmed', 'preparing', 'ready'], true)) {
+            return $order->status;
+        }
+
+        if ($order->status !== 'pending') {
+            return null;
+        }
+
+        $visible = $order->type === 'dine_in'
+            || ($order->type === 'self_service' && in_array($order->payment_status, ['pending', 'paid'], true))
+            || (in_array($order->type, ['takeaway', 'delivery', 'online'], true) && $order->payment_status === 'paid');
+
+        return $visible ? 'pending' : null;
+    }
+
+    /**
+     * Invalidate the cached queues of a business once the change is committed
+     */
+    public function touch($businessId)
+    {
+        if (!$businessId) {
+            return;
+        }
+
+        DB::afterCommit(function () use ($businessId) {
+            $key = self::versionKey($businessId);
+            Cache::add($key, 0, now()->addDay());
+            Cache::increment($key);
+        });
+    }
+
+    /**
+     * Kitchen queue of a business (optionally one outlet), oldest first.
+     *
+     * Returns ['orders' => Collection, 'generated_at' => Carbon]. Without a
+     * business the query is not cached.
+     */
+    public function queue($businessId, $outletId = null)
+    {
+        if (!$businessId) {
+            return $this->build(null, $outletId);
+        }
+
+        $version = (int) Cache::get(self::versionKey($businessId), 0);
+        $cacheKey = "kitchen_queue:{$businessId}:" . ($outletId ?: 'all') . ":v{$version}";
+
+        return Cache::remember($cacheKey, self::CACHE_TTL, fn () => $this->build($businessId, $outletId));
+    }
+
+    /**
+     * Changes of the queue since a cursor.
+     *
+     * orders:  kitchen orders updated at or after the cursor
+     * removed: ids of orders that left the kitchen (served, cancelled, deleted) since the cursor
+     */
+    public function changes(array $queue, $businessId, $outletId, Carbon $since)
+    {
+        $since = $since->copy()->subSeconds(self::CURSOR_GRACE);
+
+        $orders = $queue['orders']
+            ->filter(fn ($order) => $order->updated_at && $order->updated_at->gte($since))
+            ->values();
+
+        // Nothing can have left the queue after the snapshot was built (that bumps the version)
+        $removed = $since->gt($queue['generated_at'])
+            ? collect()
+            : Order::withTrashed()
+                ->when($businessId, fn ($query) => $query->where('business_id', $businessId))
+                ->when($outletId, fn ($query) => $query->where('outlet_id', $outletId))
+                ->where('updated_at', '>=', $since)
+                ->where(fn ($query) => $query->whereNull('kitchen_state')->orWhereNotNull('deleted_at'))
+                ->pluck('id');
+
+        return ['orders' => $orders, 'removed' => $removed->values()];
+    }
+
+    private function build($businessId, $outletId)
+    {
+        $generatedAt = now();
+
+        $orders = Order::with(self::RELATIONS)
+            ->whereIn('kitchen_state', self::STATES)
+            ->when($outletId, fn ($query) => $query->where('outlet_id', $outletId))
+            ->when($businessId, fn ($query) => $query->where('business_id', $businessId))
+            ->orderBy('created_at', 'asc')
+            ->get();
+
+        return ['orders' => $orders, 'generated_at' => $generatedAt];
+    }
+
+    public static function versionKey($businessId)
+    {
+        return "kitchen_queue:{$businessId}:version";
+    }
+}
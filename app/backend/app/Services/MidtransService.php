@@ -216,21 +216,7 @@ public function handleNotification()
             ]);
 
             // Determine payment status
-            $status = 'pending';
-
-            if ($transaction_status == 'capture') {
-                if ($fraud_status == 'accept') {
-                    $status = 'success';
-                } else if ($fraud_status == 'challenge') {
-                    $status = 'challenge';
-                }
-            } else if ($transaction_status == 'settlement') {
-                $status = 'success';
-            } else if ($transaction_status == 'cancel' || $transaction_status == 'deny' || $transaction_status == 'expire') {
-                $status = 'failed';
-            } else if ($transaction_status == 'pending') {
-                $status = 'pending';
-            }
+            $status = self::paymentStatus($transaction_status, $fraud_status);
 
             return [
                 'order_id' => $order_id,
@@ -253,6 +239,32 @@ public function handleNotification()
         }
     }
 
+    /**
+     * Map a Midtrans transaction_status / fraud_status to our payment status
+     *
+     * @return string success, challenge, failed or pending
+     */
+    public static function paymentStatus($transactionStatus, $fraudStatus = 'accept')
+    {
+        $status = 'pending';
+
+        if ($transactionStatus == 'capture') {
+            if ($fraudStatus == 'accept') {
+                $status = 'success';
+            } else if ($fraudStatus == 'challenge') {
+                $status = 'challenge';
+            }
+        } else if ($transactionStatus == 'settlement') {
+            $status = 'success';
+        } else if ($transactionStatus == 'cancel' || $transactionStatus == 'deny' || $transactionStatus == 'expire') {
+            $status = 'failed';
+        } else if ($transactionStatus == 'pending') {
+            $status = 'pending';
+        }
+
+        return $status;
+    }
+
     /**
      * Cancel transaction
      *
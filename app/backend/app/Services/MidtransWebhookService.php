@@ -0,0 +1,594 @@
+<?php
+
+namespace App\Services;
+
+use App\Jobs\ProcessMidtransEvents;
+use App\Models\MidtransEvent;
+use App\Models\Payment;
+use App\Models\SubscriptionPayment;
+use App\Models\UserSubscription;
+use Carbon\Carbon;
+use Illuminate\Support\Facades\DB;
+use Illuminate\Support\Facades\Log;
+
+/**
+ * Midtrans callback ingestion.
+ *
+ * The webhook request only verifies the signature and stores the raw event
+ * once per transaction_id + transaction_status; the payments queue worker
+ * applies the events of one order in the order they were received.
+ */
+class MidtransWebhookService
+{
+    /**
+     * Verify and store a callback.
+     *
+     * @param array $payload Raw Midtrans notification body
+     * @param string $type MidtransEvent::TYPE_ORDER or MidtransEvent::TYPE_SUBSCRIPTION
+     * @return array ['status' => HTTP status, 'success' => bool, 'message' => string]
+     */
+    public function ingest(array $payload, string $type)
+    {
+        $midtransOrderId = (string) ($payload['order_id'] ?? '');
+        $transactionStatus = (string) ($payload['transaction_status'] ?? '');
+
+        if ($midtransOrderId === '' || $transactionStatus === '') {
+            return $this->result(400, false, 'Invalid notification payload');
+        }
+
+        $eventKey = self::eventKey($payload);
+
+        // Midtrans retries until it gets a 2xx: answer repeats before any other lookup
+        if (MidtransEvent::where('event_key', $eventKey)->exists()) {
+            return $this->result(200, true, 'Notification already received');
+        }
+
+        $target = $type === MidtransEvent::TYPE_SUBSCRIPTION
+            ? $this->resolveSubscription($midtransOrderId)
+            : $this->resolveOrderPayment($midtransOrderId);
+
+        if (!$target) {
+            Log::warning('MidtransWebhookService: Target not found for notification', [
+                'type' => $type,
+                'order_id' => $midtransOrderId,
+            ]);
+
+            return $this->result(404, false, $type === MidtransEvent::TYPE_SUBSCRIPTION ? 'Subscription not found' : 'Payment not found');
+        }
+
+        if (config('midtrans.webhook.verify_signature', true) && !self::validSignature($payload, $target['server_key'])) {
+            Log::warning('MidtransWebhookService: Invalid signature', [
+                'type' => $type,
+                'order_id' => $midtransOrderId,
+                'ip' => request()->ip(),
+            ]);
+
+            return $this->result(403, false, 'Invalid signature');
+        }
+
+        if (!$this->record($payload, $type, $target)) {
+            return $this->result(200, true, 'Notification already received');
+        }
+
+        return $this->result(200, true, 'Notification queued');
+    }
+
+    /**
+     * Store an event once (per transaction_id + transaction_status) and queue it.
+     *
+     * Used by the webhook and by status checks that asked Midtrans directly,
+     * so both feed the same idempotent pipeline.
+     *
+     * @param array $target ['id' => int, 'order_key' => string] (see orderTarget())
+     * @return bool false when the event was already stored
+     */
+    public function record(array $payload, string $type, array $target)
+    {
+        $now = now();
+        $inserted = DB::table('midtrans_events')->insertOrIgnore([
+            'event_key' => self::eventKey($payload),
+            'type' => $type,
+            'order_key' => $target['order_key'],
+            'midtrans_order_id' => (string) ($payload['order_id'] ?? ''),
+            'transaction_id' => $payload['transaction_id'] ?? null,
+            'transaction_status' => (string) ($payload['transaction_status'] ?? ''),
+            'fraud_status' => $payload['fraud_status'] ?? null,
+            'status_code' => $payload['status_code'] ?? null,
+            'gross_amount' => $payload['gross_amount'] ?? null,
+            'target_id' => $target['id'],
+            'payload' => json_encode($payload),
+            'status' => 'pending',
+            'attempts' => 0,
+            'created_at' => $now,
+            'updated_at' => $now,
+        ]);
+
+        if ($inserted) {
+            $this->dispatch($target['order_key']);
+        }
+
+        return (bool) $inserted;
+    }
+
+    /**
+     * Queue processing of the pending events of one order.
+     */
+    public function dispatch(string $orderKey)
+    {
+        ProcessMidtransEvents::dispatch($orderKey)
+            ->onQueue(config('midtrans.webhook.queue', 'payments'));
+    }
+
+    /**
+     * Apply one stored event (called by the worker, in id order per order_key).
+     *
+     * Exceptions are rethrown so the job retries with backoff; after
+     * midtrans.webhook.max_attempts the event is marked failed and the next
+     * event of the order can proceed.
+     */
+    public function apply(MidtransEvent $event)
+    {
+        $event->increment('attempts');
+        $notification = self::notification($event->payload);
+
+        try {
+            $ignored = $event->type === MidtransEvent::TYPE_SUBSCRIPTION
+                ? $this->applySubscription($event, $notification)
+                : $this->applyOrder($event, $notification);
+
+            $event->update([
+                'status' => $ignored ? 'ignored' : 'processed',
+                'last_error' => $ignored,
+                'processed_at' => now(),
+            ]);
+        } catch (\Exception $e) {
+            Log::error('MidtransWebhookService: Failed to apply event', [
+                'event_id' => $event->id,
+                'order_id' => $event->midtrans_order_id,
+                'transaction_status' => $event->transaction_status,
+                'attempts' => $event->attempts,
+                'error' => $e->getMessage(),
+            ]);
+
+            $failed = $event->attempts >= (int) config('midtrans.webhook.max_attempts', 5);
+
+            $event->update([
+                'status' => $failed ? 'failed' : 'pending',
+                'last_error' => mb_substr($e->getMessage(), 0, 2000),
+            ]);
+
+            if (!$failed) {
+                throw $e;
+            }
+        }
+    }
+
+    /**
+     * Apply an order payment callback.
+     *
+     * @return string|null reason when the event is ignored
+     */
+    protected function applyOrder(MidtransEvent $event, array $notification)
+    {
+        $payment = Payment::with('order.outlet', 'order.business')->find($event->target_id);
+        $order = $payment?->order;
+
+        if (!$order) {
+            return 'Payment not found';
+        }
+
+        // Idempotent: a settled payment is never downgraded by a late/out-of-order
+        // callback, and a second success (capture + settlement) has no side effects
+        if ($payment->status === 'success') {
+            return $notification['payment_status'] === 'success' ? 'Payment already confirmed' : 'Payment already settled';
+        }
+
+        Log::info('Processing Midtrans notification for order', [
+            'order_id' => $notification['order_id'],
+            'payment_status' => $notification['payment_status'],
+            'transaction_status' => $notification['transaction_status'],
+            'payment_type' => $notification['payment_type'],
+        ]);
+
+        DB::transaction(function () use ($notification, $payment, $order) {
+            // Update payment status
+            $paymentStatus = $notification['payment_status'] === 'success' ? 'success' :
+                            ($notification['payment_status'] === 'failed' ? 'failed' : 'pending');
+
+            $payment->update([
+                'status' => $paymentStatus,
+                'paid_at' => $notification['payment_status'] === 'success' ? Carbon::parse($notification['transaction_time']) : null,
+                'payment_data' => array_merge(
+                    $payment->payment_data ?? [],
+                    [
+                        'transaction_id' => $notification['raw_notification']->transaction_id ?? null,
+                        'transaction_status' => $notification['transaction_status'],
+                        'payment_type' => $notification['payment_type'],
+                        'transaction_time' => $notification['transaction_time'],
+                    ]
+                ),
+            ]);
+
+            // Update order status based on payment status
+            if ($notification['payment_status'] === 'success') {
+                // ✅ FIX: Update employee_id order dengan kasir yang memproses pembayaran QRIS
+                // Jika payment sudah punya processed_by_employee_id, gunakan itu
+                if ($payment->processed_by_employee_id && $payment->processed_by_employee_id != $order->employee_id) {
+                    $order->employee_id = $payment->processed_by_employee_id;
+                    Log::info('OrderPaymentController: Updating order employee_id from QRIS payment (webhook)', [
+                        'order_id' => $order->id,
+                        'payment_id' => $payment->id,
+                        'employee_id' => $payment->processed_by_employee_id,
+                        'reason' => 'QRIS payment confirmed via webhook'
+                    ]);
+                }
+
+                // ✅ NEW: Assign shift_id untuk order self-service yang sudah dibayar via Midtrans
+                // Ini memastikan order muncul di transaksi kasir
+                if ($order->type === 'self_service' && !$order->shift_id) {
+                    // Cari shift aktif di outlet yang sama
+                    $activeShift = \App\Models\CashierShift::where('outlet_id', $order->outlet_id)
+                        ->where('status', 'open')
+                        ->orderBy('opened_at', 'desc')
+                        ->first();
+
+                    if ($activeShift) {
+                        $order->shift_id = $activeShift->id;
+                        Log::info('OrderPaymentController: Assigning shift_id to self-service order (webhook)', [
+                            'order_id' => $order->id,
+                            'shift_id' => $activeShift->id,
+                            'outlet_id' => $order->outlet_id,
+                            'reason' => 'Self-service order paid via Midtrans, assigned to active shift'
+                        ]);
+                    } else {
+                        Log::info('OrderPaymentController: No active shift found for self-service order (webhook)', [
+                            'order_id' => $order->id,
+                            'outlet_id' => $order->outlet_id,
+                            'note' => 'Order will appear as Self-Service Payment without shift'
+                        ]);
+                    }
+                }
+
+                // ✅ NEW: Cek setting auto-confirm dari business
+                $business = $order->business;
+                $settings = $business->settings ?? [];
+                $autoConfirm = $settings['kitchen_auto_confirm'] ?? true; // Default: true (auto-confirm)
+
+                $newStatus = $order->status;
+                if ($order->status === 'pending') {
+                    // Jika auto-confirm enabled, langsung jadi 'confirmed'
+                    // Jika tidak, tetap 'pending' (akan muncul di Kitchen Dashboard untuk manual confirm)
+                    $newStatus = $autoConfirm ? 'confirmed' : 'pending';
+                }
+
+                $order->update([
+                    'payment_status' => 'paid',
+                    'status' => $newStatus,
+                ]);
+
+                // ✅ Generate receipt token when payment is confirmed
+                $order->generateReceiptToken();
+
+                // ✅ SECURITY: Send notification when order payment is confirmed
+                try {
+                    \App\Models\AppNotification::create([
+                        'business_id' => $order->business_id,
+                        'outlet_id' => $order->outlet_id,
+                        'user_id' => null,
+                        'role_targets' => ['kasir', 'kitchen', 'owner', 'admin'], // Payment confirmed - notify relevant roles
+                        'type' => 'order.paid',
+                        'title' => 'Pembayaran Dikonfirmasi: ' . $order->order_number,
+                        'message' => "Order #{$order->order_number} telah dibayar via {$notification['payment_type']}. Status: " . ($newStatus === 'confirmed' ? 'Dikonfirmasi' : 'Pending Konfirmasi'),
+                        'severity' => 'success',
+                        'resource_type' => 'order',
+                        'resource_id' => $order->id,
+                        'meta' => [
+                            'order_number' => $order->order_number,
+                            'payment_status' => 'paid',
+                            'status' => $newStatus,
+                            'payment_type' => $notification['payment_type'],
+                        ],
+                    ]);
+                } catch (\Exception $e) {
+                    Log::warning('OrderPaymentController: Failed to create payment notification', ['error' => $e->getMessage()]);
+                }
+
+                Log::info('Order payment confirmed', [
+                    'order_id' => $order->id,
+                    'payment_method' => $notification['payment_type'],
+                    'auto_confirm' => $autoConfirm,
+                    'new_status' => $newStatus,
+                ]);
+
+                // ✅ Send WhatsApp notification if payment is confirmed and outlet setting is enabled
+                $order->load(['orderItems.product', 'customer', 'business', 'outlet', 'payments']);
+
+                // Check if outlet has enabled sending receipt via WA
+                if ($order->outlet && $order->outlet->isSendReceiptViaWAEnabled()) {
+                    try {
+                        // Pass outlet to WhatsAppService to use outlet-specific API key
+                        // ✅ Queued: the gateway callback does not wait for the WhatsApp provider
+                        $whatsappService = new \App\Services\WhatsAppService($order->outlet);
+                        $queued = $whatsappService->queuePaymentReceipt($order);
+                        Log::info('OrderPaymentController: WhatsApp receipt queued', [
+                            'order_id' => $order->id,
+                            'outlet_id' => $order->outlet->id,
+                            'whatsapp_message_id' => $queued->id ?? null
+                        ]);
+                    } catch (\Exception $e) {
+                        Log::warning('OrderPaymentController: Failed to queue WhatsApp notification', [
+                            'order_id' => $order->id,
+                            'error' => $e->getMessage()
+                        ]);
+                        // Don't fail the payment if WhatsApp fails
+                    }
+                } else {
+                    Log::info('OrderPaymentController: WhatsApp receipt not sent - setting disabled', [
+                        'order_id' => $order->id,
+                        'outlet_id' => $order->outlet->id ?? null,
+                        'setting_enabled' => $order->outlet ? $order->outlet->isSendReceiptViaWAEnabled() : false
+                    ]);
+                }
+
+                // ✅ NEW: Send invoice email if payment is confirmed and customer has email
+                try {
+                    $order->load(['orderItems.product', 'customer', 'business', 'outlet', 'payments']);
+
+                    // Get customer email (from customer or order)
+                    $customerEmail = null;
+                    $customerName = null;
+
+                    if ($order->customer && $order->customer->email) {
+                        $customerEmail = $order->customer->email;
+                        $customerName = $order->customer->name;
+                    } elseif ($order->customer_email) {
+                        $customerEmail = $order->customer_email;
+                        $customerName = $order->customer->name ?? 'Pelanggan';
+                    }
+
+                    if ($customerEmail) {
+                        // Try to find user first, if not found, send directly via Mail
+                        $user = null;
+                        if ($order->customer && $order->customer->user_id) {
+                            $user = \App\Models\User::find($order->customer->user_id);
+                        }
+
+                        if ($user) {
+                            // User exists, use notification
+                            $user->notify(new \App\Notifications\InvoiceEmailNotification($order));
+                        } else {
+                            // No user, send directly via Mail facade
+                            \Illuminate\Support\Facades\Mail::to($customerEmail)->send(
+                                new \App\Mail\InvoiceMail($order, $customerName)
+                            );
+                        }
+
+                        Log::info('Invoice email sent successfully', [
+                            'order_id' => $order->id,
+                            'email' => $customerEmail
+                        ]);
+                    }
+                } catch (\Exception $e) {
+                    Log::warning('OrderPaymentController: Failed to send invoice email', [
+                        'order_id' => $order->id,
+                        'error' => $e->getMessage()
+                    ]);
+                    // Don't fail the payment if email fails
+                }
+
+            } elseif ($notification['payment_status'] === 'failed') {
+                $order->update([
+                    'payment_status' => 'failed',
+                ]);
+
+                Log::info('Order payment failed', [
+                    'order_id' => $order->id,
+                ]);
+            }
+        });
+
+        return null;
+    }
+
+    /**
+     * Apply a subscription payment callback.
+     *
+     * @return string|null reason when the event is ignored
+     */
+    protected function applySubscription(MidtransEvent $event, array $notification)
+    {
+        $subscription = UserSubscription::with('user.ownedBusinesses')->find($event->target_id);
+
+        if (!$subscription) {
+            return 'Subscription not found';
+        }
+
+        $paid = SubscriptionPayment::where('user_subscription_id', $subscription->id)
+            ->where('payment_code', $notification['order_id'])
+            ->where('status', 'paid')
+            ->exists();
+
+        if ($paid) {
+            return $notification['payment_status'] === 'success' ? 'Payment already confirmed' : 'Payment already settled';
+        }
+
+        $business = $subscription->user->ownedBusinesses()->first()
+            ?? $subscription->user->businesses()->first();
+
+        Log::info('Processing Midtrans notification', [
+            'order_id' => $notification['order_id'],
+            'payment_status' => $notification['payment_status'],
+        ]);
+
+        DB::transaction(function () use ($notification, $subscription, $business) {
+            // Update or create payment record
+            $payment = SubscriptionPayment::updateOrCreate(
+                [
+                    'user_subscription_id' => $subscription->id,
+                    'payment_code' => $notification['order_id'],
+                ],
+                [
+                    'payment_method' => $notification['payment_type'],
+                    'payment_gateway' => 'midtrans',
+                    'gateway_payment_id' => $notification['raw_notification']->transaction_id ?? $notification['order_id'],
+                    'amount' => $notification['gross_amount'],
+                    'status' => $notification['payment_status'] === 'success' ? 'paid' : ($notification['payment_status'] === 'failed' ? 'failed' : 'pending'),
+                    'paid_at' => $notification['payment_status'] === 'success' ? Carbon::parse($notification['transaction_time']) : null,
+                    'payment_data' => json_encode($notification['raw_notification']),
+                ]
+            );
+
+            // Update subscription status based on payment status
+            if ($notification['payment_status'] === 'success') {
+                $subscription->update([
+                    'status' => 'active',
+                    'notes' => ($subscription->notes ?? '') . ' | Payment confirmed via ' . $notification['payment_type'],
+                ]);
+
+                // ✅ FIX: Update business to use new subscription (for upgrade scenario)
+                if ($business) {
+                    $business->update([
+                        'current_subscription_id' => $subscription->id,
+                        'subscription_expires_at' => $subscription->ends_at,
+                    ]);
+
+                    Log::info('Business updated with new subscription', [
+                        'business_id' => $business->id,
+                        'subscription_id' => $subscription->id,
+                    ]);
+                }
+
+                Log::info('Subscription activated', [
+                    'subscription_id' => $subscription->id,
+                    'subscription_code' => $subscription->subscription_code,
+                ]);
+
+                // Fire SubscriptionPaid event
+                event(new \App\Events\SubscriptionPaid($payment));
+
+            } elseif ($notification['payment_status'] === 'failed') {
+                $subscription->update([
+                    'status' => 'cancelled',
+                    'notes' => ($subscription->notes ?? '') . ' | Payment failed',
+                ]);
+
+                Log::info('Subscription cancelled due to failed payment', [
+                    'subscription_id' => $subscription->id,
+                ]);
+            }
+        });
+
+        return null;
+    }
+
+    /**
+     * Payment (with its order outlet server key) of an order callback.
+     */
+    protected function resolveOrderPayment(string $midtransOrderId)
+    {
+        $payment = Payment::where('reference_number', $midtransOrderId)->first();
+
+        // Self-service (SS-{order_id}-{timestamp}) and POS (ORD-{order_id}-{timestamp}) QRIS
+        if (!$payment && preg_match('/^(?:SS|ORD)-(\d+)-/', $midtransOrderId, $matches)) {
+            $payment = Payment::where('order_id', $matches[1])
+                ->where('payment_method', 'qris')
+                ->orderBy('created_at', 'desc')
+                ->first();
+        }
+
+        return $payment && $payment->order ? $this->orderTarget($payment) : null;
+    }
+
+    /**
+     * Event target of an order payment, with the server key of its outlet (-> business -> global)
+     */
+    public function orderTarget(Payment $payment)
+    {
+        $config = $payment->order?->outlet
+            ? $payment->order->outlet->getMidtransConfig()
+            : ['server_key' => config('midtrans.server_key')];
+
+        return [
+            'id' => $payment->id,
+            'order_key' => MidtransEvent::TYPE_ORDER . ':' . $payment->order_id,
+            'server_key' => $config['server_key'] ?? null,
+        ];
+    }
+
+    /**
+     * Subscription (with its business server key) of a subscription callback.
+     */
+    protected function resolveSubscription(string $midtransOrderId)
+    {
+        // Format bisa: SUB-XXXXX atau SUB-XXXXX-TIMESTAMP atau SUB-XXXXX-TIMESTAMP-RANDOM
+        $parts = explode('-', $midtransOrderId);
+        $subscriptionCode = count($parts) >= 2 ? $parts[0] . '-' . $parts[1] : $midtransOrderId;
+
+        $subscription = UserSubscription::with('user.ownedBusinesses')
+            ->where('subscription_code', $subscriptionCode)
+            ->first();
+
+        if (!$subscription) {
+            return null;
+        }
+
+        $business = $subscription->user?->ownedBusinesses->first()
+            ?? $subscription->user?->businesses()->first();
+
+        return [
+            'id' => $subscription->id,
+            'order_key' => MidtransEvent::TYPE_SUBSCRIPTION . ':' . $subscription->id,
+            'server_key' => $business ? $business->getMidtransConfig()['server_key'] : config('midtrans.server_key'),
+        ];
+    }
+
+    /**
+     * Deduplication key: Midtrans retries the same transaction status until it gets a 2xx.
+     */
+    public static function eventKey(array $payload)
+    {
+        return ($payload['transaction_id'] ?? $payload['order_id'] ?? '') . ':' . ($payload['transaction_status'] ?? '');
+    }
+
+    /**
+     * signature_key = SHA512(order_id + status_code + gross_amount + server_key)
+     */
+    public static function signature(array $payload, ?string $serverKey)
+    {
+        return hash('sha512', ($payload['order_id'] ?? '') . ($payload['status_code'] ?? '') . ($payload['gross_amount'] ?? '') . $serverKey);
+    }
+
+    public static function validSignature(array $payload, ?string $serverKey)
+    {
+        return !empty($serverKey)
+            && is_string($payload['signature_key'] ?? null)
+            && hash_equals(self::signature($payload, $serverKey), $payload['signature_key']);
+    }
+
+    /**
+     * Stored payload in the shape of MidtransService::handleNotification().
+     *
+     * The signed callback is trusted as is, the worker does not re-query
+     * the transaction status from Midtrans.
+     */
+    public static function notification(array $payload)
+    {
+        $fraudStatus = $payload['fraud_status'] ?? 'accept';
+
+        return [
+            'order_id' => $payload['order_id'] ?? null,
+            'transaction_status' => $payload['transaction_status'] ?? null,
+            'fraud_status' => $fraudStatus,
+            'payment_status' => MidtransService::paymentStatus($payload['transaction_status'] ?? null, $fraudStatus),
+            'payment_type' => $payload['payment_type'] ?? null,
+            'transaction_time' => $payload['transaction_time'] ?? now()->toDateTimeString(),
+            'gross_amount' => $payload['gross_amount'] ?? null,
+            'raw_notification' => (object) $payload,
+        ];
+    }
+
+    private function result(int $status, bool $success, string $message)
+    {
+        return ['status' => $status, 'success' => $success, 'message' => $message];
+    }
+}
@@ -2,140 +2,245 @@
 
 namespace App\Services;
 
+use App\Jobs\SendPushNotification;
 use App\Models\AppNotification;
 use App\Models\PushSubscription;
 use App\Models\User;
+use Illuminate\Support\Facades\Cache;
 use Illuminate\Support\Facades\Log;
+use Minishlink\WebPush\MessageSentReport;
 use Minishlink\WebPush\WebPush;
 use Minishlink\WebPush\Subscription;
 
 class NotificationService
 {
+    /**
+     * Per-minute push delivery counters (see recordMetrics / push:metrics)
+     */
+    public const METRICS = ['sent', 'failed', 'expired', 'coalesced', 'duration_ms'];
+
+    /**
+     * ✅ Queue push delivery for a notification (runs on the push queue worker)
+     *
+     * Repeated notifications about the same resource + type within the
+     * coalesce window collapse into a single push of the latest one.
+     *
+     * @param AppNotification $notification
+     * @return void
+     */
+    public function queuePushNotification(AppNotification $notification)
+    {
+        $coalesceKey = $this->coalesceKey($notification);
+
+        if ($coalesceKey) {
+            // The job only delivers if it is still the latest notification for the key
+            Cache::put($coalesceKey, $notification->id, now()->addMinutes(10));
+        }
+
+        $job = SendPushNotification::dispatch($notification->id, $coalesceKey)
+            ->onQueue(config('push.queue', 'push'))
+            ->afterCommit();
+
+        if ($coalesceKey) {
+            $job->delay(now()->addSeconds((int) config('push.coalesce_seconds', 3)));
+        }
+    }
+
     /**
      * ✅ SECURITY: Send push notification to users based on role_targets
      * Only sends to users with matching roles and proper business/outlet access
      *
+     * Called by the SendPushNotification job. Subscriptions are resolved in one
+     * query, sent in pooled batches with a concurrency limit and expired
+     * endpoints are pruned.
+     *
      * @param AppNotification $notification
-     * @return array ['sent' => int, 'failed' => int]
+     * @return array ['sent' => int, 'failed' => int, 'expired' => int]
      */
     public function sendPushNotification(AppNotification $notification)
     {
-        try {
-            // Get VAPID keys from environment
-            $vapidPublicKey = env('VAPID_PUBLIC_KEY');
-            $vapidPrivateKey = env('VAPID_PRIVATE_KEY');
-            $vapidSubject = env('VAPID_SUBJECT', 'mailto:admin@quickkasir.com');
-
-            if (!$vapidPublicKey || !$vapidPrivateKey) {
-                Log::warning('Push notification skipped: VAPID keys not configured');
-                return ['sent' => 0, 'failed' => 0];
-            }
+        $vapid = config('push.vapid');
+
+        if (empty($vapid['public_key']) || empty($vapid['private_key'])) {
+            Log::warning('Push notification skipped: VAPID keys not configured');
+            return ['sent' => 0, 'failed' => 0, 'expired' => 0];
+        }
 
-            // Get target users based on role_targets
-            $targetUsers = $this->getTargetUsers($notification);
+        $subscriptions = $this->getTargetSubscriptions($notification);
 
-            if ($targetUsers->isEmpty()) {
-                Log::info('No target users found for push notification', [
-                    'notification_id' => $notification->id,
-                    'role_targets' => $notification->role_targets
+        if ($subscriptions->isEmpty()) {
+            Log::info('No push subscriptions found for notification', [
+                'notification_id' => $notification->id,
+                'role_targets' => $notification->role_targets
+            ]);
+            return ['sent' => 0, 'failed' => 0, 'expired' => 0];
+        }
+
+        $webPush = new WebPush([
+            'VAPID' => [
+                'subject' => $vapid['subject'],
+                'publicKey' => $vapid['public_key'],
+                'privateKey' => $vapid['private_key'],
+            ],
+        ], ['TTL' => (int) config('push.ttl', 3600)], (int) config('push.timeout', 20));
+
+        // Same VAPID JWT for every endpoint origin in this batch
+        $webPush->setReuseVAPIDHeaders(true);
+
+        $payload = $this->buildPayload($notification);
+        $sent = 0;
+        $failed = 0;
+        $expired = [];
+
+        foreach ($subscriptions as $subscription) {
+            try {
+                $webPush->queueNotification(Subscription::create([
+                    'endpoint' => $subscription->endpoint,
+                    'keys' => [
+                        'p256dh' => $subscription->p256dh,
+                        'auth' => $subscription->auth,
+                    ],
+                ]), $payload);
+            } catch (\Exception $e) {
+                Log::error('Error queueing push notification', [
+                    'error' => $e->getMessage(),
+                    'subscription_id' => $subscription->id,
+                    'user_id' => $subscription->user_id
                 ]);
-                return ['sent' => 0, 'failed' => 0];
+                $failed++;
             }
+        }
 
-            // Setup WebPush
-            $auth = [
-                'VAPID' => [
-                    'subject' => $vapidSubject,
-                    'publicKey' => $vapidPublicKey,
-                    'privateKey' => $vapidPrivateKey,
-                ],
-            ];
-
-            $webPush = new WebPush($auth);
-
-            $sent = 0;
-            $failed = 0;
-
-            // Prepare notification payload
-            $payload = json_encode([
-                'title' => $notification->title,
-                'body' => $notification->message ?? $notification->title,
-                'icon' => '/logo-qk.png',
-                'badge' => '/logo-qk.png',
-                'tag' => $notification->type ?? 'kasir-pos-notification',
-                'data' => [
-                    'notification_id' => $notification->id,
-                    'type' => $notification->type,
-                    'resource_type' => $notification->resource_type,
-                    'resource_id' => $notification->resource_id,
-                    'meta' => $notification->meta ?? [],
-                ],
-            ]);
+        $start = hrtime(true);
 
-            // Send to all target users
-            foreach ($targetUsers as $user) {
-                // Get push subscriptions for this user
-                $subscriptions = $this->getUserSubscriptions($user, $notification);
-
-                foreach ($subscriptions as $subscription) {
-                    try {
-                        $pushSubscription = Subscription::create([
-                            'endpoint' => $subscription->endpoint,
-                            'keys' => [
-                                'p256dh' => $subscription->p256dh,
-                                'auth' => $subscription->auth,
-                            ],
-                        ]);
-
-                        $webPush->queueNotification($pushSubscription, $payload);
-                        $sent++;
-                    } catch (\Exception $e) {
-                        Log::error('Error queueing push notification', [
-                            'error' => $e->getMessage(),
-                            'subscription_id' => $subscription->id,
-                            'user_id' => $user->id
-                        ]);
-                        $failed++;
-                    }
-                }
+        $webPush->flushPooled(function (MessageSentReport $report) use (&$sent, &$failed, &$expired) {
+            if ($report->isSuccess()) {
+                $sent++;
+                return;
             }
 
-            // Send all queued notifications
-            $results = $webPush->flush();
-
-            // Check results and remove invalid subscriptions
-            foreach ($results as $result) {
-                if (!$result->isSuccess()) {
-                    Log::warning('Push notification failed', [
-                        'endpoint' => $result->getRequest()->getUri()->__toString(),
-                        'status' => $result->getStatusCode(),
-                        'reason' => $result->getReason()
-                    ]);
-
-                    // Remove invalid subscription
-                    if ($result->isSubscriptionExpired()) {
-                        PushSubscription::where('endpoint', $result->getRequest()->getUri()->__toString())
-                            ->delete();
-                    }
-                }
+            $failed++;
+
+            if ($report->isSubscriptionExpired()) {
+                $expired[] = $report->getEndpoint();
+                return;
             }
 
-            Log::info('Push notification sent', [
-                'notification_id' => $notification->id,
-                'sent' => $sent,
-                'failed' => $failed,
-                'target_users_count' => $targetUsers->count()
+            Log::warning('Push notification failed', [
+                'endpoint' => $report->getEndpoint(),
+                'status' => $report->getResponse()?->getStatusCode(),
+                'reason' => $report->getReason()
             ]);
+        }, max(1, (int) config('push.batch_size', 100)), max(1, (int) config('push.concurrency', 20)));
 
-            return ['sent' => $sent, 'failed' => $failed];
-        } catch (\Exception $e) {
-            Log::error('Error sending push notification', [
-                'error' => $e->getMessage(),
-                'notification_id' => $notification->id
-            ]);
+        $durationMs = (int) round((hrtime(true) - $start) / 1e6);
 
-            return ['sent' => 0, 'failed' => 0];
+        // Remove expired / unsubscribed endpoints (404/410 from the push service)
+        foreach (array_chunk(array_unique($expired), 500) as $endpoints) {
+            PushSubscription::whereIn('endpoint', $endpoints)->delete();
         }
+
+        $this->recordMetrics([
+            'sent' => $sent,
+            'failed' => $failed,
+            'expired' => count($expired),
+            'duration_ms' => $durationMs,
+        ]);
+
+        Log::info('Push notification sent', [
+            'notification_id' => $notification->id,
+            'sent' => $sent,
+            'failed' => $failed,
+            'expired' => count($expired),
+            'subscriptions_count' => $subscriptions->count(),
+            'duration_ms' => $durationMs,
+        ]);
+
+        return ['sent' => $sent, 'failed' => $failed, 'expired' => count($expired)];
+    }
+
+    /**
+     * Add push delivery counters to the current per-minute metrics bucket.
+     *
+     * @param array $counts [metric => int] (sent, failed, expired, coalesced, duration_ms)
+     */
+    public function recordMetrics(array $counts)
+    {
+        $bucket = now()->format('YmdHi');
+
+        foreach ($counts as $metric => $value) {
+            if (!$value) {
+                continue;
+            }
+
+            $key = "push_metrics:{$bucket}:{$metric}";
+            Cache::add($key, 0, now()->addDay());
+            Cache::increment($key, (int) $value);
+        }
+    }
+
+    /**
+     * Per-minute push delivery metrics, newest first.
+     *
+     * @param int $minutes
+     * @return array
+     */
+    public function metrics(int $minutes = 15)
+    {
+        $rows = [];
+
+        for ($i = 0; $i < $minutes; $i++) {
+            $minute = now()->subMinutes($i);
+            $bucket = $minute->format('YmdHi');
+
+            $row = ['minute' => $minute->format('Y-m-d H:i')];
+            foreach (self::METRICS as $metric) {
+                $row[$metric] = (int) Cache::get("push_metrics:{$bucket}:{$metric}", 0);
+            }
+            $row['pushes_per_second'] = $row['duration_ms'] > 0
+                ? round($row['sent'] / ($row['duration_ms'] / 1000), 1)
+                : 0;
+
+            $rows[] = $row;
+        }
+
+        return $rows;
+    }
+
+    /**
+     * Build the Web Push payload of a notification.
+     */
+    private function buildPayload(AppNotification $notification)
+    {
+        return json_encode([
+            'title' => $notification->title,
+            'body' => $notification->message ?? $notification->title,
+            'icon' => '/logo-qk.png',
+            'badge' => '/logo-qk.png',
+            // Same tag per resource: the browser replaces the previous notification of the order
+            'tag' => $notification->resource_type && $notification->resource_id
+                ? "{$notification->resource_type}-{$notification->resource_id}"
+                : ($notification->type ?? 'kasir-pos-notification'),
+            'data' => [
+                'notification_id' => $notification->id,
+                'type' => $notification->type,
+                'resource_type' => $notification->resource_type,
+                'resource_id' => $notification->resource_id,
+                'meta' => $notification->meta ?? [],
+            ],
+        ]);
+    }
+
+    /**
+     * Coalescing key for notifications about a resource (null = never coalesced).
+     */
+    private function coalesceKey(AppNotification $notification)
+    {
+        if (config('push.coalesce_seconds', 3) <= 0 || !$notification->resource_type || !$notification->resource_id) {
+            return null;
+        }
+
+        return "push:coalesce:{$notification->resource_type}:{$notification->resource_id}:{$notification->type}:" . ($notification->user_id ?? 'roles');
     }
 
     /**
@@ -143,7 +248,7 @@ public function sendPushNotification(AppNotification $notification)
      * Only returns users with proper access
      *
      * @param AppNotification $notification
-     * @return \Illuminate\Database\Eloquent\Collection
+     * @return \Illuminate\Database\Eloquent\Builder
      */
     private function getTargetUsers(AppNotification $notification)
     {
@@ -178,19 +283,19 @@ private function getTargetUsers(AppNotification $notification)
         // Only get active users
         $query->where('is_active', true);
 
-        return $query->get();
+        return $query;
     }
 
     /**
-     * ✅ SECURITY: Get push subscriptions for user, filtered by business/outlet
+     * ✅ SECURITY: Get push subscriptions of all target users, filtered by business
+     * One query (target users as a subquery) instead of one query per user
      *
-     * @param User $user
      * @param AppNotification $notification
      * @return \Illuminate\Database\Eloquent\Collection
      */
-    private function getUserSubscriptions(User $user, AppNotification $notification)
+    private function getTargetSubscriptions(AppNotification $notification)
     {
-        $query = PushSubscription::where('user_id', $user->id);
+        $query = PushSubscription::whereIn('user_id', $this->getTargetUsers($notification)->select('users.id'));
 
         // Filter by business if specified
         if ($notification->business_id) {
@@ -200,7 +305,7 @@ private function getUserSubscriptions(User $user, AppNotification $notification)
             });
         }
 
-        return $query->get();
+        return $query->get(['id', 'user_id', 'endpoint', 'p256dh', 'auth']);
     }
 
     /**
@@ -212,11 +317,13 @@ private function getUserSubscriptions(User $user, AppNotification $notification)
      */
     public function createAndSend(array $data)
     {
-        // Create notification
+        // Create notification (role-targeted notifications queue their push on create)
         $notification = AppNotification::create($data);
 
-        // Send push notification to relevant users
-        $this->sendPushNotification($notification);
+        // Queue push for user-specific notifications
+        if (empty($notification->role_targets)) {
+            $this->queuePushNotification($notification);
+        }
 
         return $notification;
     }
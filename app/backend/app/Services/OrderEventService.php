@@ -0,0 +1,145 @@
+<?php
+
+namespace App\Services;
+
+use App\Models\Order;
+use Illuminate\Contracts\Cache\LockTimeoutException;
+use Illuminate\Support\Facades\Cache;
+use Illuminate\Support\Facades\DB;
+use Illuminate\Support\Facades\Log;
+
+class OrderEventService
+{
+    public const CREATED = 'order.created';
+    public const STATUS_CHANGED = 'order.status_changed';
+    public const PAID = 'order.paid';
+
+    /**
+     * Hours events are kept for polling clients to catch up
+     */
+    public const RETENTION_HOURS = 24;
+
+    /**
+     * Publish an order event to the outlet's stream.
+     *
+     * Written after commit so subscribers never see an order that was rolled
+     * back, and the outlet's latest cursor is cached so idle streams can skip
+     * the events query entirely.
+     */
+    public function publish(Order $order, string $type, array $meta = [])
+    {
+        if (!$order->outlet_id) {
+            return;
+        }
+
+        $row = [
+            'business_id' => $order->business_id,
+            'outlet_id' => $order->outlet_id,
+            'order_id' => $order->id,
+            'type' => $type,
+            'payload' => json_encode(array_merge([
+                'order_id' => $order->id,
+                'order_number' => $order->order_number,
+                'type' => $order->type,
+                'status' => $order->status,
+                'payment_status' => $order->payment_status,
+                'table_id' => $order->table_id,
+                'total' => (float) $order->total,
+            ], $meta)),
+            'created_at' => now(),
+        ];
+
+        DB::afterCommit(function () use ($row) {
+            try {
+                $id = DB::table('order_events')->insertGetId($row);
+                $this->advanceCursor($row['outlet_id'], $id);
+            } catch (\Exception $e) {
+                Log::warning('OrderEventService: Failed to publish order event', [
+                    'order_id' => $row['order_id'],
+                    'type' => $row['type'],
+                    'error' => $e->getMessage(),
+                ]);
+            }
+        });
+    }
+
+    /**
+     * Events of an outlet after the given cursor, oldest first.
+     */
+    public function since($outletId, int $cursor, int $limit = 100)
+    {
+        return DB::table('order_events')
+            ->where('outlet_id', $outletId)
+            ->where('id', '>', $cursor)
+            ->orderBy('id')
+            ->limit($limit)
+            ->get()
+            ->map(function ($event) {
+                return [
+                    'id' => (int) $event->id,
+                    'event' => $event->type,
+                    'order_id' => (int) $event->order_id,
+                    'data' => json_decode($event->payload, true),
+                    'created_at' => $event->created_at,
+                ];
+            });
+    }
+
+    /**
+     * Latest event id of an outlet (0 when there are none).
+     */
+    public function latestCursor($outletId)
+    {
+        return (int) Cache::rememberForever(self::cursorKey($outletId), function () use ($outletId) {
+            return DB::table('order_events')->where('outlet_id', $outletId)->max('id') ?? 0;
+        });
+    }
+
+    /**
+     * Whether a cursor points before the retained events (client must refetch everything).
+     */
+    public function isExpired(int $cursor)
+    {
+        if ($cursor <= 0) {
+            return false;
+        }
+
+        $oldest = DB::table('order_events')->min('id');
+
+        return $oldest !== null && $cursor < $oldest - 1;
+    }
+
+    public function prune()
+    {
+        return DB::table('order_events')
+            ->where('created_at', '<', now()->subHours(self::RETENTION_HOURS))
+            ->delete();
+    }
+
+    /**
+     * Move the cached cursor of an outlet forward, never back: publishes of
+     * concurrent requests can finish in any order.
+     */
+    private function advanceCursor($outletId, int $id)
+    {
+        $key = self::cursorKey($outletId);
+
+        try {
+            Cache::lock("{$key}:lock", 5)->block(2, function () use ($key, $id) {
+                $current = Cache::get($key);
+
+                // Not cached: latestCursor() reads the max id from the table
+                if ($current !== null && $id > (int) $current) {
+                    Cache::forever($key, $id);
+                }
+            });
+        } catch (LockTimeoutException $e) {
+            Cache::forget($key);
+        }
+    }
+
+    public static function cursorKey($outletId)
+    {
+        return "order_events:outlet:{$outletId}:cursor";
+    }
+}
@@ -0,0 +1,72 @@
+<?php
+
+namespace App\Services;
+
+use App\Models\OutletSetting;
+use Illuminate\Support\Facades\Cache;
+use Illuminate\Support\Facades\DB;
+
+class OutletSettingsService
+{
+    /**
+     * Snapshots already resolved in this request / job [outlet_id => [key => value]]
+     */
+    protected $snapshots = [];
+
+    /**
+     * All settings of an outlet as [setting_key => typed value].
+     *
+     * One outlet_settings query per outlet per cache version; afterwards the
+     * snapshot is served from the cache and memoized for the request.
+     */
+    public function all($outletId)
+    {
+        $outletId = (int) $outletId;
+
+        if (isset($this->snapshots[$outletId])) {
+            return $this->snapshots[$outletId];
+        }
+
+        $version = (int) Cache::get(self::versionKey($outletId), 1);
+
+        return $this->snapshots[$outletId] = Cache::remember(
+            "outlet_settings:{$outletId}:v{$version}",
+            86400,
+            fn () => OutletSetting::where('outlet_id', $outletId)
+                ->get(['setting_key', 'setting_value', 'data_type'])
+                ->mapWithKeys(fn ($setting) => [$setting->setting_key => $setting->getValueAttribute()])
+                ->all()
+        );
+    }
+
+    public function get($outletId, $key, $default = null)
+    {
+        return array_key_exists($key, $snapshot = $this->all($outletId))
+            ? $snapshot[$key]
+            : $default;
+    }
+
+    /**
+     * Invalidate an outlet's snapshot by bumping its cache version.
+     *
+     * Deferred until commit so a concurrent request cannot cache the old
+     * rows under the new version.
+     */
+    public function forget($outletId)
+    {
+        $outletId = (int) $outletId;
+        unset($this->snapshots[$outletId]);
+
+        DB::afterCommit(function () use ($outletId) {
+            $key = self::versionKey($outletId);
+            Cache::add($key, 1);
+            Cache::increment($key);
+            unset($this->snapshots[$outletId]);
+        });
+    }
+
+    public static function versionKey($outletId)
+    {
+        return "outlet_settings:{$outletId}:version";
+    }
+}
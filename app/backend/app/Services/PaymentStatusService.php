@@ -0,0 +1,185 @@
+<?php
+
+namespace App\Services;
+
+use App\Jobs\ProcessMidtransEvents;
+use App\Models\MidtransEvent;
+use App\Models\Payment;
+use Illuminate\Contracts\Cache\LockTimeoutException;
+use Illuminate\Support\Facades\Cache;
+use Illuminate\Support\Facades\DB;
+use Illuminate\Support\Facades\Log;
+
+/**
+ * Payment status channel for checkout screens.
+ *
+ * Every status change of a payment (webhook worker, cash, cancel, ...) bumps
+ * a cached version; clients long-poll on that version instead of asking
+ * Midtrans. Checks that do need Midtrans share one upstream call per
+ * payment and feed the result into the webhook event pipeline.
+ */
+class PaymentStatusService
+{
+    /**
+     * Midtrans transaction statuses worth recording as an event
+     */
+    private const FINAL_TRANSACTION_STATUSES = ['settlement', 'capture', 'cancel', 'deny', 'expire'];
+
+    private const POLL_INTERVAL_MICROSECONDS = 500000;
+
+    /**
+     * Current status version of a payment (0 until its first change)
+     */
+    public function version($paymentId)
+    {
+        return (int) Cache::get(self::versionKey($paymentId), 0);
+    }
+
+    /**
+     * Wake up long-polls of a payment once the change is committed
+     */
+    public function publish($paymentId)
+    {
+        DB::afterCommit(function () use ($paymentId) {
+            $key = self::versionKey($paymentId);
+            Cache::add($key, 0, now()->addDay());
+            Cache::increment($key);
+        });
+    }
+
+    /**
+     * Hold until the payment status version passes $since, the payment is no
+     * longer pending or $timeout seconds elapsed.
+     *
+     * A webhook that never arrived (local setups, gateway incidents) is covered
+     * by one coalesced upstream check per wait.
+     */
+    public function wait(Payment $payment, int $since, int $timeout)
+    {
+        $deadline = microtime(true) + $timeout;
+        $version = $this->version($payment->id);
+
+        if ($version <= $since && $payment->status === 'pending') {
+            $this->reconcile($payment);
+            $payment->refresh();
+            $version = $this->version($payment->id);
+        }
+
+        while ($version <= $since && $payment->status === 'pending' && microtime(true) < $deadline && !connection_aborted()) {
+            usleep(self::POLL_INTERVAL_MICROSECONDS);
+
+            $current = $this->version($payment->id);
+            if ($current > $version) {
+                $version = $current;
+                $payment->refresh();
+            }
+        }
+
+        return $this->snapshot($payment->load('order'), $version);
+    }
+
+    /**
+     * Ask Midtrans for a pending payment and apply a final status through the
+     * webhook pipeline (deduplicated with the webhook's own event).
+     *
+     * @return array|null Midtrans transaction status
+     */
+    public function reconcile(Payment $payment)
+    {
+        if ($payment->status !== 'pending' || !$payment->reference_number) {
+            return null;
+        }
+
+        $status = $this->upstreamStatus($payment);
+
+        if (!in_array($status['transaction_status'] ?? null, self::FINAL_TRANSACTION_STATUSES, true)) {
+            return $status;
+        }
+
+        $payment->loadMissing('order.outlet');
+        $webhooks = app(MidtransWebhookService::class);
+        $target = $webhooks->orderTarget($payment);
+
+        $webhooks->record($status, MidtransEvent::TYPE_ORDER, $target);
+
+        // Apply right away for the waiting cashier; the queued job covers the
+        // case where a worker currently holds this order
+        ProcessMidtransEvents::dispatchSync($target['order_key']);
+
+        return $status;
+    }
+
+    /**
+     * Midtrans transaction status, shared by all concurrent checks of a payment.
+     *
+     * One request per payment calls Midtrans (others wait on the lock) and the
+     * answer is reused for midtrans.status.check_interval seconds.
+     *
+     * @return array|null
+     */
+    public function upstreamStatus(Payment $payment)
+    {
+        $key = "payment_status:{$payment->id}:upstream";
+
+        if (is_array($cached = Cache::get($key))) {
+            return $cached;
+        }
+
+        try {
+            return Cache::lock("{$key}:lock", 30)->block(15, function () use ($key, $payment) {
+                if (is_array($cached = Cache::get($key))) {
+                    return $cached;
+                }
+
+                try {
+                    $payment->loadMissing('order.outlet');
+                    $status = MidtransService::forOutlet($payment->order->outlet)
+                        ->getTransactionStatus($payment->reference_number);
+                    $status = json_decode(json_encode($status), true);
+                } catch (\Exception $e) {
+                    // Not created yet / gateway error: cached too, so every client doesn't retry it
+                    $status = ['transaction_status' => null, 'error' => $e->getMessage()];
+                }
+
+                Cache::put($key, $status, (int) config('midtrans.status.check_interval', 15));
+
+                return $status;
+            });
+        } catch (LockTimeoutException $e) {
+            Log::warning('PaymentStatusService: Timed out waiting for upstream status', [
+                'payment_id' => $payment->id,
+            ]);
+
+            return null;
+        }
+    }
+
+    /**
+     * Status payload returned to clients
+     */
+    public function snapshot(Payment $payment, ?int $version = null)
+    {
+        $order = $payment->order;
+
+        return [
+            'payment_id' => $payment->id,
+            'status' => $payment->status,
+            'transaction_status' => $payment->status === 'success'
+                ? 'settlement'
+                : ($payment->payment_data['transaction_status'] ?? $payment->status),
+            'paid_at' => $payment->paid_at,
+            'version' => $version ?? $this->version($payment->id),
+            'order' => $order ? [
+                'id' => $order->id,
+                'order_number' => $order->order_number,
+                'status' => $order->status,
+                'payment_status' => $order->payment_status,
+            ] : null,
+        ];
+    }
+
+    public static function versionKey($paymentId)
+    {
+        return "payment_status:{$paymentId}:version";
+    }
+}
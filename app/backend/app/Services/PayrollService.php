@@ -9,11 +9,27 @@
 use App\Models\Order;
 use App\Models\Outlet;
 use Carbon\Carbon;
+use Illuminate\Support\Collection;
 use Illuminate\Support\Facades\DB;
 use Illuminate\Support\Facades\Log;
 
 class PayrollService
 {
+    /**
+     * Order statuses whose paid sales count towards commission
+     */
+    public const COMMISSION_ORDER_STATUSES = ['completed', 'confirmed', 'preparing', 'ready'];
+
+    /**
+     * Employees per upsert/transaction in the bulk engine
+     */
+    public const BULK_CHUNK = 100;
+
+    /**
+     * Rows per page when streaming the shifts of a month
+     */
+    private const SHIFT_CHUNK = 1000;
+
     /**
      * Calculate payroll for an employee for a specific period
      */
@@ -25,9 +41,6 @@ public function calculatePayroll($employeeId, $year, $month, $options = [])
         $periodStart = Carbon::create($year, $month, 1)->startOfMonth();
         $periodEnd = $periodStart->copy()->endOfMonth();
 
-        // Get base salary
-        $baseSalary = $employee->salary ?? 0;
-
         // Get attendance data
         $shifts = EmployeeShift::where('user_id', $employee->user_id)
             ->where('business_id', $employee->business_id)
@@ -35,32 +48,57 @@ public function calculatePayroll($employeeId, $year, $month, $options = [])
             ->get();
 
         // ✅ NEW: Get working days configuration from outlet
-        // Try to get from primary outlet or first outlet from shifts
-        $workingDays = [1, 2, 3, 4, 5]; // Default: Monday-Friday
-        $outlet = null;
-
         // Try to get outlet from employee's primary outlet or first shift
         $primaryOutlet = \App\Models\EmployeeOutlet::where('user_id', $employee->user_id)
             ->where('business_id', $employee->business_id)
             ->where('is_primary', true)
             ->first();
 
-        if ($primaryOutlet) {
-            $outlet = Outlet::find($primaryOutlet->outlet_id);
-        } elseif ($shifts->isNotEmpty()) {
-            // Fallback: get outlet from first shift
-            $outlet = Outlet::find($shifts->first()->outlet_id);
-        }
+        $outletId = $primaryOutlet ? $primaryOutlet->outlet_id : $shifts->first()?->outlet_id;
+        $outlet = $outletId ? Outlet::find($outletId) : null;
 
-        if ($outlet && $outlet->working_days) {
-            $workingDays = is_array($outlet->working_days)
-                ? $outlet->working_days
-                : json_decode($outlet->working_days, true);
-            if (!is_array($workingDays) || empty($workingDays)) {
-                $workingDays = [1, 2, 3, 4, 5]; // Fallback to default
-            }
+        // Calculate commission base (from orders in the period)
+        $orders = collect();
+        if ($employee->commission_rate > 0) {
+            $orders = Order::where('employee_id', $employee->id)
+                ->where('business_id', $employee->business_id)
+                ->where('payment_status', 'paid')
+                ->whereIn('status', self::COMMISSION_ORDER_STATUSES)
+                ->whereBetween('created_at', [$periodStart, $periodEnd])
+                ->whereNull('deleted_at')
+                ->get();
         }
 
+        $calculation = $this->computePayroll(
+            $employee,
+            $shifts,
+            $this->workingDays($outlet?->working_days),
+            $orders->sum('total'),
+            $year,
+            $month,
+            $options
+        );
+        $calculation['orders'] = $orders;
+
+        return $calculation;
+    }
+
+    /**
+     * Payroll figures of one employee from already loaded data.
+     *
+     * @param Collection $shifts EmployeeShift models of the period
+     * @param array $workingDays days of week (0=Sunday ... 6=Saturday)
+     * @param float $totalSales paid sales of the employee in the period (commission base)
+     */
+    public function computePayroll(Employee $employee, Collection $shifts, array $workingDays, $totalSales, $year, $month, $options = [])
+    {
+        // Get period dates
+        $periodStart = Carbon::create($year, $month, 1)->startOfMonth();
+        $periodEnd = $periodStart->copy()->endOfMonth();
+
+        // Get base salary
+        $baseSalary = $employee->salary ?? 0;
+
         // ✅ NEW: Calculate expected working days based on working_days configuration
         $expectedWorkingDays = 0;
         $currentDate = $periodStart->copy();
@@ -206,15 +244,6 @@ public function calculatePayroll($employeeId, $year, $month, $options = [])
         // Calculate commission (from orders in the period)
         $commission = 0;
         if ($employee->commission_rate > 0) {
-            $orders = Order::where('employee_id', $employee->id)
-                ->where('business_id', $employee->business_id)
-                ->where('payment_status', 'paid')
-                ->whereIn('status', ['completed', 'confirmed', 'preparing', 'ready'])
-                ->whereBetween('created_at', [$periodStart, $periodEnd])
-                ->whereNull('deleted_at')
-                ->get();
-
-            $totalSales = $orders->sum('total');
             $commission = $totalSales * ($employee->commission_rate / 100);
         }
 
@@ -270,7 +299,6 @@ public function calculatePayroll($employeeId, $year, $month, $options = [])
             'incomplete_shifts' => $incompleteShifts, // ✅ NEW: Shifts without clock_out
             'incomplete_shifts_count' => count($incompleteShifts), // ✅ NEW: Count of incomplete shifts
             'shifts' => $shifts,
-            'orders' => $orders ?? collect(),
         ];
     }
 
@@ -294,35 +322,7 @@ public function generatePayroll($employeeId, $year, $month, $options = [])
             if ($existingPayroll) {
                 // Update existing payroll
                 $payroll = $existingPayroll;
-                $payroll->update([
-                    'period_start' => $calculation['period_start'],
-                    'period_end' => $calculation['period_end'],
-                    'base_salary' => $calculation['base_salary'],
-                    'pro_rated_base_salary' => $calculation['pro_rated_base_salary'] ?? $calculation['base_salary'], // ✅ NEW: Use pro-rated if available
-                    'expected_working_days' => $calculation['expected_working_days'] ?? $calculation['total_working_days'], // ✅ NEW: Expected working days
-                    'actual_working_days' => $calculation['actual_working_days'] ?? $calculation['total_working_days'], // ✅ NEW: Actual working days
-                    'overtime_hours' => $calculation['overtime_hours'],
-                    'overtime_pay' => $calculation['overtime_pay'],
-                    'commission' => $calculation['commission'],
-                    'bonus' => $calculation['bonus'],
-                    'allowance' => $calculation['allowance'],
-                    'late_count' => $calculation['late_count'],
-                    'late_penalty' => $calculation['late_penalty'],
-                    'late_penalty_per_occurrence' => $calculation['late_penalty_per_occurrence'],
-                    'absent_count' => $calculation['absent_count'],
-                    'absent_penalty' => $calculation['absent_penalty'],
-                    'absent_penalty_per_day' => $calculation['absent_penalty_per_day'],
-                    'other_deductions' => $calculation['other_deductions'],
-                    'gross_salary' => $calculation['gross_salary'],
-                    'total_deductions' => $calculation['total_deductions'],
-                    'net_salary' => $calculation['net_salary'],
-                    'total_working_days' => $calculation['total_working_days'],
-                    'present_days' => $calculation['present_days'],
-                    'absent_days' => $calculation['absent_days'],
-                    'total_working_hours' => $calculation['total_working_hours'],
-                    'status' => 'calculated',
-                    'notes' => $options['notes'] ?? null,
-                ]);
+                $payroll->update($this->payrollAttributes($calculation, $options));
 
                 // Delete old items
                 $payroll->items()->delete();
@@ -338,145 +338,16 @@ public function generatePayroll($employeeId, $year, $month, $options = [])
                     'business_id' => $employee->business_id,
                     'employee_id' => $employeeId,
                     'payroll_number' => $payrollNumber,
-                    'period_start' => $calculation['period_start'],
-                    'period_end' => $calculation['period_end'],
                     'year' => $year,
                     'month' => $month,
-                    'base_salary' => $calculation['base_salary'],
-                    'pro_rated_base_salary' => $calculation['pro_rated_base_salary'] ?? $calculation['base_salary'], // ✅ NEW: Use pro-rated if available
-                    'expected_working_days' => $calculation['expected_working_days'] ?? $calculation['total_working_days'], // ✅ NEW: Expected working days
-                    'actual_working_days' => $calculation['actual_working_days'] ?? $calculation['total_working_days'], // ✅ NEW: Actual working days
-                    'overtime_hours' => $calculation['overtime_hours'],
-                    'overtime_pay' => $calculation['overtime_pay'],
-                    'commission' => $calculation['commission'],
-                    'bonus' => $calculation['bonus'],
-                    'allowance' => $calculation['allowance'],
-                    'late_count' => $calculation['late_count'],
-                    'late_penalty' => $calculation['late_penalty'],
-                    'late_penalty_per_occurrence' => $calculation['late_penalty_per_occurrence'],
-                    'absent_count' => $calculation['absent_count'],
-                    'absent_penalty' => $calculation['absent_penalty'],
-                    'absent_penalty_per_day' => $calculation['absent_penalty_per_day'],
-                    'other_deductions' => $calculation['other_deductions'],
-                    'gross_salary' => $calculation['gross_salary'],
-                    'total_deductions' => $calculation['total_deductions'],
-                    'net_salary' => $calculation['net_salary'],
-                    'total_working_days' => $calculation['total_working_days'],
-                    'present_days' => $calculation['present_days'],
-                    'absent_days' => $calculation['absent_days'],
-                    'total_working_hours' => $calculation['total_working_hours'],
-                    'status' => 'calculated',
-                    'notes' => $options['notes'] ?? null,
-                ]);
+                ] + $this->payrollAttributes($calculation, $options));
             }
 
             // Create payroll items for detailed breakdown
-            $items = [];
-
-            // Earnings
-            if ($calculation['base_salary'] > 0) {
-                $items[] = [
-                    'payroll_id' => $payroll->id,
-                    'type' => 'earning',
-                    'category' => 'base_salary',
-                    'description' => 'Gaji Pokok',
-                    'amount' => $calculation['base_salary'],
-                    'quantity' => 1,
-                    'rate' => $calculation['base_salary'],
-                ];
-            }
-
-            if ($calculation['overtime_pay'] > 0) {
-                $items[] = [
-                    'payroll_id' => $payroll->id,
-                    'type' => 'earning',
-                    'category' => 'overtime',
-                    'description' => "Lembur ({$calculation['overtime_hours']} jam)",
-                    'amount' => $calculation['overtime_pay'],
-                    'quantity' => $calculation['overtime_hours'],
-                    'rate' => $options['overtime_rate'] ?? ($calculation['base_salary'] > 0 ? ($calculation['base_salary'] / 30 / 8 * 1.5) : 10000),
-                ];
-            }
-
-            if ($calculation['commission'] > 0) {
-                $items[] = [
-                    'payroll_id' => $payroll->id,
-                    'type' => 'earning',
-                    'category' => 'commission',
-                    'description' => "Komisi ({$employee->commission_rate}%)",
-                    'amount' => $calculation['commission'],
-                    'quantity' => 1,
-                    'rate' => $calculation['commission'],
-                ];
-            }
-
-            if ($calculation['bonus'] > 0) {
-                $items[] = [
-                    'payroll_id' => $payroll->id,
-                    'type' => 'earning',
-                    'category' => 'bonus',
-                    'description' => 'Bonus',
-                    'amount' => $calculation['bonus'],
-                    'quantity' => 1,
-                    'rate' => $calculation['bonus'],
-                ];
-            }
-
-            if ($calculation['allowance'] > 0) {
-                $items[] = [
-                    'payroll_id' => $payroll->id,
-                    'type' => 'earning',
-                    'category' => 'allowance',
-                    'description' => 'Tunjangan',
-                    'amount' => $calculation['allowance'],
-                    'quantity' => 1,
-                    'rate' => $calculation['allowance'],
-                ];
-            }
-
-            // Deductions
-            if ($calculation['late_penalty'] > 0) {
-                foreach ($calculation['shifts']->where('status', 'late') as $shift) {
-                    $items[] = [
-                        'payroll_id' => $payroll->id,
-                        'type' => 'deduction',
-                        'category' => 'late_penalty',
-                        'description' => "Denda Terlambat - " . Carbon::parse($shift->shift_date)->format('d/m/Y'),
-                        'amount' => $calculation['late_penalty_per_occurrence'],
-                        'quantity' => 1,
-                        'rate' => $calculation['late_penalty_per_occurrence'],
-                        'date' => $shift->shift_date,
-                    ];
-                }
-            }
-
-            if ($calculation['absent_penalty'] > 0) {
-                foreach ($calculation['shifts']->where('status', 'absent') as $shift) {
-                    $items[] = [
-                        'payroll_id' => $payroll->id,
-                        'type' => 'deduction',
-                        'category' => 'absent_penalty',
-                        'description' => "Denda Tidak Hadir - " . Carbon::parse($shift->shift_date)->format('d/m/Y'),
-                        'amount' => $calculation['absent_penalty_per_day'],
-                        'quantity' => 1,
-                        'rate' => $calculation['absent_penalty_per_day'],
-                        'date' => $shift->shift_date,
-                    ];
-                }
-            }
-
-            if ($calculation['other_deductions'] > 0) {
-                $items[] = [
-                    'payroll_id' => $payroll->id,
-                    'type' => 'deduction',
-                    'category' => 'other',
-                    'description' => 'Potongan Lainnya',
-                    'amount' => $calculation['other_deductions'],
-                    'quantity' => 1,
-                    'rate' => $calculation['other_deductions'],
-                    'notes' => $options['other_deductions_notes'] ?? null,
-                ];
-            }
+            $items = array_map(
+                fn ($item) => ['payroll_id' => $payroll->id] + $item,
+                $this->payrollItems($calculation, $employee, $options)
+            );
 
             // Bulk insert items
             if (!empty($items)) {
@@ -495,25 +366,309 @@ public function generatePayroll($employeeId, $year, $month, $options = [])
 
     /**
      * Generate payrolls for all employees in a business for a specific period
+     *
+     * @param callable|null $progress fn (int $done, int $total) after every chunk of employees
+     */
+    public function generatePayrollsForAll($businessId, $year, $month, $options = [], ?callable $progress = null)
+    {
+        $payrollIds = $this->generateBulk($businessId, $year, $month, $options, $progress);
+
+        return Payroll::with(['employee.user', 'items'])
+            ->whereIn('id', $payrollIds)
+            ->orderBy('id')
+            ->get()
+            ->all();
+    }
+
+    /**
+     * Bulk payroll engine: payrolls of all active employees with a constant number of reads.
+     *
+     * Shifts of the whole business/month are streamed once (keyset paginated)
+     * and grouped by user in memory, primary outlets, working days, commission
+     * sales and existing payrolls are one query each. Payrolls are then upserted
+     * and their items bulk inserted per chunk of BULK_CHUNK employees, each
+     * chunk in its own transaction. Returns the payroll ids.
+     *
+     * @param callable|null $progress fn (int $done, int $total) after every chunk of employees
      */
-    public function generatePayrollsForAll($businessId, $year, $month, $options = [])
+    public function generateBulk($businessId, $year, $month, $options = [], ?callable $progress = null)
     {
+        $periodStart = Carbon::create($year, $month, 1)->startOfMonth();
+        $periodEnd = $periodStart->copy()->endOfMonth();
+
         $employees = Employee::where('business_id', $businessId)
             ->where('is_active', true)
+            ->orderBy('id')
             ->get();
 
-        $payrolls = [];
-        foreach ($employees as $employee) {
-            try {
-                $payroll = $this->generatePayroll($employee->id, $year, $month, $options);
-                $payrolls[] = $payroll;
-            } catch (\Exception $e) {
-                Log::error("Error generating payroll for employee {$employee->id}: " . $e->getMessage());
-                continue;
+        $total = $employees->count();
+
+        if ($total === 0) {
+            if ($progress) {
+                $progress(0, 0);
             }
+            return [];
         }
 
-        return $payrolls;
+        $shiftsByUser = [];
+        EmployeeShift::where('business_id', $businessId)
+            ->whereBetween('shift_date', [$periodStart, $periodEnd])
+            ->lazyById(self::SHIFT_CHUNK)
+            ->each(function ($shift) use (&$shiftsByUser) {
+                $shiftsByUser[$shift->user_id][] = $shift;
+            });
+
+        $primaryOutlets = \App\Models\EmployeeOutlet::where('business_id', $businessId)
+            ->where('is_primary', true)
+            ->orderBy('id')
+            ->get(['user_id', 'outlet_id'])
+            ->unique('user_id')
+            ->pluck('outlet_id', 'user_id');
+
+        $outletWorkingDays = Outlet::where('business_id', $businessId)->get(['id', 'working_days'])->pluck('working_days', 'id');
+
+        $commissionEmployeeIds = $employees->where('commission_rate', '>', 0)->pluck('id')->all();
+        $sales = empty($commissionEmployeeIds) ? collect() : Order::where('business_id', $businessId)
+            ->whereIn('employee_id', $commissionEmployeeIds)
+            ->where('payment_status', 'paid')
+            ->whereIn('status', self::COMMISSION_ORDER_STATUSES)
+            ->whereBetween('created_at', [$periodStart, $periodEnd])
+            ->groupBy('employee_id')
+            ->selectRaw('employee_id, SUM(total) as total_sales')
+            ->toBase()
+            ->pluck('total_sales', 'employee_id');
+
+        $existingNumbers = Payroll::whereIn('employee_id', $employees->pluck('id'))
+            ->where('year', $year)
+            ->where('month', $month)
+            ->orderBy('id')
+            ->get(['employee_id', 'payroll_number'])
+            ->unique('employee_id')
+            ->pluck('payroll_number', 'employee_id');
+
+        // Numbers already taken in this period, including soft-deleted payrolls (payroll_number is unique)
+        $takenNumbers = array_flip(Payroll::withTrashed()
+            ->where('business_id', $businessId)
+            ->where('year', $year)
+            ->where('month', $month)
+            ->pluck('payroll_number')
+            ->all());
+        $sequence = count($takenNumbers);
+
+        $payrollIds = [];
+        $done = 0;
+
+        foreach ($employees->chunk(self::BULK_CHUNK) as $chunk) {
+            $rows = [];
+            $items = [];
+
+            foreach ($chunk as $employee) {
+                try {
+                    $shifts = collect($shiftsByUser[$employee->user_id] ?? []);
+                    $outletId = $primaryOutlets[$employee->user_id] ?? $shifts->first()?->outlet_id;
+
+                    $calculation = $this->computePayroll(
+                        $employee,
+                        $shifts,
+                        $this->workingDays($outletId ? ($outletWorkingDays[$outletId] ?? null) : null),
+                        (float) ($sales[$employee->id] ?? 0),
+                        $year,
+                        $month,
+                        $options
+                    );
+                } catch (\Exception $e) {
+                    Log::error("Error generating payroll for employee {$employee->id}: " . $e->getMessage());
+                    continue;
+                }
+
+                $number = $existingNumbers[$employee->id] ?? null;
+                if (!$number) {
+                    do {
+                        $number = "PR-{$businessId}-{$year}-{$month}-" . str_pad(++$sequence, 4, '0', STR_PAD_LEFT);
+                    } while (isset($takenNumbers[$number]));
+                    $takenNumbers[$number] = true;
+                }
+
+                $rows[$number] = [
+                    'business_id' => $businessId,
+                    'employee_id' => $employee->id,
+                    'payroll_number' => $number,
+                    'year' => $year,
+                    'month' => $month,
+                ] + $this->payrollAttributes($calculation, $options);
+                $items[$number] = $this->payrollItems($calculation, $employee, $options);
+            }
+
+            if (!empty($rows)) {
+                array_push($payrollIds, ...$this->writePayrolls($rows, $items));
+            }
+
+            $done += $chunk->count();
+            if ($progress) {
+                $progress($done, $total);
+            }
+        }
+
+        return $payrollIds;
     }
-}
 
+    /**
+     * Upsert a chunk of payroll rows (keyed by payroll_number) and replace their items
+     */
+    private function writePayrolls(array $rows, array $items)
+    {
+        return DB::transaction(function () use ($rows, $items) {
+            $update = array_values(array_diff(
+                array_keys(reset($rows)),
+                ['business_id', 'employee_id', 'payroll_number', 'year', 'month']
+            ));
+
+            Payroll::upsert(array_values($rows), ['payroll_number'], $update);
+
+            $ids = Payroll::whereIn('payroll_number', array_keys($rows))->pluck('id', 'payroll_number');
+
+            PayrollItem::whereIn('payroll_id', $ids->values())->delete();
+
+            $now = now();
+            $itemRows = [];
+            foreach ($items as $number => $payrollItems) {
+                foreach ($payrollItems as $item) {
+                    $itemRows[] = ['payroll_id' => $ids[$number]] + $item + ['created_at' => $now, 'updated_at' => $now];
+                }
+            }
+
+            foreach (array_chunk($itemRows, 1000) as $chunk) {
+                PayrollItem::insert($chunk);
+            }
+
+            return $ids->values()->all();
+        });
+    }
+
+    /**
+     * Payroll columns of a calculation (shared by generatePayroll and the bulk engine)
+     */
+    private function payrollAttributes(array $calculation, array $options)
+    {
+        return [
+            'period_start' => $calculation['period_start']->toDateString(),
+            'period_end' => $calculation['period_end']->toDateString(),
+            'base_salary' => $calculation['base_salary'],
+            'overtime_hours' => $calculation['overtime_hours'],
+            'overtime_pay' => $calculation['overtime_pay'],
+            'commission' => $calculation['commission'],
+            'bonus' => $calculation['bonus'],
+            'allowance' => $calculation['allowance'],
+            'late_count' => $calculation['late_count'],
+            'late_penalty' => $calculation['late_penalty'],
+            'late_penalty_per_occurrence' => $calculation['late_penalty_per_occurrence'],
+            'absent_count' => $calculation['absent_count'],
+            'absent_penalty' => $calculation['absent_penalty'],
+            'absent_penalty_per_day' => $calculation['absent_penalty_per_day'],
+            'other_deductions' => $calculation['other_deductions'],
+            'gross_salary' => $calculation['gross_salary'],
+            'total_deductions' => $calculation['total_deductions'],
+            'net_salary' => $calculation['net_salary'],
+            'total_working_days' => $calculation['total_working_days'],
+            'present_days' => $calculation['present_days'],
+            'absent_days' => $calculation['absent_days'],
+            'total_working_hours' => $calculation['total_working_hours'],
+            'status' => 'calculated',
+            'notes' => $options['notes'] ?? null,
+        ];
+    }
+
+    /**
+     * Payroll item rows (without payroll_id) of a calculation.
+     * Every row has the same columns so they can be inserted in one statement.
+     */
+    private function payrollItems(array $calculation, Employee $employee, array $options)
+    {
+        $items = [];
+        $item = function ($type, $category, $description, $amount, $quantity, $rate, $date = null, $notes = null) use (&$items) {
+            $items[] = compact('type', 'category', 'description', 'amount', 'quantity', 'rate', 'date', 'notes');
+        };
+
+        // Earnings
+        if ($calculation['base_salary'] > 0) {
+            $item('earning', 'base_salary', 'Gaji Pokok', $calculation['base_salary'], 1, $calculation['base_salary']);
+        }
+
+        if ($calculation['overtime_pay'] > 0) {
+            $item(
+                'earning',
+                'overtime',
+                "Lembur ({$calculation['overtime_hours']} jam)",
+                $calculation['overtime_pay'],
+                $calculation['overtime_hours'],
+                $options['overtime_rate'] ?? ($calculation['base_salary'] > 0 ? ($calculation['base_salary'] / 30 / 8 * 1.5) : 10000)
+            );
+        }
+
+        if ($calculation['commission'] > 0) {
+            $item('earning', 'commission', "Komisi ({$employee->commission_rate}%)", $calculation['commission'], 1, $calculation['commission']);
+        }
+
+        if ($calculation['bonus'] > 0) {
+            $item('earning', 'bonus', 'Bonus', $calculation['bonus'], 1, $calculation['bonus']);
+        }
+
+        if ($calculation['allowance'] > 0) {
+            $item('earning', 'allowance', 'Tunjangan', $calculation['allowance'], 1, $calculation['allowance']);
+        }
+
+        // Deductions
+        if ($calculation['late_penalty'] > 0) {
+            foreach ($calculation['shifts']->where('status', 'late') as $shift) {
+                $item(
+                    'deduction',
+                    'late_penalty',
+                    "Denda Terlambat - " . Carbon::parse($shift->shift_date)->format('d/m/Y'),
+                    $calculation['late_penalty_per_occurrence'],
+                    1,
+                    $calculation['late_penalty_per_occurrence'],
+                    Carbon::parse($shift->shift_date)->toDateString()
+                );
+            }
+        }
+
+        if ($calculation['absent_penalty'] > 0) {
+            foreach ($calculation['shifts']->where('status', 'absent') as $shift) {
+                $item(
+                    'deduction',
+                    'absent_penalty',
+                    "Denda Tidak Hadir - " . Carbon::parse($shift->shift_date)->format('d/m/Y'),
+                    $calculation['absent_penalty_per_day'],
+                    1,
+                    $calculation['absent_penalty_per_day'],
+                    Carbon::parse($shift->shift_date)->toDateString()
+                );
+            }
+        }
+
+        if ($calculation['other_deductions'] > 0) {
+            $item(
+                'deduction',
+                'other',
+                'Potongan Lainnya',
+                $calculation['other_deductions'],
+                1,
+                $calculation['other_deductions'],
+                null,
+                $options['other_deductions_notes'] ?? null
+            );
+        }
+
+        return $items;
+    }
+
+    /**
+     * Working days of an outlet config (array or JSON), Monday-Friday by default
+     */
+    private function workingDays($config)
+    {
+        $workingDays = is_array($config) ? $config : json_decode($config ?? '', true);
+
+        return is_array($workingDays) && !empty($workingDays) ? $workingDays : [1, 2, 3, 4, 5];
+    }
+}
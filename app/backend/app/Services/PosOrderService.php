@@ -0,0 +1,397 @@
+<?php
+
+namespace App\Services;
+
+use App\Models\AppNotification;
+use App\Models\Business;
+use App\Models\CashierShift;
+use App\Models\Employee;
+use App\Models\Order;
+use App\Models\Outlet;
+use App\Models\Table;
+use App\Models\User;
+use Carbon\Carbon;
+use Illuminate\Database\UniqueConstraintViolationException;
+use Illuminate\Support\Facades\DB;
+use Illuminate\Support\Facades\Log;
+use Illuminate\Support\Facades\Validator;
+use Illuminate\Support\Str;
+
+/**
+ * Creating POS orders, one at a time (POST /orders) or as a batch of orders
+ * queued offline (POST /orders/batch).
+ *
+ * Every order may carry a client_uuid generated by the POS when the order was
+ * made. It is unique per business, so replaying an order (lost response, sync
+ * retried after a crash) returns the existing order instead of a duplicate.
+ * A batch resolves outlet, employee and shift once, checks all referenced
+ * rows with one query per table and writes BATCH_CHUNK orders per
+ * transaction, each order in its own savepoint so one bad order does not
+ * fail the others.
+ */
+class PosOrderService
+{
+    /**
+     * Most orders accepted by one batch request
+     */
+    public const BATCH_LIMIT = 500;
+
+    /**
+     * Orders written per transaction
+     */
+    public const BATCH_CHUNK = 50;
+
+    /**
+     * Structure of one order (existence of products/customers/tables is checked separately)
+     */
+    public const RULES = [
+        'client_uuid' => 'nullable|uuid',
+        'customer_id' => 'nullable|integer',
+        'table_id' => 'nullable|integer',
+        'queue_number' => 'nullable|string|max:20',
+        'items' => 'required|array|min:1',
+        'items.*.product_id' => 'required|integer',
+        'items.*.quantity' => 'required|integer|min:1',
+        'items.*.price' => 'required|numeric|min:0',
+        'discount' => 'nullable|numeric|min:0',
+        'coupon_code' => 'nullable|string',
+        'tax' => 'nullable|numeric|min:0',
+        'notes' => 'nullable|string',
+        'ordered_at' => 'nullable|date',
+    ];
+
+    /**
+     * What every order of a request shares: business, outlet, employee, shift and business type.
+     *
+     * Returns ['error' => message, 'requires_shift' => bool] when orders cannot be
+     * created (no outlet, or a kasir without an open shift).
+     */
+    public function context($businessId, $outletId, User $user)
+    {
+        $employee = Employee::where('user_id', $user->id)
+            ->where('business_id', $businessId)
+            ->first();
+
+        $shiftId = null;
+
+        // For kasir: MUST have active shift (waiter no longer required)
+        if ($user->role === 'kasir') {
+            $shiftId = CashierShift::where('user_id', $user->id)
+                ->where('outlet_id', $outletId)
+                ->where('status', 'open')
+                ->value('id');
+
+            if (!$shiftId) {
+                Log::channel('pos')->warning('PosOrderService: No active shift found for kasir', [
+                    'user_id' => $user->id,
+                    'outlet_id' => $outletId,
+                ]);
+
+                return [
+                    'error' => 'Anda harus membuka shift terlebih dahulu sebelum melakukan transaksi',
+                    'requires_shift' => true,
+                ];
+            }
+        }
+        // For other roles (owner/admin): use the open shift of their employee record, if any
+        elseif ($employee) {
+            $shiftId = CashierShift::where('employee_id', $employee->id)
+                ->where('outlet_id', $outletId)
+                ->where('status', 'open')
+                ->value('id');
+        }
+
+        if (!$shiftId && $user->role !== 'kasir') {
+            // Don't block owner/admin
+            Log::channel('pos')->info('PosOrderService: No active shift for owner/admin, order will be created without shift_id', [
+                'user_id' => $user->id,
+                'outlet_id' => $outletId,
+            ]);
+        }
+
+        // Outlet from the header if available, otherwise the first outlet of the business
+        $outlet = $outletId
+            ? Outlet::find($outletId)
+            : Outlet::where('business_id', $businessId)->first();
+
+        if (!$outlet) {
+            Log::channel('pos')->error('PosOrderService: No outlet found for business', ['business_id' => $businessId]);
+            return ['error' => 'No outlet configured for this business', 'requires_shift' => false];
+        }
+
+        return [
+            'business_id' => (int) $businessId,
+            'outlet_id' => $outlet->id,
+            // Store employee_id, not user_id, so relations (employee.user) resolve correctly
+            'employee_id' => $employee?->id,
+            'shift_id' => $shiftId,
+            'business_type' => Business::find($businessId)?->businessType?->code,
+        ];
+    }
+
+    /**
+     * Order of a business already created for a client_uuid
+     */
+    public function findByClientUuid($businessId, $clientUuid)
+    {
+        if (!$clientUuid) {
+            return null;
+        }
+
+        return Order::where('business_id', $businessId)
+            ->where('client_uuid', $clientUuid)
+            ->first();
+    }
+
+    /**
+     * Create one order: order row, table occupied, stock reserved and order items.
+     * Must run inside a transaction; announce() the order after the commit.
+     *
+     * @throws \Exception When a tracked product does not have enough stock
+     */
+    public function create(array $data, array $context)
+    {
+        $subtotal = 0;
+        foreach ($data['items'] as $item) {
+            $subtotal += $item['quantity'] * $item['price'];
+        }
+
+        $taxAmount = $data['tax'] ?? 0;
+        $discountAmount = $data['discount'] ?? 0;
+
+        // Check if deferred payment (for laundry business)
+        // Handle both boolean true and string "true"
+        $deferred = $data['deferred_payment'] ?? false;
+        $isDeferredPayment = $deferred === true || $deferred === 'true' || $deferred === 1;
+
+        // Untuk laundry dengan deferred payment, status awal adalah 'received'
+        // (selain itu pending, akan diupdate saat payment)
+        $initialStatus = $isDeferredPayment && $context['business_type'] === 'laundry' ? 'received' : 'pending';
+
+        $order = Order::create([
+            'business_id' => $context['business_id'],
+            'outlet_id' => $context['outlet_id'],
+            'customer_id' => $data['customer_id'] ?? null,
+            'table_id' => $data['table_id'] ?? null,
+            'queue_number' => $data['queue_number'] ?? null,
+            'employee_id' => $context['employee_id'],
+            'shift_id' => $context['shift_id'],
+            'order_number' => 'ORD-' . strtoupper(Str::random(8)),
+            'client_uuid' => $data['client_uuid'] ?? null,
+            'type' => 'dine_in', // Default type for POS
+            'status' => $initialStatus,
+            'subtotal' => $subtotal,
+            'tax_amount' => $taxAmount,
+            'discount_amount' => $discountAmount,
+            'coupon_code' => $data['coupon_code'] ?? null,
+            'service_charge' => 0,
+            'delivery_fee' => 0,
+            'total' => $subtotal + $taxAmount - $discountAmount,
+            'paid_amount' => 0,
+            'change_amount' => 0,
+            'payment_status' => 'pending', // Always pending for deferred payment
+            'notes' => $data['notes'] ?? null,
+            // Orders queued offline keep the time they were made at the POS
+            'ordered_at' => isset($data['ordered_at']) ? Carbon::parse($data['ordered_at'])->min(now()) : now(),
+        ]);
+
+        // If linked to a table, mark the table as occupied
+        if ($order->table_id) {
+            Table::where('id', $order->table_id)
+                ->where('status', '!=', 'occupied')
+                ->update(['status' => 'occupied', 'updated_at' => now()]);
+        }
+
+        // ✅ PERF: Lock all cart products at once, bulk decrement stock and
+        // bulk insert order items + inventory movements
+        app(StockReservationService::class)->reserve($order, $data['items']);
+
+        return $order;
+    }
+
+    /**
+     * Create a batch of orders queued offline.
+     *
+     * Returns one result per order, in request order:
+     * ['client_uuid', 'status' => created|duplicate|failed, 'order_id', 'order_number', 'error']
+     */
+    public function createBatch(array $orders, array $context)
+    {
+        $results = [];
+        $valid = [];
+
+        foreach (array_values($orders) as $index => $data) {
+            $validator = Validator::make(is_array($data) ? $data : [], ['client_uuid' => 'required|uuid'] + self::RULES);
+
+            if ($validator->fails()) {
+                $results[$index] = $this->result(is_array($data) ? ($data['client_uuid'] ?? null) : null, 'failed', null, $validator->errors()->first());
+                continue;
+            }
+
+            $valid[$index] = $data;
+        }
+
+        // Referenced rows and already synced orders: one query each for the whole batch
+        $missing = $this->missingReferences($valid);
+
+        $existing = Order::where('business_id', $context['business_id'])
+            ->whereIn('client_uuid', array_unique(array_column($valid, 'client_uuid')))
+            ->get(['id', 'order_number', 'client_uuid'])
+            ->keyBy('client_uuid');
+
+        foreach (array_chunk($valid, self::BATCH_CHUNK, true) as $chunk) {
+            $created = [];
+
+            DB::transaction(function () use ($chunk, $context, $missing, &$existing, &$created, &$results) {
+                foreach ($chunk as $index => $data) {
+                    $uuid = $data['client_uuid'];
+
+                    if ($order = $existing->get($uuid)) {
+                        $results[$index] = $this->result($uuid, 'duplicate', $order);
+                        continue;
+                    }
+
+                    if ($error = $this->referenceError($data, $missing)) {
+                        $results[$index] = $this->result($uuid, 'failed', null, $error);
+                        continue;
+                    }
+
+                    try {
+                        // Savepoint: a failed order is rolled back alone
+                        $order = DB::transaction(fn () => $this->create($data, $context));
+
+                        $existing->put($uuid, $order);
+                        $created[] = $order;
+                        $results[$index] = $this->result($uuid, 'created', $order);
+                    } catch (UniqueConstraintViolationException $e) {
+                        // Synced concurrently (e.g. the same queue from a second tab)
+                        $order = $this->findByClientUuid($context['business_id'], $uuid);
+                        $results[$index] = $order
+                            ? $this->result($uuid, 'duplicate', $order)
+                            : $this->result($uuid, 'failed', null, $e->getMessage());
+                    } catch (\Exception $e) {
+                        $results[$index] = $this->result($uuid, 'failed', null, $e->getMessage());
+                    }
+                }
+            });
+
+            foreach ($created as $order) {
+                $this->announce($order);
+            }
+        }
+
+        ksort($results);
+
+        return array_values($results);
+    }
+
+    /**
+     * Order stream event and notification of a new order (after the commit)
+     */
+    public function announce(Order $order)
+    {
+        // Push to kitchen/waiter/kasir screens subscribed to the outlet's order stream
+        app(OrderEventService::class)->publish($order, OrderEventService::CREATED);
+
+        $itemCount = $order->orderItems()->count();
+
+        // ✅ SECURITY: Persist notification for new order with role-based targeting
+        try {
+            // Always notify kitchen, owner, admin
+            $roleTargets = ['kitchen', 'owner', 'admin'];
+
+            // Add waiter if dine-in order
+            if ($order->type === 'dine_in') {
+                $roleTargets[] = 'waiter';
+            }
+
+            // Add kasir if payment is pending (kasir needs to process payment)
+            if ($order->payment_status === 'pending') {
+                $roleTargets[] = 'kasir';
+            }
+
+            AppNotification::create([
+                'business_id' => $order->business_id,
+                'outlet_id' => $order->outlet_id,
+                'user_id' => null,
+                'role_targets' => array_values(array_unique($roleTargets)),
+                'type' => 'order.created',
+                'title' => 'Order Baru: ' . $order->order_number,
+                'message' => "{$itemCount} item - Total: Rp " . number_format($order->total, 0, ',', '.'),
+                'severity' => 'info',
+                'resource_type' => 'order',
+                'resource_id' => $order->id,
+                'meta' => [
+                    'order_number' => $order->order_number,
+                    'table_id' => $order->table_id,
+                    'payment_status' => $order->payment_status,
+                    'status' => $order->status,
+                    'order_type' => $order->type,
+                ],
+            ]);
+        } catch (\Exception $e) {
+            Log::channel('pos')->warning('PosOrderService: Failed to create order notification', ['error' => $e->getMessage()]);
+        }
+    }
+
+    /**
+     * Ids referenced by the orders that do not exist: ['products' => [...], 'customers' => [...], 'tables' => [...]]
+     */
+    private function missingReferences(array $orders)
+    {
+        $ids = ['products' => [], 'customers' => [], 'tables' => []];
+
+        foreach ($orders as $data) {
+            foreach ($data['items'] as $item) {
+                $ids['products'][(int) $item['product_id']] = true;
+            }
+            if (!empty($data['customer_id'])) {
+                $ids['customers'][(int) $data['customer_id']] = true;
+            }
+            if (!empty($data['table_id'])) {
+                $ids['tables'][(int) $data['table_id']] = true;
+            }
+        }
+
+        $missing = [];
+        foreach ($ids as $table => $wanted) {
+            $found = empty($wanted)
+                ? []
+                : DB::table($table)->whereIn('id', array_keys($wanted))->pluck('id')->map(fn ($id) => (int) $id)->all();
+
+            $missing[$table] = array_flip(array_diff(array_keys($wanted), $found));
+        }
+
+        return $missing;
+    }
+
+    private function referenceError(array $data, array $missing)
+    {
+        foreach ($data['items'] as $item) {
+            if (isset($missing['products'][(int) $item['product_id']])) {
+                return "Produk #{$item['product_id']} tidak ditemukan";
+            }
+        }
+
+        if (!empty($data['customer_id']) && isset($missing['customers'][(int) $data['customer_id']])) {
+            return "Pelanggan #{$data['customer_id']} tidak ditemukan";
+        }
+
+        if (!empty($data['table_id']) && isset($missing['tables'][(int) $data['table_id']])) {
+            return "Meja #{$data['table_id']} tidak ditemukan";
+        }
+
+        return null;
+    }
+
+    private function result($clientUuid, $status, $order = null, $error = null)
+    {
+        return [
+            'client_uuid' => $clientUuid,
+            'status' => $status,
+            'order_id' => $order?->id,
+            'order_number' => $order?->order_number,
+            'error' => $error,
+        ];
+    }
+}
@@ -0,0 +1,239 @@
+<?php
+
+namespace App\Services;
+
+use App\Models\Product;
+use Illuminate\Support\Facades\Cache;
+use Illuminate\Support\Facades\DB;
+use Illuminate\Support\Facades\Log;
+
+class ProductCatalogService
+{
+    /**
+     * Columns of the POS catalog payload (full list and delta rows)
+     */
+    public const COLUMNS = [
+        'id', 'name', 'sku', 'price', 'cost', 'stock', 'stock_type', 'min_stock', 'image', 'category_id', 'is_active', 'description',
+        'discount_price', 'discount_percentage', 'discount_start_date', 'discount_end_date',
+    ];
+
+    /**
+     * Product attributes that invalidate the cached full catalog. Stock is
+     * deliberately missing: stock changes travel as a separate small delta.
+     */
+    public const CATALOG_ATTRIBUTES = [
+        'business_id', 'category_id', 'name', 'sku', 'description', 'image', 'price', 'cost',
+        'min_stock', 'stock_type', 'is_active', 'discount_price', 'discount_percentage',
+        'discount_start_date', 'discount_end_date', 'deleted_at',
+    ];
+
+    /**
+     * Seconds the full catalog stays cached (entries are also validated against catalog_version)
+     */
+    public const CACHE_TTL = 3600;
+
+    /**
+     * Record that products of a business changed.
+     *
+     * Runs after the surrounding transaction commits, in its own short
+     * transaction, so the version row is only locked for two statements and
+     * never for the whole order transaction. A version becomes visible
+     * together with the product rows stamped with it.
+     *
+     * @param int $businessId
+     * @param array $productIds
+     * @param bool $catalog false when only stock changed
+     */
+    public function recordChange($businessId, array $productIds, bool $catalog = true)
+    {
+        $productIds = array_values(array_unique(array_map('intval', $productIds)));
+
+        if (!$businessId || empty($productIds)) {
+            return;
+        }
+
+        DB::afterCommit(function () use ($businessId, $productIds, $catalog) {
+            try {
+                DB::transaction(function () use ($businessId, $productIds, $catalog) {
+                    $version = $this->bump($businessId, $catalog);
+
+                    DB::table('products')
+                        ->whereIn('id', $productIds)
+                        ->update($catalog
+                            ? ['catalog_version' => $version, 'stock_version' => $version]
+                            : ['stock_version' => $version]);
+                });
+            } catch (\Exception $e) {
+                Log::warning('ProductCatalogService: Failed to record catalog change', [
+                    'business_id' => $businessId,
+                    'product_ids' => $productIds,
+                    'error' => $e->getMessage(),
+                ]);
+            }
+        });
+    }
+
+    /**
+     * Current versions of a business: ['version' => int, 'catalog_version' => int].
+     */
+    public function current($businessId)
+    {
+        $row = DB::table('catalog_versions')->where('business_id', $businessId)->first();
+
+        return [
+            'version' => (int) ($row->version ?? 0),
+            'catalog_version' => (int) ($row->catalog_version ?? 0),
+        ];
+    }
+
+    /**
+     * Weak ETag of a catalog version
+     */
+    public function etag($businessId, int $version)
+    {
+        return "catalog-{$businessId}-{$version}";
+    }
+
+    /**
+     * Full active POS catalog at (at least) the given version.
+     *
+     * The product list is cached until a catalog change; stock that changed
+     * since the cached snapshot is overlaid from a small indexed query instead
+     * of rebuilding the whole list after every sale.
+     */
+    public function catalog($businessId, array $current)
+    {
+        $cacheKey = "products_pos:business:{$businessId}";
+        $cached = Cache::get($cacheKey);
+
+        // Entries from before versioning were plain collections
+        if (!is_array($cached) || ($cached['catalog_version'] ?? null) !== $current['catalog_version']) {
+            $cached = [
+                'catalog_version' => $current['catalog_version'],
+                'version' => $current['version'],
+                'products' => $this->baseQuery($businessId)
+                    ->where('is_active', true)
+                    ->orderBy('name', 'asc')
+                    ->get(),
+            ];
+            Cache::put($cacheKey, $cached, self::CACHE_TTL);
+
+            return $cached['products'];
+        }
+
+        if ($cached['version'] < $current['version']) {
+            $stock = $this->stockChanges($businessId, $cached['version']);
+
+            if ($stock->isNotEmpty()) {
+                foreach ($cached['products'] as $product) {
+                    if ($stock->has($product->id)) {
+                        $product->stock = $stock->get($product->id);
+                    }
+                }
+            }
+
+            // Keep the snapshot fresh so the overlay stays small
+            $cached['version'] = $current['version'];
+            Cache::put($cacheKey, $cached, self::CACHE_TTL);
+        }
+
+        return $cached['products'];
+    }
+
+    /**
+     * Changes after a client's version.
+     *
+     * products: full rows whose price/name/availability/... changed
+     * stock:    [product_id => stock] for rows where only stock changed
+     * removed:  ids deactivated or deleted
+     * reset:    client version is unknown, it must reload the full catalog
+     */
+    public function delta($businessId, int $since, array $current)
+    {
+        $delta = [
+            'version' => $current['version'],
+            'reset' => $since <= 0 || $since > $current['version'],
+            'products' => [],
+            'stock' => (object) [],
+            'removed' => [],
+        ];
+
+        if ($delta['reset'] || $since === $current['version']) {
+            return $delta;
+        }
+
+        if ($current['catalog_version'] > $since) {
+            $changed = $this->baseQuery($businessId)
+                ->withTrashed()
+                ->addSelect('deleted_at')
+                ->where('catalog_version', '>', $since)
+                ->orderBy('id')
+                ->get();
+
+            [$active, $removed] = $changed->partition(fn ($product) => $product->is_active && !$product->trashed());
+
+            $delta['products'] = $active->values();
+            $delta['removed'] = $removed->pluck('id')->values();
+        }
+
+        $stock = $this->stockChanges($businessId, $since, true);
+        if ($stock->isNotEmpty()) {
+            $delta['stock'] = $stock;
+        }
+
+        return $delta;
+    }
+
+    /**
+     * Increment the business version; must run inside a transaction.
+     */
+    private function bump($businessId, bool $catalog)
+    {
+        $now = now();
+
+        DB::table('catalog_versions')->insertOrIgnore([
+            'business_id' => $businessId,
+            'version' => 0,
+            'catalog_version' => 0,
+            'created_at' => $now,
+            'updated_at' => $now,
+        ]);
+
+        $row = DB::table('catalog_versions')
+            ->where('business_id', $businessId)
+            ->lockForUpdate()
+            ->first();
+
+        $version = (int) $row->version + 1;
+
+        $update = ['version' => $version, 'updated_at' => $now];
+        if ($catalog) {
+            $update['catalog_version'] = $version;
+        }
+
+        DB::table('catalog_versions')->where('business_id', $businessId)->update($update);
+
+        return $version;
+    }
+
+    private function baseQuery($businessId)
+    {
+        return Product::with(['category:id,name', 'barcodes:id,product_id,product_variant_id,barcode'])
+            ->select(self::COLUMNS)
+            ->where('business_id', $businessId);
+    }
+
+    /**
+     * [product_id => stock] of active products whose stock changed after a version.
+     */
+    private function stockChanges($businessId, int $since, bool $stockOnly = false)
+    {
+        return DB::table('products')
+            ->where('business_id', $businessId)
+            ->where('stock_version', '>', $since)
+            ->when($stockOnly, fn ($query) => $query->where('catalog_version', '<=', $since))
+            ->where('is_active', true)
+            ->whereNull('deleted_at')
+            ->pluck('stock', 'id');
+    }
+}
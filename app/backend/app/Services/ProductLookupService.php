@@ -0,0 +1,210 @@
+<?php
+
+namespace App\Services;
+
+use App\Models\Product;
+use App\Models\ProductBarcode;
+use Illuminate\Support\Facades\DB;
+
+/**
+ * Exact barcode / SKU lookup for POS scanning.
+ *
+ * A scan is resolved with at most three unique-index lookups instead of the
+ * LIKE search of the product list: product_barcodes (business_id, barcode),
+ * products (business_id, sku) and product_variants (sku).
+ */
+class ProductLookupService
+{
+    /**
+     * Longest accepted barcode (product_barcodes.barcode)
+     */
+    public const MAX_LENGTH = 64;
+
+    /**
+     * Active product of a business for a scanned code.
+     *
+     * Returns ['product' => Product, 'variant_id' => int|null, 'matched' => barcode|sku|variant_sku]
+     * or null when nothing matches exactly.
+     */
+    public function find($businessId, $code)
+    {
+        $code = $this->normalize($code);
+
+        if ($code === '') {
+            return null;
+        }
+
+        $match = DB::table('product_barcodes')
+            ->where('business_id', $businessId)
+            ->where('barcode', $code)
+            ->first(['product_id', 'product_variant_id']);
+
+        if ($match) {
+            return $this->result($businessId, $match->product_id, $match->product_variant_id, 'barcode');
+        }
+
+        $productId = DB::table('products')
+            ->where('business_id', $businessId)
+            ->where('sku', $code)
+            ->whereNull('deleted_at')
+            ->value('id');
+
+        if ($productId) {
+            return $this->result($businessId, $productId, null, 'sku');
+        }
+
+        $variant = DB::table('product_variants')
+            ->join('products', 'products.id', '=', 'product_variants.product_id')
+            ->where('product_variants.sku', $code)
+            ->where('products.business_id', $businessId)
+            ->whereNull('product_variants.deleted_at')
+            ->where('product_variants.is_active', true)
+            ->first(['product_variants.id', 'product_variants.product_id']);
+
+        return $variant ? $this->result($businessId, $variant->product_id, $variant->id, 'variant_sku') : null;
+    }
+
+    /**
+     * Codes (from $codes) already used by another product of the business, as a barcode or SKU
+     */
+    public function conflicts($businessId, array $codes, $productId = null)
+    {
+        $codes = $this->clean($codes);
+
+        if (empty($codes)) {
+            return [];
+        }
+
+        $barcodes = DB::table('product_barcodes')
+            ->where('business_id', $businessId)
+            ->whereIn('barcode', $codes)
+            ->when($productId, fn ($query) => $query->where('product_id', '!=', $productId))
+            ->pluck('barcode');
+
+        $skus = DB::table('products')
+            ->where('business_id', $businessId)
+            ->whereIn('sku', $codes)
+            ->whereNull('deleted_at')
+            ->when($productId, fn ($query) => $query->where('id', '!=', $productId))
+            ->pluck('sku');
+
+        return $barcodes->merge($skus)->unique()->values()->all();
+    }
+
+    /**
+     * Validation rules of a barcodes field: a list of codes, or
+     * ['barcode' => ..., 'product_variant_id' => ...] entries for variant barcodes.
+     */
+    public function rules()
+    {
+        return [
+            'barcodes' => ['nullable', 'array', function ($attribute, $value, $fail) {
+                $codes = array_map(fn ($entry) => $this->normalize(is_array($entry) ? ($entry['barcode'] ?? '') : $entry), (array) $value);
+                if (count($codes) !== count(array_unique($codes))) {
+                    $fail('Barcode tidak boleh duplikat.');
+                }
+            }],
+            'barcodes.*' => [function ($attribute, $value, $fail) {
+                $code = is_array($value) ? ($value['barcode'] ?? null) : $value;
+                if (!is_string($code) || mb_strlen($code) > self::MAX_LENGTH) {
+                    $fail('Barcode harus berupa teks maksimal ' . self::MAX_LENGTH . ' karakter.');
+                }
+            }],
+            'barcodes.*.product_variant_id' => 'nullable|integer',
+        ];
+    }
+
+    /**
+     * Variant ids referenced by $barcodes that are not (active) variants of the product.
+     * A product that does not exist yet has no variants, so every id is foreign.
+     */
+    public function foreignVariants(array $barcodes, $productId = null)
+    {
+        $variantIds = collect($barcodes)
+            ->filter(fn ($entry) => is_array($entry) && !empty($entry['product_variant_id']))
+            ->map(fn ($entry) => (int) $entry['product_variant_id'])
+            ->unique()
+            ->values();
+
+        if ($variantIds->isEmpty()) {
+            return [];
+        }
+
+        $own = $productId
+            ? DB::table('product_variants')
+                ->where('product_id', $productId)
+                ->whereIn('id', $variantIds)
+                ->whereNull('deleted_at')
+                ->pluck('id')
+                ->all()
+            : [];
+
+        return $variantIds->diff($own)->values()->all();
+    }
+
+    /**
+     * Replace the barcodes of a product.
+     *
+     * $barcodes: list of codes, or ['barcode' => ..., 'product_variant_id' => ...]
+     * entries for variant barcodes. Bumps the catalog version so POS clients
+     * rebuild their barcode map.
+     */
+    public function syncBarcodes(Product $product, array $barcodes)
+    {
+        $rows = [];
+        foreach ($barcodes as $entry) {
+            $code = $this->normalize(is_array($entry) ? ($entry['barcode'] ?? '') : $entry);
+
+            if ($code !== '') {
+                $rows[$code] = [
+                    'business_id' => $product->business_id,
+                    'product_id' => $product->id,
+                    'product_variant_id' => is_array($entry) ? ($entry['product_variant_id'] ?? null) : null,
+                    'barcode' => $code,
+                ];
+            }
+        }
+
+        DB::transaction(function () use ($product, $rows) {
+            ProductBarcode::where('product_id', $product->id)
+                ->whereNotIn('barcode', array_keys($rows))
+                ->delete();
+
+            if (!empty($rows)) {
+                $now = now();
+
+                ProductBarcode::upsert(
+                    array_map(fn ($row) => $row + ['created_at' => $now, 'updated_at' => $now], array_values($rows)),
+                    ['business_id', 'barcode'],
+                    ['product_id', 'product_variant_id', 'updated_at']
+                );
+            }
+
+            app(ProductCatalogService::class)->recordChange($product->business_id, [$product->id]);
+        });
+    }
+
+    public function normalize($code)
+    {
+        return mb_substr(trim((string) $code), 0, self::MAX_LENGTH);
+    }
+
+    private function clean(array $codes)
+    {
+        return array_values(array_unique(array_filter(
+            array_map(fn ($entry) => $this->normalize(is_array($entry) ? ($entry['barcode'] ?? '') : $entry), $codes),
+            fn ($code) => $code !== ''
+        )));
+    }
+
+    private function result($businessId, $productId, $variantId, $matched)
+    {
+        $product = Product::with(['category:id,name', 'barcodes:id,product_id,product_variant_id,barcode'])
+            ->select(ProductCatalogService::COLUMNS)
+            ->where('business_id', $businessId)
+            ->where('is_active', true)
+            ->find($productId);
+
+        return $product ? ['product' => $product, 'variant_id' => $variantId, 'matched' => $matched] : null;
+    }
+}
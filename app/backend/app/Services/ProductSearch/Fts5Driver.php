@@ -0,0 +1,61 @@
+<?php
+
+namespace App\Services\ProductSearch;
+
+use App\Services\ProductSearchService;
+use Illuminate\Support\Facades\DB;
+
+/**
+ * SQLite FTS5 table products_fts (rowid = products.id), ranked by bm25.
+ */
+class Fts5Driver implements ProductSearchDriver
+{
+    public function index(array $products): void
+    {
+        if (empty($products)) {
+            return;
+        }
+
+        $this->remove(array_column($products, 'id'));
+
+        foreach (array_chunk($products, 500) as $chunk) {
+            DB::table('products_fts')->insert(array_map(fn ($product) => [
+                'rowid' => $product['id'],
+                'business_id' => (int) $product['business_id'],
+                'name' => $product['name'],
+                'sku' => $product['sku'],
+                'description' => $product['description'] ?? '',
+            ], $chunk));
+        }
+    }
+
+    public function remove(array $productIds): void
+    {
+        if (!empty($productIds)) {
+            DB::table('products_fts')->whereIn('rowid', $productIds)->delete();
+        }
+    }
+
+    public function search($businessId, string $term, int $limit): array
+    {
+        $words = ProductSearchService::words($term);
+
+        if (empty($words)) {
+            return [];
+        }
+
+        // Every word required, as a quoted prefix: "kopi"* "susu"*
+        $query = implode(' ', array_map(fn ($word) => '"' . $word . '"*', $words));
+
+        return DB::table('products_fts')
+            ->whereRaw('products_fts MATCH ?', ['{name sku description} : (' . $query . ')'])
+            // UNINDEXED columns have no type affinity
+            ->whereRaw('CAST(business_id AS INTEGER) = ?', [(int) $businessId])
+            ->orderByRaw('rank')
+            ->orderBy('rowid')
+            ->limit($limit)
+            ->pluck('rowid')
+            ->map(fn ($id) => (int) $id)
+            ->all();
+    }
+}
@@ -0,0 +1,91 @@
+<?php
+
+namespace App\Services\ProductSearch;
+
+use App\Services\ProductSearchService;
+use Illuminate\Support\Facades\DB;
+
+/**
+ * MySQL / MariaDB FULLTEXT index on products (name, sku, description).
+ *
+ * InnoDB maintains the index itself, so index() / remove() have nothing to do.
+ *
+ * FULLTEXT only matches words by prefix. Code-like terms (one token with a
+ * digit, e.g. part of a SKU or barcode) are therefore also matched as a
+ * substring of the SKU and the product barcodes, like the former LIKE search.
+ */
+class FullTextDriver implements ProductSearchDriver
+{
+    public function index(array $products): void
+    {
+        //
+    }
+
+    public function remove(array $productIds): void
+    {
+        //
+    }
+
+    public function search($businessId, string $term, int $limit): array
+    {
+        // Every word required, as a prefix: +kopi* +susu*
+        $words = array_filter(ProductSearchService::words($term), fn ($word) => strlen($word) >= 2);
+
+        $ids = [];
+
+        if (!empty($words)) {
+            $against = implode(' ', array_map(fn ($word) => '+' . $word . '*', $words));
+            $match = 'MATCH(name, sku, description) AGAINST (? IN BOOLEAN MODE)';
+
+            $ids = DB::table('products')
+                ->where('business_id', $businessId)
+                ->whereNull('deleted_at')
+                ->whereRaw($match, [$against])
+                ->orderByRaw("{$match} DESC", [$against])
+                ->orderBy('id')
+                ->limit($limit)
+                ->pluck('id')
+                ->map(fn ($id) => (int) $id)
+                ->all();
+        }
+
+        if (count($ids) < $limit && $this->isCode($term)) {
+            $ids = array_values(array_unique(array_merge($ids, $this->substring($businessId, trim($term), $limit))));
+        }
+
+        return array_slice($ids, 0, $limit);
+    }
+
+    /**
+     * One token containing a digit (SKU / barcode fragment)
+     */
+    private function isCode(string $term)
+    {
+        $term = trim($term);
+
+        return strlen($term) >= 3 && !preg_match('/\s/', $term) && preg_match('/\d/', $term);
+    }
+
+    /**
+     * Products whose SKU or one of whose barcodes contains the term
+     */
+    private function substring($businessId, string $term, int $limit)
+    {
+        $like = '%' . addcslashes($term, '%_\\') . '%';
+
+        return DB::table('products')
+            ->where('business_id', $businessId)
+            ->whereNull('deleted_at')
+            ->where(function ($query) use ($like) {
+                $query->where('sku', 'like', $like)
+                    ->orWhereExists(fn ($barcodes) => $barcodes->from('product_barcodes')
+                        ->whereColumn('product_barcodes.product_id', 'products.id')
+                        ->where('product_barcodes.barcode', 'like', $like));
+            })
+            ->orderBy('id')
+            ->limit($limit)
+            ->pluck('id')
+            ->map(fn ($id) => (int) $id)
+            ->all();
+    }
+}
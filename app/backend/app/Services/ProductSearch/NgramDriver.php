@@ -0,0 +1,87 @@
+<?php
+
+namespace App\Services\ProductSearch;
+
+use App\Services\ProductSearchService;
+use Illuminate\Support\Facades\DB;
+
+/**
+ * Trigram index on product name and SKU (product_search_grams).
+ *
+ * Works on every database and tolerates typos: a product matches when a
+ * minimum fraction of the term's trigrams occur in it ("kopi susu" still
+ * finds "Kopi Susu Gula Aren" when typed as "kopi susu gla aren").
+ */
+class NgramDriver implements ProductSearchDriver
+{
+    /**
+     * Rows per insert statement
+     */
+    public const CHUNK = 1000;
+
+    public function __construct(protected float $minSimilarity = 0.5)
+    {
+    }
+
+    public function index(array $products): void
+    {
+        $this->remove(array_column($products, 'id'));
+
+        $rows = [];
+        foreach ($products as $product) {
+            foreach (self::grams($product['name'] . ' ' . $product['sku']) as $gram) {
+                $rows[] = ['business_id' => $product['business_id'], 'product_id' => $product['id'], 'gram' => $gram];
+            }
+        }
+
+        foreach (array_chunk($rows, self::CHUNK) as $chunk) {
+            DB::table('product_search_grams')->insertOrIgnore($chunk);
+        }
+    }
+
+    public function remove(array $productIds): void
+    {
+        if (!empty($productIds)) {
+            DB::table('product_search_grams')->whereIn('product_id', $productIds)->delete();
+        }
+    }
+
+    public function search($businessId, string $term, int $limit): array
+    {
+        $grams = self::grams($term);
+
+        if (empty($grams)) {
+            return [];
+        }
+
+        return DB::table('product_search_grams')
+            ->where('business_id', $businessId)
+            ->whereIn('gram', $grams)
+            ->groupBy('product_id')
+            ->havingRaw('COUNT(*) >= ?', [max(1, (int) ceil(count($grams) * $this->minSimilarity))])
+            ->orderByRaw('COUNT(*) DESC')
+            ->orderBy('product_id')
+            ->limit($limit)
+            ->pluck('product_id')
+            ->map(fn ($id) => (int) $id)
+            ->all();
+    }
+
+    /**
+     * Distinct trigrams of the words of a text, padded with spaces so word
+     * starts and ends count ("kopi" → " ko", "kop", "opi", "pi ").
+     */
+    public static function grams($text)
+    {
+        $grams = [];
+
+        foreach (ProductSearchService::words($text) as $word) {
+            $padded = ' ' . $word . ' ';
+            for ($i = 0, $length = strlen($padded) - 2; $i < $length; $i++) {
+                $grams[substr($padded, $i, 3)] = true;
+            }
+        }
+
+        return array_keys($grams);
+    }
+}
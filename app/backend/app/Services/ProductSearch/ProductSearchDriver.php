@@ -0,0 +1,21 @@
+<?php
+
+namespace App\Services\ProductSearch;
+
+interface ProductSearchDriver
+{
+    /**
+     * (Re)index products; rows have id, business_id, name, sku and description.
+     */
+    public function index(array $products): void;
+
+    /**
+     * Remove products from the index.
+     */
+    public function remove(array $productIds): void;
+
+    /**
+     * Product ids of a business matching a term, most relevant first (ties by id).
+     */
+    public function search($businessId, string $term, int $limit): array;
+}
@@ -0,0 +1,207 @@
+<?php
+
+namespace App\Services;
+
+use App\Models\Product;
+use App\Services\ProductSearch\FullTextDriver;
+use App\Services\ProductSearch\Fts5Driver;
+use App\Services\ProductSearch\NgramDriver;
+use App\Services\ProductSearch\ProductSearchDriver;
+use Illuminate\Support\Facades\DB;
+use Illuminate\Support\Facades\Log;
+use Illuminate\Support\Facades\Schema;
+use Illuminate\Support\Str;
+
+/**
+ * Product search for the catalog, POS and reports.
+ *
+ * A term is resolved by the configured driver (MySQL FULLTEXT, SQLite FTS5
+ * or the n-gram index) into product ids ordered by relevance; endpoints
+ * filter with whereIn() and order with orderByRelevance(). When the driver
+ * finds nothing (typically a typo) the n-gram index, which is always kept,
+ * is tried as well. Products are indexed by ProductObserver on save.
+ */
+class ProductSearchService
+{
+    /**
+     * Columns read for indexing
+     */
+    public const COLUMNS = ['id', 'business_id', 'name', 'sku', 'description'];
+
+    /**
+     * Product attributes that change the index
+     */
+    public const INDEXED_ATTRIBUTES = ['business_id', 'name', 'sku', 'description'];
+
+    /**
+     * Products per reindex batch
+     */
+    public const CHUNK = 500;
+
+    protected $driver;
+
+    protected $ngram;
+
+    /**
+     * Ranked product ids of a business for a term (most relevant first, ties by id).
+     */
+    public function search($businessId, $term, $limit = null)
+    {
+        $term = trim((string) $term);
+        $limit = $limit ?? (int) config('search.products.max_results', 1000);
+
+        if ($term === '' || !$businessId) {
+            return [];
+        }
+
+        $ids = $this->driver()->search($businessId, $term, $limit);
+
+        if (empty($ids) && !$this->driver() instanceof NgramDriver) {
+            $ids = $this->ngram()->search($businessId, $term, $limit);
+        }
+
+        return $ids;
+    }
+
+    /**
+     * Order a query by the position of its rows in search() results
+     */
+    public function orderByRelevance($query, array $ids, $column = 'products.id')
+    {
+        if (empty($ids)) {
+            return $query;
+        }
+
+        $cases = '';
+        foreach (array_values($ids) as $position => $id) {
+            $cases .= sprintf(' WHEN %d THEN %d', $id, $position);
+        }
+
+        return $query->orderByRaw("CASE {$column}{$cases} ELSE " . count($ids) . ' END');
+    }
+
+    /**
+     * (Re)index products (models, ids or rows)
+     */
+    public function index($products)
+    {
+        $rows = $this->rows($products);
+
+        if (empty($rows)) {
+            return;
+        }
+
+        try {
+            $this->ngram()->index($rows);
+
+            if (!$this->driver() instanceof NgramDriver) {
+                $this->driver()->index($rows);
+            }
+        } catch (\Exception $e) {
+            // Search must never block saving a product; search:reindex-products repairs it
+            Log::warning('ProductSearchService: Failed to index products', [
+                'product_ids' => array_column($rows, 'id'),
+                'error' => $e->getMessage(),
+            ]);
+        }
+    }
+
+    /**
+     * Remove products from the index
+     */
+    public function remove(array $productIds)
+    {
+        try {
+            $this->ngram()->remove($productIds);
+
+            if (!$this->driver() instanceof NgramDriver) {
+                $this->driver()->remove($productIds);
+            }
+        } catch (\Exception $e) {
+            Log::warning('ProductSearchService: Failed to remove products from the index', [
+                'product_ids' => $productIds,
+                'error' => $e->getMessage(),
+            ]);
+        }
+    }
+
+    /**
+     * Rebuild the index of one business (or all), in batches. Returns the number of products indexed.
+     */
+    public function rebuild($businessId = null, ?callable $progress = null)
+    {
+        $count = 0;
+
+        Product::select(self::COLUMNS)
+            ->when($businessId, fn ($query) => $query->where('business_id', $businessId))
+            ->chunkById(self::CHUNK, function ($products) use (&$count, $progress) {
+                $this->index($products);
+                $count += $products->count();
+
+                if ($progress) {
+                    $progress($count);
+                }
+            });
+
+        return $count;
+    }
+
+    /**
+     * Driver for the current connection (config search.products.driver)
+     */
+    public function driver(): ProductSearchDriver
+    {
+        if ($this->driver) {
+            return $this->driver;
+        }
+
+        $name = config('search.products.driver', 'auto');
+
+        if ($name === 'auto') {
+            $name = match (DB::connection()->getDriverName()) {
+                'mysql', 'mariadb' => 'fulltext',
+                'sqlite' => Schema::hasTable('products_fts') ? 'fts5' : 'ngram',
+                default => 'ngram',
+            };
+        }
+
+        return $this->driver = match ($name) {
+            'fulltext' => new FullTextDriver(),
+            'fts5' => new Fts5Driver(),
+            default => $this->ngram(),
+        };
+    }
+
+    /**
+     * Lowercase ASCII words of a text ("Es Kopi-Susu Gula Aren" → es, kopi, susu, gula, aren)
+     */
+    public static function words($text)
+    {
+        $text = preg_replace('/[^a-z0-9]+/', ' ', Str::lower(Str::ascii((string) $text)));
+
+        return array_values(array_unique(array_filter(explode(' ', $text), fn ($word) => $word !== '')));
+    }
+
+    private function ngram()
+    {
+        return $this->ngram ??= new NgramDriver((float) config('search.products.min_similarity', 0.5));
+    }
+
+    private function rows($products)
+    {
+        $products = collect($products instanceof Product ? [$products] : $products);
+
+        // Ids: load the indexed columns
+        if ($products->isNotEmpty() && !is_object($products->first()) && !is_array($products->first())) {
+            $products = Product::select(self::COLUMNS)->whereIn('id', $products->all())->get();
+        }
+
+        return $products->map(fn ($product) => [
+            'id' => (int) data_get($product, 'id'),
+            'business_id' => (int) data_get($product, 'business_id'),
+            'name' => (string) data_get($product, 'name'),
+            'sku' => (string) data_get($product, 'sku'),
+            'description' => (string) data_get($product, 'description'),
+        ])->values()->all();
+    }
+}
@@ -0,0 +1,295 @@
+<?php
+
+namespace App\Services;
+
+use App\Models\Outlet;
+use App\Models\Product;
+use Illuminate\Contracts\Cache\LockTimeoutException;
+use Illuminate\Http\Request;
+use Illuminate\Http\Response;
+use Illuminate\Support\Facades\Cache;
+use Illuminate\Support\Facades\DB;
+use Illuminate\Support\Facades\Log;
+
+/**
+ * Public self-service menu (QR scans, /menu/{slug}, public outlet products).
+ *
+ * The menu of an outlet is built once into a snapshot with the products and
+ * categories already rendered to JSON, and served from the cache with an
+ * ETag. The snapshot is keyed on the business catalog_version (product
+ * changes), a menu version bumped on category / business config changes and
+ * the outlet's updated_at (outlet config changes).
+ *
+ * Table scans are counted in the cache and written to `tables` in batches
+ * by selfservice:flush-scans instead of two writes per scan.
+ */
+class PublicMenuService
+{
+    /**
+     * Seconds a snapshot is kept (every change moves the key anyway)
+     */
+    public const CACHE_TTL = 3600;
+
+    /**
+     * Seconds browsers / proxies may reuse a menu without revalidating
+     */
+    public const MAX_AGE = 30;
+
+    /**
+     * Seconds buffered scan counters survive without a flush
+     */
+    public const SCAN_TTL = 86400;
+
+    /**
+     * Tables updated per flush statement
+     */
+    public const SCAN_FLUSH_CHUNK = 500;
+
+    /**
+     * Invalidate the menus of a business once the change is committed
+     */
+    public function touch($businessId)
+    {
+        if (!$businessId) {
+            return;
+        }
+
+        DB::afterCommit(function () use ($businessId) {
+            $key = self::versionKey($businessId);
+            Cache::add($key, 0, now()->addDays(30));
+            Cache::increment($key);
+        });
+    }
+
+    /**
+     * Version string of an outlet's menu (one catalog_versions lookup, one cache read)
+     */
+    public function version(Outlet $outlet)
+    {
+        $catalog = app(ProductCatalogService::class)->current($outlet->business_id)['catalog_version'];
+        $menu = (int) Cache::get(self::versionKey($outlet->business_id), 0);
+
+        return implode('.', [$outlet->id, $catalog, $menu, optional($outlet->updated_at)->getTimestamp() ?? 0]);
+    }
+
+    /**
+     * Menu snapshot of an outlet:
+     * - outlet:           id, name, slug, address, phone, tax_rate
+     * - midtrans_enabled: whether customers can pay online
+     * - products:         product rows (with category and image_url) for filtering
+     * - json:             the `"products":[...],"categories":[...]` fragment, rendered once
+     */
+    public function snapshot(Outlet $outlet, $version = null)
+    {
+        $version = $version ?? $this->version($outlet);
+
+        return Cache::remember("public_menu:{$outlet->id}:v{$version}", self::CACHE_TTL, fn () => $this->build($outlet));
+    }
+
+    /**
+     * Weak ETag of a menu version plus whatever else ends up in the response
+     */
+    public function etag($version, ...$parts)
+    {
+        return 'menu-' . md5(implode('|', array_merge([$version], $parts)));
+    }
+
+    /**
+     * JSON response with ETag / Cache-Control. The body is only produced when
+     * the client's If-None-Match does not match (otherwise 304 without a body).
+     */
+    public function respond(Request $request, $etag, callable $body, $maxAge = self::MAX_AGE)
+    {
+        $response = new Response('', 200, ['Content-Type' => 'application/json']);
+        $response->setEtag($etag, true);
+        $response->setPublic();
+
+        if ($maxAge > 0) {
+            $response->setMaxAge($maxAge);
+        } else {
+            $response->headers->addCacheControlDirective('no-cache');
+        }
+
+        if ($response->isNotModified($request)) {
+            return $response;
+        }
+
+        return $response->setContent($body());
+    }
+
+    /**
+     * Success body of a menu: $data rendered as usual, followed by the pre-rendered products/categories
+     */
+    public function body(array $data, array $snapshot, $message = 'Menu berhasil dimuat')
+    {
+        $head = json_encode(['success' => true, 'message' => $message, 'data' => $data ?: new \stdClass()]);
+
+        // Drop the closing "}}" of data + envelope and append the fragment
+        $separator = empty($data) ? '' : ',';
+
+        return substr($head, 0, -2) . $separator . $snapshot['json'] . '}}';
+    }
+
+    /**
+     * Count a QR scan of a table. Buffered in the cache; flushScans() writes it.
+     */
+    public function recordScan($tableId)
+    {
+        $key = self::scanKey($tableId);
+
+        Cache::add($key, 0, self::SCAN_TTL);
+        $count = Cache::increment($key);
+        Cache::put($key . ':last', now()->toDateTimeString(), self::SCAN_TTL);
+
+        // First scan since the last flush: register the table for flushing
+        if ($count === 1) {
+            try {
+                Cache::lock('table_scans:lock', 10)->block(3, function () use ($tableId) {
+                    $pending = Cache::get('table_scans:pending', []);
+                    $pending[$tableId] = true;
+                    Cache::put('table_scans:pending', $pending, self::SCAN_TTL);
+                });
+            } catch (LockTimeoutException $e) {
+                // Never lose the scan: write it directly instead
+                Cache::decrement($key);
+                DB::table('tables')->where('id', $tableId)->update([
+                    'scan_count' => DB::raw('COALESCE(scan_count, 0) + 1'),
+                    'last_scan_at' => now(),
+                ]);
+            }
+        }
+    }
+
+    /**
+     * Write buffered scans to `tables` (scan_count += n, last_scan_at), a
+     * few hundred tables per statement. Returns the number of tables updated.
+     */
+    public function flushScans()
+    {
+        $scans = Cache::lock('table_scans:lock', 30)->block(10, function () {
+            $scans = [];
+            $remaining = [];
+
+            foreach (array_keys(Cache::get('table_scans:pending', [])) as $tableId) {
+                $key = self::scanKey($tableId);
+                $count = (int) Cache::get($key, 0);
+
+                if ($count > 0) {
+                    $scans[(int) $tableId] = [$count, Cache::get($key . ':last') ?? now()->toDateTimeString()];
+
+                    // Scans counted after the read stay for the next flush
+                    if (Cache::decrement($key, $count) > 0) {
+                        $remaining[$tableId] = true;
+                    }
+                }
+            }
+
+            Cache::put('table_scans:pending', $remaining, self::SCAN_TTL);
+
+            return $scans;
+        });
+
+        foreach (array_chunk($scans, self::SCAN_FLUSH_CHUNK, true) as $chunk) {
+            $counts = '';
+            $lastScans = '';
+            foreach ($chunk as $tableId => [$count, $lastScanAt]) {
+                $counts .= sprintf(' WHEN %d THEN %d', $tableId, $count);
+                $lastScans .= sprintf(' WHEN %d THEN %s', $tableId, DB::getPdo()->quote($lastScanAt));
+            }
+
+            DB::table('tables')->whereIn('id', array_keys($chunk))->update([
+                'scan_count' => DB::raw("COALESCE(scan_count, 0) + CASE id{$counts} ELSE 0 END"),
+                'last_scan_at' => DB::raw("CASE id{$lastScans} ELSE last_scan_at END"),
+            ]);
+        }
+
+        return count($scans);
+    }
+
+    private function build(Outlet $outlet)
+    {
+        $products = Product::with('category')
+            ->where('business_id', $outlet->business_id)
+            ->where('is_active', true)
+            ->orderBy('id')
+            ->get()
+            ->map(function ($product) {
+                // Image URL (handle both old "storage/..." and new format)
+                $product->image_url = $product->image
+                    ? asset('storage/' . str_replace('storage/', '', $product->image))
+                    : null;
+
+                return $product->toArray();
+            });
+
+        $categories = $products->pluck('category')->filter()->unique('id')->values();
+
+        return [
+            'outlet' => [
+                'id' => $outlet->id,
+                'name' => $outlet->name,
+                'slug' => $outlet->slug,
+                'address' => $outlet->address ?? null,
+                'phone' => $outlet->phone ?? null,
+                'tax_rate' => $outlet->getEffectiveTaxRate(),
+            ],
+            'midtrans_enabled' => $this->midtransEnabled($outlet),
+            'products' => $products->all(),
+            'json' => '"products":' . json_encode($products->all()) . ',"categories":' . json_encode($categories->all()),
+        ];
+    }
+
+    /**
+     * Whether the outlet (custom config) or its business has usable Midtrans keys
+     */
+    private function midtransEnabled(Outlet $outlet)
+    {
+        try {
+            if ($outlet->hasCustomMidtransConfig()) {
+                $config = $outlet->payment_gateway_config['midtrans'] ?? [];
+
+                if (($config['enabled'] ?? false) !== true) {
+                    return false;
+                }
+
+                $serverKey = $config['server_key'] ?? '';
+                if (strpos($serverKey, 'eyJpdiI6') === 0) {
+                    try {
+                        $serverKey = decrypt($serverKey);
+                    } catch (\Exception $e) {
+                        // Might be plain text
+                        Log::warning('Failed to decrypt server_key in self-service check', ['outlet_id' => $outlet->id]);
+                    }
+                }
+
+                return !empty($serverKey) && !empty($config['client_key'] ?? '');
+            }
+
+            $business = $outlet->business;
+            if ($business && $business->hasCustomMidtransConfig()) {
+                $config = $business->midtrans_config;
+
+                return ($config['enabled'] ?? false) === true
+                    && !empty($config['server_key'] ?? '')
+                    && !empty($config['client_key'] ?? '');
+            }
+        } catch (\Exception $e) {
+            Log::warning('Error checking Midtrans config in self-service', [
+                'outlet_id' => $outlet->id,
+                'error' => $e->getMessage(),
+            ]);
+        }
+
+        return false;
+    }
+
+    public static function versionKey($businessId)
+    {
+        return "public_menu:{$businessId}:version";
+    }
+
+    public static function scanKey($tableId)
+    {
+        return "table_scans:{$tableId}";
+    }
+}
@@ -0,0 +1,305 @@
+<?php
+
+namespace App\Services;
+
+use App\Http\Controllers\Api\ReportController;
+use App\Jobs\GenerateReportExport;
+use App\Models\AppNotification;
+use App\Models\ReportExport;
+use App\Models\User;
+use Carbon\Carbon;
+use Illuminate\Http\Request;
+use Illuminate\Support\Facades\Auth;
+use Illuminate\Support\Facades\Cache;
+use Illuminate\Support\Facades\DB;
+use Illuminate\Support\Facades\Log;
+use Illuminate\Support\Str;
+use Symfony\Component\HttpFoundation\StreamedResponse;
+
+class ReportExportService
+{
+    /**
+     * Query params that influence the generated report (everything else is ignored
+     * so that cache-busting params don't defeat deduplication)
+     */
+    public const PARAMS = [
+        'date_range',
+        'custom_start',
+        'custom_end',
+        'search',
+        'status',
+        'payment_method',
+        'paymentMethod',
+        'category_id',
+        'stock_status',
+        'cashier_id',
+    ];
+
+    /**
+     * Find a reusable export for an identical request or enqueue a new one.
+     *
+     * Identical = same user, business, outlet, type, format and params, with
+     * relative ranges (today, week, month...) resolved to concrete dates first.
+     * Pending or processing exports are shared; completed ones are reused until
+     * they expire, or for a few minutes only when their range includes today.
+     */
+    public function request(User $user, $businessId, $outletId, $type, $format, array $params)
+    {
+        $params = array_filter(
+            array_intersect_key($params, array_flip(self::PARAMS)),
+            fn ($value) => $value !== null && $value !== ''
+        );
+
+        // Same rules as the render path (ReportController::getDateRange)
+        $range = app(ReportController::class)->getDateRange(new Request($params));
+        unset($params['date_range']);
+        $params['custom_start'] = $range['start']->toDateString();
+        $params['custom_end'] = $range['end']->toDateString();
+        $live = $range['end']->gte(Carbon::now($range['end']->getTimezone())->startOfDay());
+
+        $fingerprint = ReportExport::fingerprint($user->id, $businessId, $outletId, $type, $format, $params);
+
+        // Lock per fingerprint so a double click on "Export" shares one job
+        return Cache::lock('report-export:' . $fingerprint, 10)->block(5, function () use ($user, $businessId, $outletId, $type, $format, $params, $fingerprint, $live) {
+            $existing = ReportExport::where('fingerprint', $fingerprint)
+                ->reusable()
+                ->latest('id')
+                ->first();
+
+            $fresh = !$live || ($existing?->completed_at
+                && $existing->completed_at->gt(now()->subMinutes(config('reports.exports.live_reuse_minutes', 5))));
+
+            if ($existing && ($existing->status !== 'completed' || ($existing->hasArtifact() && $fresh))) {
+                return $existing;
+            }
+
+            $export = ReportExport::create([
+                'uuid' => (string) Str::uuid(),
+                'business_id' => $businessId,
+                'outlet_id' => $outletId,
+                'user_id' => $user->id,
+                'type' => $type,
+                'format' => $format,
+                'params' => $params,
+                'fingerprint' => $fingerprint,
+                'status' => 'pending',
+            ]);
+
+            $this->dispatch($export);
+
+            return $export;
+        });
+    }
+
+    /**
+     * Put an export (back) on the queue, e.g. when its artifact was pruned.
+     */
+    public function requeue(ReportExport $export)
+    {
+        $export->update([
+            'status' => 'pending',
+            'file_path' => null,
+            'file_size' => null,
+            'error' => null,
+            'expires_at' => null,
+        ]);
+
+        $this->dispatch($export);
+
+        return $export;
+    }
+
+    /**
+     * Render the report and store it as an artifact. Called from the queue worker.
+     */
+    public function generate(ReportExport $export)
+    {
+        // Resumable: a retried job does not render a finished artifact twice
+        if ($export->hasArtifact()) {
+            return $export;
+        }
+
+        $export->update([
+            'status' => 'processing',
+            'started_at' => now(),
+            'attempts' => $export->attempts + 1,
+            'error' => null,
+        ]);
+
+        $content = $this->render($export);
+
+        $disk = ReportExport::disk();
+        $directory = config('reports.exports.directory', 'report-exports');
+        $path = "{$directory}/{$export->uuid}." . $this->extension($export->format);
+        $tmpPath = "{$path}.part";
+
+        // Write to a temp file first so a download never sees a half-written artifact
+        $disk->put($tmpPath, $content);
+        if ($disk->exists($path)) {
+            $disk->delete($path);
+        }
+        $disk->move($tmpPath, $path);
+
+        $export->update([
+            'status' => 'completed',
+            'file_path' => $path,
+            'file_size' => strlen($content),
+            'completed_at' => now(),
+            'expires_at' => now()->addHours(config('reports.exports.retention_hours', 24)),
+        ]);
+
+        $this->notifyCompleted($export);
+
+        return $export;
+    }
+
+    public function markFailed(ReportExport $export, $message)
+    {
+        $export->update([
+            'status' => 'failed',
+            'error' => Str::limit($message, 500),
+        ]);
+    }
+
+    /**
+     * Delete expired artifacts and their export records.
+     *
+     * @return int number of exports removed
+     */
+    public function prune()
+    {
+        $disk = ReportExport::disk();
+        $removed = 0;
+
+        ReportExport::expired()->chunkById(200, function ($exports) use ($disk, &$removed) {
+            foreach ($exports as $export) {
+                if ($export->file_path && $disk->exists($export->file_path)) {
+                    $disk->delete($export->file_path);
+                }
+            }
+
+            $removed += ReportExport::whereIn('id', $exports->pluck('id'))->delete();
+        });
+
+        // Failed exports are kept for a day so users can see the error, then removed
+        $removed += ReportExport::where('status', 'failed')
+            ->where('updated_at', '<', now()->subDay())
+            ->delete();
+
+        return $removed;
+    }
+
+    private function dispatch(ReportExport $export)
+    {
+        // Dispatch after commit so the worker always finds the export row
+        DB::afterCommit(function () use ($export) {
+            GenerateReportExport::dispatch($export->id)
+                ->onQueue(config('reports.exports.queue', 'reports'));
+        });
+    }
+
+    /**
+     * Run the existing synchronous export path with a rebuilt request for the
+     * export's user, business and outlet, and return the rendered body.
+     * The worker's request and authenticated user are restored afterwards so
+     * the next job on a long-running worker does not inherit them.
+     */
+    private function render(ReportExport $export)
+    {
+        $user = User::findOrFail($export->user_id);
+
+        $request = Request::create(
+            '/api/v1/reports/export/' . $export->type,
+            'GET',
+            array_merge($export->params ?? [], ['format' => $export->format])
+        );
+        $request->headers->set('Accept', 'application/json');
+        $request->headers->set('X-Business-Id', (string) $export->business_id);
+        if ($export->outlet_id) {
+            $request->headers->set('X-Outlet-Id', (string) $export->outlet_id);
+        }
+        $request->setUserResolver(fn () => $user);
+
+        // ReportController also reads request() and auth() helpers
+        $previousRequest = app()->bound('request') ? app('request') : null;
+        $previousUser = Auth::hasUser() ? Auth::user() : null;
+
+        app()->instance('request', $request);
+        Auth::setUser($user);
+
+        try {
+            $response = app(ReportController::class)->exportReport($request, $export->type);
+
+            if ($response instanceof StreamedResponse) {
+                ob_start();
+                $response->sendContent();
+                $content = ob_get_clean();
+            } else {
+                $content = $response->getContent();
+            }
+        } finally {
+            if ($previousRequest) {
+                app()->instance('request', $previousRequest);
+            } else {
+                app()->forgetInstance('request');
+            }
+
+            if ($previousUser) {
+                Auth::setUser($previousUser);
+            } else {
+                Auth::forgetUser();
+            }
+        }
+
+        if ($response->getStatusCode() >= 400) {
+            $message = json_decode($content, true)['message'] ?? ('HTTP ' . $response->getStatusCode());
+            throw new \RuntimeException($message);
+        }
+
+        // A stream that failed midway ends with an error row: fail (and retry) instead of storing a cut-off file
+        if ($response instanceof StreamedResponse && str_contains($content, "\n" . ReportController::STREAM_ERROR_MARKER . ',')) {
+            throw new \RuntimeException('Export stream failed before completion');
+        }
+
+        return $content;
+    }
+
+    private function extension($format)
+    {
+        return match ($format) {
+            'csv' => 'csv',
+            'excel' => 'csv',
+            default => 'html', // PDF exports are print-ready HTML
+        };
+    }
+
+    /**
+     * In-app notification for the requesting user (user-specific, so no role broadcast)
+     */
+    private function notifyCompleted(ReportExport $export)
+    {
+        try {
+            AppNotification::create([
+                'business_id' => $export->business_id,
+                'outlet_id' => $export->outlet_id,
+                'user_id' => $export->user_id,
+                'type' => 'report.export_completed',
+                'title' => 'Laporan Siap Diunduh',
+                'message' => 'Export laporan ' . str_replace('-', ' ', $export->type) . ' sudah selesai dan siap diunduh.',
+                'severity' => 'info',
+                'resource_type' => 'report_export',
+                'resource_id' => $export->id,
+                'meta' => [
+                    'export_id' => $export->uuid,
+                    'type' => $export->type,
+                    'format' => $export->format,
+                ],
+            ]);
+        } catch (\Exception $e) {
+            Log::warning('ReportExportService: Failed to create completion notification', [
+                'export_id' => $export->id,
+                'error' => $e->getMessage(),
+            ]);
+        }
+    }
+}
@@ -0,0 +1,481 @@
+<?php
+
+namespace App\Services;
+
+use App\Models\Order;
+use Carbon\Carbon;
+use Illuminate\Support\Arr;
+use Illuminate\Support\Collection;
+use Illuminate\Support\Facades\Cache;
+use Illuminate\Support\Facades\DB;
+use Illuminate\Support\Facades\Log;
+
+class SalesRollupService
+{
+    /**
+     * Order statuses that count as a sale (together with payment_status = paid)
+     */
+    public const SALE_STATUSES = ['completed', 'confirmed', 'preparing', 'ready'];
+
+    private const KEY_COLUMNS = [
+        'business_id', 'outlet_id', 'sale_date', 'hour', 'grain',
+        'payment_method', 'product_id', 'category_id', 'customer_id',
+    ];
+
+    private const METRIC_COLUMNS = [
+        'orders_count', 'quantity', 'subtotal', 'discount_amount', 'tax_amount', 'total',
+    ];
+
+    /**
+     * Seconds the live rows of today are cached (also invalidated on every synced order)
+     */
+    private const LIVE_CACHE_TTL = 60;
+
+    /**
+     * Live rows of today, memoized per business/outlet/range for the lifetime of this instance
+     */
+    private array $liveRows = [];
+
+    /**
+     * Bring the rollups in line with the current state of an order.
+     *
+     * A paid sale adds its contributions (order totals, payments, products,
+     * customer) to the buckets of the hour it is recognized in (recognized_at). When it stops
+     * counting (cancel/refund/delete) or its amounts change, exactly what was
+     * added before is subtracted again. Safe to call any number of times.
+     */
+    public function syncOrder(Order $order)
+    {
+        try {
+            $tracked = DB::table('daily_sales_rollup_orders')->where('order_id', $order->id)->first();
+
+            $rows = [];
+            if ($this->countsAsSale($order)) {
+                // recognized_at is written by Order::refreshPaidAt without touching the model
+                $order->setAttribute('recognized_at', Order::withTrashed()->whereKey($order->id)->value('recognized_at') ?? $order->recognized_at);
+                $order->syncOriginalAttribute('recognized_at');
+                $order->load(['payments', 'items.product:id,category_id']);
+                $rows = $this->contributions($order);
+            }
+
+            if ($tracked && json_decode($tracked->contributions, true) == $rows) {
+                return;
+            }
+
+            DB::transaction(function () use ($order, $tracked, $rows) {
+                if ($tracked) {
+                    $deleted = DB::table('daily_sales_rollup_orders')->where('id', $tracked->id)->delete();
+                    if ($deleted) {
+                        $this->applyRows(json_decode($tracked->contributions, true), -1);
+                    }
+                }
+
+                if (!empty($rows)) {
+                    $inserted = DB::table('daily_sales_rollup_orders')->insertOrIgnore([
+                        'order_id' => $order->id,
+                        'business_id' => $order->business_id,
+                        'outlet_id' => $order->outlet_id ?? 0,
+                        'sale_date' => $rows[0]['sale_date'],
+                        'contributions' => json_encode($rows),
+                        'created_at' => now(),
+                        'updated_at' => now(),
+                    ]);
+                    if ($inserted) {
+                        $this->applyRows($rows, 1);
+                    }
+                }
+
+                $this->touch($order->business_id);
+            });
+        } catch (\Exception $e) {
+            Log::error('SalesRollupService: Failed to sync order', [
+                'order_id' => $order->id,
+                'error' => $e->getMessage(),
+            ]);
+        }
+    }
+
+    /**
+     * Remove a (force deleted) order from the rollups.
+     */
+    public function removeOrder($orderId)
+    {
+        $tracked = DB::table('daily_sales_rollup_orders')->where('order_id', $orderId)->first();
+
+        if (!$tracked) {
+            return;
+        }
+
+        DB::transaction(function () use ($tracked) {
+            if (DB::table('daily_sales_rollup_orders')->where('id', $tracked->id)->delete()) {
+                $this->applyRows(json_decode($tracked->contributions, true), -1);
+            }
+
+            $this->touch($tracked->business_id);
+        });
+    }
+
+    /**
+     * Rebuild the rollups of whole days from orders (backfill / nightly repair).
+     *
+     * @param callable|null $progress called with (date, orders counted) after each day
+     * @return int number of orders rolled up
+     */
+    public function rebuild(Carbon $from, Carbon $to, $businessId = null, ?callable $progress = null)
+    {
+        $total = 0;
+
+        for ($day = $from->copy()->startOfDay(); $day->lte($to); $day->addDay()) {
+            $date = $day->toDateString();
+            $buckets = [];
+            $tracking = [];
+
+            $this->saleOrders($businessId, null, $day->copy()->startOfDay(), $day->copy()->endOfDay())
+                ->chunkById(500, function ($orders) use ($date, &$buckets, &$tracking) {
+                    foreach ($orders as $order) {
+                        $rows = $this->contributions($order);
+                        if (empty($rows) || $rows[0]['sale_date'] !== $date) {
+                            continue;
+                        }
+
+                        $tracking[] = [
+                            'order_id' => $order->id,
+                            'business_id' => $order->business_id,
+                            'outlet_id' => $order->outlet_id ?? 0,
+                            'sale_date' => $date,
+                            'contributions' => json_encode($rows),
+                            'created_at' => now(),
+                            'updated_at' => now(),
+                        ];
+
+                        foreach ($rows as $row) {
+                            $this->accumulate($buckets, $row);
+                        }
+                    }
+                });
+
+            DB::transaction(function () use ($date, $businessId, $buckets, $tracking) {
+                DB::table('daily_sales_rollups')
+                    ->where('sale_date', $date)
+                    ->when($businessId, fn ($q) => $q->where('business_id', $businessId))
+                    ->delete();
+                DB::table('daily_sales_rollup_orders')
+                    ->where('sale_date', $date)
+                    ->when($businessId, fn ($q) => $q->where('business_id', $businessId))
+                    ->delete();
+                // Orders previously tracked under another day are re-tracked here
+                foreach (array_chunk(array_column($tracking, 'order_id'), 1000) as $orderIds) {
+                    DB::table('daily_sales_rollup_orders')->whereIn('order_id', $orderIds)->delete();
+                }
+
+                $now = now();
+                foreach (array_chunk(array_values($buckets), 500) as $chunk) {
+                    DB::table('daily_sales_rollups')->insert(array_map(
+                        fn ($row) => $row + ['created_at' => $now, 'updated_at' => $now],
+                        $chunk
+                    ));
+                }
+                foreach (array_chunk($tracking, 500) as $chunk) {
+                    DB::table('daily_sales_rollup_orders')->insert($chunk);
+                }
+            });
+
+            $total += count($tracking);
+
+            if ($progress) {
+                $progress($date, count($tracking));
+            }
+        }
+
+        return $total;
+    }
+
+    /**
+     * Aggregate one grain over a date range, grouped by the given columns.
+     *
+     * Days before today are read from the rollup table, today is aggregated
+     * live from orders with the same contribution rules (cached briefly and
+     * invalidated whenever an order of the business is synced). Ranges are
+     * treated as whole days.
+     *
+     * @param string $grain order|payment|product|customer
+     * @param array $groupBy key columns (e.g. ['sale_date'], ['hour'], ['product_id'])
+     * @return Collection of arrays with the group columns and summed metrics
+     */
+    public function aggregate($grain, array $groupBy, $businessId, $outletId, Carbon $start, Carbon $end)
+    {
+        $todayStart = now()->startOfDay();
+        $rows = collect();
+
+        if ($start->lt($todayStart)) {
+            $historicEnd = $end->lt($todayStart) ? $end : $todayStart->copy()->subDay();
+
+            $select = array_merge($groupBy, array_map(
+                fn ($column) => DB::raw("SUM({$column}) as {$column}"),
+                self::METRIC_COLUMNS
+            ));
+            if ($grain === 'product') {
+                $select[] = DB::raw('MAX(product_name) as product_name');
+            }
+
+            $rows = DB::table('daily_sales_rollups')
+                ->where('business_id', $businessId)
+                ->when($outletId, fn ($q) => $q->where('outlet_id', $outletId))
+                ->where('grain', $grain)
+                ->whereBetween('sale_date', [$start->toDateString(), $historicEnd->toDateString()])
+                ->select($select)
+                ->when(!empty($groupBy), fn ($q) => $q->groupBy($groupBy))
+                ->get()
+                ->map(fn ($row) => (array) $row);
+        }
+
+        if ($end->gte($todayStart)) {
+            $liveStart = $start->gt($todayStart) ? $start : $todayStart;
+            $rows = $rows->concat(
+                $this->liveRows($businessId, $outletId, $liveStart, $end)->where('grain', $grain)
+            );
+        }
+
+        return $this->regroup($rows, $groupBy);
+    }
+
+    /**
+     * Order totals of a date range (single row) plus the number of distinct customers.
+     */
+    public function totals($businessId, $outletId, Carbon $start, Carbon $end)
+    {
+        $totals = $this->aggregate('order', [], $businessId, $outletId, $start, $end)->first()
+            ?? array_fill_keys(self::METRIC_COLUMNS, 0);
+
+        $totals['customers_count'] = $this->aggregate('customer', ['customer_id'], $businessId, $outletId, $start, $end)
+            ->where('customer_id', '>', 0)
+            ->count();
+
+        return $totals;
+    }
+
+    /**
+     * Whether an order currently counts as a sale.
+     */
+    public function countsAsSale(Order $order)
+    {
+        return $order->payment_status === 'paid'
+            && in_array($order->status, self::SALE_STATUSES)
+            && !$order->trashed();
+    }
+
+    /**
+     * Rollup rows a single paid order contributes, bucketed by the hour it is
+     * recognized in (recognized_at: first valid payment, or creation time when
+     * there is no payment record) - the same date FinanceController filters on.
+     * Expects payments and items.product to be loaded.
+     */
+    public function contributions(Order $order)
+    {
+        $payments = $order->payments
+            ->whereIn('status', ShiftLedgerService::VALID_PAYMENT_STATUSES)
+            ->sortBy('id');
+
+        $paidAt = Carbon::parse($order->recognized_at ?? $order->created_at)->setTimezone(config('app.timezone'));
+
+        $base = [
+            'business_id' => (int) $order->business_id,
+            'outlet_id' => (int) ($order->outlet_id ?? 0),
+            'sale_date' => $paidAt->toDateString(),
+            'hour' => (int) $paidAt->hour,
+            'grain' => 'order',
+            'payment_method' => '',
+            'product_id' => 0,
+            'category_id' => 0,
+            'customer_id' => 0,
+            'product_name' => null,
+            'orders_count' => 1,
+            'quantity' => 0,
+            'subtotal' => 0,
+            'discount_amount' => 0,
+            'tax_amount' => 0,
+            'total' => 0,
+        ];
+
+        $rows = [array_merge($base, [
+            'quantity' => (float) $order->items->sum('quantity'),
+            'subtotal' => (float) $order->subtotal,
+            'discount_amount' => (float) $order->discount_amount,
+            'tax_amount' => (float) $order->tax_amount,
+            'total' => (float) $order->total,
+        ])];
+
+        // Latest payment per method, cash net of change (same rules as the shift ledger)
+        foreach ($payments->keyBy('payment_method') as $method => $payment) {
+            $amount = (float) $payment->amount;
+            if ($method === 'cash') {
+                $amount -= (float) ($order->change_amount ?? 0);
+            }
+            $rows[] = array_merge($base, [
+                'grain' => 'payment',
+                'payment_method' => (string) $method,
+                'total' => $amount,
+            ]);
+        }
+
+        foreach ($order->items->groupBy('product_id') as $productId => $items) {
+            $rows[] = array_merge($base, [
+                'grain' => 'product',
+                'product_id' => (int) $productId,
+                'category_id' => (int) ($items->first()->product?->category_id ?? 0),
+                'product_name' => $items->first()->product_name,
+                'quantity' => (float) $items->sum('quantity'),
+                'subtotal' => (float) $items->sum('subtotal'),
+                'total' => (float) $items->sum('subtotal'),
+            ]);
+        }
+
+        if ($order->customer_id) {
+            $rows[] = array_merge($base, [
+                'grain' => 'customer',
+                'customer_id' => (int) $order->customer_id,
+                'total' => (float) $order->total,
+            ]);
+        }
+
+        return $rows;
+    }
+
+    /**
+     * Paid sale orders recognized within [start, end].
+     */
+    private function saleOrders($businessId, $outletId, Carbon $start, Carbon $end)
+    {
+        return Order::query()
+            ->where('payment_status', 'paid')
+            ->whereIn('status', self::SALE_STATUSES)
+            ->recognizedBetween($start, $end)
+            ->when($businessId, fn ($q) => $q->where('business_id', $businessId))
+            ->when($outletId, fn ($q) => $q->where('outlet_id', $outletId))
+            ->with(['payments', 'items.product:id,category_id']);
+    }
+
+    /**
+     * Invalidate the cached live rows of a business (after commit)
+     */
+    private function touch($businessId)
+    {
+        DB::afterCommit(function () use ($businessId) {
+            $key = self::versionKey($businessId);
+            Cache::add($key, 0, now()->addDay());
+            Cache::increment($key);
+        });
+    }
+
+    private static function versionKey($businessId)
+    {
+        return "sales_rollup_live_version:{$businessId}";
+    }
+
+    private function liveRows($businessId, $outletId, Carbon $start, Carbon $end)
+    {
+        $key = implode('|', [$businessId, $outletId, $start->toDateString(), $end->toDateString()]);
+
+        if (!isset($this->liveRows[$key])) {
+            $version = (int) Cache::get(self::versionKey($businessId), 0);
+            $cacheKey = 'sales_rollup_live:' . implode(':', [
+                $businessId, $outletId ?: 'all', $start->toDateString(), $end->toDateString(), "v{$version}",
+            ]);
+
+            $this->liveRows[$key] = collect(Cache::remember($cacheKey, self::LIVE_CACHE_TTL, function () use ($businessId, $outletId, $start, $end) {
+                $from = $start->toDateString();
+                $to = $end->toDateString();
+                $rows = [];
+
+                $this->saleOrders($businessId, $outletId, $start->copy()->startOfDay(), $end->copy()->endOfDay())
+                    ->chunkById(500, function ($orders) use ($from, $to, &$rows) {
+                        foreach ($orders as $order) {
+                            foreach ($this->contributions($order) as $row) {
+                                if ($row['sale_date'] >= $from && $row['sale_date'] <= $to) {
+                                    $rows[] = $row;
+                                }
+                            }
+                        }
+                    });
+
+                return $rows;
+            }));
+        }
+
+        return $this->liveRows[$key];
+    }
+
+    private function regroup(Collection $rows, array $groupBy)
+    {
+        $groups = [];
+
+        foreach ($rows as $row) {
+            $key = implode('|', array_map(fn ($column) => $row[$column], $groupBy));
+
+            if (!isset($groups[$key])) {
+                $groups[$key] = Arr::only($row, $groupBy) + array_fill_keys(self::METRIC_COLUMNS, 0) + ['product_name' => null];
+            }
+            foreach (self::METRIC_COLUMNS as $column) {
+                $groups[$key][$column] += (float) $row[$column];
+            }
+            $groups[$key]['product_name'] = $groups[$key]['product_name'] ?? ($row['product_name'] ?? null);
+        }
+
+        return collect(array_values($groups));
+    }
+
+    private function accumulate(array &$buckets, array $row)
+    {
+        $key = implode('|', Arr::only($row, self::KEY_COLUMNS));
+
+        if (!isset($buckets[$key])) {
+            $buckets[$key] = $row;
+            return;
+        }
+
+        foreach (self::METRIC_COLUMNS as $column) {
+            $buckets[$key][$column] += $row[$column];
+        }
+    }
+
+    /**
+     * Add (or subtract) contribution rows to their buckets with atomic increments.
+     */
+    private function applyRows(array $rows, int $sign)
+    {
+        foreach ($rows as $row) {
+            $key = Arr::only($row, self::KEY_COLUMNS);
+
+            if ($this->incrementBucket($key, $row, $sign) || $sign < 0) {
+                continue;
+            }
+
+            $inserted = DB::table('daily_sales_rollups')->insertOrIgnore(
+                $row + ['created_at' => now(), 'updated_at' => now()]
+            );
+
+            // Bucket created concurrently by another order: increment it instead
+            if (!$inserted) {
+                $this->incrementBucket($key, $row, $sign);
+            }
+        }
+
+        if ($sign < 0) {
+            DB::table('daily_sales_rollups')
+                ->where('business_id', $rows[0]['business_id'] ?? 0)
+                ->where('sale_date', $rows[0]['sale_date'] ?? null)
+                ->where('orders_count', '<=', 0)
+                ->delete();
+        }
+    }
+
+    private function incrementBucket(array $key, array $row, int $sign)
+    {
+        $amounts = [];
+        foreach (self::METRIC_COLUMNS as $column) {
+            $amounts[$column] = round($sign * $row[$column], 2);
+        }
+
+        return DB::table('daily_sales_rollups')->where($key)->incrementEach($amounts, ['updated_at' => now()]);
+    }
+}
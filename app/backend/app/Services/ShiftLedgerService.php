@@ -0,0 +1,381 @@
+<?php
+
+namespace App\Services;
+
+use App\Models\CashierShift;
+use App\Models\CashierShiftLedgerEntry;
+use App\Models\Order;
+use Illuminate\Support\Facades\DB;
+use Illuminate\Support\Facades\Log;
+
+class ShiftLedgerService
+{
+    /**
+     * Payment methods tracked per shift (expected_{method} / {method}_transactions)
+     */
+    public const METHODS = ['cash', 'card', 'transfer', 'qris'];
+
+    /**
+     * Payment statuses that count as money received
+     */
+    public const VALID_PAYMENT_STATUSES = ['success', 'paid', 'settlement', 'capture'];
+
+    /**
+     * Bring the shift ledger in line with the current state of an order.
+     *
+     * A paid order with a shift_id gets exactly one ledger entry whose amounts
+     * are added to the shift counters with a single atomic UPDATE. When the
+     * order's total or payments change while it stays paid in the same shift
+     * (edit, partial refund, split payment), the entry is updated and only the
+     * difference is applied. When the order is no longer paid (cancel/refund)
+     * or moved to another shift, the entry is removed and its amounts are
+     * subtracted again. Safe to call any number of times for the same order.
+     */
+    public function syncOrder(Order $order)
+    {
+        try {
+            $entry = CashierShiftLedgerEntry::where('order_id', $order->id)->first();
+            $shouldCount = $order->shift_id && $order->payment_status === 'paid' && !$order->trashed();
+
+            if ($entry && (!$shouldCount || (int) $entry->cashier_shift_id !== (int) $order->shift_id)) {
+                $this->reverseEntry($entry);
+                $entry = null;
+            }
+
+            if ($shouldCount && !$entry) {
+                $this->applyEntry($this->buildEntry($order));
+            } elseif ($shouldCount) {
+                $this->adjustEntry($entry, $this->buildEntry($order));
+            }
+        } catch (\Exception $e) {
+            Log::error('ShiftLedgerService: Failed to sync order', [
+                'order_id' => $order->id,
+                'shift_id' => $order->shift_id,
+                'error' => $e->getMessage(),
+            ]);
+        }
+    }
+
+    /**
+     * Remove a (deleted) order from the ledger of its shift.
+     */
+    public function removeOrder($orderId)
+    {
+        $entry = CashierShiftLedgerEntry::where('order_id', $orderId)->first();
+
+        if ($entry) {
+            $this->reverseEntry($entry);
+        }
+    }
+
+    /**
+     * Attach paid self-service orders (paid via Midtrans, without a cashier)
+     * that have no shift yet to an open shift and add them to its ledger.
+     * Returns the number of orders assigned.
+     */
+    public function assignSelfServiceOrders(CashierShift $shift, $outletId = null)
+    {
+        if (!$shift->isOpen()) {
+            return 0;
+        }
+
+        $orders = Order::where('business_id', $shift->business_id)
+            ->where('outlet_id', $outletId ?? $shift->outlet_id)
+            ->where('type', 'self_service')
+            ->where('payment_status', 'paid')
+            ->whereNull('shift_id')
+            ->whereBetween('created_at', [$shift->opened_at, now()])
+            ->get();
+
+        $assigned = 0;
+
+        foreach ($orders as $order) {
+            // Claim the order only if no other shift did in the meantime
+            if (!Order::whereKey($order->id)->whereNull('shift_id')->update(['shift_id' => $shift->id])) {
+                continue;
+            }
+
+            $order->shift_id = $shift->id;
+            $order->syncOriginalAttribute('shift_id');
+            $this->syncOrder($order);
+            $assigned++;
+
+            Log::info('ShiftLedgerService: Assigned shift_id to self-service order', [
+                'order_id' => $order->id,
+                'order_number' => $order->order_number,
+                'shift_id' => $shift->id,
+            ]);
+        }
+
+        return $assigned;
+    }
+
+    /**
+     * Refresh the shift counters from its ledger entries (one aggregate query, no order scan).
+     *
+     * Shifts from before the ledger have no entries: their ledger is built
+     * from orders first (see also shift:reconcile --rebuild-all).
+     */
+    public function refreshFromLedger(CashierShift $shift)
+    {
+        if (!CashierShiftLedgerEntry::where('cashier_shift_id', $shift->id)->exists()) {
+            $this->rebuild([$shift->id]);
+
+            return $shift->refresh();
+        }
+
+        return $this->writeCounters($shift);
+    }
+
+    /**
+     * Write the sums of a shift's ledger entries to its counters
+     */
+    private function writeCounters(CashierShift $shift)
+    {
+        $totals = CashierShiftLedgerEntry::where('cashier_shift_id', $shift->id)
+            ->selectRaw('
+                COUNT(*) as total_transactions,
+                COALESCE(SUM(total), 0) as expected_total,
+                COALESCE(SUM(cash), 0) as cash,
+                COALESCE(SUM(card), 0) as card,
+                COALESCE(SUM(transfer), 0) as transfer,
+                COALESCE(SUM(qris), 0) as qris,
+                COALESCE(SUM(cash_transactions), 0) as cash_transactions,
+                COALESCE(SUM(card_transactions), 0) as card_transactions,
+                COALESCE(SUM(transfer_transactions), 0) as transfer_transactions,
+                COALESCE(SUM(qris_transactions), 0) as qris_transactions
+            ')
+            ->first();
+
+        $counters = [
+            'total_transactions' => (int) $totals->total_transactions,
+            'expected_total' => $totals->expected_total,
+            // Expected Cash = Modal Awal + Net Cash Sales
+            'expected_cash' => $shift->opening_balance + $totals->cash,
+            'expected_card' => $totals->card,
+            'expected_transfer' => $totals->transfer,
+            'expected_qris' => $totals->qris,
+            'cash_transactions' => (int) $totals->cash_transactions,
+            'card_transactions' => (int) $totals->card_transactions,
+            'transfer_transactions' => (int) $totals->transfer_transactions,
+            'qris_transactions' => (int) $totals->qris_transactions,
+        ];
+
+        // Closed shifts keep their counted amounts, only the differences follow
+        if ($shift->isClosed()) {
+            $counters['cash_difference'] = ($shift->actual_cash ?? 0) - $counters['expected_cash'];
+            $counters['total_difference'] = ($shift->actual_total ?? 0) - $counters['expected_total'];
+        }
+
+        $shift->update($counters);
+
+        return $shift;
+    }
+
+    /**
+     * Recompute shift totals from orders and payments in bulk SQL.
+     *
+     * @param array $shiftIds
+     * @return \Illuminate\Support\Collection keyed by shift_id
+     */
+    public function recomputeFromOrders(array $shiftIds)
+    {
+        return DB::query()
+            ->fromSub($this->perOrderQuery($shiftIds), 'entries')
+            ->selectRaw('
+                cashier_shift_id,
+                COUNT(*) as total_transactions,
+                SUM(total) as expected_total,
+                SUM(cash) as cash,
+                SUM(card) as card,
+                SUM(transfer) as transfer,
+                SUM(qris) as qris,
+                SUM(cash_transactions) as cash_transactions,
+                SUM(card_transactions) as card_transactions,
+                SUM(transfer_transactions) as transfer_transactions,
+                SUM(qris_transactions) as qris_transactions
+            ')
+            ->groupBy('cashier_shift_id')
+            ->get()
+            ->keyBy('cashier_shift_id');
+    }
+
+    /**
+     * Rebuild ledger entries of the given shifts from orders and payments,
+     * then refresh the shift counters from the rebuilt ledger.
+     */
+    public function rebuild(array $shiftIds)
+    {
+        DB::transaction(function () use ($shiftIds) {
+            CashierShiftLedgerEntry::whereIn('cashier_shift_id', $shiftIds)->delete();
+
+            // Orders may have moved between shifts, drop their stale entries too
+            CashierShiftLedgerEntry::whereIn('order_id', function ($query) use ($shiftIds) {
+                $query->select('id')->from('orders')->whereIn('shift_id', $shiftIds);
+            })->delete();
+
+            DB::table('cashier_shift_ledger_entries')->insertUsing([
+                'cashier_shift_id', 'order_id', 'total',
+                'cash', 'card', 'transfer', 'qris',
+                'cash_transactions', 'card_transactions', 'transfer_transactions', 'qris_transactions',
+                'created_at', 'updated_at',
+            ], $this->perOrderQuery($shiftIds)->selectRaw('?, ?', [now(), now()]));
+
+            CashierShift::whereIn('id', $shiftIds)->get()->each(function ($shift) {
+                $this->writeCounters($shift);
+            });
+        });
+    }
+
+    /**
+     * One row per paid order of the given shifts with the same amounts as
+     * buildEntry(): valid payments only, latest payment per method, cash net of change.
+     */
+    private function perOrderQuery(array $shiftIds)
+    {
+        $latestPayments = DB::table('payments')
+            ->selectRaw('MAX(id)')
+            ->whereIn('status', self::VALID_PAYMENT_STATUSES)
+            ->whereIn('order_id', function ($query) use ($shiftIds) {
+                $query->select('id')->from('orders')->whereIn('shift_id', $shiftIds);
+            })
+            ->groupBy('order_id', 'payment_method');
+
+        $columns = [];
+        foreach (self::METHODS as $method) {
+            $amount = "SUM(CASE WHEN p.payment_method = '{$method}' THEN p.amount ELSE 0 END)";
+            if ($method === 'cash') {
+                $amount .= " - MAX(CASE WHEN p.payment_method = 'cash' THEN COALESCE(o.change_amount, 0) ELSE 0 END)";
+            }
+            $columns[] = "{$amount} as {$method}";
+        }
+        foreach (self::METHODS as $method) {
+            $columns[] = "MAX(CASE WHEN p.payment_method = '{$method}' THEN 1 ELSE 0 END) as {$method}_transactions";
+        }
+
+        return DB::table('orders as o')
+            ->leftJoin('payments as p', function ($join) use ($latestPayments) {
+                $join->on('p.order_id', '=', 'o.id')->whereIn('p.id', $latestPayments);
+            })
+            ->selectRaw('o.shift_id as cashier_shift_id, o.id as order_id, o.total, ' . implode(', ', $columns))
+            ->whereIn('o.shift_id', $shiftIds)
+            ->where('o.payment_status', 'paid')
+            ->whereNull('o.deleted_at')
+            ->groupBy('o.shift_id', 'o.id', 'o.total', 'o.change_amount');
+    }
+
+    /**
+     * Build the ledger row of a single order from its payments.
+     */
+    private function buildEntry(Order $order)
+    {
+        $payments = $order->payments()
+            ->whereIn('status', self::VALID_PAYMENT_STATUSES)
+            ->orderBy('id')
+            ->get();
+
+        // Latest payment per method (handles retries with the same method)
+        $paymentByMethod = $payments->keyBy('payment_method');
+
+        $entry = [
+            'cashier_shift_id' => $order->shift_id,
+            'order_id' => $order->id,
+            'total' => (float) $order->total,
+            'created_at' => now(),
+            'updated_at' => now(),
+        ];
+
+        foreach (self::METHODS as $method) {
+            $payment = $paymentByMethod->get($method);
+            $amount = $payment ? (float) $payment->amount : 0;
+
+            // Net cash = cash received - change given
+            if ($method === 'cash' && $payment) {
+                $amount -= (float) ($order->change_amount ?? 0);
+            }
+
+            $entry[$method] = $amount;
+            $entry["{$method}_transactions"] = $payment ? 1 : 0;
+        }
+
+        return $entry;
+    }
+
+    private function applyEntry(array $entry)
+    {
+        DB::transaction(function () use ($entry) {
+            // Unique order_id makes duplicate applications (e.g. webhook retries) a no-op
+            $inserted = DB::table('cashier_shift_ledger_entries')->insertOrIgnore($entry);
+
+            if ($inserted) {
+                $this->applyDelta($entry['cashier_shift_id'], $entry, 1);
+            }
+        });
+    }
+
+    /**
+     * Bring an existing entry to the order's current amounts and apply the difference
+     */
+    private function adjustEntry(CashierShiftLedgerEntry $entry, array $fresh)
+    {
+        DB::transaction(function () use ($entry, $fresh) {
+            // Re-read under lock so concurrent syncs of the same order apply each difference once
+            $stored = DB::table('cashier_shift_ledger_entries')->where('id', $entry->id)->lockForUpdate()->first();
+
+            if (!$stored) {
+                return;
+            }
+
+            $diff = ['total' => round((float) $fresh['total'] - (float) $stored->total, 2)];
+            foreach (self::METHODS as $method) {
+                $diff[$method] = round((float) $fresh[$method] - (float) $stored->{$method}, 2);
+                $diff["{$method}_transactions"] = (int) $fresh["{$method}_transactions"] - (int) $stored->{"{$method}_transactions"};
+            }
+
+            if (empty(array_filter($diff))) {
+                return;
+            }
+
+            DB::table('cashier_shift_ledger_entries')->where('id', $stored->id)->update(
+                array_intersect_key($fresh, $diff) + ['updated_at' => now()]
+            );
+
+            // Same order, still one transaction: only the amounts move
+            $this->applyDelta($stored->cashier_shift_id, $diff, 1, false);
+        });
+    }
+
+    private function reverseEntry(CashierShiftLedgerEntry $entry)
+    {
+        DB::transaction(function () use ($entry) {
+            $deleted = CashierShiftLedgerEntry::where('id', $entry->id)->delete();
+
+            if ($deleted) {
+                $this->applyDelta($entry->cashier_shift_id, $entry->getAttributes(), -1);
+            }
+        });
+    }
+
+    /**
+     * Add (or subtract) one ledger entry, or the difference of an adjusted
+     * entry ($countTransaction = false), to the shift counters in a single atomic UPDATE.
+     */
+    private function applyDelta($shiftId, array $entry, int $sign, bool $countTransaction = true)
+    {
+        $sets = ['total_transactions = total_transactions + ?', 'expected_total = expected_total + ?'];
+        $bindings = [$countTransaction ? $sign : 0, $sign * (float) $entry['total']];
+
+        foreach (self::METHODS as $method) {
+            $sets[] = "expected_{$method} = expected_{$method} + ?";
+            $sets[] = "{$method}_transactions = {$method}_transactions + ?";
+            $bindings[] = $sign * (float) $entry[$method];
+            $bindings[] = $sign * (int) $entry["{$method}_transactions"];
+        }
+
+        $sets[] = 'updated_at = ?';
+        $bindings[] = now();
+        $bindings[] = $shiftId;
+
+        DB::update('UPDATE cashier_shifts SET ' . implode(', ', $sets) . ' WHERE id = ?', $bindings);
+    }
+}
@@ -0,0 +1,184 @@
+<?php
+
+namespace App\Services;
+
+use App\Exceptions\InsufficientStockException;
+use App\Models\InventoryMovement;
+use App\Models\Order;
+use App\Models\OrderItem;
+use App\Models\Product;
+use Illuminate\Support\Facades\Cache;
+use Illuminate\Support\Facades\DB;
+
+class StockReservationService
+{
+    /**
+     * Reserve stock for every cart line of an order.
+     *
+     * Must be called inside an open transaction. All cart products are loaded
+     * with a single SELECT ... FOR UPDATE (ordered by id so concurrent tills
+     * always lock rows in the same order), stock is decremented with one
+     * conditional UPDATE and order items / inventory movements are written
+     * with one bulk INSERT each.
+     *
+     * @param Order $order
+     * @param array $items Cart lines (product_id, quantity, price, ...)
+     * @return void
+     * @throws InsufficientStockException When a tracked product does not have enough stock
+     */
+    public function reserve(Order $order, array $items)
+    {
+        $productIds = array_values(array_unique(array_map(
+            fn ($item) => (int) $item['product_id'],
+            $items
+        )));
+        sort($productIds);
+
+        $products = Product::whereIn('id', $productIds)
+            ->orderBy('id')
+            ->lockForUpdate()
+            ->get()
+            ->keyBy('id');
+
+        $requested = [];
+        foreach ($items as $item) {
+            $product = $products->get((int) $item['product_id']);
+            if (!$product) {
+                throw (new \Illuminate\Database\Eloquent\ModelNotFoundException)
+                    ->setModel(Product::class, [$item['product_id']]);
+            }
+
+            if ($product->stock_type !== 'untracked') {
+                $requested[$product->id] = ($requested[$product->id] ?? 0) + (int) $item['quantity'];
+            }
+        }
+
+        // ✅ Check stock availability on the locked rows (untracked = unlimited stock)
+        foreach ($requested as $productId => $quantity) {
+            $product = $products->get($productId);
+            if ($product->stock < $quantity) {
+                throw new InsufficientStockException("Stok produk '{$product->name}' tidak mencukupi. Stok tersedia: {$product->stock}");
+            }
+        }
+
+        $this->decrementStock($requested);
+
+        $now = now();
+        $orderItems = [];
+        $movements = [];
+        $runningStock = [];
+
+        foreach ($items as $item) {
+            $product = $products->get((int) $item['product_id']);
+
+            $orderItems[] = [
+                'order_id' => $order->id,
+                'product_id' => $product->id,
+                'product_name' => $product->name,
+                'product_variant_id' => $item['product_variant_id'] ?? null,
+                'variant_name' => $item['variant_name'] ?? null,
+                'quantity' => $item['quantity'],
+                'price' => $item['price'],
+                'subtotal' => $item['quantity'] * $item['price'],
+                'notes' => $item['notes'] ?? null,
+                'created_at' => $now,
+                'updated_at' => $now,
+            ];
+
+            // Only tracked products get an inventory movement record
+            if ($product->stock_type === 'untracked') {
+                continue;
+            }
+
+            $stockBefore = $runningStock[$product->id] ?? $product->stock;
+            $stockAfter = $stockBefore - $item['quantity'];
+            $runningStock[$product->id] = $stockAfter;
+
+            $movements[] = [
+                'product_id' => $product->id,
+                'ingredient_id' => null,
+                'type' => 'out',
+                'reason' => 'sale',
+                'quantity' => $item['quantity'],
+                'stock_before' => $stockBefore,
+                'stock_after' => $stockAfter,
+                'reference_type' => 'order',
+                'reference_id' => $order->id,
+                'notes' => "Penjualan order #{$order->order_number}",
+                'created_at' => $now,
+                'updated_at' => $now,
+            ];
+        }
+
+        OrderItem::insert($orderItems);
+
+        if (!empty($movements)) {
+            InventoryMovement::insert($movements);
+        }
+
+        // ✅ Stock-only catalog delta (the cached POS product list stays valid);
+        // product stats are cleared once, after the surrounding transaction commits
+        $businessId = $order->business_id;
+        if (!empty($requested)) {
+            app(ProductCatalogService::class)->recordChange($businessId, array_keys($requested), false);
+        }
+        DB::afterCommit(function () use ($businessId) {
+            self::forgetProductCaches($businessId);
+        });
+    }
+
+    /**
+     * Forget the cached product stats of a business.
+     *
+     * The POS product list is versioned (see ProductCatalogService) and is not
+     * invalidated by stock changes.
+     */
+    public static function forgetProductCaches($businessId)
+    {
+        Cache::forget("products_stats:business:{$businessId}");
+    }
+
+    /**
+     * Decrement stock of all products with a single conditional UPDATE.
+     *
+     * Every row is guarded with `stock >= quantity`, so if the affected row
+     * count does not match, another till sold the stock first and the whole
+     * reservation is aborted.
+     *
+     * @param array $quantities [product_id => quantity]
+     * @throws InsufficientStockException
+     */
+    private function decrementStock(array $quantities)
+    {
+        if (empty($quantities)) {
+            return;
+        }
+
+        $decrementCase = 'CASE id';
+        $guardCase = 'CASE id';
+        $decrementBindings = [];
+        $guardBindings = [];
+
+        foreach ($quantities as $productId => $quantity) {
+            $decrementCase .= ' WHEN ? THEN stock - ?';
+            $guardCase .= ' WHEN ? THEN stock >= ?';
+            array_push($decrementBindings, $productId, $quantity);
+            array_push($guardBindings, $productId, $quantity);
+        }
+
+        $decrementCase .= ' ELSE stock END';
+        $guardCase .= ' ELSE 0 END';
+
+        $ids = array_keys($quantities);
+        $placeholders = implode(',', array_fill(0, count($ids), '?'));
+
+        $affected = DB::update(
+            "UPDATE products SET stock = {$decrementCase}, updated_at = ? WHERE id IN ({$placeholders}) AND ({$guardCase}) = 1",
+            array_merge($decrementBindings, [now()], $ids, $guardBindings)
+        );
+
+        if ($affected !== count($quantities)) {
+            throw new InsufficientStockException('Stok produk berubah saat transaksi diproses. Silakan coba lagi.');
+        }
+    }
+}
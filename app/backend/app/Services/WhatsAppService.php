@@ -2,8 +2,13 @@
 
 namespace App\Services;
 
+use App\Jobs\SendWhatsAppMessage;
 use App\Models\Order;
 use App\Models\Customer;
+use App\Models\WhatsappApiToken;
+use App\Models\WhatsappMessage;
+use Illuminate\Http\Client\ConnectionException;
+use Illuminate\Support\Facades\Cache;
 use Illuminate\Support\Facades\Http;
 use Illuminate\Support\Facades\Log;
 use Exception;
@@ -17,6 +22,12 @@ class WhatsAppService
 
     protected $outlet;
 
+    /**
+     * Guzzle handler shared by every request of this process, so curl keeps
+     * provider connections alive across messages (queue worker)
+     */
+    protected static $httpHandler;
+
     public function __construct($outlet = null)
     {
         $this->outlet = $outlet;
@@ -88,11 +99,7 @@ public function sendMessage($phoneNumber, $message, $options = [])
             }
 
             // Check if WhatsApp is enabled
-            $isEnabled = $this->outlet
-                ? ($this->outlet->whatsapp_enabled ?? false)
-                : config('whatsapp.enabled', false);
-
-            if (!$isEnabled) {
+            if (!$this->isEnabled()) {
                 Log::info('WhatsApp service is disabled', [
                     'outlet_id' => $this->outlet->id ?? null
                 ]);
@@ -110,23 +117,7 @@ public function sendMessage($phoneNumber, $message, $options = [])
             ]);
 
             // Send based on provider
-            $result = null;
-            switch ($this->provider) {
-                case 'fonnte':
-                    $result = $this->sendViaFonnte($phoneNumber, $message, $options);
-                    break;
-                case 'wablas':
-                    $result = $this->sendViaWablas($phoneNumber, $message, $options);
-                    break;
-                case 'kirimwa':
-                    $result = $this->sendViaKirimWA($phoneNumber, $message, $options);
-                    break;
-                case 'wablitz':
-                    $result = $this->sendViaWablitz($phoneNumber, $message, $options);
-                    break;
-                default:
-                    throw new Exception("Unsupported WhatsApp provider: {$this->provider}");
-            }
+            $result = $this->sendViaProvider($phoneNumber, $message, $options);
 
             Log::info('WhatsApp: Message send result', [
                 'provider' => $this->provider,
@@ -157,12 +148,237 @@ public function sendMessage($phoneNumber, $message, $options = [])
         }
     }
 
+    /**
+     * Whether WhatsApp sending is enabled for the outlet (or globally)
+     */
+    protected function isEnabled()
+    {
+        return $this->outlet
+            ? (bool) ($this->outlet->whatsapp_enabled ?? false)
+            : (bool) config('whatsapp.enabled', false);
+    }
+
+    /**
+     * Send through the currently selected provider
+     */
+    protected function sendViaProvider($phoneNumber, $message, $options = [])
+    {
+        switch ($this->provider) {
+            case 'fonnte':
+                return $this->sendViaFonnte($phoneNumber, $message, $options);
+            case 'wablas':
+                return $this->sendViaWablas($phoneNumber, $message, $options);
+            case 'kirimwa':
+                return $this->sendViaKirimWA($phoneNumber, $message, $options);
+            case 'wablitz':
+                return $this->sendViaWablitz($phoneNumber, $message, $options);
+            default:
+                throw new Exception("Unsupported WhatsApp provider: {$this->provider}");
+        }
+    }
+
+    /**
+     * HTTP client for provider calls (shared keep-alive handler, bounded timeouts)
+     */
+    protected function http()
+    {
+        static::$httpHandler ??= \GuzzleHttp\Utils::chooseHandler();
+
+        return Http::setHandler(static::$httpHandler)
+            ->connectTimeout(config('whatsapp.http.connect_timeout', 5))
+            ->timeout(config('whatsapp.http.timeout', 15));
+    }
+
+    /**
+     * ✅ Queue a payment receipt (payment flows) - the cashier never waits for the provider
+     *
+     * @param Order $order Order object (with customer, business, outlet, orderItems, payments)
+     * @param Customer|null $customer Customer object (optional)
+     * @return WhatsappMessage|null Null when there is nothing to send
+     */
+    public function queuePaymentReceipt($order, $customer = null)
+    {
+        $phoneNumber = $this->resolveCustomerPhone($order, $customer);
+
+        if (!$phoneNumber || !$this->isEnabled() || empty($this->apiKey)) {
+            Log::info('WhatsApp: Receipt not queued', [
+                'order_id' => $order->id,
+                'has_phone' => !empty($phoneNumber),
+                'enabled' => $this->isEnabled(),
+                'has_api_key' => !empty($this->apiKey),
+            ]);
+            return null;
+        }
+
+        // One receipt per order (payment callbacks may fire more than once)
+        $alreadyQueued = WhatsappMessage::where('order_id', $order->id)
+            ->where('type', WhatsappMessage::TYPE_PAYMENT_RECEIPT)
+            ->whereIn('status', ['queued', 'sending', 'sent'])
+            ->exists();
+
+        if ($alreadyQueued) {
+            return null;
+        }
+
+        return $this->queueMessage($phoneNumber, $this->buildReceiptMessage($order), [
+            'business_id' => $order->business_id,
+            'order_id' => $order->id,
+            'type' => WhatsappMessage::TYPE_PAYMENT_RECEIPT,
+        ]);
+    }
+
+    /**
+     * Queue an outbound message for the whatsapp queue worker
+     *
+     * @param string $phoneNumber
+     * @param string $message
+     * @param array $attributes business_id, order_id, type
+     * @return WhatsappMessage
+     */
+    public function queueMessage($phoneNumber, $message, array $attributes = [])
+    {
+        $record = WhatsappMessage::create([
+            'business_id' => $attributes['business_id'] ?? $this->outlet->business_id ?? null,
+            'outlet_id' => $this->outlet->id ?? null,
+            'order_id' => $attributes['order_id'] ?? null,
+            'type' => $attributes['type'] ?? WhatsappMessage::TYPE_CUSTOM,
+            'phone' => $this->formatPhoneNumber($phoneNumber),
+            'message' => $message,
+            'status' => 'queued',
+        ]);
+
+        SendWhatsAppMessage::dispatch($record->id, $record->outlet_id)
+            ->onQueue(config('whatsapp.queue.name', 'whatsapp'))
+            ->afterCommit();
+
+        return $record;
+    }
+
+    /**
+     * Deliver a queued message, failing over to the next provider on error
+     *
+     * Called by the SendWhatsAppMessage job. A provider that times out is
+     * skipped for failover.down_seconds so later messages go straight to the
+     * next one.
+     *
+     * @param WhatsappMessage $record
+     * @return array
+     * @throws Exception When every provider failed (the job retries with backoff)
+     */
+    public function deliver(WhatsappMessage $record)
+    {
+        if ($record->status === 'sent') {
+            return ['success' => true, 'message' => 'Already sent'];
+        }
+
+        if (!$this->isEnabled()) {
+            $record->update(['status' => 'failed', 'last_error' => 'WhatsApp service is disabled for this outlet']);
+            return ['success' => false, 'message' => 'WhatsApp service is disabled for this outlet'];
+        }
+
+        $record->update(['status' => 'sending', 'attempts' => $record->attempts + 1]);
+
+        $chain = $this->providerChain();
+        $errors = [];
+
+        foreach ($chain as $channel) {
+            $downKey = 'whatsapp:provider_down:' . md5($channel['provider'] . '|' . $channel['url']);
+
+            if (count($chain) > 1 && Cache::has($downKey)) {
+                $errors[] = "{$channel['provider']}: skipped (recently unavailable)";
+                continue;
+            }
+
+            $this->useChannel($channel);
+
+            try {
+                $result = $this->sendViaProvider($record->phone, $record->message);
+
+                $record->update([
+                    'status' => 'sent',
+                    'provider' => $channel['provider'],
+                    'provider_message_id' => $result['message_id'] ?? null,
+                    'last_error' => null,
+                    'sent_at' => now(),
+                ]);
+
+                return $result;
+            } catch (Exception $e) {
+                $errors[] = "{$channel['provider']}: {$e->getMessage()}";
+
+                if ($e instanceof ConnectionException && count($chain) > 1) {
+                    Cache::put($downKey, true, (int) config('whatsapp.failover.down_seconds', 60));
+                }
+            }
+        }
+
+        $error = implode(' | ', $errors) ?: 'No WhatsApp provider configured';
+        $record->update(['status' => 'queued', 'last_error' => mb_substr($error, 0, 2000)]);
+
+        throw new Exception('WhatsApp delivery failed: ' . $error);
+    }
+
+    /**
+     * Providers to try in order: outlet (or global) config, then failover channels
+     */
+    protected function providerChain()
+    {
+        $chain = [[
+            'provider' => $this->provider,
+            'api_key' => $this->apiKey,
+            'url' => $this->apiUrl,
+            'sender_phone' => $this->senderPhone,
+        ]];
+
+        if (config('whatsapp.failover.enabled', false)) {
+            if (config('whatsapp.api_key')) {
+                $provider = config('whatsapp.provider', 'fonnte');
+                $chain[] = [
+                    'provider' => $provider,
+                    'api_key' => config('whatsapp.api_key'),
+                    'url' => config("whatsapp.providers.{$provider}.url") ?? config('whatsapp.api_url'),
+                    'sender_phone' => config('whatsapp.sender_phone'),
+                ];
+            }
+
+            if (config('whatsapp.failover.use_platform_tokens', true)) {
+                foreach (WhatsappApiToken::active()->get() as $token) {
+                    $chain[] = [
+                        'provider' => $token->provider,
+                        'api_key' => $token->api_token,
+                        'url' => $token->url ?: config("whatsapp.providers.{$token->provider}.url"),
+                        'sender_phone' => $token->sender,
+                    ];
+                }
+            }
+        }
+
+        // Skip unusable and duplicate channels
+        $unique = [];
+        foreach ($chain as $channel) {
+            if (empty($channel['api_key']) || empty($channel['url'])) {
+                continue;
+            }
+            $unique[$channel['provider'] . '|' . $channel['api_key']] = $channel;
+        }
+
+        return array_values($unique);
+    }
+
+    protected function useChannel(array $channel)
+    {
+        $this->provider = $channel['provider'];
+        $this->apiKey = $channel['api_key'];
+        $this->apiUrl = $channel['url'];
+        $this->senderPhone = $channel['sender_phone'];
+    }
+
     /**
      * Send via Fonnte API
      */
     protected function sendViaFonnte($phoneNumber, $message, $options = [])
     {
-        $response = Http::withHeaders([
+        $response = $this->http()->withHeaders([
             'Authorization' => $this->apiKey,
             'Content-Type' => 'application/json',
         ])->post($this->apiUrl, [
@@ -209,7 +425,7 @@ protected function sendViaFonnte($phoneNumber, $message, $options = [])
      */
     protected function sendViaWablas($phoneNumber, $message, $options = [])
     {
-        $response = Http::withHeaders([
+        $response = $this->http()->withHeaders([
             'Authorization' => $this->apiKey,
             'Content-Type' => 'application/json',
         ])->post($this->apiUrl, [
@@ -256,7 +472,7 @@ protected function sendViaWablas($phoneNumber, $message, $options = [])
      */
     protected function sendViaKirimWA($phoneNumber, $message, $options = [])
     {
-        $response = Http::withHeaders([
+        $response = $this->http()->withHeaders([
             'Authorization' => 'Bearer ' . $this->apiKey,
             'Content-Type' => 'application/json',
         ])->post($this->apiUrl, [
@@ -318,7 +534,7 @@ protected function sendViaWablitz($phoneNumber, $message, $options = [])
             'message' => $message,
         ];
 
-        $response = Http::withHeaders([
+        $response = $this->http()->withHeaders([
             'Content-Type' => 'application/json',
         ])->post($this->apiUrl, $data);
 
@@ -476,12 +692,7 @@ public function sendPaymentReceipt($order, $customer = null, $customMessage = nu
     {
         try {
             // Get customer phone
-            $phoneNumber = null;
-            if ($customer && $customer->phone) {
-                $phoneNumber = $customer->phone;
-            } elseif ($order->customer && $order->customer->phone) {
-                $phoneNumber = $order->customer->phone;
-            }
+            $phoneNumber = $this->resolveCustomerPhone($order, $customer);
 
             if (!$phoneNumber) {
                 Log::warning('WhatsApp: No phone number found for order', [
@@ -509,21 +720,7 @@ public function sendPaymentReceipt($order, $customer = null, $customMessage = nu
             ]);
 
             // Generate receipt message (use custom if provided, otherwise use default)
-            try {
-                $message = $customMessage ?? $this->generateReceiptMessage($order);
-            } catch (\Exception $e) {
-                Log::error('WhatsApp: Failed to generate receipt message', [
-                    'order_id' => $order->id,
-                    'error' => $e->getMessage(),
-                    'file' => $e->getFile(),
-                    'line' => $e->getLine()
-                ]);
-                // Use fallback simple message if generation fails
-                $message = "Terima kasih telah berbelanja di " . ($order->business->name ?? 'QuickKasir') . "!\n\n";
-                $message .= "Order: {$order->order_number}\n";
-                $message .= "Total: Rp " . number_format($order->total ?? 0, 0, ',', '.') . "\n\n";
-                $message .= "Terima kasih!";
-            }
+            $message = $customMessage ?? $this->buildReceiptMessage($order);
 
             Log::info('WhatsApp: Sending receipt message', [
                 'order_id' => $order->id,
@@ -590,6 +787,42 @@ public function sendCustomMessage($phoneNumber, $message)
         return $this->sendMessage($phoneNumber, $message);
     }
 
+    /**
+     * Customer phone of an order (explicit customer first)
+     */
+    protected function resolveCustomerPhone($order, $customer = null)
+    {
+        if ($customer && $customer->phone) {
+            return $customer->phone;
+        }
+
+        return $order->customer->phone ?? null;
+    }
+
+    /**
+     * Receipt message with a simple fallback when template generation fails
+     */
+    protected function buildReceiptMessage($order)
+    {
+        try {
+            return $this->generateReceiptMessage($order);
+        } catch (\Exception $e) {
+            Log::error('WhatsApp: Failed to generate receipt message', [
+                'order_id' => $order->id,
+                'error' => $e->getMessage(),
+                'file' => $e->getFile(),
+                'line' => $e->getLine()
+            ]);
+            // Use fallback simple message if generation fails
+            $message = "Terima kasih telah berbelanja di " . ($order->business->name ?? 'QuickKasir') . "!\n\n";
+            $message .= "Order: {$order->order_number}\n";
+            $message .= "Total: Rp " . number_format($order->total ?? 0, 0, ',', '.') . "\n\n";
+            $message .= "Terima kasih!";
+
+            return $message;
+        }
+    }
+
     /**
      * Generate receipt message template
      */
@@ -13,6 +13,9 @@
     )
     ->withMiddleware(function (Middleware $middleware): void {
         //
+        // Request id / business / outlet on every log record, buffered logs written after the response
+        $middleware->prepend(\App\Http\Middleware\AssignRequestContext::class);
+
         $middleware->api(prepend: [
             \App\Http\Middleware\Cors::class,
         ]);
@@ -40,7 +40,7 @@
 
     'allowed_headers' => ['*'],
 
-    'exposed_headers' => [],
+    'exposed_headers' => ['ETag', 'X-Catalog-Version'], // POS catalog versioning
 
     'max_age' => 0,
 
@@ -1,5 +1,6 @@
 <?php
 
+use App\Logging\BufferRequestLogs;
 use Monolog\Handler\NullHandler;
 use Monolog\Handler\StreamHandler;
 use Monolog\Handler\SyslogUdpHandler;
@@ -36,6 +37,36 @@
         'trace' => env('LOG_DEPRECATIONS_TRACE', false),
     ],
 
+    /*
+    |--------------------------------------------------------------------------
+    | Request Logging
+    |--------------------------------------------------------------------------
+    |
+    | Channels with the BufferRequestLogs tap keep the records of an HTTP
+    | request in memory and write them in one go when the request ends
+    | (errors are written right away). Every record carries request_id,
+    | business_id, outlet_id, route and user_id.
+    |
+    | Sampling: only this share of requests keeps its info/debug records;
+    | warnings and errors are always written. The first matching pattern of
+    | "sample_routes" (Request::is) wins over "sample_rate".
+    |
+    */
+
+    'request' => [
+        'buffer' => env('LOG_BUFFER', true),
+        'buffer_limit' => (int) env('LOG_BUFFER_LIMIT', 200),
+        'sample_rate' => (float) env('LOG_SAMPLE_RATE', 1.0),
+        'sample_routes' => [
+            // Hot paths: POS checkout, login, public menu
+            'api/v1/orders' => (float) env('LOG_SAMPLE_RATE_POS', 0.1),
+            'api/v1/orders/batch' => (float) env('LOG_SAMPLE_RATE_POS', 0.1),
+            'api/login' => (float) env('LOG_SAMPLE_RATE_AUTH', 0.25),
+            'api/public/v1/self-service/menu/*' => (float) env('LOG_SAMPLE_RATE_MENU', 0.05),
+            'api/public/v1/order/*/menu' => (float) env('LOG_SAMPLE_RATE_MENU', 0.05),
+        ],
+    ],
+
     /*
     |--------------------------------------------------------------------------
     | Log Channels
@@ -62,6 +93,8 @@
             'driver' => 'single',
             'path' => storage_path('logs/laravel.log'),
             'level' => env('LOG_LEVEL', 'debug'),
+            'formatter' => env('LOG_FORMATTER'),
+            'tap' => [BufferRequestLogs::class],
             'replace_placeholders' => true,
         ],
 
@@ -70,6 +103,40 @@
             'path' => storage_path('logs/laravel.log'),
             'level' => env('LOG_LEVEL', 'debug'),
             'days' => env('LOG_DAILY_DAYS', 14),
+            'formatter' => env('LOG_FORMATTER'),
+            'tap' => [BufferRequestLogs::class],
+            'replace_placeholders' => true,
+        ],
+
+        // Hot-path channels. Their level is set per channel: "debug" turns on
+        // payload logging (order items, lookups, key checks) for that channel only.
+        'pos' => [
+            'driver' => env('LOG_APP_DRIVER', 'single'),
+            'path' => storage_path('logs/laravel.log'),
+            'level' => env('LOG_POS_LEVEL', 'info'),
+            'days' => env('LOG_DAILY_DAYS', 14),
+            'formatter' => env('LOG_FORMATTER'),
+            'tap' => [BufferRequestLogs::class],
+            'replace_placeholders' => true,
+        ],
+
+        'auth' => [
+            'driver' => env('LOG_APP_DRIVER', 'single'),
+            'path' => storage_path('logs/laravel.log'),
+            'level' => env('LOG_AUTH_LEVEL', 'info'),
+            'days' => env('LOG_DAILY_DAYS', 14),
+            'formatter' => env('LOG_FORMATTER'),
+            'tap' => [BufferRequestLogs::class],
+            'replace_placeholders' => true,
+        ],
+
+        'payment' => [
+            'driver' => env('LOG_APP_DRIVER', 'single'),
+            'path' => storage_path('logs/laravel.log'),
+            'level' => env('LOG_PAYMENT_LEVEL', 'info'),
+            'days' => env('LOG_DAILY_DAYS', 14),
+            'formatter' => env('LOG_FORMATTER'),
+            'tap' => [BufferRequestLogs::class],
             'replace_placeholders' => true,
         ],
 
@@ -93,4 +93,38 @@
     |
     */
     'error_url' => env('FRONTEND_URL', 'http://localhost:3000') . '/payment/failed',
+
+    /*
+    |--------------------------------------------------------------------------
+    | Webhook Ingestion
+    |--------------------------------------------------------------------------
+    |
+    | Callbacks are verified (signature_key), stored once per
+    | transaction_id + transaction_status in midtrans_events and answered
+    | with 200 immediately. The payments queue worker applies them in order
+    | per order (php artisan queue:work --queue=payments,whatsapp,push,reports,default).
+    |
+    */
+    'webhook' => [
+        'queue' => env('MIDTRANS_WEBHOOK_QUEUE', 'payments'),
+        'verify_signature' => env('MIDTRANS_VERIFY_SIGNATURE', true),
+        'max_attempts' => (int) env('MIDTRANS_WEBHOOK_MAX_ATTEMPTS', 5),
+        'per_minute' => (int) env('MIDTRANS_WEBHOOK_PER_MINUTE', 3000),
+    ],
+
+    /*
+    |--------------------------------------------------------------------------
+    | Payment Status Checks
+    |--------------------------------------------------------------------------
+    |
+    | Checkout screens long-poll /v1/orders/payment/{id}/wait, which returns as
+    | soon as the webhook pipeline changes the payment. When Midtrans has to be
+    | asked directly, concurrent checks of one payment share a single call whose
+    | answer is reused for check_interval seconds.
+    |
+    */
+    'status' => [
+        'wait_seconds' => (int) env('MIDTRANS_STATUS_WAIT_SECONDS', 25),
+        'check_interval' => (int) env('MIDTRANS_STATUS_CHECK_INTERVAL', 15),
+    ],
 ];
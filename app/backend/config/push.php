@@ -0,0 +1,35 @@
+<?php
+
+return [
+    /*
+    |--------------------------------------------------------------------------
+    | Web Push Delivery
+    |--------------------------------------------------------------------------
+    |
+    | Push notifikasi dikirim oleh queue worker, bukan di request yang membuat
+    | order (php artisan queue:work --queue=push,reports,default). Notifikasi
+    | berulang untuk order + tipe yang sama dalam coalesce window digabung
+    | menjadi satu push (yang terbaru).
+    |
+    */
+
+    'vapid' => [
+        'subject' => env('VAPID_SUBJECT', 'mailto:admin@quickkasir.com'),
+        'public_key' => env('VAPID_PUBLIC_KEY'),
+        'private_key' => env('VAPID_PRIVATE_KEY'),
+    ],
+
+    // Queue yang dipakai job push
+    'queue' => env('PUSH_QUEUE', 'push'),
+
+    // Detik menunggu notifikasi berikutnya untuk resource + tipe yang sama (0 = tanpa coalescing)
+    'coalesce_seconds' => (int) env('PUSH_COALESCE_SECONDS', 3),
+
+    // Jumlah push per flush batch dan request HTTP paralel ke push service
+    'batch_size' => (int) env('PUSH_BATCH_SIZE', 100),
+    'concurrency' => (int) env('PUSH_CONCURRENCY', 20),
+
+    // Timeout HTTP (detik) dan TTL pesan di push service (detik)
+    'timeout' => (int) env('PUSH_TIMEOUT', 20),
+    'ttl' => (int) env('PUSH_TTL', 3600),
+];
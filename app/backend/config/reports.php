@@ -0,0 +1,43 @@
+<?php
+
+return [
+    /*
+    |--------------------------------------------------------------------------
+    | Background Report Exports
+    |--------------------------------------------------------------------------
+    |
+    | Laporan PDF dibuat di queue worker (driver database sudah cukup untuk
+    | satu server), disimpan sebagai artifact di storage lalu di-download.
+    | Export identik (business/outlet/tipe/format/rentang sama) memakai ulang
+    | artifact yang masih berlaku.
+    |
+    */
+
+    'exports' => [
+        // Disk dan folder penyimpanan artifact
+        'disk' => env('REPORT_EXPORT_DISK', 'local'),
+        'directory' => env('REPORT_EXPORT_DIRECTORY', 'report-exports'),
+
+        // Queue yang dipakai job export (php artisan queue:work --queue=reports,default)
+        'queue' => env('REPORT_EXPORT_QUEUE', 'reports'),
+
+        // Berapa lama artifact disimpan sebelum dihapus oleh reports:prune-exports
+        'retention_hours' => (int) env('REPORT_EXPORT_RETENTION_HOURS', 24),
+
+        // Artifact yang rentangnya mencakup hari ini masih bisa berubah (penjualan baru),
+        // jadi hanya dipakai ulang selama beberapa menit setelah selesai dibuat
+        'live_reuse_minutes' => (int) env('REPORT_EXPORT_LIVE_REUSE_MINUTES', 5),
+
+        // Tipe laporan yang boleh dibuat di background
+        'types' => [
+            'sales',
+            'sales-summary',
+            'sales-detail',
+            'product-sales',
+            'category-sales',
+            'inventory-status',
+            'cashier-performance',
+            'commission',
+        ],
+    ],
+];
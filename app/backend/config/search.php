@@ -0,0 +1,26 @@
+<?php
+
+return [
+    /*
+    |--------------------------------------------------------------------------
+    | Product Search
+    |--------------------------------------------------------------------------
+    |
+    | Pencarian produk (katalog, POS, laporan) memakai index, bukan
+    | LIKE '%term%'. Driver "auto" memilih MySQL FULLTEXT atau SQLite FTS5
+    | sesuai koneksi database; index n-gram selalu dijaga sebagai fallback
+    | untuk salah ketik (typo) pada nama produk.
+    |
+    */
+
+    'products' => [
+        // auto, fulltext (MySQL/MariaDB), fts5 (SQLite), ngram
+        'driver' => env('PRODUCT_SEARCH_DRIVER', 'auto'),
+
+        // Maksimal hasil (diurutkan relevansi) yang dipakai endpoint per pencarian
+        'max_results' => (int) env('PRODUCT_SEARCH_MAX_RESULTS', 1000),
+
+        // Fraksi trigram kata kunci yang harus cocok di fallback n-gram (0-1)
+        'min_similarity' => (float) env('PRODUCT_SEARCH_MIN_SIMILARITY', 0.5),
+    ],
+];
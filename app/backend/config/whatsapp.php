@@ -49,6 +49,58 @@
         ],
     ],
 
+    /*
+    |--------------------------------------------------------------------------
+    | Outbound Queue
+    |--------------------------------------------------------------------------
+    |
+    | Struk WhatsApp dikirim oleh queue worker (php artisan queue:work
+    | --queue=whatsapp,push,reports,default) supaya provider yang lambat tidak
+    | menahan pembayaran di kasir. Retry memakai exponential backoff:
+    | backoff_base, x3, x9, ... detik.
+    |
+    */
+
+    'queue' => [
+        'name' => env('WHATSAPP_QUEUE', 'whatsapp'),
+        'per_outlet_per_minute' => (int) env('WHATSAPP_PER_OUTLET_PER_MINUTE', 20),
+        'max_attempts' => (int) env('WHATSAPP_MAX_ATTEMPTS', 5),
+        'backoff_base' => (int) env('WHATSAPP_BACKOFF_BASE', 10),
+        'retry_hours' => (int) env('WHATSAPP_RETRY_HOURS', 6),
+    ],
+
+    /*
+    |--------------------------------------------------------------------------
+    | HTTP Client
+    |--------------------------------------------------------------------------
+    |
+    | Satu Guzzle handler dipakai ulang per proses worker, sehingga koneksi
+    | keep-alive ke provider tidak dibuka ulang untuk setiap pesan.
+    |
+    */
+
+    'http' => [
+        'connect_timeout' => (int) env('WHATSAPP_CONNECT_TIMEOUT', 5),
+        'timeout' => (int) env('WHATSAPP_TIMEOUT', 15),
+    ],
+
+    /*
+    |--------------------------------------------------------------------------
+    | Provider Failover
+    |--------------------------------------------------------------------------
+    |
+    | Jika provider outlet gagal (timeout / error), pesan yang di-queue dicoba
+    | lewat konfigurasi global lalu token platform yang aktif. Provider yang
+    | gagal dilewati selama down_seconds.
+    |
+    */
+
+    'failover' => [
+        'enabled' => env('WHATSAPP_FAILOVER_ENABLED', false),
+        'use_platform_tokens' => env('WHATSAPP_FAILOVER_PLATFORM_TOKENS', true),
+        'down_seconds' => (int) env('WHATSAPP_PROVIDER_DOWN_SECONDS', 60),
+    ],
+
     /*
     |--------------------------------------------------------------------------
     | Auto Send Settings
@@ -0,0 +1,36 @@
+<?php
+
+namespace Database\Factories;
+
+use App\Models\Business;
+use Illuminate\Database\Eloquent\Factories\Factory;
+use Illuminate\Support\Str;
+
+/**
+ * @extends \Illuminate\Database\Eloquent\Factories\Factory<\App\Models\Business>
+ */
+class BusinessFactory extends Factory
+{
+    protected $model = Business::class;
+
+    /**
+     * Define the model's default state.
+     *
+     * @return array<string, mixed>
+     */
+    public function definition(): array
+    {
+        $name = fake()->company();
+
+        return [
+            'name' => $name,
+            'slug' => Str::slug($name) . '-' . fake()->unique()->numerify('####'),
+            'email' => fake()->companyEmail(),
+            'phone' => fake()->numerify('08##########'),
+            'address' => fake()->address(),
+            'tax_rate' => 10,
+            'currency' => 'IDR',
+            'status' => 'active',
+        ];
+    }
+}
@@ -0,0 +1,30 @@
+<?php
+
+namespace Database\Factories;
+
+use App\Models\Customer;
+use Illuminate\Database\Eloquent\Factories\Factory;
+
+/**
+ * @extends \Illuminate\Database\Eloquent\Factories\Factory<\App\Models\Customer>
+ */
+class CustomerFactory extends Factory
+{
+    protected $model = Customer::class;
+
+    /**
+     * Define the model's default state.
+     *
+     * @return array<string, mixed>
+     */
+    public function definition(): array
+    {
+        return [
+            'name' => fake()->name(),
+            'email' => fake()->boolean(60) ? fake()->safeEmail() : null,
+            'phone' => fake()->numerify('08##########'),
+            'gender' => fake()->randomElement(['male', 'female']),
+            'birthday' => fake()->boolean(40) ? fake()->date('Y-m-d', '-18 years') : null,
+        ];
+    }
+}
@@ -0,0 +1,38 @@
+<?php
+
+namespace Database\Factories;
+
+use App\Models\Outlet;
+use Illuminate\Database\Eloquent\Factories\Factory;
+use Illuminate\Support\Str;
+
+/**
+ * @extends \Illuminate\Database\Eloquent\Factories\Factory<\App\Models\Outlet>
+ */
+class OutletFactory extends Factory
+{
+    protected $model = Outlet::class;
+
+    /**
+     * Define the model's default state.
+     *
+     * @return array<string, mixed>
+     */
+    public function definition(): array
+    {
+        $name = 'Outlet ' . fake()->city();
+        $code = 'OUT-' . fake()->unique()->bothify('??###');
+
+        return [
+            'name' => $name,
+            'code' => $code,
+            'slug' => Str::slug($name . ' ' . $code),
+            'address' => fake()->address(),
+            'phone' => fake()->numerify('08##########'),
+            'latitude' => fake()->latitude(-8.8, -6.0),
+            'longitude' => fake()->longitude(106.5, 112.8),
+            'is_active' => true,
+            'is_public' => true,
+        ];
+    }
+}
@@ -0,0 +1,39 @@
+<?php
+
+namespace Database\Factories;
+
+use App\Models\Product;
+use Illuminate\Database\Eloquent\Factories\Factory;
+use Illuminate\Support\Str;
+
+/**
+ * @extends \Illuminate\Database\Eloquent\Factories\Factory<\App\Models\Product>
+ */
+class ProductFactory extends Factory
+{
+    protected $model = Product::class;
+
+    /**
+     * Define the model's default state.
+     *
+     * @return array<string, mixed>
+     */
+    public function definition(): array
+    {
+        $name = Str::title(fake()->words(fake()->numberBetween(1, 3), true));
+        $price = fake()->numberBetween(5, 150) * 1000;
+
+        return [
+            'name' => $name,
+            'slug' => Str::slug($name) . '-' . fake()->unique()->numerify('######'),
+            'sku' => fake()->unique()->bothify('SKU-####-????'),
+            'description' => fake()->sentence(),
+            'price' => $price,
+            'cost' => round($price * fake()->randomFloat(2, 0.3, 0.7), -2),
+            'stock' => fake()->numberBetween(200, 2000),
+            'min_stock' => 10,
+            'stock_type' => fake()->boolean(70) ? 'tracked' : 'untracked',
+            'is_active' => fake()->boolean(95),
+        ];
+    }
+}
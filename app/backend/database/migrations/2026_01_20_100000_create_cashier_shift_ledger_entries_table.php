@@ -0,0 +1,41 @@
+<?php
+
+use Illuminate\Database\Migrations\Migration;
+use Illuminate\Database\Schema\Blueprint;
+use Illuminate\Support\Facades\Schema;
+
+return new class extends Migration
+{
+    /**
+     * Run the migrations.
+     */
+    public function up(): void
+    {
+        Schema::create('cashier_shift_ledger_entries', function (Blueprint $table) {
+            $table->id();
+            $table->foreignId('cashier_shift_id')->constrained('cashier_shifts')->onDelete('cascade');
+            $table->unsignedBigInteger('order_id')->unique(); // Satu order hanya boleh masuk ledger sekali
+            $table->decimal('total', 15, 2)->default(0); // Total order
+            $table->decimal('cash', 15, 2)->default(0); // Cash bersih (diterima - kembalian)
+            $table->decimal('card', 15, 2)->default(0);
+            $table->decimal('transfer', 15, 2)->default(0);
+            $table->decimal('qris', 15, 2)->default(0);
+            $table->unsignedTinyInteger('cash_transactions')->default(0);
+            $table->unsignedTinyInteger('card_transactions')->default(0);
+            $table->unsignedTinyInteger('transfer_transactions')->default(0);
+            $table->unsignedTinyInteger('qris_transactions')->default(0);
+            $table->timestamps();
+
+            // Indexes
+            $table->index('cashier_shift_id');
+        });
+    }
+
+    /**
+     * Reverse the migrations.
+     */
+    public function down(): void
+    {
+        Schema::dropIfExists('cashier_shift_ledger_entries');
+    }
+};
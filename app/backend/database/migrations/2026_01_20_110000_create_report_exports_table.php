@@ -0,0 +1,48 @@
+<?php
+
+use Illuminate\Database\Migrations\Migration;
+use Illuminate\Database\Schema\Blueprint;
+use Illuminate\Support\Facades\Schema;
+
+return new class extends Migration
+{
+    /**
+     * Run the migrations.
+     */
+    public function up(): void
+    {
+        Schema::create('report_exports', function (Blueprint $table) {
+            $table->id();
+            $table->uuid('uuid')->unique();
+            $table->foreignId('business_id')->constrained()->onDelete('cascade');
+            $table->unsignedBigInteger('outlet_id')->nullable();
+            $table->foreignId('user_id')->constrained()->onDelete('cascade');
+            $table->string('type', 50); // sales, product-sales, inventory-status, ...
+            $table->string('format', 10)->default('pdf');
+            $table->json('params')->nullable(); // Query params (date_range, custom_start, ...)
+            $table->string('fingerprint', 64); // Hash business/outlet/type/format/params untuk deduplikasi
+            $table->enum('status', ['pending', 'processing', 'completed', 'failed'])->default('pending');
+            $table->string('file_path')->nullable();
+            $table->unsignedBigInteger('file_size')->nullable();
+            $table->unsignedTinyInteger('attempts')->default(0);
+            $table->text('error')->nullable();
+            $table->timestamp('started_at')->nullable();
+            $table->timestamp('completed_at')->nullable();
+            $table->timestamp('expires_at')->nullable();
+            $table->timestamps();
+
+            // Indexes
+            $table->index(['fingerprint', 'status']);
+            $table->index(['business_id', 'created_at']);
+            $table->index('expires_at');
+        });
+    }
+
+    /**
+     * Reverse the migrations.
+     */
+    public function down(): void
+    {
+        Schema::dropIfExists('report_exports');
+    }
+};
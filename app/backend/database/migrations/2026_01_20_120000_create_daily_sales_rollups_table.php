@@ -0,0 +1,67 @@
+<?php
+
+use Illuminate\Database\Migrations\Migration;
+use Illuminate\Database\Schema\Blueprint;
+use Illuminate\Support\Facades\Schema;
+
+return new class extends Migration
+{
+    /**
+     * Run the migrations.
+     */
+    public function up(): void
+    {
+        // Pre-aggregated paid sales per business/outlet/day/hour.
+        // grain: order (order totals), payment (per payment method),
+        //        product (per product & category), customer (per customer, for distinct counts)
+        Schema::create('daily_sales_rollups', function (Blueprint $table) {
+            $table->id();
+            $table->unsignedBigInteger('business_id');
+            $table->unsignedBigInteger('outlet_id')->default(0);
+            $table->date('sale_date');
+            $table->unsignedTinyInteger('hour');
+            $table->string('grain', 10);
+            $table->string('payment_method', 30)->default('');
+            $table->unsignedBigInteger('product_id')->default(0);
+            $table->unsignedBigInteger('category_id')->default(0);
+            $table->unsignedBigInteger('customer_id')->default(0);
+            $table->string('product_name')->nullable();
+            $table->integer('orders_count')->default(0);
+            $table->decimal('quantity', 15, 2)->default(0);
+            $table->decimal('subtotal', 15, 2)->default(0);
+            $table->decimal('discount_amount', 15, 2)->default(0);
+            $table->decimal('tax_amount', 15, 2)->default(0);
+            $table->decimal('total', 15, 2)->default(0);
+            $table->timestamps();
+
+            $table->unique(
+                ['business_id', 'outlet_id', 'sale_date', 'hour', 'grain', 'payment_method', 'product_id', 'category_id', 'customer_id'],
+                'daily_sales_rollups_bucket_unique'
+            );
+            $table->index(['business_id', 'grain', 'sale_date'], 'daily_sales_rollups_grain_date_index');
+        });
+
+        // Which bucket each paid order was added to and what it contributed,
+        // so refunds/cancellations subtract exactly what was added
+        Schema::create('daily_sales_rollup_orders', function (Blueprint $table) {
+            $table->id();
+            $table->unsignedBigInteger('order_id')->unique();
+            $table->unsignedBigInteger('business_id');
+            $table->unsignedBigInteger('outlet_id')->default(0);
+            $table->date('sale_date');
+            $table->json('contributions');
+            $table->timestamps();
+
+            $table->index(['business_id', 'sale_date']);
+        });
+    }
+
+    /**
+     * Reverse the migrations.
+     */
+    public function down(): void
+    {
+        Schema::dropIfExists('daily_sales_rollup_orders');
+        Schema::dropIfExists('daily_sales_rollups');
+    }
+};
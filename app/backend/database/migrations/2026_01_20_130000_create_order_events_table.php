@@ -0,0 +1,37 @@
+<?php
+
+use Illuminate\Database\Migrations\Migration;
+use Illuminate\Database\Schema\Blueprint;
+use Illuminate\Support\Facades\Schema;
+
+return new class extends Migration
+{
+    /**
+     * Run the migrations.
+     */
+    public function up(): void
+    {
+        // Append-only order event log per outlet. The id is the stream cursor
+        // (SSE Last-Event-ID / polling ?since=).
+        Schema::create('order_events', function (Blueprint $table) {
+            $table->id();
+            $table->unsignedBigInteger('business_id');
+            $table->unsignedBigInteger('outlet_id');
+            $table->unsignedBigInteger('order_id');
+            $table->string('type', 40); // order.created, order.status_changed, order.paid
+            $table->json('payload');
+            $table->timestamp('created_at')->nullable();
+
+            $table->index(['outlet_id', 'id']);
+            $table->index('created_at');
+        });
+    }
+
+    /**
+     * Reverse the migrations.
+     */
+    public function down(): void
+    {
+        Schema::dropIfExists('order_events');
+    }
+};
@@ -0,0 +1,46 @@
+<?php
+
+use Illuminate\Database\Migrations\Migration;
+use Illuminate\Database\Schema\Blueprint;
+use Illuminate\Support\Facades\Schema;
+
+return new class extends Migration
+{
+    /**
+     * Run the migrations.
+     */
+    public function up(): void
+    {
+        // Monotonic POS catalog version per business.
+        // version         = bumped on every product change (catalog or stock)
+        // catalog_version = last version that changed more than stock (price, name, availability, ...)
+        Schema::create('catalog_versions', function (Blueprint $table) {
+            $table->unsignedBigInteger('business_id')->primary();
+            $table->unsignedBigInteger('version')->default(0);
+            $table->unsignedBigInteger('catalog_version')->default(0);
+            $table->timestamps();
+        });
+
+        Schema::table('products', function (Blueprint $table) {
+            $table->unsignedBigInteger('catalog_version')->default(0)->after('is_active');
+            $table->unsignedBigInteger('stock_version')->default(0)->after('catalog_version');
+
+            $table->index(['business_id', 'catalog_version']);
+            $table->index(['business_id', 'stock_version']);
+        });
+    }
+
+    /**
+     * Reverse the migrations.
+     */
+    public function down(): void
+    {
+        Schema::table('products', function (Blueprint $table) {
+            $table->dropIndex(['business_id', 'catalog_version']);
+            $table->dropIndex(['business_id', 'stock_version']);
+            $table->dropColumn(['catalog_version', 'stock_version']);
+        });
+
+        Schema::dropIfExists('catalog_versions');
+    }
+};
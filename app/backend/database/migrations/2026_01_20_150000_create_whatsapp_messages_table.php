@@ -0,0 +1,44 @@
+<?php
+
+use Illuminate\Database\Migrations\Migration;
+use Illuminate\Database\Schema\Blueprint;
+use Illuminate\Support\Facades\Schema;
+
+return new class extends Migration
+{
+    /**
+     * Run the migrations.
+     */
+    public function up(): void
+    {
+        // Outbound WhatsApp messages, delivered by the whatsapp queue worker
+        Schema::create('whatsapp_messages', function (Blueprint $table) {
+            $table->id();
+            $table->unsignedBigInteger('business_id')->nullable();
+            $table->unsignedBigInteger('outlet_id')->nullable();
+            $table->unsignedBigInteger('order_id')->nullable();
+            $table->string('type', 40)->default('custom'); // payment_receipt, custom
+            $table->string('phone', 30);
+            $table->text('message');
+            $table->enum('status', ['queued', 'sending', 'sent', 'failed'])->default('queued');
+            $table->string('provider', 30)->nullable(); // Provider that delivered (after failover)
+            $table->string('provider_message_id')->nullable();
+            $table->unsignedInteger('attempts')->default(0);
+            $table->text('last_error')->nullable();
+            $table->timestamp('sent_at')->nullable();
+            $table->timestamps();
+
+            $table->index(['outlet_id', 'status']);
+            $table->index(['order_id', 'type']);
+            $table->index(['status', 'created_at']);
+        });
+    }
+
+    /**
+     * Reverse the migrations.
+     */
+    public function down(): void
+    {
+        Schema::dropIfExists('whatsapp_messages');
+    }
+};
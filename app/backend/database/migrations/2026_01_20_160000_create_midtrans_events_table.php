@@ -0,0 +1,48 @@
+<?php
+
+use Illuminate\Database\Migrations\Migration;
+use Illuminate\Database\Schema\Blueprint;
+use Illuminate\Support\Facades\Schema;
+
+return new class extends Migration
+{
+    /**
+     * Run the migrations.
+     */
+    public function up(): void
+    {
+        // Raw Midtrans callbacks, applied by the payments queue worker.
+        // event_key = transaction_id:transaction_status, so Midtrans retries are stored once.
+        Schema::create('midtrans_events', function (Blueprint $table) {
+            $table->id();
+            $table->string('event_key', 191)->unique();
+            $table->string('type', 20); // order, subscription
+            $table->string('order_key', 100); // Events of one order are applied in id order
+            $table->string('midtrans_order_id', 100);
+            $table->string('transaction_id', 100)->nullable();
+            $table->string('transaction_status', 30);
+            $table->string('fraud_status', 30)->nullable();
+            $table->string('status_code', 10)->nullable();
+            $table->string('gross_amount', 30)->nullable();
+            $table->unsignedBigInteger('target_id')->nullable(); // payments.id (order) or user_subscriptions.id (subscription)
+            $table->json('payload');
+            $table->enum('status', ['pending', 'processed', 'ignored', 'failed'])->default('pending');
+            $table->unsignedInteger('attempts')->default(0);
+            $table->text('last_error')->nullable();
+            $table->timestamp('processed_at')->nullable();
+            $table->timestamps();
+
+            $table->index(['order_key', 'status', 'id']);
+            $table->index(['status', 'created_at']);
+            $table->index('midtrans_order_id');
+        });
+    }
+
+    /**
+     * Reverse the migrations.
+     */
+    public function down(): void
+    {
+        Schema::dropIfExists('midtrans_events');
+    }
+};
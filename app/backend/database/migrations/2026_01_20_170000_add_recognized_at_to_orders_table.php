@@ -0,0 +1,58 @@
+<?php
+
+use Illuminate\Database\Migrations\Migration;
+use Illuminate\Database\Schema\Blueprint;
+use Illuminate\Support\Facades\DB;
+use Illuminate\Support\Facades\Schema;
+
+return new class extends Migration
+{
+    /**
+     * Run the migrations.
+     */
+    public function up(): void
+    {
+        // paid_at       = first valid payment (COALESCE(payments.paid_at, payments.created_at)), null without payment record
+        // recognized_at = when the order counts in date filters: paid_at, or created_at when there is no payment
+        // Maintained by Order::refreshPaidAt() (PaymentObserver) and OrderObserver::creating
+        Schema::table('orders', function (Blueprint $table) {
+            $table->timestamp('paid_at')->nullable()->after('ordered_at');
+            $table->timestamp('recognized_at')->nullable()->after('paid_at');
+
+            $table->index(['business_id', 'outlet_id', 'recognized_at']);
+            $table->index(['business_id', 'recognized_at']);
+        });
+
+        // Backfill in id ranges so a large orders table is never locked as a whole
+        $maxId = (int) DB::table('orders')->max('id');
+
+        for ($from = 0; $from < $maxId; $from += 10000) {
+            DB::update("
+                UPDATE orders SET paid_at = (
+                    SELECT MIN(COALESCE(payments.paid_at, payments.created_at))
+                    FROM payments
+                    WHERE payments.order_id = orders.id
+                    AND payments.status IN ('success', 'paid', 'settlement', 'capture')
+                )
+                WHERE id > ? AND id <= ?
+            ", [$from, $from + 10000]);
+
+            DB::update(
+                'UPDATE orders SET recognized_at = COALESCE(paid_at, created_at) WHERE id > ? AND id <= ?',
+                [$from, $from + 10000]
+            );
+        }
+    }
+
+    /**
+     * Reverse the migrations.
+     */
+    public function down(): void
+    {
+        Schema::table('orders', function (Blueprint $table) {
+            $table->dropIndex(['business_id', 'outlet_id', 'recognized_at']);
+            $table->dropIndex(['business_id', 'recognized_at']);
+            $table->dropColumn(['paid_at', 'recognized_at']);
+        });
+    }
+};
@@ -0,0 +1,60 @@
+<?php
+
+use Illuminate\Database\Migrations\Migration;
+use Illuminate\Database\Schema\Blueprint;
+use Illuminate\Support\Facades\DB;
+use Illuminate\Support\Facades\Schema;
+
+return new class extends Migration
+{
+    /**
+     * Run the migrations.
+     */
+    public function up(): void
+    {
+        // kitchen_state = pending/confirmed/preparing/ready when the order shows on kitchen screens, null otherwise
+        // Maintained by OrderObserver::saving (KitchenQueueService::stateOf)
+        Schema::table('orders', function (Blueprint $table) {
+            $table->string('kitchen_state', 16)->nullable()->after('status');
+
+            $table->index(['outlet_id', 'kitchen_state', 'created_at']);
+            $table->index(['business_id', 'kitchen_state', 'created_at']);
+            // updated_since polls: orders that left the kitchen
+            $table->index(['outlet_id', 'updated_at']);
+        });
+
+        // Backfill only orders that can still be on a screen, in id ranges
+        // (rules as of this migration; inlined so replaying it always gives the same result)
+        $maxId = (int) DB::table('orders')->max('id');
+        $expression = "CASE
+            WHEN status IN ('confirmed', 'preparing', 'ready') THEN status
+            WHEN status = 'pending' AND (
+                type = 'dine_in'
+                OR (type = 'self_service' AND payment_status IN ('pending', 'paid'))
+                OR (type IN ('takeaway', 'delivery', 'online') AND payment_status = 'paid')
+            ) THEN 'pending'
+            ELSE NULL
+        END";
+
+        for ($from = 0; $from < $maxId; $from += 10000) {
+            DB::table('orders')
+                ->where('id', '>', $from)
+                ->where('id', '<=', $from + 10000)
+                ->whereIn('status', ['pending', 'confirmed', 'preparing', 'ready'])
+                ->update(['kitchen_state' => DB::raw($expression)]);
+        }
+    }
+
+    /**
+     * Reverse the migrations.
+     */
+    public function down(): void
+    {
+        Schema::table('orders', function (Blueprint $table) {
+            $table->dropIndex(['outlet_id', 'kitchen_state', 'created_at']);
+            $table->dropIndex(['business_id', 'kitchen_state', 'created_at']);
+            $table->dropIndex(['outlet_id', 'updated_at']);
+            $table->dropColumn('kitchen_state');
+        });
+    }
+};
@@ -0,0 +1,36 @@
+<?php
+
+use Illuminate\Database\Migrations\Migration;
+use Illuminate\Database\Schema\Blueprint;
+use Illuminate\Support\Facades\Schema;
+
+return new class extends Migration
+{
+    /**
+     * Run the migrations.
+     */
+    public function up(): void
+    {
+        // Extra barcodes (EAN/UPC/...) per product or variant, besides products.sku
+        // Scans resolve with one lookup on the unique (business_id, barcode) index
+        Schema::create('product_barcodes', function (Blueprint $table) {
+            $table->id();
+            $table->foreignId('business_id')->constrained()->onDelete('cascade');
+            $table->foreignId('product_id')->constrained()->onDelete('cascade');
+            $table->foreignId('product_variant_id')->nullable()->constrained()->onDelete('cascade');
+            $table->string('barcode', 64);
+            $table->timestamps();
+
+            $table->unique(['business_id', 'barcode']);
+            $table->index('product_id');
+        });
+    }
+
+    /**
+     * Reverse the migrations.
+     */
+    public function down(): void
+    {
+        Schema::dropIfExists('product_barcodes');
+    }
+};
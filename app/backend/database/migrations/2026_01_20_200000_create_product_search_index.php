@@ -0,0 +1,67 @@
+<?php
+
+use Illuminate\Database\Migrations\Migration;
+use Illuminate\Database\Schema\Blueprint;
+use Illuminate\Support\Facades\DB;
+use Illuminate\Support\Facades\Log;
+use Illuminate\Support\Facades\Schema;
+
+return new class extends Migration
+{
+    /**
+     * Run the migrations.
+     */
+    public function up(): void
+    {
+        // Trigram index on product name + SKU (typo-tolerant fallback, every database)
+        // Maintained by ProductObserver (ProductSearchService::index)
+        Schema::create('product_search_grams', function (Blueprint $table) {
+            $table->unsignedBigInteger('business_id');
+            $table->unsignedBigInteger('product_id');
+            $table->string('gram', 3);
+
+            $table->primary(['business_id', 'gram', 'product_id']);
+            $table->index('product_id');
+        });
+
+        $driver = DB::connection()->getDriverName();
+
+        if (in_array($driver, ['mysql', 'mariadb'])) {
+            Schema::table('products', function (Blueprint $table) {
+                $table->fullText(['name', 'sku', 'description']);
+            });
+        }
+
+        if ($driver === 'sqlite') {
+            try {
+                DB::statement("CREATE VIRTUAL TABLE products_fts USING fts5(name, sku, description, business_id UNINDEXED, tokenize = 'unicode61 remove_diacritics 2')");
+            } catch (\Exception $e) {
+                // SQLite built without FTS5: the n-gram index is used instead
+                Log::warning('FTS5 not available, product search uses the n-gram index', ['error' => $e->getMessage()]);
+            }
+        }
+
+        // Schema only: existing products are indexed by `php artisan search:reindex-products`
+        // (run after deploying), new and edited products by ProductObserver
+    }
+
+    /**
+     * Reverse the migrations.
+     */
+    public function down(): void
+    {
+        $driver = DB::connection()->getDriverName();
+
+        if (in_array($driver, ['mysql', 'mariadb'])) {
+            Schema::table('products', function (Blueprint $table) {
+                $table->dropFullText(['name', 'sku', 'description']);
+            });
+        }
+
+        if ($driver === 'sqlite') {
+            DB::statement('DROP TABLE IF EXISTS products_fts');
+        }
+
+        Schema::dropIfExists('product_search_grams');
+    }
+};
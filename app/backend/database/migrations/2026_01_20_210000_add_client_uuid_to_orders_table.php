@@ -0,0 +1,33 @@
+<?php
+
+use Illuminate\Database\Migrations\Migration;
+use Illuminate\Database\Schema\Blueprint;
+use Illuminate\Support\Facades\Schema;
+
+return new class extends Migration
+{
+    /**
+     * Run the migrations.
+     */
+    public function up(): void
+    {
+        // Idempotency key generated by the POS when an order is made (also offline)
+        // A replayed order (lost response, sync retry) hits the unique index instead of creating a duplicate
+        Schema::table('orders', function (Blueprint $table) {
+            $table->uuid('client_uuid')->nullable()->after('order_number');
+
+            $table->unique(['business_id', 'client_uuid']);
+        });
+    }
+
+    /**
+     * Reverse the migrations.
+     */
+    public function down(): void
+    {
+        Schema::table('orders', function (Blueprint $table) {
+            $table->dropUnique(['business_id', 'client_uuid']);
+            $table->dropColumn('client_uuid');
+        });
+    }
+};
@@ -0,0 +1,565 @@
+<?php
+
+namespace Database\Seeders;
+
+use App\Models\Business;
+use App\Models\SubscriptionPlan;
+use App\Services\ProductSearchService;
+use App\Services\SalesRollupService;
+use App\Services\ShiftLedgerService;
+use Carbon\Carbon;
+use Database\Factories\BusinessFactory;
+use Database\Factories\CategoryFactory;
+use Database\Factories\CustomerFactory;
+use Database\Factories\OutletFactory;
+use Database\Factories\ProductFactory;
+use Database\Factories\UserFactory;
+use Illuminate\Database\Seeder;
+use Illuminate\Support\Facades\DB;
+use Illuminate\Support\Facades\Hash;
+
+/**
+ * Deterministic large dataset for performance benchmarks.
+ *
+ * Master data (businesses, outlets, categories, products, customers) comes
+ * from the factories, the high-volume tables (orders, order_items, payments,
+ * inventory_movements) are generated here and written with bulk inserts.
+ * Everything is drawn from one seeded generator, so the same profile and
+ * seed always produce the same rows.
+ *
+ * php artisan benchmark:seed --profile=medium --seed=42
+ */
+class BenchmarkSeeder extends Seeder
+{
+    /**
+     * Size profiles. Orders = businesses x outlets x days x orders_per_day (±20%, more on weekends).
+     */
+    public const PROFILES = [
+        'small' => ['businesses' => 1, 'outlets' => 3, 'categories' => 12, 'products' => 2000, 'customers' => 2000, 'days' => 30, 'orders_per_day' => 40],
+        'medium' => ['businesses' => 2, 'outlets' => 10, 'categories' => 25, 'products' => 10000, 'customers' => 20000, 'days' => 90, 'orders_per_day' => 120],
+        'large' => ['businesses' => 3, 'outlets' => 25, 'categories' => 40, 'products' => 30000, 'customers' => 100000, 'days' => 180, 'orders_per_day' => 150],
+    ];
+
+    /**
+     * Accounts are created as owner{n}.s{seed}@benchmark.test / kasir{n}-{m}.s{seed}@benchmark.test
+     */
+    public const EMAIL_DOMAIN = 'benchmark.test';
+
+    public const PASSWORD = 'password';
+
+    /**
+     * Share of orders per opening hour (lunch and dinner peaks)
+     */
+    private const HOUR_WEIGHTS = [
+        8 => 3, 9 => 4, 10 => 5, 11 => 9, 12 => 14, 13 => 12, 14 => 6,
+        15 => 5, 16 => 6, 17 => 8, 18 => 12, 19 => 13, 20 => 9, 21 => 4,
+    ];
+
+    private const PAYMENT_WEIGHTS = ['cash' => 45, 'qris' => 35, 'card' => 10, 'transfer' => 10];
+
+    private array $counts = [];
+
+    public function __construct(
+        private string $profile = 'small',
+        private int $seed = 20260120,
+        private ?string $until = null,
+        private int $chunk = 1000,
+    ) {
+    }
+
+    /**
+     * Run the database seeds.
+     */
+    public function run(): void
+    {
+        $profile = self::PROFILES[$this->profile] ?? null;
+        if (!$profile) {
+            throw new \InvalidArgumentException("Unknown benchmark profile [{$this->profile}]");
+        }
+
+        DB::disableQueryLog();
+        fake()->seed($this->seed);
+        mt_srand($this->seed);
+
+        $until = Carbon::parse($this->until ?? today())->startOfDay();
+        $from = $until->copy()->subDays($profile['days'] - 1);
+        $plan = SubscriptionPlan::where('slug', 'enterprise')->first();
+
+        if (!$plan) {
+            $this->command?->warn('Enterprise plan not found (run SubscriptionPlanSeeder): owners get no subscription and the v1 API will refuse them.');
+        }
+
+        $this->counts = array_fill_keys(['orders', 'order_items', 'payments', 'inventory_movements', 'cashier_shifts'], 0);
+
+        for ($number = 1; $number <= $profile['businesses']; $number++) {
+            $startedAt = microtime(true);
+            fake()->unique(true);
+
+            $business = $this->seedBusiness($number, $profile, $plan, $from, $until);
+
+            $this->command?->info(sprintf(
+                'Business %d/%d (#%d) seeded in %.1fs',
+                $number, $profile['businesses'], $business->id, microtime(true) - $startedAt
+            ));
+        }
+    }
+
+    /**
+     * Rows written by the last run, per table
+     */
+    public function counts()
+    {
+        return $this->counts;
+    }
+
+    /**
+     * Whether data of this seed already exists
+     */
+    public function exists()
+    {
+        return DB::table('businesses')->where('slug', 'like', $this->slugPrefix() . '%')->exists();
+    }
+
+    /**
+     * Delete the data of this seed (orders first, in chunks, so the cascades stay small).
+     */
+    public function purge()
+    {
+        $businessIds = DB::table('businesses')->where('slug', 'like', $this->slugPrefix() . '%')->pluck('id');
+
+        foreach ($businessIds as $businessId) {
+            do {
+                $deleted = DB::table('orders')->where('business_id', $businessId)->limit(5000)->delete();
+            } while ($deleted > 0);
+
+            DB::table('daily_sales_rollups')->where('business_id', $businessId)->delete();
+            DB::table('daily_sales_rollup_orders')->where('business_id', $businessId)->delete();
+            DB::table('catalog_versions')->where('business_id', $businessId)->delete();
+            app(ProductSearchService::class)->remove(DB::table('products')->where('business_id', $businessId)->pluck('id')->all());
+            DB::table('businesses')->where('id', $businessId)->delete();
+        }
+
+        DB::table('users')->where('email', 'like', '%.s' . $this->seed . '@' . self::EMAIL_DOMAIN)->delete();
+
+        return $businessIds->count();
+    }
+
+    private function seedBusiness(int $number, array $profile, ?SubscriptionPlan $plan, Carbon $from, Carbon $until)
+    {
+        $owner = UserFactory::new()->create([
+            'name' => "Benchmark Owner {$number}",
+            'email' => "owner{$number}.s{$this->seed}@" . self::EMAIL_DOMAIN,
+            'password' => Hash::make(self::PASSWORD),
+            'role' => 'owner',
+        ]);
+
+        // Without the observer: it would add an extra default outlet
+        $business = Business::withoutEvents(fn () => BusinessFactory::new()->create([
+            'owner_id' => $owner->id,
+            'slug' => $this->slugPrefix() . $number,
+        ]));
+
+        if ($plan) {
+            $subscriptionId = DB::table('user_subscriptions')->insertGetId([
+                'user_id' => $owner->id,
+                'subscription_plan_id' => $plan->id,
+                'subscription_plan_price_id' => $plan->prices()->value('id'),
+                'subscription_code' => 'BENCH-' . $this->seed . '-' . $number,
+                'status' => 'active',
+                'amount_paid' => 0,
+                'starts_at' => $from->copy()->subDay(),
+                'ends_at' => $until->copy()->addYear(),
+                'created_at' => now(),
+                'updated_at' => now(),
+            ]);
+            $business->update(['current_subscription_id' => $subscriptionId, 'subscription_expires_at' => $until->copy()->addYear()]);
+        }
+
+        $outlets = [];
+        for ($index = 1; $index <= $profile['outlets']; $index++) {
+            $outlet = OutletFactory::new()->create(['business_id' => $business->id]);
+            $outlets[$outlet->id] = $this->seedCashier($business, $outlet->id, "{$number}-{$index}");
+        }
+
+        $categoryIds = collect(range(1, $profile['categories']))
+            ->map(fn ($sort) => CategoryFactory::new()->create(['business_id' => $business->id, 'sort_order' => $sort])->id)
+            ->all();
+
+        $this->bulk('products', $profile['products'], fn () => ProductFactory::new()
+            ->state(fn () => ['category_id' => $categoryIds[mt_rand(0, count($categoryIds) - 1)]])
+            ->raw(['business_id' => $business->id]));
+
+        // Bulk inserts skip ProductObserver: index the products for search
+        app(ProductSearchService::class)->rebuild($business->id);
+
+        $this->bulk('customers', $profile['customers'], fn () => CustomerFactory::new()->raw(['business_id' => $business->id]));
+
+        $products = DB::table('products')
+            ->where('business_id', $business->id)
+            ->where('is_active', true)
+            ->orderBy('id')
+            ->get(['id', 'name', 'price', 'stock', 'stock_type'])
+            ->all();
+        $customerIds = DB::table('customers')->where('business_id', $business->id)->orderBy('id')->pluck('id')->all();
+
+        $this->seedProductOutlets($products, array_keys($outlets));
+
+        $stock = [];
+        foreach ($products as $product) {
+            if ($product->stock_type === 'tracked') {
+                $stock[$product->id] = (int) $product->stock;
+            }
+        }
+
+        $shiftIds = [];
+        $buffer = [];
+        for ($day = $from->copy(); $day->lte($until); $day->addDay()) {
+            foreach ($outlets as $outletId => $cashier) {
+                $shiftId = $this->openShift($business->id, $outletId, $cashier, $day, $day->equalTo($until));
+                $shiftIds[] = $shiftId;
+
+                $orders = (int) round($profile['orders_per_day'] * ($day->isWeekend() ? 1.3 : 1.0) * (0.8 + mt_rand(0, 400) / 1000));
+                for ($sequence = 1; $sequence <= $orders; $sequence++) {
+                    $buffer[] = $this->makeOrder($business, $outletId, $cashier, $shiftId, $day, $sequence, $products, $customerIds, $stock);
+
+                    if (count($buffer) >= $this->chunk) {
+                        $this->flushOrders($buffer);
+                        $buffer = [];
+                    }
+                }
+            }
+        }
+        $this->flushOrders($buffer);
+
+        $this->updateStock($stock);
+        $this->refreshDerived($business->id, $shiftIds, $from, $until);
+
+        return $business;
+    }
+
+    /**
+     * Kasir account assigned to one outlet
+     */
+    private function seedCashier(Business $business, $outletId, string $suffix)
+    {
+        $user = UserFactory::new()->create([
+            'name' => "Benchmark Kasir {$suffix}",
+            'email' => "kasir{$suffix}.s{$this->seed}@" . self::EMAIL_DOMAIN,
+            'password' => Hash::make(self::PASSWORD),
+            'role' => 'kasir',
+        ]);
+
+        $now = now();
+        $employeeId = DB::table('employees')->insertGetId([
+            'business_id' => $business->id,
+            'user_id' => $user->id,
+            'employee_code' => "BENCH-{$suffix}",
+            'name' => $user->name,
+            'email' => $user->email,
+            'is_active' => true,
+            'hired_at' => $now,
+            'created_at' => $now,
+            'updated_at' => $now,
+        ]);
+        DB::table('employee_outlets')->insert([
+            'user_id' => $user->id,
+            'outlet_id' => $outletId,
+            'business_id' => $business->id,
+            'is_primary' => true,
+            'created_at' => $now,
+            'updated_at' => $now,
+        ]);
+        DB::table('business_users')->insert([
+            'business_id' => $business->id,
+            'user_id' => $user->id,
+            'role' => 'kasir',
+            'is_active' => true,
+            'joined_at' => $now,
+            'created_at' => $now,
+            'updated_at' => $now,
+        ]);
+
+        return ['user_id' => $user->id, 'employee_id' => $employeeId];
+    }
+
+    private function seedProductOutlets(array $products, array $outletIds)
+    {
+        $now = now();
+        $rows = [];
+
+        foreach ($products as $product) {
+            foreach ($outletIds as $outletId) {
+                $rows[] = [
+                    'product_id' => $product->id,
+                    'outlet_id' => $outletId,
+                    'stock' => mt_rand(0, 500),
+                    'min_stock' => 10,
+                    'is_available' => true,
+                    'created_at' => $now,
+                    'updated_at' => $now,
+                ];
+
+                if (count($rows) >= $this->chunk) {
+                    DB::table('product_outlets')->insert($rows);
+                    $rows = [];
+                }
+            }
+        }
+
+        if ($rows) {
+            DB::table('product_outlets')->insert($rows);
+        }
+    }
+
+    private function openShift($businessId, $outletId, array $cashier, Carbon $day, bool $isLastDay)
+    {
+        $this->counts['cashier_shifts']++;
+
+        return DB::table('cashier_shifts')->insertGetId([
+            'business_id' => $businessId,
+            'outlet_id' => $outletId,
+            'user_id' => $cashier['user_id'],
+            'employee_id' => $cashier['employee_id'],
+            'shift_name' => 'Shift Harian',
+            'status' => $isLastDay ? 'open' : 'closed',
+            'opened_at' => $day->copy()->setTime(7, 45),
+            'closed_at' => $isLastDay ? null : $day->copy()->setTime(22, 15),
+            'opening_balance' => 500000,
+            'closed_by_user_id' => $isLastDay ? null : $cashier['user_id'],
+            'created_at' => $day->copy()->setTime(7, 45),
+            'updated_at' => $day->copy()->setTime(22, 15),
+        ]);
+    }
+
+    /**
+     * One order with its items, payment and stock movements (keyed by order_number until inserted).
+     */
+    private function makeOrder(Business $business, $outletId, array $cashier, $shiftId, Carbon $day, int $sequence, array $products, array $customerIds, array &$stock)
+    {
+        $orderedAt = $day->copy()->setTime($this->pick(self::HOUR_WEIGHTS), mt_rand(0, 59), mt_rand(0, 59));
+        $orderNumber = sprintf('BM%d-%d-%s-%04d', $this->seed, $outletId, $day->format('Ymd'), $sequence);
+        $cancelled = mt_rand(1, 100) <= 3;
+
+        $items = [];
+        $movements = [];
+        $subtotal = 0;
+        $lines = mt_rand(1, 5);
+
+        for ($line = 0; $line < $lines; $line++) {
+            // Squared uniform: a few products sell much more than the rest
+            $product = $products[(int) floor(count($products) * (mt_rand() / (mt_getrandmax() + 1)) ** 2)];
+            $quantity = mt_rand(1, 3);
+            $lineTotal = $product->price * $quantity;
+            $subtotal += $lineTotal;
+
+            $items[] = [
+                'product_id' => $product->id,
+                'product_name' => $product->name,
+                'price' => $product->price,
+                'quantity' => $quantity,
+                'subtotal' => $lineTotal,
+                'created_at' => $orderedAt,
+                'updated_at' => $orderedAt,
+            ];
+
+            if ($cancelled || !isset($stock[$product->id])) {
+                continue;
+            }
+
+            if ($stock[$product->id] < $quantity + 10) {
+                $movements[] = $this->movement($product->id, 'in', 'purchase', 1000, $stock[$product->id], $orderedAt, null);
+                $stock[$product->id] += 1000;
+            }
+
+            $movements[] = $this->movement($product->id, 'out', 'sale', $quantity, $stock[$product->id], $orderedAt, $orderNumber);
+            $stock[$product->id] -= $quantity;
+        }
+
+        $discount = mt_rand(1, 100) <= 10 ? round($subtotal * 0.05, -2) : 0;
+        $tax = round(($subtotal - $discount) * $business->tax_rate / 100);
+        $total = $subtotal - $discount + $tax;
+        $method = $this->pick(self::PAYMENT_WEIGHTS);
+        $paid = $method === 'cash' ? ceil($total / 5000) * 5000 : $total;
+        $paidAt = $orderedAt->copy()->addMinutes(mt_rand(1, 45));
+
+        $order = [
+            'order_number' => $orderNumber,
+            'business_id' => $business->id,
+            'outlet_id' => $outletId,
+            'customer_id' => mt_rand(1, 100) <= 30 ? $customerIds[mt_rand(0, count($customerIds) - 1)] : null,
+            'employee_id' => $cashier['employee_id'],
+            'shift_id' => $shiftId,
+            'type' => mt_rand(1, 100) <= 60 ? 'dine_in' : 'takeaway',
+            'status' => $cancelled ? 'cancelled' : 'completed',
+            'subtotal' => $subtotal,
+            'tax_amount' => $tax,
+            'discount_amount' => $discount,
+            'total' => $total,
+            'paid_amount' => $cancelled ? 0 : $paid,
+            'change_amount' => $cancelled ? 0 : $paid - $total,
+            'payment_status' => $cancelled ? 'pending' : 'paid',
+            'ordered_at' => $orderedAt,
+            'paid_at' => $cancelled ? null : $paidAt,
+            'recognized_at' => $cancelled ? $orderedAt : $paidAt,
+            'created_at' => $orderedAt,
+            'updated_at' => $orderedAt,
+        ];
+
+        $payment = $cancelled ? null : [
+            'payment_method' => $method,
+            'amount' => $paid,
+            'reference_number' => $method === 'cash' ? null : 'REF-' . $orderNumber,
+            'status' => 'success',
+            'paid_at' => $paidAt,
+            'processed_by_user_id' => $cashier['user_id'],
+            'processed_by_employee_id' => $cashier['employee_id'],
+            'created_at' => $paidAt,
+            'updated_at' => $paidAt,
+        ];
+
+        return compact('order', 'items', 'payment', 'movements');
+    }
+
+    private function movement($productId, string $type, string $reason, int $quantity, int $stockBefore, Carbon $at, ?string $orderNumber)
+    {
+        return [
+            'product_id' => $productId,
+            'type' => $type,
+            'reason' => $reason,
+            'quantity' => $quantity,
+            'stock_before' => $stockBefore,
+            'stock_after' => $type === 'in' ? $stockBefore + $quantity : $stockBefore - $quantity,
+            'reference_type' => $orderNumber ? 'order' : null,
+            'order_number' => $orderNumber,
+            'notes' => $orderNumber ? "Penjualan order #{$orderNumber}" : 'Restock benchmark',
+            'created_at' => $at,
+            'updated_at' => $at,
+        ];
+    }
+
+    /**
+     * Insert a batch of generated orders, then their children with the real order ids.
+     */
+    private function flushOrders(array $batch)
+    {
+        if (empty($batch)) {
+            return;
+        }
+
+        DB::transaction(function () use ($batch) {
+            DB::table('orders')->insert(array_column($batch, 'order'));
+
+            $ids = DB::table('orders')
+                ->whereIn('order_number', array_column(array_column($batch, 'order'), 'order_number'))
+                ->pluck('id', 'order_number');
+
+            $items = [];
+            $payments = [];
+            $movements = [];
+
+            foreach ($batch as $generated) {
+                $orderId = $ids[$generated['order']['order_number']];
+
+                foreach ($generated['items'] as $item) {
+                    $items[] = $item + ['order_id' => $orderId];
+                }
+                if ($generated['payment']) {
+                    $payments[] = $generated['payment'] + ['order_id' => $orderId];
+                }
+                foreach ($generated['movements'] as $movement) {
+                    $movement['reference_id'] = $movement['order_number'] ? $orderId : null;
+                    unset($movement['order_number']);
+                    $movements[] = $movement;
+                }
+            }
+
+            foreach (['order_items' => $items, 'payments' => $payments, 'inventory_movements' => $movements] as $table => $rows) {
+                foreach (array_chunk($rows, 1000) as $chunk) {
+                    DB::table($table)->insert($chunk);
+                }
+                $this->counts[$table] += count($rows);
+            }
+
+            $this->counts['orders'] += count($batch);
+        });
+    }
+
+    /**
+     * Write the running stock of tracked products back (CASE update per chunk)
+     */
+    private function updateStock(array $stock)
+    {
+        foreach (array_chunk($stock, 500, true) as $chunk) {
+            $cases = implode(' ', array_map(fn ($id) => "WHEN {$id} THEN ?", array_keys($chunk)));
+
+            DB::update(
+                'UPDATE products SET stock = CASE id ' . $cases . ' END WHERE id IN (' . implode(',', array_keys($chunk)) . ')',
+                array_values($chunk)
+            );
+        }
+    }
+
+    /**
+     * Shift ledgers, closing counts and daily sales rollups, built from the inserted orders
+     */
+    private function refreshDerived($businessId, array $shiftIds, Carbon $from, Carbon $until)
+    {
+        $ledger = app(ShiftLedgerService::class);
+        foreach (array_chunk($shiftIds, 200) as $chunk) {
+            $ledger->rebuild($chunk);
+        }
+
+        DB::table('cashier_shifts')
+            ->where('business_id', $businessId)
+            ->where('status', 'closed')
+            ->update([
+                'actual_cash' => DB::raw('expected_cash'),
+                'actual_card' => DB::raw('expected_card'),
+                'actual_transfer' => DB::raw('expected_transfer'),
+                'actual_qris' => DB::raw('expected_qris'),
+                'actual_total' => DB::raw('expected_total'),
+            ]);
+
+        app(SalesRollupService::class)->rebuild($from, $until, $businessId);
+    }
+
+    /**
+     * Generic bulk insert of factory rows
+     */
+    private function bulk(string $table, int $count, callable $make)
+    {
+        $now = now();
+
+        for ($done = 0; $done < $count; $done += $this->chunk) {
+            $rows = [];
+            for ($i = 0; $i < min($this->chunk, $count - $done); $i++) {
+                $rows[] = $make() + ['created_at' => $now, 'updated_at' => $now];
+            }
+            DB::table($table)->insert($rows);
+        }
+
+        $this->counts[$table] = ($this->counts[$table] ?? 0) + $count;
+    }
+
+    /**
+     * Weighted random key
+     */
+    private function pick(array $weights)
+    {
+        $roll = mt_rand(1, array_sum($weights));
+
+        foreach ($weights as $key => $weight) {
+            $roll -= $weight;
+            if ($roll <= 0) {
+                return $key;
+            }
+        }
+
+        return array_key_last($weights);
+    }
+
+    private function slugPrefix()
+    {
+        return "benchmark-{$this->seed}-";
+    }
+}
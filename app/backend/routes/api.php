@@ -9,11 +9,13 @@
 use App\Http\Controllers\Api\CategoryController;
 use App\Http\Controllers\Api\CustomerController;
 use App\Http\Controllers\Api\OrderController;
+use App\Http\Controllers\Api\OrderStreamController;
 use App\Http\Controllers\Api\POSController;
 use App\Http\Controllers\Api\KitchenController;
 use App\Http\Controllers\Api\DiscountController;
 use App\Http\Controllers\Api\EmployeeController;
 use App\Http\Controllers\Api\ReportController;
+use App\Http\Controllers\Api\ReportExportController;
 use App\Http\Controllers\Api\InventoryController;
 use App\Http\Controllers\Api\TableController;
 use App\Http\Controllers\Api\SettingsController;
@@ -97,10 +99,11 @@
 // Payment webhook (no auth required for Midtrans callback)
 // ✅ SECURITY: Rate limiting untuk webhook (higher limit for Midtrans callbacks)
 // Note: Webhook dari Midtrans perlu IP whitelist di production
-Route::prefix('v1/payments')->middleware('throttle:300,1')->group(function () {
-    Route::post('/midtrans/notification', [PaymentController::class, 'handleMidtransNotification']);
-    Route::post('/midtrans/order-notification', [OrderPaymentController::class, 'handleNotification']);
-    Route::get('/client-key', [PaymentController::class, 'getClientKey']);
+// ✅ Callbacks are signature-verified and only stored; the payments queue applies them
+Route::prefix('v1/payments')->group(function () {
+    Route::post('/midtrans/notification', [PaymentController::class, 'handleMidtransNotification'])->middleware('throttle:midtrans-webhook');
+    Route::post('/midtrans/order-notification', [OrderPaymentController::class, 'handleNotification'])->middleware('throttle:midtrans-webhook');
+    Route::get('/client-key', [PaymentController::class, 'getClientKey'])->middleware('throttle:300,1');
 });
 
 // ✅ Token Management (authenticated users)
@@ -155,6 +158,8 @@
     Route::prefix('products')->group(function () {
         Route::get('/initial-data', [ProductController::class, 'getInitialData']); // Combined endpoint
         Route::get('/', [ProductController::class, 'apiIndex']);
+        Route::get('/sync', [ProductController::class, 'sync']); // POS catalog delta (?since=version)
+        Route::get('/lookup', [ProductController::class, 'lookup']); // Exact barcode/SKU scan (?code=)
         Route::post('/', [ProductController::class, 'store']);
         Route::get('/{product}', [ProductController::class, 'apiShow']);
         Route::put('/{product}', [ProductController::class, 'update']);
@@ -246,6 +251,7 @@
         Route::get('/', [OrderController::class, 'index']);
         Route::get('/unpaid', [OrderController::class, 'unpaidOrders']); // ✅ New endpoint for unpaid orders
         Route::post('/', [POSController::class, 'createOrder']);
+        Route::post('/batch', [POSController::class, 'batchOrders']); // ✅ Offline queue sync (idempotent per client_uuid)
         Route::get('/{order}', [OrderController::class, 'show']);
         Route::get('/{order}/receipt', [POSController::class, 'printReceipt']);
         Route::post('/{order}/payment', [POSController::class, 'processPayment']);
@@ -259,6 +265,7 @@
         // QRIS Payment routes
         Route::post('/payment/qris', [OrderPaymentController::class, 'createQrisPayment']);
         Route::get('/payment/{payment}/status', [OrderPaymentController::class, 'checkPaymentStatus']);
+        Route::get('/payment/{payment}/wait', [OrderPaymentController::class, 'waitPaymentStatus']); // ✅ Long-poll, woken by the webhook pipeline
         Route::post('/payment/{payment}/cancel', [OrderPaymentController::class, 'cancelPayment']);
 
         // Admin/Owner only routes
@@ -268,6 +275,12 @@
         });
     });
 
+    // Order event stream (SSE) + polling fallback with since cursor - for kitchen/waiter/kasir screens
+    Route::prefix('order-stream')->middleware('outlet.access')->group(function () {
+        Route::get('/', [OrderStreamController::class, 'stream']);
+        Route::get('/events', [OrderStreamController::class, 'events']);
+    });
+
     // Kitchen API - Requires outlet access for kitchen role
     Route::prefix('kitchen')->middleware('outlet.access')->group(function () {
         Route::get('/orders', [KitchenController::class, 'getOrders']);
@@ -325,6 +338,7 @@
         Route::post('/calculate', [PayrollController::class, 'calculate']); // Preview calculation
         Route::post('/', [PayrollController::class, 'store']); // Generate payroll
         Route::post('/generate-all', [PayrollController::class, 'generateAll']); // Generate for all employees
+        Route::get('/generate-all/status', [PayrollController::class, 'generateAllStatus']); // Progress of a queued generate-all
         Route::get('/{id}', [PayrollController::class, 'show']);
         Route::put('/{id}', [PayrollController::class, 'update']);
         Route::delete('/{id}', [PayrollController::class, 'destroy']);
@@ -350,6 +364,10 @@
         Route::get('/customer-analytics', [ReportController::class, 'getCustomerAnalytics']);
         Route::get('/export/sales', [ReportController::class, 'exportSales']);
         Route::get('/export/inventory', [ReportController::class, 'exportInventory']);
+        // Background exports (queued PDF generation, poll then download the cached artifact)
+        Route::post('/exports', [ReportExportController::class, 'store']);
+        Route::get('/exports/{id}', [ReportExportController::class, 'show']);
+        Route::get('/exports/{id}/download', [ReportExportController::class, 'download']);
         // Dynamic export route - must be last to avoid conflicts
         Route::get('/export/{type}', [ReportController::class, 'exportReport'])->where('type', '[a-z-]+');
 
@@ -25,3 +25,29 @@
 })
     ->hourly()
     ->description('Cleanup expired WhatsApp verification codes');
+
+// Remove expired background report export artifacts (retention: config/reports.php)
+Schedule::command('reports:prune-exports')
+    ->hourly()
+    ->description('Delete expired report export artifacts')
+    ->withoutOverlapping();
+
+// Rebuild yesterday's sales rollups after midnight (repairs orders changed outside Eloquent)
+Schedule::command('sales:rollup --days=2')
+    ->dailyAt('00:30')
+    ->timezone('Asia/Jakarta')
+    ->description('Rebuild daily sales rollups for yesterday and today')
+    ->withoutOverlapping();
+
+// Cleanup order stream events older than the polling retention window (run every hour)
+Schedule::call(function () {
+    app(\App\Services\OrderEventService::class)->prune();
+})
+    ->hourly()
+    ->description('Cleanup old order stream events');
+
+// Write buffered self-service QR scans to tables (scan_count / last_scan_at)
+Schedule::command('selfservice:flush-scans')
+    ->everyMinute()
+    ->description('Flush buffered table QR scan counters')
+    ->withoutOverlapping();
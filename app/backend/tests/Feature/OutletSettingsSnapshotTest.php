@@ -0,0 +1,78 @@
+<?php
+
+namespace Tests\Feature;
+
+use App\Models\Outlet;
+use App\Models\OutletSetting;
+use App\Services\OutletSettingsService;
+use Illuminate\Support\Facades\DB;
+use Illuminate\Support\Facades\Schema;
+use Tests\TestCase;
+
+class OutletSettingsSnapshotTest extends TestCase
+{
+    protected function setUp(): void
+    {
+        parent::setUp();
+
+        Schema::dropIfExists('outlet_settings');
+        Schema::create('outlet_settings', function ($table) {
+            $table->id();
+            $table->unsignedBigInteger('outlet_id');
+            $table->string('setting_key');
+            $table->text('setting_value')->nullable();
+            $table->string('data_type')->default('string');
+            $table->text('description')->nullable();
+            $table->timestamps();
+        });
+
+        OutletSetting::create(['outlet_id' => 1, 'setting_key' => 'receipt_footer_message', 'setting_value' => 'Terima kasih', 'data_type' => 'string']);
+        OutletSetting::create(['outlet_id' => 1, 'setting_key' => 'send_receipt_via_wa', 'setting_value' => 'true', 'data_type' => 'boolean']);
+    }
+
+    /**
+     * A receipt print reads several settings; only one settings query may hit the database.
+     */
+    public function test_receipt_print_issues_at_most_one_settings_query(): void
+    {
+        $outlet = (new Outlet)->forceFill(['id' => 1]);
+        $queries = $this->countSettingsQueries();
+
+        $this->assertSame('Terima kasih', $outlet->getSetting('receipt_footer_message', ''));
+        $this->assertTrue($outlet->isSendReceiptViaWAEnabled());
+        $this->assertNull($outlet->getSetting('tax_rate'));
+        $this->assertSame('Terima kasih', $outlet->getSetting('receipt_footer_message', ''));
+
+        $this->assertLessThanOrEqual(1, $queries->count);
+    }
+
+    public function test_settings_update_invalidates_the_snapshot(): void
+    {
+        $outlet = (new Outlet)->forceFill(['id' => 1]);
+        $this->assertSame('Terima kasih', $outlet->getSetting('receipt_footer_message'));
+
+        OutletSetting::updateOrCreate(
+            ['outlet_id' => 1, 'setting_key' => 'receipt_footer_message'],
+            ['setting_value' => 'Sampai jumpa', 'data_type' => 'string']
+        );
+
+        // A fresh request must see the new value from the versioned cache
+        $this->app->forgetScopedInstances();
+
+        $this->assertSame('Sampai jumpa', app(OutletSettingsService::class)->get(1, 'receipt_footer_message'));
+    }
+
+    private function countSettingsQueries()
+    {
+        $counter = new \stdClass;
+        $counter->count = 0;
+
+        DB::listen(function ($query) use ($counter) {
+            if (str_contains($query->sql, 'outlet_settings')) {
+                $counter->count++;
+            }
+        });
+
+        return $counter;
+    }
+}
@@ -0,0 +1,130 @@
+<?php
+
+namespace Tests\Feature;
+
+use App\Models\Order;
+use App\Services\PosOrderService;
+use Database\Factories\BusinessFactory;
+use Database\Factories\CategoryFactory;
+use Database\Factories\OutletFactory;
+use Database\Factories\ProductFactory;
+use Database\Factories\UserFactory;
+use Illuminate\Foundation\Testing\RefreshDatabase;
+use Illuminate\Support\Facades\DB;
+use Illuminate\Support\Str;
+use Tests\TestCase;
+
+class PosOrderBatchSyncTest extends TestCase
+{
+    use RefreshDatabase;
+
+    private const QUEUED_ORDERS = 300;
+
+    private array $context;
+
+    private array $productIds;
+
+    protected function setUp(): void
+    {
+        parent::setUp();
+
+        $owner = UserFactory::new()->create(['role' => 'owner']);
+        $business = BusinessFactory::new()->create(['owner_id' => $owner->id]);
+        $outlet = OutletFactory::new()->create(['business_id' => $business->id]);
+        $category = CategoryFactory::new()->create(['business_id' => $business->id]);
+
+        $this->productIds = ProductFactory::new()->count(10)->create([
+            'business_id' => $business->id,
+            'category_id' => $category->id,
+            'stock' => 100000,
+            'stock_type' => 'tracked',
+            'is_active' => true,
+        ])->pluck('id')->all();
+
+        $this->context = app(PosOrderService::class)->context($business->id, $outlet->id, $owner);
+    }
+
+    /**
+     * A device comes back online with a large queue; the first sync loses its
+     * responses and the whole queue is replayed. Every order exists exactly once.
+     */
+    public function test_replaying_an_offline_queue_creates_each_order_once(): void
+    {
+        $service = app(PosOrderService::class);
+        $queue = $this->offlineQueue(self::QUEUED_ORDERS);
+
+        $queries = 0;
+        DB::listen(function () use (&$queries) {
+            $queries++;
+        });
+
+        $startedAt = microtime(true);
+        $first = [];
+        foreach (array_chunk($queue, 100) as $batch) {
+            $first = array_merge($first, $service->createBatch($batch, $this->context));
+        }
+        $elapsed = microtime(true) - $startedAt;
+
+        $this->assertSame(self::QUEUED_ORDERS, count(array_filter($first, fn ($result) => $result['status'] === 'created')));
+        $this->assertSame(self::QUEUED_ORDERS, Order::where('business_id', $this->context['business_id'])->count());
+
+        // Bounded: a constant number of statements per order, no per-item or per-reference lookups
+        $this->assertLessThan(self::QUEUED_ORDERS * 30, $queries);
+        $this->assertLessThan(15, $elapsed);
+
+        // Replay: responses were lost, the client sends everything again
+        $replay = $service->createBatch($queue, $this->context);
+
+        $this->assertSame(['duplicate'], array_values(array_unique(array_column($replay, 'status'))));
+        $this->assertSame(array_column($first, 'order_id'), array_column($replay, 'order_id'));
+        $this->assertSame(self::QUEUED_ORDERS, Order::where('business_id', $this->context['business_id'])->count());
+        $this->assertSame(
+            self::QUEUED_ORDERS,
+            Order::where('business_id', $this->context['business_id'])->distinct()->count('client_uuid')
+        );
+    }
+
+    public function test_duplicates_and_bad_orders_in_one_batch_do_not_fail_the_others(): void
+    {
+        $queue = $this->offlineQueue(5);
+        $queue[] = $queue[0];
+        $queue[] = ['client_uuid' => (string) Str::uuid(), 'items' => [['product_id' => 999999, 'quantity' => 1, 'price' => 1000]]];
+        $queue[] = ['client_uuid' => (string) Str::uuid(), 'items' => [['product_id' => $this->productIds[0], 'quantity' => 1000000, 'price' => 1000]]];
+        $queue[] = ['items' => [['product_id' => $this->productIds[0], 'quantity' => 1, 'price' => 1000]]];
+
+        $results = app(PosOrderService::class)->createBatch($queue, $this->context);
+
+        $this->assertSame(
+            ['created', 'created', 'created', 'created', 'created', 'duplicate', 'failed', 'failed', 'failed'],
+            array_column($results, 'status')
+        );
+        $this->assertSame($results[0]['order_id'], $results[5]['order_id']);
+        $this->assertSame(5, Order::where('business_id', $this->context['business_id'])->count());
+
+        // The order that ran out of stock was rolled back alone
+        $this->assertSame(0, DB::table('order_items')->where('quantity', 1000000)->count());
+    }
+
+    private function offlineQueue(int $count): array
+    {
+        $orders = [];
+
+        for ($i = 0; $i < $count; $i++) {
+            $items = [];
+            foreach (array_rand(array_flip($this->productIds), 2) as $productId) {
+                $items[] = ['product_id' => $productId, 'quantity' => random_int(1, 3), 'price' => 15000];
+            }
+
+            $orders[] = [
+                'client_uuid' => (string) Str::uuid(),
+                'items' => $items,
+                'tax' => 0,
+                'discount' => 0,
+                'notes' => 'Walk-in Customer',
+                'ordered_at' => now()->subMinutes($count - $i)->toIso8601String(),
+            ];
+        }
+
+        return $orders;
+    }
+}
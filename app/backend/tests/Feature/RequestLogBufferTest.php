@@ -0,0 +1,103 @@
+<?php
+
+namespace Tests\Feature;
+
+use App\Logging\BufferRequestLogs;
+use App\Logging\RequestLog;
+use Illuminate\Http\Request;
+use Illuminate\Support\Facades\Log;
+use Tests\TestCase;
+
+class RequestLogBufferTest extends TestCase
+{
+    private string $path;
+
+    protected function setUp(): void
+    {
+        parent::setUp();
+
+        $this->path = storage_path('logs/request-log-test-' . getmypid() . '.log');
+        @unlink($this->path);
+
+        config(['logging.request' => [
+            'buffer' => true,
+            'buffer_limit' => 200,
+            'sample_rate' => 1.0,
+            'sample_routes' => ['api/unsampled' => 0],
+        ]]);
+    }
+
+    protected function tearDown(): void
+    {
+        @unlink($this->path);
+
+        parent::tearDown();
+    }
+
+    /**
+     * Records of a request are written in one go at the end, tagged with the request context.
+     */
+    public function test_records_are_buffered_until_the_request_ends(): void
+    {
+        $log = app(RequestLog::class);
+        $log->start(Request::create('/api/v1/orders', 'POST', [], [], [], ['HTTP_X_BUSINESS_ID' => '7']));
+
+        $channel = $this->channel();
+        $channel->info('Order created', ['order_id' => 1]);
+        $channel->info('Order created', ['order_id' => 2]);
+
+        $this->assertSame([], $this->lines());
+
+        $log->flush();
+
+        $lines = $this->lines();
+        $this->assertCount(2, $lines);
+        $this->assertStringContainsString($log->requestId(), $lines[0]);
+        $this->assertStringContainsString('"business_id":"7"', $lines[0]);
+    }
+
+    public function test_unsampled_requests_keep_only_warnings_and_errors(): void
+    {
+        $log = app(RequestLog::class);
+        $log->start(Request::create('/api/unsampled'));
+
+        $channel = $this->channel();
+        $channel->debug('Payload', ['items' => [1, 2, 3]]);
+        $channel->info('Order created');
+        $channel->warning('Validation failed');
+
+        $log->flush();
+
+        $lines = $this->lines();
+        $this->assertCount(1, $lines);
+        $this->assertStringContainsString('Validation failed', $lines[0]);
+    }
+
+    public function test_errors_are_written_immediately(): void
+    {
+        app(RequestLog::class)->start(Request::create('/api/v1/orders', 'POST'));
+
+        $channel = $this->channel();
+        $channel->info('Creating order');
+        $channel->error('Failed to create order');
+
+        $this->assertCount(2, $this->lines());
+    }
+
+    private function channel()
+    {
+        return Log::build([
+            'driver' => 'single',
+            'path' => $this->path,
+            'level' => 'debug',
+            'tap' => [BufferRequestLogs::class],
+        ]);
+    }
+
+    private function lines(): array
+    {
+        clearstatcache();
+
+        return is_file($this->path) ? file($this->path, FILE_IGNORE_NEW_LINES) : [];
+    }
+}
@@ -0,0 +1,32 @@
+<?php
+
+/**
+ * Fake WhatsApp provider for local benchmarks (php -S router script).
+ *
+ *   FAKE_WA_LATENCY_MS=2000 FAKE_WA_FAIL_RATE=0 php -S 127.0.0.1:8787 tests/Fixtures/fake-whatsapp-provider.php
+ *   php artisan benchmark:whatsapp-queue --url=http://127.0.0.1:8787/send
+ *
+ * Accepts any path/body and answers after the configured latency with a
+ * response every supported provider parser treats as success (Fonnte,
+ * Wablas, KirimWA, Wablitz). ?latency_ms= and ?fail_rate= override the env.
+ */
+
+$latencyMs = (int) ($_GET['latency_ms'] ?? getenv('FAKE_WA_LATENCY_MS') ?: 1000);
+$failRate = (float) ($_GET['fail_rate'] ?? getenv('FAKE_WA_FAIL_RATE') ?: 0);
+
+usleep(max(0, $latencyMs) * 1000);
+
+header('Content-Type: application/json');
+
+if ($failRate > 0 && mt_rand() / mt_getrandmax() < $failRate) {
+    http_response_code(503);
+    echo json_encode(['status' => false, 'success' => false, 'message' => 'Fake provider unavailable']);
+    return;
+}
+
+echo json_encode([
+    'status' => 'success',
+    'success' => true,
+    'id' => 'fake-' . bin2hex(random_bytes(6)),
+    'msg' => 'Message sent successfully!',
+]);
@@ -14,6 +14,7 @@ import toast from 'react-hot-toast';
 import { useAuth } from '../../contexts/AuthContext';
 import { queryKeys } from '../../config/reactQuery';
 import useKeyboardShortcuts from '../../hooks/useKeyboardShortcuts';
+import { useOrderStream } from '../../hooks/useOrderStream';
 import { kitchenService } from '../../services/kitchen.service';
 import { Badge } from '../ui/badge';
 import { Button } from '../ui/button';
@@ -56,6 +57,16 @@ const KitchenDashboard = () => {
     completed: 0,
   });
 
+  // ✅ Real-time: refetch orders & notifications when order events arrive
+  // (polling below only runs while the stream is not connected)
+  const { isLive } = useOrderStream(
+    () => {
+      refetchOrders();
+      loadNotifications();
+    },
+    { enabled: Boolean(currentOutlet), outletId: currentOutlet?.id }
+  );
+
   // ✅ FIX: Use React Query for kitchen orders
   const {
     data: ordersData,
@@ -79,7 +90,7 @@ const KitchenDashboard = () => {
     staleTime: 30 * 1000, // 30 seconds - real-time data
     gcTime: 5 * 60 * 1000, // 5 minutes
     retry: 1,
-    refetchInterval: 30 * 1000, // Auto-refresh every 30 seconds
+    refetchInterval: isLive ? false : 30 * 1000, // Fallback auto-refresh every 30 seconds
     refetchOnMount: false,
     placeholderData: (previousData) => previousData,
   });
@@ -228,7 +239,10 @@ const KitchenDashboard = () => {
   }, [currentOutlet]);
 
   // ✅ FIX: Auto-refresh notifications every 30 seconds (orders handled by React Query)
+  // Skipped while the order stream is live - events trigger the reload instead
   useEffect(() => {
+    if (isLive) return undefined;
+
     const interval = setInterval(() => {
       if (currentOutlet) {
         loadNotifications();
@@ -236,7 +250,7 @@ const KitchenDashboard = () => {
     }, 30000);
 
     return () => clearInterval(interval);
-  }, [currentOutlet]);
+  }, [currentOutlet, isLive]);
 
   // ✅ FIX: Handle refresh using React Query refetch
   const handleRefresh = useCallback(async () => {
@@ -16,6 +16,7 @@ import toast, { Toaster } from 'react-hot-toast';
 import { useNavigate } from 'react-router-dom';
 import { useAuth } from '../../contexts/AuthContext';
 import { queryKeys } from '../../config/reactQuery';
+import { useOrderStream } from '../../hooks/useOrderStream';
 import { kitchenService } from '../../services/kitchen.service';
 import { tableService } from '../../services/table.service';
 import { Badge } from '../ui/badge';
@@ -62,6 +63,16 @@ const WaiterDashboard = () => {
     totalSales: 0,
   });
 
+  // ✅ Real-time: order events refresh tables & active orders
+  // (30s polling below only runs while the stream is not connected)
+  const { isLive } = useOrderStream(
+    () => {
+      refetchActiveOrders();
+      refetchTables();
+    },
+    { enabled: Boolean(currentOutlet), outletId: currentOutlet?.id }
+  );
+
   // ✅ FIX: Use React Query for tables
   const {
     data: tablesData,
@@ -167,7 +178,7 @@ const WaiterDashboard = () => {
     gcTime: 5 * 60 * 1000, // 5 minutes
     retry: 2, // ✅ FIX: Retry 2 times on failure
     retryDelay: (attemptIndex) => Math.min(1000 * 2 ** attemptIndex, 30000), // Exponential backoff
-    refetchInterval: 30 * 1000, // Auto-refresh every 30 seconds
+    refetchInterval: isLive ? false : 30 * 1000, // Fallback auto-refresh every 30 seconds
     refetchOnMount: true, // ✅ FIX: Always fetch on mount to ensure data is loaded
     refetchOnWindowFocus: true, // ✅ FIX: Refetch when window gains focus
     placeholderData: (previousData) => previousData || [], // ✅ FIX: Keep previous data while loading/on error
@@ -226,7 +237,7 @@ const WaiterDashboard = () => {
     staleTime: 30 * 1000, // 30 seconds - real-time data
     gcTime: 5 * 60 * 1000, // 5 minutes
     retry: 1,
-    refetchInterval: 30 * 1000, // Auto-refresh every 30 seconds
+    refetchInterval: isLive ? false : 30 * 1000, // Fallback auto-refresh every 30 seconds
     refetchOnMount: true, // ✅ FIX: Always fetch on mount to ensure data is loaded
     refetchOnWindowFocus: true, // ✅ FIX: Refetch when window gains focus
     placeholderData: (previousData) => previousData, // Keep previous data while loading
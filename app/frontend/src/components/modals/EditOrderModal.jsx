@@ -164,7 +164,7 @@ const EditOrderModal = ({ open, onClose, orderId, onOrderUpdated }) => {
 
   const loadProducts = async () => {
     try {
-      const response = await productService.getAll();
+      const response = await productService.getCatalog();
       if (response.success) {
         // Handle both array and object response
         const productData = Array.isArray(response.data)
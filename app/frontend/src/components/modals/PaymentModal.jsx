@@ -1224,31 +1224,34 @@ const PaymentModal = ({
             console.log('✅ Payment success:', result);
             
             // ✅ FIX: Sync payment status dari Midtrans sebelum reload
-            try {
-              // Use orderId prop or get order from qrisData.order_number
-              const orderIdToSync = orderId || (qrisData?.order_number ? await getOrderIdFromOrderNumber(qrisData.order_number) : null);
-              
-              if (orderIdToSync) {
-                const syncResult = await orderService.syncPaymentStatus(orderIdToSync);
-                console.log('🔄 Payment status synced:', syncResult);
-              } else if (qrisData?.payment_id) {
-                // Fallback: check payment status which will also update order
-                const API_BASE = process.env.REACT_APP_API_BASE_URL || 'http://localhost:8000/api';
-                const token = localStorage.getItem('token');
-                await fetch(
-                  `${API_BASE}/v1/orders/payment/${qrisData.payment_id}/status`,
-                  {
-                    headers: {
-                      'Authorization': `Bearer ${token}`,
-                      'X-Business-Id': localStorage.getItem('currentBusinessId'),
-                      'X-Outlet-Id': localStorage.getItem('currentOutletId'),
-                    },
-                  }
-                );
+            // (skipped when the status long-poll already confirmed the payment locally)
+            if (!result?.was_updated) {
+              try {
+                // Use orderId prop or get order from qrisData.order_number
+                const orderIdToSync = orderId || (qrisData?.order_number ? await getOrderIdFromOrderNumber(qrisData.order_number) : null);
+                
+                if (orderIdToSync) {
+                  const syncResult = await orderService.syncPaymentStatus(orderIdToSync);
+                  console.log('🔄 Payment status synced:', syncResult);
+                } else if (qrisData?.payment_id) {
+                  // Fallback: check payment status which will also update order
+                  const API_BASE = process.env.REACT_APP_API_BASE_URL || 'http://localhost:8000/api';
+                  const token = localStorage.getItem('token');
+                  await fetch(
+                    `${API_BASE}/v1/orders/payment/${qrisData.payment_id}/status`,
+                    {
+                      headers: {
+                        'Authorization': `Bearer ${token}`,
+                        'X-Business-Id': localStorage.getItem('currentBusinessId'),
+                        'X-Outlet-Id': localStorage.getItem('currentOutletId'),
+                      },
+                    }
+                  );
+                }
+              } catch (syncError) {
+                console.error('⚠️ Failed to sync payment status:', syncError);
+                // Continue anyway - webhook will update it later
               }
-            } catch (syncError) {
-              console.error('⚠️ Failed to sync payment status:', syncError);
-              // Continue anyway - webhook will update it later
             }
             
             // Close both modals
@@ -9,12 +9,12 @@ import {
   DialogTitle,
   DialogOverlay,
 } from '../ui/dialog';
-import { orderService } from '../../services/order.service';
+import { usePaymentStatus } from '../../hooks/usePaymentStatus';
 
 const MidtransPaymentModal = ({ open, onClose, qrisData, onPaymentSuccess }) => {
   const [paymentStatus, setPaymentStatus] = useState('pending'); // pending, checking, success, failed
   const [error, setError] = useState(null);
-  const [checkingInterval, setCheckingInterval] = useState(null);
+  const [watching, setWatching] = useState(false); // Long-poll payment status (usePaymentStatus)
   const snapInitialized = useRef(false);
 
   useEffect(() => {
@@ -77,101 +77,13 @@ const MidtransPaymentModal = ({ open, onClose, qrisData, onPaymentSuccess }) =>
         console.log('🚀 Opening Midtrans Snap payment popup...');
         try {
           window.snap.pay(qrisData.snap_token, {
-            onSuccess: async function(result) {
+            onSuccess: function(result) {
               console.log('✅ Payment success callback:', result);
               
               // ✅ FIX: Don't stop checking immediately - payment might still be pending in Midtrans
-              // Instead, start checking payment status to ensure it's settled
+              // The status long-poll returns as soon as the webhook (or one shared
+              // Midtrans status check) confirms the payment
               setPaymentStatus('checking');
-              
-              // ✅ FIX: Try to sync payment status immediately
-              try {
-                if (qrisData.payment_id) {
-                  const API_BASE = process.env.REACT_APP_API_BASE_URL || 'http://localhost:8000/api';
-                  const token = localStorage.getItem('token');
-                  
-                  // Check payment status - this endpoint will update order status if payment is settled
-                  const statusResponse = await fetch(
-                    `${API_BASE}/v1/orders/payment/${qrisData.payment_id}/status`,
-                    {
-                      headers: {
-                        'Authorization': `Bearer ${token}`,
-                        'X-Business-Id': localStorage.getItem('currentBusinessId'),
-                        'X-Outlet-Id': localStorage.getItem('currentOutletId'),
-                      },
-                    }
-                  );
-                  
-                  if (statusResponse.ok) {
-                    const statusData = await statusResponse.json();
-                    console.log('🔄 Payment status checked after success:', statusData);
-                    
-                    // If status was updated, great!
-                    if (statusData.data?.was_updated) {
-                      console.log('✅ Payment status was updated by backend!');
-                      setPaymentStatus('success');
-                      stopChecking();
-                      // ✅ FIX: Pass order data to callback untuk update UI tanpa reload
-                      setTimeout(() => {
-                        onPaymentSuccess && onPaymentSuccess({
-                          ...statusData.data,
-                          order: statusData.data.order,
-                          was_updated: true,
-                        });
-                        handleClose();
-                      }, 1500); // Reduced delay for faster UI update
-                      return;
-                    }
-                    
-                    // If payment is settled but not updated, try sync
-                    if (statusData.data?.transaction_status === 'settlement' || statusData.data?.transaction_status === 'capture' || statusData.data?.transaction_status === 'success') {
-                      console.log('⚠️ Payment is settled but not updated, trying sync...');
-                      if (qrisData.order_number) {
-                        // Try to sync via order sync endpoint
-                        const orderResponse = await fetch(
-                          `${API_BASE}/v1/orders?order_number=${qrisData.order_number}`,
-                          {
-                            headers: {
-                              'Authorization': `Bearer ${token}`,
-                              'X-Business-Id': localStorage.getItem('currentBusinessId'),
-                              'X-Outlet-Id': localStorage.getItem('currentOutletId'),
-                            },
-                          }
-                        );
-                        
-                        if (orderResponse.ok) {
-                          const orderData = await orderResponse.json();
-                          if (orderData.success && orderData.data && orderData.data.length > 0) {
-                            const order = orderData.data[0];
-                            const syncResult = await orderService.syncPaymentStatus(order.id);
-                            console.log('🔄 Payment status synced via order sync:', syncResult);
-                            
-                            if (syncResult.success) {
-                              setPaymentStatus('success');
-                              stopChecking();
-                              // ✅ FIX: Pass order data to callback untuk update UI tanpa reload
-                              setTimeout(() => {
-                                onPaymentSuccess && onPaymentSuccess({
-                                  ...syncResult.data,
-                                  order: syncResult.data?.order,
-                                  was_synced: true,
-                                });
-                                handleClose();
-                              }, 1500); // Reduced delay for faster UI update
-                              return;
-                            }
-                          }
-                        }
-                      }
-                    }
-                  }
-                }
-              } catch (syncError) {
-                console.error('⚠️ Failed to sync payment status:', syncError);
-              }
-              
-              // ✅ FIX: Start polling to check payment status (payment might still be pending)
-              // This will continue checking until payment is settled
               startCheckingPaymentStatus();
             },
             onPending: function(result) {
@@ -229,114 +141,38 @@ const MidtransPaymentModal = ({ open, onClose, qrisData, onPaymentSuccess }) =>
     }
   }, [open, qrisData]);
 
-  const startCheckingPaymentStatus = () => {
-    stopChecking(); // Clear any existing interval
-
-    const interval = setInterval(async () => {
-      try {
-        const response = await fetch(
-          `http://localhost:8000/api/v1/orders/payment/${qrisData.payment_id}/status`,
-          {
-            headers: {
-              'Authorization': `Bearer ${localStorage.getItem('token')}`,
-              'X-Business-Id': localStorage.getItem('currentBusinessId'),
-              'X-Outlet-Id': localStorage.getItem('currentOutletId'),
-            },
-          }
-        );
-
-        const result = await response.json();
-
-        if (result.success) {
-          const status = result.data.transaction_status;
+  // ✅ Payment status via long-poll instead of a 3 s interval + sync calls
+  const handlePaymentStatus = snapshot => {
+    if (snapshot.status === 'success') {
+      setPaymentStatus('success');
+      stopChecking();
+      // ✅ FIX: Pass order data to callback untuk update UI tanpa reload
+      setTimeout(() => {
+        onPaymentSuccess && onPaymentSuccess({
+          ...snapshot,
+          order: snapshot.order,
+          was_updated: true,
+        });
+        handleClose();
+      }, 1500); // Reduced delay for faster UI update
+    } else if (snapshot.status === 'failed' || snapshot.status === 'cancelled') {
+      setPaymentStatus('failed');
+      setError('Pembayaran gagal atau dibatalkan');
+      stopChecking();
+    }
+  };
 
-          // ✅ FIX: Handle 'capture' status as well
-          if (status === 'settlement' || status === 'capture' || status === 'success') {
-            // ✅ FIX: If status was updated by backend, great!
-            if (result.data.was_updated) {
-              console.log('✅ Payment and order status updated by backend!');
-              setPaymentStatus('success');
-              stopChecking();
-              // ✅ FIX: Pass order data to callback untuk update UI tanpa reload
-              setTimeout(() => {
-                onPaymentSuccess && onPaymentSuccess({
-                  ...result.data,
-                  order: result.data.order,
-                  was_updated: true,
-                });
-                handleClose();
-              }, 1500); // Reduced delay for faster UI update
-            } else {
-              // Payment is settled but not updated yet, try to sync
-              console.log('⚠️ Payment is settled but not updated, trying sync...');
-              try {
-                if (qrisData.order_number) {
-                  const API_BASE = process.env.REACT_APP_API_BASE_URL || 'http://localhost:8000/api';
-                  const token = localStorage.getItem('token');
-                  
-                  // Get order by order_number
-                  const orderResponse = await fetch(
-                    `${API_BASE}/v1/orders?order_number=${qrisData.order_number}`,
-                    {
-                      headers: {
-                        'Authorization': `Bearer ${token}`,
-                        'X-Business-Id': localStorage.getItem('currentBusinessId'),
-                        'X-Outlet-Id': localStorage.getItem('currentOutletId'),
-                      },
-                    }
-                  );
-                  
-                  if (orderResponse.ok) {
-                    const orderData = await orderResponse.json();
-                    if (orderData.success && orderData.data && orderData.data.length > 0) {
-                      const order = orderData.data[0];
-                      const syncResult = await orderService.syncPaymentStatus(order.id);
-                      console.log('🔄 Payment status synced via polling:', syncResult);
-                      
-                      if (syncResult.success) {
-                        setPaymentStatus('success');
-                        stopChecking();
-                        // ✅ FIX: Pass order data to callback untuk update UI tanpa reload
-                        setTimeout(() => {
-                          onPaymentSuccess && onPaymentSuccess({
-                            ...syncResult.data,
-                            order: syncResult.data?.order,
-                            was_synced: true,
-                          });
-                          handleClose();
-                        }, 1500); // Reduced delay for faster UI update
-                      } else {
-                        // Sync failed, continue polling
-                        console.log('⚠️ Sync failed, will continue polling...');
-                      }
-                    }
-                  }
-                }
-              } catch (syncError) {
-                console.error('⚠️ Failed to sync during polling:', syncError);
-                // Continue polling
-              }
-            }
-          } else if (status === 'failed' || status === 'cancel' || status === 'deny' || status === 'expire') {
-            setPaymentStatus('failed');
-            setError('Pembayaran gagal atau dibatalkan');
-            stopChecking();
-          }
-          // ✅ FIX: If status is 'pending', continue polling
-        }
-      } catch (error) {
-        console.error('Error checking payment status:', error);
-      }
-    }, 3000); // Check every 3 seconds
+  usePaymentStatus(qrisData?.payment_id, {
+    enabled: open && watching,
+    onChange: handlePaymentStatus,
+  });
 
-    setCheckingInterval(interval);
+  const startCheckingPaymentStatus = () => {
+    setWatching(true);
   };
 
   const stopChecking = () => {
-    if (checkingInterval) {
-      clearInterval(checkingInterval);
-      setCheckingInterval(null);
-    }
+    setWatching(false);
   };
 
   const handleClose = () => {
@@ -427,6 +263,9 @@ const MidtransPaymentModal = ({ open, onClose, qrisData, onPaymentSuccess }) =>
           // Skip if it's the Midtrans popup itself (has higher z-index)
           if (zIndex > 1000) return;
           
+          // Already patched: skip, so our own style writes don't re-trigger the observer
+          if (overlay.hasAttribute('data-midtrans-overlay') && overlay.style.pointerEvents === 'none') return;
+          
           // ALWAYS set to pointer-events: none when modal is open
           if (paymentStatus === 'pending' || paymentStatus === 'success') {
             overlay.style.setProperty('pointer-events', 'none', 'important');
@@ -445,12 +284,16 @@ const MidtransPaymentModal = ({ open, onClose, qrisData, onPaymentSuccess }) =>
       setTimeout(updateOverlay, 500);
       setTimeout(updateOverlay, 1000);
       
-      // Keep checking every 50ms to ensure overlay stays non-blocking
-      const overlayCheckInterval = setInterval(updateOverlay, 50);
-      
       // Use MutationObserver to detect when Midtrans popup is added to DOM
+      // ✅ Replaces the 50ms polling interval; bursts of mutations are coalesced
+      // into one overlay update per animation frame
+      let frame = null;
       const observer = new MutationObserver(() => {
-        updateOverlay();
+        if (frame) return;
+        frame = requestAnimationFrame(() => {
+          frame = null;
+          updateOverlay();
+        });
       });
       
       observer.observe(document.body, {
@@ -461,8 +304,8 @@ const MidtransPaymentModal = ({ open, onClose, qrisData, onPaymentSuccess }) =>
       });
       
       return () => {
-        clearInterval(overlayCheckInterval);
         observer.disconnect();
+        if (frame) cancelAnimationFrame(frame);
         
         // Remove global CSS style
         if (styleElement && styleElement.parentNode) {
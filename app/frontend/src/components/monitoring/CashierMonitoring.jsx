@@ -24,6 +24,7 @@ import * as XLSX from 'xlsx';
 import 'jspdf-autotable';
 import { queryKeys } from '../../config/reactQuery';
 import { useAuth } from '../../contexts/AuthContext';
+import { useOrderStream } from '../../hooks/useOrderStream';
 import { shiftService } from '../../services/shift.service';
 // ✅ REMOVED: useKeyboardRefresh - using direct event listener like dashboard
 import { Badge } from '../ui/badge';
@@ -145,6 +146,12 @@ const CashierMonitoring = () => {
   const { user, currentOutlet } = useAuth();
   const { toast } = useToast();
 
+  // ✅ Real-time: new/paid orders update shift totals, refetch on order events
+  const { isLive } = useOrderStream(() => refetchCashiers(), {
+    enabled: Boolean(currentOutlet),
+    outletId: currentOutlet?.id,
+  });
+
   // Fetch active cashiers with React Query
   const {
     data: activeCashiers = [],
@@ -172,7 +179,7 @@ const CashierMonitoring = () => {
     staleTime: 30 * 1000, // ✅ 30 seconds - real-time data
     gcTime: 5 * 60 * 1000, // ✅ 5 minutes
     retry: 1,
-    refetchInterval: 30 * 1000, // ✅ Auto-refresh every 30 seconds
+    refetchInterval: isLive ? false : 30 * 1000, // ✅ Fallback auto-refresh every 30 seconds
     refetchOnMount: false, // ✅ Don't refetch if data is fresh
     placeholderData: (previousData) => previousData, // ✅ Keep previous data during refetch
   });
@@ -30,6 +30,7 @@ import { useNavigate } from 'react-router-dom';
 import { queryKeys } from '../../config/reactQuery';
 import { useAuth } from '../../contexts/AuthContext';
 import { useToast } from '../../hooks/use-toast';
+import { useOrderStream } from '../../hooks/useOrderStream';
 import outletService from '../../services/outlet.service';
 import selfServiceApi from '../../services/selfServiceApi';
 import { debugAuth, forceReloadOutlets } from '../../utils/debugAuth';
@@ -231,6 +232,17 @@ function SelfServiceOrder() {
     return dateParams;
   }, [isOwnerOrAdmin, dateRange, customDateRange.start, customDateRange.end]);
 
+  // ✅ Real-time: self-service orders arrive as order events, refetch instead of polling
+  const { isLive } = useOrderStream(
+    () => {
+      refetchStats();
+      if (selectedTab === 'orders') {
+        refetchOrders();
+      }
+    },
+    { enabled: Boolean(currentOutlet), outletId: currentOutlet?.id }
+  );
+
   // ✅ REACT QUERY: Fetch Stats
   const {
     data: statsData,
@@ -249,7 +261,7 @@ function SelfServiceOrder() {
     retry: 1,
     refetchOnMount: true,
     refetchOnWindowFocus: true, // Refetch when window gains focus
-    refetchInterval: 30000, // Auto-refetch stats every 30 seconds
+    refetchInterval: isLive ? false : 30000, // Fallback auto-refetch stats every 30 seconds
     placeholderData: previousData => previousData || {},
   });
 
@@ -310,7 +322,7 @@ function SelfServiceOrder() {
     retry: 1,
     refetchOnMount: true,
     refetchOnWindowFocus: true, // Refetch when window gains focus
-    refetchInterval: selectedTab === 'orders' ? 30000 : false, // Auto-refetch every 30s when orders tab is active
+    refetchInterval: selectedTab === 'orders' && !isLive ? 30000 : false, // Fallback auto-refetch every 30s when orders tab is active
     placeholderData: previousData =>
       previousData || { orders: [], total: 0, last_page: 1, current_page: 1 },
   });
@@ -29,6 +29,9 @@ import { shiftService } from '../../services/shift.service';
 import offlineService from '../../services/offlineService';
 import { debounce } from '../../utils/performance';
 import { retryNetworkErrors } from '../../utils/retry.utils';
+import { buildSkuIndex, findBySku } from '../../utils/skuIndex.utils';
+import { pageFromCatalog } from '../../utils/catalogPage.utils';
+import { createClientUuid } from '../../utils/clientUuid.utils';
 import CustomerSelectModal from '../modals/CustomerSelectModal';
 import PaymentModal from '../modals/PaymentModal';
 import PrintReceiptModal from '../modals/PrintReceiptModal';
@@ -179,6 +182,7 @@ const CashierPOS = () => {
   const [scanMode, setScanMode] = useState(false);
   const [barcodeInput, setBarcodeInput] = useState('');
   const scanInputRef = useRef(null);
+  const skuIndexRef = useRef(null); // SKU/barcode map of the POS catalog (see loadSkuIndex)
 
   // Held orders
   const [heldOrders, setHeldOrders] = useState([]);
@@ -293,78 +297,29 @@ const CashierPOS = () => {
         shiftResult = { status: 'rejected', reason: error };
       }
 
-      // ✅ OPTIMIZED: Load products first (visible data priority) then categories
+      // ✅ OPTIMIZED: Products from the versioned POS catalog (full list once,
+      // afterwards only the delta), categories in background (less critical)
       const loadInitialDataPromise = async () => {
-        try {
-          const params = {
-            page: currentPage,
-            per_page: itemsPerPage,
-            category: selectedCategory !== 'all' ? selectedCategory : undefined,
-            search: searchTerm || undefined,
-            sort_field: sortBy,
-            sort_direction: sortOrder,
-            outlet_id: currentOutlet?.id,
-          };
-
-          const result = await productService.getInitialData(params, true);
-          
-          if (result.success && result.data) {
-            // Extract products and categories from combined response
-            const productsData = result.data.products || result.data;
-            const categoriesData = result.data.categories || [];
-
-            // ✅ PRIORITY 1: Set products FIRST (visible data) - instant UI update
-            const productArray = Array.isArray(productsData)
-              ? productsData
-              : productsData?.data || productsData?.products || [];
-
-            if (productArray.length > 0) {
-              setProducts(productArray);
-              setLoading(false); // ✅ Stop loading once products are visible
-              if (productsData?.pagination) {
-                setTotalProducts(productsData.pagination.total || productArray.length);
-              } else {
-                setTotalProducts(productArray.length);
-              }
-            }
-
-            // ✅ PRIORITY 2: Set categories AFTER products (less critical, can appear slightly later)
-            if (categoriesData.length > 0) {
-              const categoryArray = Array.isArray(categoriesData) ? categoriesData : [];
-              setCategories([{ id: 'all', name: 'Semua' }, ...categoryArray]);
-            }
+        retryNetworkErrors(() => loadCategories(), {
+          maxRetries: 3,
+          initialDelay: 1000,
+        }).catch(err => {
+          // Silent fail for categories - not critical
+          console.debug('Categories load failed (non-critical):', err);
+          setCategories([{ id: 'all', name: 'Semua' }]); // Set default
+        });
 
-            return { success: true, fromInitialData: true };
-          }
-          
-          // Fallback to separate calls if initial data fails
-          throw new Error('Initial data failed, falling back to separate calls');
+        try {
+          await retryNetworkErrors(() => loadProducts(currentPage), {
+            maxRetries: 3,
+            initialDelay: 1000,
+          });
         } catch (error) {
-          console.warn('⚠️ Initial data endpoint failed, using separate calls:', error);
-          // ✅ OPTIMIZED: Load products FIRST (priority), then categories
-          try {
-            // Priority 1: Load products first (visible data)
-            const productsResult = await retryNetworkErrors(() => loadProducts(currentPage), {
-              maxRetries: 3,
-              initialDelay: 1000,
-            });
-            setLoading(false); // Stop loading once products are loaded
-            
-            // Priority 2: Load categories in background (less critical)
-            retryNetworkErrors(() => loadCategories(), {
-              maxRetries: 3,
-              initialDelay: 1000,
-            }).catch(err => {
-              // Silent fail for categories - not critical
-              console.debug('Categories load failed (non-critical):', err);
-              setCategories([{ id: 'all', name: 'Semua' }]); // Set default
-            });
-          } catch (error) {
-            console.error('Failed to load products:', error);
-            setLoading(false);
-          }
-          return { success: true, fromInitialData: false };
+          console.error('Failed to load products:', error);
+        } finally {
+          setLoading(false); // Stop loading once products are loaded
         }
+        return { success: true };
       };
 
       // ✅ OPTIMIZATION: Load other data in parallel dengan retry logic
@@ -659,13 +614,21 @@ const CashierPOS = () => {
 
   const loadProducts = async (page = 1, retryCount = 0) => {
     const maxRetries = 2;
+
+    // ✅ Browsing (no search term): page through the cached catalog kept current
+    // with the delta sync, instead of fetching every page from the server.
+    // Searches still go to the server, which ranks them with the search index.
+    if (!searchTerm) {
+      return loadCatalogPage(page);
+    }
+
     try {
       const params = {
         page: page,
         per_page: itemsPerPage,
         category: selectedCategory !== 'all' ? selectedCategory : undefined,
         search: searchTerm || undefined,
-        sort_field: sortBy,
+        sort_field: searchTerm ? 'relevance' : sortBy, // ✅ Search results ranked by relevance
         sort_direction: sortOrder,
       };
 
@@ -745,6 +708,29 @@ const CashierPOS = () => {
     }
   };
 
+  const loadCatalogPage = async page => {
+    const result = await productService.getCatalog();
+
+    if (!result.success || !Array.isArray(result.data)) {
+      return { success: false, error: result.error || result.message };
+    }
+
+    // Keep the scan index in step with the catalog that was just synced
+    skuIndexRef.current = buildSkuIndex(result.data);
+
+    const { data, total } = pageFromCatalog(result.data, {
+      page,
+      perPage: itemsPerPage,
+      category: selectedCategory,
+      sortBy,
+      sortOrder,
+    });
+
+    setProducts(data);
+    setTotalProducts(total);
+    return { success: true, productsCount: data.length };
+  };
+
   // Handle refresh - ringan seperti EmployeeManagement
   const handleRefresh = async () => {
     setRefreshingData(true);
@@ -873,15 +859,16 @@ const CashierPOS = () => {
     loadProducts(page);
     
     // ✅ NEW: Prefetch next page in background for faster browsing
+    // (browsing pages come from the local catalog, only search pages need it)
     const totalPages = Math.ceil(totalProducts / itemsPerPage);
-    if (page < totalPages) {
+    if (searchTerm && page < totalPages) {
       // Prefetch next page quietly
       const nextPageParams = {
         page: page + 1,
         per_page: itemsPerPage,
         category: selectedCategory !== 'all' ? selectedCategory : undefined,
         search: searchTerm || undefined,
-        sort_field: sortBy,
+        sort_field: searchTerm ? 'relevance' : sortBy, // ✅ Search results ranked by relevance
         sort_direction: sortOrder,
         outlet_id: currentOutlet?.id,
       };
@@ -979,58 +966,74 @@ const CashierPOS = () => {
   const getTotalAmount = () => calculateTotal();
 
   // Cart Management
-  // Handle barcode scan
-  const handleBarcodeScan = async (barcode) => {
-    if (!barcode || !barcode.trim()) return;
+  // ✅ Barcode scan: SKU/barcode map built from the cached POS catalog, so scans
+  // resolve in memory (also offline). Codes missing from the map fall back to the
+  // exact lookup endpoint instead of the LIKE product search
+  // (skuIndexRef is declared with the scanner state and also refreshed by loadCatalogPage).
+  const loadSkuIndex = async () => {
+    const result = await productService.getCatalog();
+    if (result.success && Array.isArray(result.data)) {
+      skuIndexRef.current = buildSkuIndex(result.data);
+    }
+  };
 
-    try {
-      // Search product by barcode/SKU
-      const result = await productService.getAll({
-        search: barcode.trim(),
-        per_page: 10,
-      });
+  useEffect(() => {
+    if (scanMode && currentBusiness) {
+      loadSkuIndex();
+    }
+  }, [scanMode, currentBusiness]);
 
-      if (result.success) {
-        const productData = Array.isArray(result.data)
-          ? result.data
-          : result.data?.data || result.data?.products || [];
+  const resetScanInput = () => {
+    setBarcodeInput('');
 
-        // Find exact match by SKU or barcode
-        const foundProduct = productData.find(
-          (p) =>
-            p.sku?.toLowerCase() === barcode.trim().toLowerCase() ||
-            p.barcode?.toLowerCase() === barcode.trim().toLowerCase() ||
-            p.name?.toLowerCase().includes(barcode.trim().toLowerCase())
-        );
+    // Auto focus kembali untuk scan berikutnya
+    if (scanInputRef.current) {
+      setTimeout(() => {
+        scanInputRef.current?.focus();
+      }, 100);
+    }
+  };
 
-        if (foundProduct) {
-          // ✅ FIX: Check stock only for tracked products
-          const isUnlimited = foundProduct.stock_type === 'untracked';
-          if (!isUnlimited && (foundProduct.stock === null || foundProduct.stock === undefined || foundProduct.stock <= 0)) {
-            toast.error(`⚠️ ${foundProduct.name} stok habis. Tidak bisa dipilih.`);
-            return;
-          }
+  // Handle barcode scan
+  const handleBarcodeScan = async (barcode) => {
+    const code = barcode?.trim();
+    if (!code) return;
 
-          // Add to cart
-          addToCart(foundProduct);
-          
-          // Clear barcode input
-          setBarcodeInput('');
-          
-          // Auto focus kembali untuk scan berikutnya
-          if (scanInputRef.current) {
-            setTimeout(() => {
-              scanInputRef.current?.focus();
-            }, 100);
-          }
-        } else {
-          toast.error(`Produk dengan barcode "${barcode}" tidak ditemukan`);
+    try {
+      let foundProduct = findBySku(skuIndexRef.current, code)?.product;
+
+      if (!foundProduct && isOnline()) {
+        const result = await productService.lookup(code);
+        if (result.success) {
+          foundProduct = result.data;
+          // Catalog changed since the map was built (new SKU/barcode)
+          loadSkuIndex();
+        } else if (!result.notFound) {
+          toast.error('Gagal mencari produk');
           setBarcodeInput('');
+          return;
         }
-      } else {
-        toast.error('Gagal mencari produk');
+      }
+
+      if (!foundProduct) {
+        toast.error(`Produk dengan barcode "${barcode}" tidak ditemukan`);
         setBarcodeInput('');
+        return;
       }
+
+      // Prefer the row shown in the grid (freshest stock)
+      foundProduct = products.find(p => p.id === foundProduct.id) || foundProduct;
+
+      // ✅ FIX: Check stock only for tracked products
+      const isUnlimited = foundProduct.stock_type === 'untracked';
+      if (!isUnlimited && (foundProduct.stock === null || foundProduct.stock === undefined || foundProduct.stock <= 0)) {
+        toast.error(`⚠️ ${foundProduct.name} stok habis. Tidak bisa dipilih.`);
+        return;
+      }
+
+      // Add to cart
+      addToCart(foundProduct);
+      resetScanInput();
     } catch (error) {
       console.error('Error scanning barcode:', error);
       toast.error('Terjadi kesalahan saat scan barcode');
@@ -1218,6 +1221,9 @@ const CashierPOS = () => {
       deferred_payment: deferredPayment,
       // Tambahkan queue number jika ada
       queue_number: queueNumber.trim() || null,
+      // ✅ Idempotency key: a retry or an offline replay never creates the order twice
+      client_uuid: createClientUuid(),
+      ordered_at: new Date().toISOString(),
     };
 
     console.log('💳 Creating order:', orderData);
@@ -37,6 +37,8 @@ export const API_CONFIG = {
     // Products
     PRODUCTS: {
       LIST: '/v1/products',
+      SYNC: '/v1/products/sync', // POS catalog delta (?since=version)
+      LOOKUP: '/v1/products/lookup', // Exact barcode/SKU scan (?code=)
       CREATE: '/v1/products',
       DETAIL: id => `/v1/products/${id}`,
       UPDATE: id => `/v1/products/${id}`,
@@ -58,6 +60,7 @@ export const API_CONFIG = {
     ORDERS: {
       LIST: '/v1/orders',
       CREATE: '/v1/orders',
+      BATCH: '/v1/orders/batch',
       DETAIL: id => `/v1/orders/${id}`,
       UPDATE: id => `/v1/orders/${id}`,
       DELETE: id => `/v1/orders/${id}`,
@@ -1,4 +1,5 @@
 import Dexie from 'dexie';
+import { createClientUuid } from '../utils/clientUuid.utils';
 
 /**
  * IndexedDB configuration menggunakan Dexie
@@ -136,9 +137,14 @@ export const customerCache = {
 
 export const transactionQueue = {
   // Add transaction to queue
+  // client_uuid is the idempotency key: the server creates the order only once, however often it is sent
   async add(orderData) {
     return await db.pendingTransactions.add({
-      order_data: orderData,
+      order_data: {
+        ...orderData,
+        client_uuid: orderData.client_uuid || createClientUuid(),
+        ordered_at: orderData.ordered_at || new Date().toISOString(),
+      },
       status: 'pending', // pending, syncing, synced, failed
       created_at: new Date(),
       synced_at: null,
@@ -160,6 +166,33 @@ export const transactionQueue = {
     });
   },
 
+  // Mark a batch as syncing (entries queued before client_uuid existed get one, stored before sending)
+  async markBatchSyncing(transactions) {
+    return await db.transaction('rw', db.pendingTransactions, async () => {
+      for (const transaction of transactions) {
+        if (!transaction.order_data.client_uuid) {
+          transaction.order_data = {
+            ...transaction.order_data,
+            client_uuid: createClientUuid(),
+          };
+        }
+        await db.pendingTransactions.update(transaction.id, {
+          status: 'syncing',
+          order_data: transaction.order_data,
+        });
+      }
+    });
+  },
+
+  // Back to pending (batch request failed, or a sync interrupted by closing the app)
+  // Safe to resend: orders already created come back as duplicates
+  async resetSyncing() {
+    return await db.pendingTransactions
+      .where('status')
+      .equals('syncing')
+      .modify({ status: 'pending' });
+  },
+
   // Mark as synced
   async markSynced(id) {
     return await db.pendingTransactions.update(id, {
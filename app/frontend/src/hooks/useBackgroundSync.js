@@ -3,6 +3,9 @@ import toast from 'react-hot-toast';
 import { transactionQueue, isOnline } from '../db/indexedDB';
 import { orderService } from '../services/order.service';
 
+// Orders sent per sync request (the server accepts up to 500)
+const SYNC_BATCH_SIZE = 100;
+
 /**
  * Custom hook untuk background sync transactions
  * Auto-retry pending transactions saat online
@@ -26,6 +29,9 @@ const useBackgroundSync = (enabled = true) => {
     }
 
     setIsSyncing(true);
+
+    // Entries left in 'syncing' by an interrupted sync are resent (duplicates are detected server-side)
+    await transactionQueue.resetSyncing();
     const pending = await transactionQueue.getPending();
 
     if (pending.length === 0) {
@@ -39,40 +45,47 @@ const useBackgroundSync = (enabled = true) => {
     let successCount = 0;
     let failCount = 0;
 
-    for (let i = 0; i < pending.length; i++) {
-      const transaction = pending[i];
-      setSyncProgress({ total: pending.length, current: i + 1 });
+    // ✅ PERF: one request (one transaction per chunk server-side) per SYNC_BATCH_SIZE orders
+    for (let start = 0; start < pending.length; start += SYNC_BATCH_SIZE) {
+      const batch = pending.slice(start, start + SYNC_BATCH_SIZE);
+
+      await transactionQueue.markBatchSyncing(batch);
+
+      const result = await orderService.createBatch(
+        batch.map(transaction => transaction.order_data)
+      );
+
+      if (!result.success) {
+        // Network / server error: keep the whole batch pending for the next round
+        await transactionQueue.resetSyncing();
+        console.error('❌ Batch sync failed, will retry:', result.error);
+        break;
+      }
 
-      try {
-        // Mark as syncing
-        await transactionQueue.markSyncing(transaction.id);
+      const results = result.data?.data?.results ?? [];
+      const byUuid = new Map(results.map(entry => [entry.client_uuid, entry]));
 
-        // Submit to backend
-        const result = await orderService.create(transaction.order_data);
+      for (const transaction of batch) {
+        const entry = byUuid.get(transaction.order_data.client_uuid);
 
-        if (result.success) {
-          // Mark as synced
+        if (entry && entry.status !== 'failed') {
+          // created, or duplicate (already synced by an earlier attempt)
           await transactionQueue.markSynced(transaction.id);
           successCount++;
-          console.log(`✅ Transaction ${transaction.id} synced successfully`);
         } else {
-          // Mark as failed
           await transactionQueue.markFailed(
             transaction.id,
-            result.error || 'Unknown error'
+            entry?.error || 'Unknown error'
           );
           failCount++;
-          console.error(`❌ Transaction ${transaction.id} failed:`, result.error);
+          console.error(`❌ Transaction ${transaction.id} failed:`, entry?.error);
         }
-      } catch (error) {
-        // Mark as failed
-        await transactionQueue.markFailed(transaction.id, error.message);
-        failCount++;
-        console.error(`❌ Transaction ${transaction.id} error:`, error);
       }
 
-      // Small delay between requests
-      await new Promise(resolve => setTimeout(resolve, 100));
+      setSyncProgress({
+        total: pending.length,
+        current: Math.min(start + SYNC_BATCH_SIZE, pending.length),
+      });
     }
 
     // Update pending count
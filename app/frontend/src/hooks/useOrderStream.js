@@ -0,0 +1,190 @@
+// src/hooks/useOrderStream.js
+// ✅ Real-time order events for kitchen/waiter/kasir screens.
+// Connects to the SSE stream (/v1/order-stream) and falls back to cheap
+// cursor polling (/v1/order-stream/events?since=) when streaming is unavailable.
+import { useEffect, useRef, useState } from 'react';
+import { API_CONFIG } from '../config/api.config';
+import apiClient from '../utils/apiClient';
+
+const STREAM_PATH = '/v1/order-stream';
+const POLL_INTERVAL = 5000; // Fallback polling interval (events endpoint is a cursor lookup)
+const MAX_STREAM_FAILURES = 3; // Switch to polling after this many failed connects
+const EVENT_BATCH_DELAY = 300; // Coalesce bursts of events into a single callback
+
+const getStreamHeaders = () => {
+  const headers = { Accept: 'text/event-stream' };
+  const token = localStorage.getItem('token');
+  const businessId = localStorage.getItem('currentBusinessId');
+  const outletId = localStorage.getItem('currentOutletId');
+
+  if (token) headers.Authorization = `Bearer ${token}`;
+  if (businessId) headers['X-Business-Id'] = businessId;
+  if (outletId) headers['X-Outlet-Id'] = outletId;
+
+  return headers;
+};
+
+// Parse one SSE message block ("id: ..\nevent: ..\ndata: ..")
+const parseMessage = raw => {
+  const message = { id: null, event: 'message', data: '' };
+  raw.split('\n').forEach(line => {
+    if (!line || line.startsWith(':')) return; // comment / heartbeat
+    const index = line.indexOf(':');
+    const field = index === -1 ? line : line.slice(0, index);
+    const value = index === -1 ? '' : line.slice(index + 1).trimStart();
+    if (field === 'id') message.id = value;
+    if (field === 'event') message.event = value;
+    if (field === 'data') message.data += value;
+  });
+
+  if (!message.data) return null;
+
+  try {
+    return { ...message, data: JSON.parse(message.data) };
+  } catch (error) {
+    return null;
+  }
+};
+
+/**
+ * Subscribe to order events of the current outlet.
+ *
+ * @param {Function} onEvents called with an array of events ({ event, order_id, data })
+ *   - an event named 'reset' means the cursor expired and everything should be refetched
+ * @param {Object} options { enabled, outletId } - outletId re-subscribes when the outlet changes
+ * @returns {{ mode: 'idle'|'stream'|'polling', isLive: boolean }}
+ */
+export const useOrderStream = (onEvents, { enabled = true, outletId } = {}) => {
+  const [mode, setMode] = useState('idle');
+  const onEventsRef = useRef(onEvents);
+
+  useEffect(() => {
+    onEventsRef.current = onEvents;
+  }, [onEvents]);
+
+  useEffect(() => {
+    if (!enabled || !outletId) {
+      setMode('idle');
+      return undefined;
+    }
+
+    let stopped = false;
+    let cursor = 0;
+    let failures = 0;
+    let controller = null;
+    let pollTimer = null;
+    let retryTimer = null;
+    let batchTimer = null;
+    let pending = [];
+
+    const emit = events => {
+      if (!events.length) return;
+      pending = pending.concat(events);
+      if (batchTimer) return;
+      batchTimer = setTimeout(() => {
+        const batch = pending;
+        pending = [];
+        batchTimer = null;
+        if (!stopped) onEventsRef.current?.(batch);
+      }, EVENT_BATCH_DELAY);
+    };
+
+    const poll = async () => {
+      if (stopped) return;
+      try {
+        const response = await apiClient.get(`${STREAM_PATH}/events`, {
+          params: { since: cursor },
+        });
+        const body = response.data || {};
+        if (body.reset) emit([{ event: 'reset' }]);
+        emit(body.data || []);
+        cursor = body.cursor ?? cursor;
+      } catch (error) {
+        // Ignore and retry on the next tick
+      }
+      if (!stopped) pollTimer = setTimeout(poll, POLL_INTERVAL);
+    };
+
+    const startPolling = () => {
+      setMode('polling');
+      poll();
+    };
+
+    const connect = async () => {
+      if (stopped) return;
+      controller = new AbortController();
+
+      try {
+        const query = cursor > 0 ? `?since=${cursor}` : '';
+
+        const response = await fetch(`${API_CONFIG.BASE_URL}${STREAM_PATH}${query}`, {
+          headers: getStreamHeaders(),
+          credentials: 'include',
+          signal: controller.signal,
+        });
+
+        if (!response.ok || !response.body) {
+          throw new Error(`Order stream unavailable (${response.status})`);
+        }
+
+        setMode('stream');
+        failures = 0;
+
+        const reader = response.body.getReader();
+        const decoder = new TextDecoder();
+        let buffer = '';
+
+        while (!stopped) {
+          const { value, done } = await reader.read();
+          if (done) break;
+
+          buffer += decoder.decode(value, { stream: true });
+          let separator = buffer.indexOf('\n\n');
+          while (separator !== -1) {
+            const message = parseMessage(buffer.slice(0, separator));
+            buffer = buffer.slice(separator + 2);
+            separator = buffer.indexOf('\n\n');
+
+            if (!message) continue;
+            if (message.event === 'ready') {
+              cursor = Math.max(cursor, Number(message.data.cursor) || 0);
+              continue;
+            }
+            if (message.id) cursor = Number(message.id);
+            emit([message.data]);
+          }
+        }
+
+        // Server closes the stream periodically: resume from the last cursor
+        if (!stopped) connect();
+      } catch (error) {
+        if (stopped || error.name === 'AbortError') return;
+
+        failures += 1;
+        if (failures >= MAX_STREAM_FAILURES) {
+          startPolling();
+        } else {
+          retryTimer = setTimeout(connect, 3000 * failures);
+        }
+      }
+    };
+
+    if (typeof window !== 'undefined' && window.ReadableStream && window.fetch) {
+      connect();
+    } else {
+      startPolling();
+    }
+
+    return () => {
+      stopped = true;
+      controller?.abort();
+      clearTimeout(pollTimer);
+      clearTimeout(retryTimer);
+      clearTimeout(batchTimer);
+    };
+  }, [enabled, outletId]);
+
+  return { mode, isLive: mode !== 'idle' };
+};
+
+export default useOrderStream;
@@ -0,0 +1,91 @@
+// src/hooks/usePaymentStatus.js
+// ✅ Waits for a Midtrans payment to settle without tight polling.
+// Long-polls /v1/orders/payment/{id}/wait: the server holds the request until
+// the webhook pipeline changes the payment (or ~25 s pass) and asks Midtrans
+// itself at most once per payment per check interval.
+import { useEffect, useRef, useState } from 'react';
+import { API_CONFIG } from '../config/api.config';
+
+const WAIT_SECONDS = 25;
+const RETRY_DELAY = 3000; // Network error / server restart
+const FINAL_STATUSES = ['success', 'failed', 'cancelled'];
+const STOP_HTTP_STATUSES = [401, 403, 404];
+
+const getHeaders = () => {
+  const headers = { Accept: 'application/json' };
+  const token = localStorage.getItem('token');
+  const businessId = localStorage.getItem('currentBusinessId');
+  const outletId = localStorage.getItem('currentOutletId');
+
+  if (token) headers.Authorization = `Bearer ${token}`;
+  if (businessId) headers['X-Business-Id'] = businessId;
+  if (outletId) headers['X-Outlet-Id'] = outletId;
+
+  return headers;
+};
+
+/**
+ * Watch the status of one payment.
+ *
+ * @param {number|string} paymentId
+ * @param {Object} options { enabled, onChange } - onChange receives every status
+ *   snapshot ({ status, transaction_status, order, version, ... })
+ * @returns {{ status: Object|null }}
+ */
+export const usePaymentStatus = (paymentId, { enabled = true, onChange } = {}) => {
+  const [status, setStatus] = useState(null);
+  const onChangeRef = useRef(onChange);
+
+  useEffect(() => {
+    onChangeRef.current = onChange;
+  }, [onChange]);
+
+  useEffect(() => {
+    if (!enabled || !paymentId) return undefined;
+
+    let stopped = false;
+    let version = 0;
+    let controller = null;
+    let retryTimer = null;
+
+    const wait = async () => {
+      if (stopped) return;
+      controller = new AbortController();
+
+      try {
+        const response = await fetch(
+          `${API_CONFIG.BASE_URL}/v1/orders/payment/${paymentId}/wait?since=${version}&timeout=${WAIT_SECONDS}`,
+          { headers: getHeaders(), credentials: 'include', signal: controller.signal }
+        );
+
+        if (STOP_HTTP_STATUSES.includes(response.status)) return;
+        if (!response.ok) throw new Error(`Payment status unavailable (${response.status})`);
+
+        const body = await response.json();
+        const snapshot = body.data || {};
+        if (stopped) return;
+
+        version = snapshot.version ?? version;
+        setStatus(snapshot);
+        onChangeRef.current?.(snapshot);
+
+        if (!FINAL_STATUSES.includes(snapshot.status)) wait();
+      } catch (error) {
+        if (stopped || error.name === 'AbortError') return;
+        retryTimer = setTimeout(wait, RETRY_DELAY);
+      }
+    };
+
+    wait();
+
+    return () => {
+      stopped = true;
+      controller?.abort();
+      clearTimeout(retryTimer);
+    };
+  }, [paymentId, enabled]);
+
+  return { status };
+};
+
+export default usePaymentStatus;
@@ -40,6 +40,19 @@ export const orderService = {
     }
   },
 
+  // Sync orders queued offline; every order carries its client_uuid (idempotency key)
+  createBatch: async orders => {
+    try {
+      const response = await apiClient.post(
+        API_CONFIG.ENDPOINTS.ORDERS.BATCH,
+        { orders }
+      );
+      return { success: true, data: response.data };
+    } catch (error) {
+      return handleApiError(error);
+    }
+  },
+
   processPayment: async (orderId, paymentData) => {
     try {
       const response = await apiClient.post(
@@ -15,6 +15,26 @@ import { handleApiError } from '../utils/errorHandler';
 // Cache TTL untuk products dan categories (5 menit)
 const PRODUCT_CACHE_TTL = 5 * 60 * 1000;
 
+// Versioned POS catalog is revalidated with ?since=version, so it can live longer
+const CATALOG_CACHE_TTL = 24 * 60 * 60 * 1000;
+
+// Apply a catalog delta ({ products, stock, removed }) to a cached catalog
+const applyCatalogDelta = (catalog, delta) => {
+  const changed = new Map((delta.products || []).map(product => [product.id, product]));
+  const removed = new Set(delta.removed || []);
+  const stock = delta.stock || {};
+
+  const products = catalog.products
+    .filter(product => !removed.has(product.id) && !changed.has(product.id))
+    .map(product =>
+      stock[product.id] !== undefined ? { ...product, stock: stock[product.id] } : product
+    )
+    .concat(Array.from(changed.values()))
+    .sort((a, b) => (a.name || '').localeCompare(b.name || ''));
+
+  return { version: delta.version, products };
+};
+
 export const productService = {
   // Combined endpoint untuk initial load - return products + categories sekaligus
   getInitialData: async (params, useCache = true) => {
@@ -93,6 +113,69 @@ export const productService = {
     }
   },
 
+  // ✅ Versioned POS catalog: full list once, afterwards only changed
+  // prices/availability and a small stock delta (GET /products/sync?since=)
+  getCatalog: async () => {
+    const businessId = localStorage.getItem('currentBusinessId') || 'none';
+    const cacheKey = `${CACHE_KEYS.PRODUCTS}_catalog_${businessId}`;
+    const cached = getCache(cacheKey, CATALOG_CACHE_TTL)?.data;
+
+    try {
+      if (cached?.version) {
+        const { data: delta } = await apiClient.get(
+          API_CONFIG.ENDPOINTS.PRODUCTS.SYNC,
+          { params: { since: cached.version } }
+        );
+
+        if (!delta.reset) {
+          const catalog =
+            delta.version === cached.version ? cached : applyCatalogDelta(cached, delta);
+          if (catalog !== cached) {
+            setCache(cacheKey, catalog, CATALOG_CACHE_TTL);
+          }
+          return { success: true, data: catalog.products };
+        }
+      }
+
+      // No (usable) version yet: load the full catalog
+      const response = await apiClient.get(API_CONFIG.ENDPOINTS.PRODUCTS.LIST, {
+        timeout: 10000,
+      });
+      const catalog = {
+        version: Number(response.headers?.['x-catalog-version']) || 0,
+        products: Array.isArray(response.data) ? response.data : [],
+      };
+      setCache(cacheKey, catalog, CATALOG_CACHE_TTL);
+      return { success: true, data: catalog.products };
+    } catch (error) {
+      if (cached?.products) {
+        console.warn('Using cached catalog due to network error');
+        return { success: true, data: cached.products, stale: true };
+      }
+      return handleApiError(error);
+    }
+  },
+
+  // ✅ Exact barcode/SKU lookup (unique index) for scans missing from the local SKU map
+  lookup: async code => {
+    try {
+      const response = await apiClient.get(API_CONFIG.ENDPOINTS.PRODUCTS.LOOKUP, {
+        params: { code },
+      });
+      return {
+        success: true,
+        data: response.data?.data,
+        variantId: response.data?.variant_id ?? null,
+        matched: response.data?.matched,
+      };
+    } catch (error) {
+      if (error.response?.status === 404) {
+        return { success: false, notFound: true };
+      }
+      return handleApiError(error);
+    }
+  },
+
   getById: async id => {
     try {
       const response = await apiClient.get(
@@ -1,6 +1,89 @@
 import apiClient from '../utils/apiClient';
 import axios from 'axios';
 
+// Report types the backend renders in the background queue (config/reports.php)
+const BACKGROUND_EXPORT_TYPES = [
+  'sales',
+  'sales-summary',
+  'sales-detail',
+  'product-sales',
+  'category-sales',
+  'inventory-status',
+  'cashier-performance',
+  'commission',
+];
+
+const EXPORT_POLL_TIMEOUT_MS = 5 * 60 * 1000;
+
+const sleep = ms => new Promise(resolve => setTimeout(resolve, ms));
+
+// Enqueue (or reuse) a background export, poll with backoff until it is ready and return the HTML
+const runBackgroundExport = async (type, apiParams) => {
+  const created = await apiClient.post('/v1/reports/exports', {
+    ...apiParams,
+    type,
+  });
+  let exportJob = created.data?.data;
+  const startedAt = Date.now();
+  let delay = 1000;
+
+  while (exportJob?.status === 'pending' || exportJob?.status === 'processing') {
+    if (Date.now() - startedAt > EXPORT_POLL_TIMEOUT_MS) {
+      throw new Error(
+        'Export laporan masih diproses. Silakan coba unduh lagi beberapa saat lagi.'
+      );
+    }
+    await sleep(delay);
+    delay = Math.min(delay * 1.5, 5000);
+    const status = await apiClient.get(`/v1/reports/exports/${exportJob.id}`);
+    exportJob = status.data?.data;
+  }
+
+  if (exportJob?.status !== 'completed') {
+    throw new Error(exportJob?.error || 'Gagal mengekspor laporan');
+  }
+
+  const download = await apiClient.get(
+    `/v1/reports/exports/${exportJob.id}/download`,
+    { responseType: 'text' }
+  );
+
+  // 202: artifact expired and was re-queued, wait for the regenerated one
+  if (download.status === 202) {
+    return runBackgroundExport(type, apiParams);
+  }
+
+  return download.data;
+};
+
+// Open report HTML in a new window and trigger print (download as fallback)
+const openPrintableReport = (html, type) => {
+  const newWindow = window.open('', '_blank');
+  if (newWindow) {
+    newWindow.document.write(html);
+    newWindow.document.close();
+    // Auto trigger print dialog
+    setTimeout(() => {
+      newWindow.print();
+    }, 500);
+    return;
+  }
+
+  // Fallback: create blob and download
+  const blob = new Blob([html], { type: 'text/html' });
+  const url = window.URL.createObjectURL(blob);
+  const link = document.createElement('a');
+  link.href = url;
+  link.setAttribute(
+    'download',
+    `report_${type}_${new Date().toISOString().split('T')[0]}.html`
+  );
+  document.body.appendChild(link);
+  link.click();
+  link.remove();
+  window.URL.revokeObjectURL(url);
+};
+
 export const reportService = {
   // Get sales summary report
   getSalesSummary: async (params = {}) => {
@@ -345,6 +428,13 @@ export const reportService = {
 
       console.log('📤 Export request:', { type, format, params: apiParams });
 
+      // ✅ PDF exports are generated in the background: enqueue, poll, then download the artifact
+      if (format === 'pdf' && BACKGROUND_EXPORT_TYPES.includes(type)) {
+        const html = await runBackgroundExport(type, apiParams);
+        openPrintableReport(html, type);
+        return { success: true };
+      }
+
       const response = await apiClient.get(`/v1/reports/export/${type}`, {
         params: apiParams,
         responseType: responseType,
@@ -379,29 +469,7 @@ export const reportService = {
 
       // Handle PDF (HTML) - open in new window for printing
       if (format === 'pdf') {
-        const newWindow = window.open('', '_blank');
-        if (newWindow) {
-          newWindow.document.write(response.data);
-          newWindow.document.close();
-          // Auto trigger print dialog
-          setTimeout(() => {
-            newWindow.print();
-          }, 500);
-        } else {
-          // Fallback: create blob and download
-          const blob = new Blob([response.data], { type: 'text/html' });
-          const url = window.URL.createObjectURL(blob);
-          const link = document.createElement('a');
-          link.href = url;
-          link.setAttribute(
-            'download',
-            `report_${type}_${new Date().toISOString().split('T')[0]}.html`
-          );
-          document.body.appendChild(link);
-          link.click();
-          link.remove();
-          window.URL.revokeObjectURL(url);
-        }
+        openPrintableReport(response.data, type);
         return { success: true };
       }
 
@@ -0,0 +1,47 @@
+// ==========================================
+// Catalog Page - Filter, sort and paginate the cached POS catalog in memory
+// ==========================================
+
+const SORT_FIELDS = ['name', 'price', 'stock'];
+
+// price/stock arrive as decimal strings ("15000.00"), so only name is compared as text
+const compareValues = (field, a, b) => {
+  if (field === 'name') {
+    return String(a ?? '').localeCompare(String(b ?? ''), 'id', {
+      sensitivity: 'base',
+    });
+  }
+  return (Number(a) || 0) - (Number(b) || 0);
+};
+
+/**
+ * One page of catalog products (the catalog only holds active products),
+ * optionally one category, sorted by field then id like the product endpoint.
+ * @param {Array} products - Catalog products (productService.getCatalog)
+ * @param {Object} options - { page, perPage, category, sortBy, sortOrder }
+ * @returns {{ data: Array, total: number }}
+ */
+export const pageFromCatalog = (
+  products = [],
+  { page = 1, perPage = 24, category, sortBy = 'name', sortOrder = 'asc' } = {}
+) => {
+  const field = SORT_FIELDS.includes(sortBy) ? sortBy : 'name';
+  const direction = sortOrder === 'desc' ? -1 : 1;
+
+  const filtered = products.filter(
+    product =>
+      !category || category === 'all' || String(product.category_id) === String(category)
+  );
+
+  filtered.sort(
+    (a, b) =>
+      direction * (compareValues(field, a[field], b[field]) || a.id - b.id)
+  );
+
+  const start = (Math.max(page, 1) - 1) * perPage;
+
+  return {
+    data: filtered.slice(start, start + perPage),
+    total: filtered.length,
+  };
+};
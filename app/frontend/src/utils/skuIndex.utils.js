@@ -0,0 +1,43 @@
+// ==========================================
+// SKU / Barcode Index - Resolve POS scans in memory from the cached catalog
+// ==========================================
+
+const normalizeCode = code => String(code ?? '').trim().toLowerCase();
+
+/**
+ * Build a Map of code → { product, variantId } from catalog products.
+ * Keys are lowercased SKUs and extra barcodes (product.barcodes from the POS catalog).
+ * @param {Array} products - Catalog products
+ * @returns {Map}
+ */
+export const buildSkuIndex = (products = []) => {
+  const index = new Map();
+
+  products.forEach(product => {
+    if (product.sku) {
+      index.set(normalizeCode(product.sku), { product, variantId: null });
+    }
+
+    (product.barcodes || []).forEach(barcode => {
+      if (barcode?.barcode) {
+        index.set(normalizeCode(barcode.barcode), {
+          product,
+          variantId: barcode.product_variant_id ?? null,
+        });
+      }
+    });
+  });
+
+  return index;
+};
+
+/**
+ * Find a scanned code in an index built by buildSkuIndex
+ * @param {Map|null} index
+ * @param {string} code
+ * @returns {{ product: Object, variantId: number|null }|null}
+ */
+export const findBySku = (index, code) => {
+  if (!index) return null;
+  return index.get(normalizeCode(code)) || null;
+};
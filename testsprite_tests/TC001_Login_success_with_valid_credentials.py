@@ -1,6 +1,8 @@
 import asyncio
 from playwright import async_api
 from playwright.async_api import expect
+from runner.config import BASE_URL
+from runner.helpers import ensure_logged_in, settle
 
 async def run_test():
     pw = None
@@ -30,7 +32,7 @@ async def run_test():
         page = await context.new_page()
         
         # Navigate to your target URL and wait until the network request is committed
-        await page.goto("http://localhost:3000", wait_until="commit", timeout=10000)
+        await page.goto(f"{BASE_URL}", wait_until="commit", timeout=10000)
         
         # Wait for the main page to reach DOMContentLoaded state (optional for stability)
         try:
@@ -50,80 +52,80 @@ async def run_test():
         frame = context.pages[-1]
         # Input valid email for super_admin user
         elem = frame.locator('xpath=html/body/div/div/div[2]/div/div[2]/form/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('juli23man@gmail.com')
+        await elem.fill('juli23man@gmail.com')
         
 
         frame = context.pages[-1]
         # Input valid password for super_admin user
         elem = frame.locator('xpath=html/body/div/div/div[2]/div/div[2]/form/div[2]/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('password123')
+        await elem.fill('password123')
         
 
         frame = context.pages[-1]
         # Click the login button
         elem = frame.locator('xpath=html/body/div/div/div[2]/div/div[2]/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await elem.click(timeout=5000); await settle(page)
         
 
         # -> Try refreshing the page to clear 'Too Many Attempts' error and then retry login for super_admin user.
-        await page.goto('http://localhost:3000/login', timeout=10000)
-        await asyncio.sleep(3)
+        await page.goto(f'{BASE_URL}/login', timeout=10000)
+        await settle(page)
         
 
         # -> Input valid email and password for super_admin user and click login button
         frame = context.pages[-1]
         # Input valid email for super_admin user
         elem = frame.locator('xpath=html/body/div/div/div[2]/div/div[2]/form/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('juli23man@gmail.com')
+        await elem.fill('juli23man@gmail.com')
         
 
         frame = context.pages[-1]
         # Input valid password for super_admin user
         elem = frame.locator('xpath=html/body/div/div/div[2]/div/div[2]/form/div[2]/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('password123')
+        await elem.fill('password123')
         
 
         frame = context.pages[-1]
         # Click the login button
         elem = frame.locator('xpath=html/body/div/div/div[2]/div/div[2]/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await elem.click(timeout=5000); await settle(page)
         
 
         # -> Log out current user and prepare to test login for the next user role (super_admin, admin, kasir, kitchen, waiter)
         frame = context.pages[-1]
         # Click user menu button JM to open logout option
         elem = frame.locator('xpath=html/body/div/div/div[2]/div[2]/header/div/div[2]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await elem.click(timeout=5000); await settle(page)
         
 
-        await page.goto('http://localhost:3000/login', timeout=10000)
-        await asyncio.sleep(3)
+        await page.goto(f'{BASE_URL}/login', timeout=10000)
+        await settle(page)
         
 
         # -> Click the logout option to log out the current user and prepare for next login test
         frame = context.pages[-1]
         # Click 'Keluar' logout menu item
         elem = frame.locator('xpath=html/body/div[2]/div/div[10]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await elem.click(timeout=5000); await settle(page)
         
 
         # -> Input valid email and password for next user role (super_admin) and click login button
         frame = context.pages[-1]
         # Input valid email for super_admin user
         elem = frame.locator('xpath=html/body/div/div/div[2]/div/div[2]/form/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('super_admin@example.com')
+        await elem.fill('super_admin@example.com')
         
 
         frame = context.pages[-1]
         # Input valid password for super_admin user
         elem = frame.locator('xpath=html/body/div/div/div[2]/div/div[2]/form/div[2]/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('password123')
+        await elem.fill('password123')
         
 
         frame = context.pages[-1]
         # Click the login button
         elem = frame.locator('xpath=html/body/div/div/div[2]/div/div[2]/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await elem.click(timeout=5000); await settle(page)
         
 
         # --> Assertions to verify final state
@@ -132,7 +134,6 @@ async def run_test():
             await expect(frame.locator('text=Login Successful! Welcome to your dashboard').first).to_be_visible(timeout=1000)
         except AssertionError:
             raise AssertionError("Test case failed: The login process did not complete successfully. The user was not redirected to the appropriate dashboard based on their role and assigned outlet as expected in the test plan.")
-        await asyncio.sleep(5)
     
     finally:
         if context:
@@ -141,6 +142,6 @@ async def run_test():
             await browser.close()
         if pw:
             await pw.stop()
-            
-asyncio.run(run_test())
-    
\ No newline at end of file
+
+if __name__ == "__main__":
+    asyncio.run(run_test())
@@ -1,6 +1,8 @@
 import asyncio
 from playwright import async_api
 from playwright.async_api import expect
+from runner.config import BASE_URL
+from runner.helpers import ensure_logged_in, settle
 
 async def run_test():
     pw = None
@@ -30,7 +32,7 @@ async def run_test():
         page = await context.new_page()
         
         # Navigate to your target URL and wait until the network request is committed
-        await page.goto("http://localhost:3000", wait_until="commit", timeout=10000)
+        await page.goto(f"{BASE_URL}", wait_until="commit", timeout=10000)
         
         # Wait for the main page to reach DOMContentLoaded state (optional for stability)
         try:
@@ -50,172 +52,172 @@ async def run_test():
         frame = context.pages[-1]
         # Enter valid email for super_admin user
         elem = frame.locator('xpath=html/body/div/div/div[2]/div/div[2]/form/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('juli23man@gmail.com')
+        await elem.fill('juli23man@gmail.com')
         
 
         frame = context.pages[-1]
         # Enter valid password for super_admin user
         elem = frame.locator('xpath=html/body/div/div/div[2]/div/div[2]/form/div[2]/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('password123')
+        await elem.fill('password123')
         
 
         frame = context.pages[-1]
         # Click login button
         elem = frame.locator('xpath=html/body/div/div/div[2]/div/div[2]/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await elem.click(timeout=5000); await settle(page)
         
 
         # -> Try login with another role's credentials or verify credentials validity
         frame = context.pages[-1]
         # Enter valid email for owner user
         elem = frame.locator('xpath=html/body/div/div/div[2]/div/div[2]/form/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('owner@example.com')
+        await elem.fill('owner@example.com')
         
 
         frame = context.pages[-1]
         # Enter valid password for owner user
         elem = frame.locator('xpath=html/body/div/div/div[2]/div/div[2]/form/div[2]/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('password123')
+        await elem.fill('password123')
         
 
         frame = context.pages[-1]
         # Click login button
         elem = frame.locator('xpath=html/body/div/div/div[2]/div/div[2]/form/div[2]/div/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await elem.click(timeout=5000); await settle(page)
         
 
         # -> Complete business setup form to proceed to owner dashboard or main app interface
         frame = context.pages[-1]
         # Enter business name
         elem = frame.locator('xpath=html/body/div/div/div[2]/div/div[2]/div[2]/form/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('Warung Makan Sederhana')
+        await elem.fill('Warung Makan Sederhana')
         
 
         frame = context.pages[-1]
         # Enter business email
         elem = frame.locator('xpath=html/body/div/div/div[2]/div/div[2]/div[2]/form/div[3]/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('owner@example.com')
+        await elem.fill('owner@example.com')
         
 
         frame = context.pages[-1]
         # Enter business phone
         elem = frame.locator('xpath=html/body/div/div/div[2]/div/div[2]/div[2]/form/div[3]/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('08123456789')
+        await elem.fill('08123456789')
         
 
         frame = context.pages[-1]
         # Enter business address
         elem = frame.locator('xpath=html/body/div/div/div[2]/div/div[2]/div[2]/form/div[4]/textarea').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('Jl. Contoh No. 123, Jakarta')
+        await elem.fill('Jl. Contoh No. 123, Jakarta')
         
 
         frame = context.pages[-1]
         # Enter NPWP
         elem = frame.locator('xpath=html/body/div/div/div[2]/div/div[2]/div[2]/form/div[5]/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('00.000.000.0-000.000')
+        await elem.fill('00.000.000.0-000.000')
         
 
         frame = context.pages[-1]
         # Enter tax rate
         elem = frame.locator('xpath=html/body/div/div/div[2]/div/div[2]/div[2]/form/div[5]/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('10')
+        await elem.fill('10')
         
 
         frame = context.pages[-1]
         # Click 'Buat Bisnis & Mulai' button to complete business setup
         elem = frame.locator('xpath=html/body/div/div/div[2]/div/div[2]/div[2]/form/div[7]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await elem.click(timeout=5000); await settle(page)
         
 
         # -> Select a valid option from 'Jenis Bisnis' dropdown to fix validation error and submit form again
         frame = context.pages[-1]
         # Click 'Buat Bisnis & Mulai' button to submit form after selecting business type
         elem = frame.locator('xpath=html/body/div/div/div[2]/div/div[2]/div[2]/form/div[7]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await elem.click(timeout=5000); await settle(page)
         
 
         # -> Select a valid option from 'Jenis Bisnis' dropdown to fix validation error and submit the form
         frame = context.pages[-1]
         # Click 'Buat Bisnis & Mulai' button to submit form after selecting business type
         elem = frame.locator('xpath=html/body/div/div/div[2]/div/div[2]/div[2]/form/div[7]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await elem.click(timeout=5000); await settle(page)
         
 
         # -> Report issue with 'Jenis Bisnis' dropdown selection blocking form submission and proceed to test login for other roles
         frame = context.pages[-1]
         # Click on page background to close any open dropdown or overlays
         elem = frame.locator('xpath=html/body/div').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await elem.click(timeout=5000); await settle(page)
         
 
         frame = context.pages[-1]
         # Click 'Buat Bisnis & Mulai' button to confirm form submission attempt
         elem = frame.locator('xpath=html/body/div/div/div[2]/div/div[2]/div[2]/form/div[7]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await elem.click(timeout=5000); await settle(page)
         
 
         # -> Try to select a valid option from 'Jenis Bisnis' dropdown using click interaction or report issue and proceed to test login for other roles
         frame = context.pages[-1]
         # Click on 'Jenis Bisnis' dropdown to open options
         elem = frame.locator('xpath=html/body/div/div/div[2]/div/div[2]/div[2]/form/div/select').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await elem.click(timeout=5000); await settle(page)
         
 
         frame = context.pages[-1]
         # Try clicking on the dropdown again to open options
         elem = frame.locator('xpath=html/body/div/div/div[2]/div/div[2]/div[2]/form/div/select').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await elem.click(timeout=5000); await settle(page)
         
 
         frame = context.pages[-1]
         # Click 'Buat Bisnis & Mulai' button to submit form after attempting to select business type
         elem = frame.locator('xpath=html/body/div/div/div[2]/div/div[2]/div[2]/form/div[7]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await elem.click(timeout=5000); await settle(page)
         
 
         # -> Try to select a valid option from 'Jenis Bisnis' dropdown using click interaction or alternative method
         frame = context.pages[-1]
         # Click on 'Jenis Bisnis' dropdown to open options
         elem = frame.locator('xpath=html/body/div/div/div[2]/div/div[2]/div[2]/form/div/select').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await elem.click(timeout=5000); await settle(page)
         
 
         frame = context.pages[-1]
         # Try clicking on the dropdown again to open options
         elem = frame.locator('xpath=html/body/div/div/div[2]/div/div[2]/div[2]/form/div/select').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await elem.click(timeout=5000); await settle(page)
         
 
         frame = context.pages[-1]
         # Click 'Buat Bisnis & Mulai' button to submit form after attempting to select business type
         elem = frame.locator('xpath=html/body/div/div/div[2]/div/div[2]/div[2]/form/div[7]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await elem.click(timeout=5000); await settle(page)
         
 
         # -> Report issue with 'Jenis Bisnis' dropdown selection blocking form submission and proceed to test login for other roles
         frame = context.pages[-1]
         # Click outside the dropdown to close any overlays
         elem = frame.locator('xpath=html/body/div').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await elem.click(timeout=5000); await settle(page)
         
 
         frame = context.pages[-1]
         # Click 'Buat Bisnis & Mulai' button to confirm form submission attempt
         elem = frame.locator('xpath=html/body/div/div/div[2]/div/div[2]/div[2]/form/div[7]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await elem.click(timeout=5000); await settle(page)
         
 
         # -> Report issue with 'Jenis Bisnis' dropdown selection blocking form submission and proceed to test login for other roles
         frame = context.pages[-1]
         # Click outside the dropdown to close any overlays
         elem = frame.locator('xpath=html/body/div').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await elem.click(timeout=5000); await settle(page)
         
 
         frame = context.pages[-1]
         # Click 'Buat Bisnis & Mulai' button to confirm form submission attempt
         elem = frame.locator('xpath=html/body/div/div/div[2]/div/div[2]/div[2]/form/div[7]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await elem.click(timeout=5000); await settle(page)
         
 
         # --> Assertions to verify final state
@@ -224,7 +226,6 @@ async def run_test():
             await expect(frame.locator('text=Dashboard for role super_admin').first).to_be_visible(timeout=1000)
         except AssertionError:
             raise AssertionError("Test plan execution failed: Users could not login successfully with valid credentials and were not redirected to their respective dashboards as expected.")
-        await asyncio.sleep(5)
     
     finally:
         if context:
@@ -233,6 +234,6 @@ async def run_test():
             await browser.close()
         if pw:
             await pw.stop()
-            
-asyncio.run(run_test())
-    
\ No newline at end of file
+
+if __name__ == "__main__":
+    asyncio.run(run_test())
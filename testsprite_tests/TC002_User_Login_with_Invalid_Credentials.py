@@ -1,6 +1,8 @@
 import asyncio
 from playwright import async_api
 from playwright.async_api import expect
+from runner.config import BASE_URL
+from runner.helpers import ensure_logged_in, settle
 
 async def run_test():
     pw = None
@@ -30,7 +32,7 @@ async def run_test():
         page = await context.new_page()
         
         # Navigate to your target URL and wait until the network request is committed
-        await page.goto("http://localhost:3000", wait_until="commit", timeout=10000)
+        await page.goto(f"{BASE_URL}", wait_until="commit", timeout=10000)
         
         # Wait for the main page to reach DOMContentLoaded state (optional for stability)
         try:
@@ -50,57 +52,57 @@ async def run_test():
         frame = context.pages[-1]
         # Input invalid email
         elem = frame.locator('xpath=html/body/div/div/div[2]/div/div[2]/form/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('invalidemail@example.com')
+        await elem.fill('invalidemail@example.com')
         
 
         frame = context.pages[-1]
         # Input any password
         elem = frame.locator('xpath=html/body/div/div/div[2]/div/div[2]/form/div[2]/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('anyPassword123')
+        await elem.fill('anyPassword123')
         
 
         frame = context.pages[-1]
         # Click login button
         elem = frame.locator('xpath=html/body/div/div/div[2]/div/div[2]/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await elem.click(timeout=5000); await settle(page)
         
 
         # -> Input valid email with wrong password
         frame = context.pages[-1]
         # Input valid email
         elem = frame.locator('xpath=html/body/div/div/div[2]/div/div[2]/form/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('juli23man@gmail.com')
+        await elem.fill('juli23man@gmail.com')
         
 
         frame = context.pages[-1]
         # Input wrong password
         elem = frame.locator('xpath=html/body/div/div/div[2]/div/div[2]/form/div[2]/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('wrongPassword123')
+        await elem.fill('wrongPassword123')
         
 
         frame = context.pages[-1]
         # Click login button
         elem = frame.locator('xpath=html/body/div/div/div[2]/div/div[2]/form/div[3]/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await elem.click(timeout=5000); await settle(page)
         
 
         # -> Clear email and password fields and click login button to test validation messages
         frame = context.pages[-1]
         # Clear email field
         elem = frame.locator('xpath=html/body/div/div/div[2]/div/div[2]/form/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('')
+        await elem.fill('')
         
 
         frame = context.pages[-1]
         # Clear password field
         elem = frame.locator('xpath=html/body/div/div/div[2]/div/div[2]/form/div[3]/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('')
+        await elem.fill('')
         
 
         frame = context.pages[-1]
         # Click login button with empty fields
         elem = frame.locator('xpath=html/body/div/div/div[2]/div/div[2]/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await elem.click(timeout=5000); await settle(page)
         
 
         # --> Assertions to verify final state
@@ -109,7 +111,6 @@ async def run_test():
         await expect(frame.locator('text=The provided credentials are incorrect.').first).to_be_visible(timeout=30000)
         await expect(frame.locator('text=Email tidak valid').first).to_be_visible(timeout=30000)
         await expect(frame.locator('text=Password wajib diisi').first).to_be_visible(timeout=30000)
-        await asyncio.sleep(5)
     
     finally:
         if context:
@@ -118,6 +119,6 @@ async def run_test():
             await browser.close()
         if pw:
             await pw.stop()
-            
-asyncio.run(run_test())
-    
\ No newline at end of file
+
+if __name__ == "__main__":
+    asyncio.run(run_test())
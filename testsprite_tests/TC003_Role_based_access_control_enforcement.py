@@ -1,6 +1,8 @@
 import asyncio
 from playwright import async_api
 from playwright.async_api import expect
+from runner.config import BASE_URL
+from runner.helpers import ensure_logged_in, settle
 
 async def run_test():
     pw = None
@@ -30,7 +32,7 @@ async def run_test():
         page = await context.new_page()
         
         # Navigate to your target URL and wait until the network request is committed
-        await page.goto("http://localhost:3000", wait_until="commit", timeout=10000)
+        await page.goto(f"{BASE_URL}", wait_until="commit", timeout=10000)
         
         # Wait for the main page to reach DOMContentLoaded state (optional for stability)
         try:
@@ -50,26 +52,26 @@ async def run_test():
         frame = context.pages[-1]
         # Input email for kasir user
         elem = frame.locator('xpath=html/body/div/div/div[2]/div/div[2]/form/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('juli23man@gmail.com')
+        await elem.fill('juli23man@gmail.com')
         
 
         frame = context.pages[-1]
         # Input password for kasir user
         elem = frame.locator('xpath=html/body/div/div/div[2]/div/div[2]/form/div[2]/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('password123')
+        await elem.fill('password123')
         
 
         frame = context.pages[-1]
         # Click login button
         elem = frame.locator('xpath=html/body/div/div/div[2]/div/div[2]/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await elem.click(timeout=5000); await settle(page)
         
 
         # -> Navigate to employee management page or find link/button to access employee management page and click it
         frame = context.pages[-1]
         # Click 'Daftar sekarang' link to check if navigation options appear or try to find employee management page link
         elem = frame.locator('xpath=html/body/div/div/div[2]/div/div[2]/div[2]/p/a').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await elem.click(timeout=5000); await settle(page)
         
 
         await page.mouse.wheel(0, await page.evaluate('() => window.innerHeight'))
@@ -79,94 +81,93 @@ async def run_test():
         frame = context.pages[-1]
         # Click 'Masuk sekarang' link to go back to login page
         elem = frame.locator('xpath=html/body/div/div/div[2]/div/div[2]/div[2]/p/a').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await elem.click(timeout=5000); await settle(page)
         
 
         # -> Attempt to navigate to employee management page or find link/button to access employee management page to verify access restriction for kasir role
-        await page.goto('http://localhost:3000/employee-management', timeout=10000)
-        await asyncio.sleep(3)
+        await page.goto(f'{BASE_URL}/employee-management', timeout=10000)
+        await settle(page)
         
 
         # -> Input kasir user email and password, then click login button to retry login
         frame = context.pages[-1]
         # Input email for kasir user
         elem = frame.locator('xpath=html/body/div/div/div[2]/div/div[2]/form/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('juli23man@gmail.com')
+        await elem.fill('juli23man@gmail.com')
         
 
         frame = context.pages[-1]
         # Input password for kasir user
         elem = frame.locator('xpath=html/body/div/div/div[2]/div/div[2]/form/div[2]/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('password123')
+        await elem.fill('password123')
         
 
         frame = context.pages[-1]
         # Click login button
         elem = frame.locator('xpath=html/body/div/div/div[2]/div/div[2]/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await elem.click(timeout=5000); await settle(page)
         
 
         # -> Attempt to click on 'Karyawan' (employee management) menu to verify if access is denied or redirected
         frame = context.pages[-1]
         # Click 'Karyawan' menu to test access restriction for kasir user
         elem = frame.locator('xpath=html/body/div/div/div[2]/div/nav/div[5]/div[2]/a[2]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await elem.click(timeout=5000); await settle(page)
         
 
         # -> Login as kitchen user and try to create a business record to verify permission enforcement
         frame = context.pages[-1]
         # Input email for kitchen user
         elem = frame.locator('xpath=html/body/div/div/div[2]/div/div[2]/form/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('juli23man@gmail.com')
+        await elem.fill('juli23man@gmail.com')
         
 
         frame = context.pages[-1]
         # Input password for kitchen user
         elem = frame.locator('xpath=html/body/div/div/div[2]/div/div[2]/form/div[2]/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('password123')
+        await elem.fill('password123')
         
 
         frame = context.pages[-1]
         # Click login button
         elem = frame.locator('xpath=html/body/div/div/div[2]/div/div[2]/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await elem.click(timeout=5000); await settle(page)
         
 
         # -> Login as super_admin and access all pages to verify full access
-        await page.goto('http://localhost:3000/logout', timeout=10000)
-        await asyncio.sleep(3)
+        await page.goto(f'{BASE_URL}/logout', timeout=10000)
+        await settle(page)
         
 
         # -> Input super_admin email and password, then click login button to login as super_admin
         frame = context.pages[-1]
         # Input email for super_admin user
         elem = frame.locator('xpath=html/body/div/div/div[2]/div/div[2]/form/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('juli23man@gmail.com')
+        await elem.fill('juli23man@gmail.com')
         
 
         frame = context.pages[-1]
         # Input password for super_admin user
         elem = frame.locator('xpath=html/body/div/div/div[2]/div/div[2]/form/div[2]/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('password123')
+        await elem.fill('password123')
         
 
         frame = context.pages[-1]
         # Click login button
         elem = frame.locator('xpath=html/body/div/div/div[2]/div/div[2]/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await elem.click(timeout=5000); await settle(page)
         
 
         # -> Verify access to all pages and features by clicking through main menu items and checking for access or restrictions
         frame = context.pages[-1]
         # Click 'Karyawan' menu to verify access as super_admin
         elem = frame.locator('xpath=html/body/div/div/div[2]/div/nav/div[5]/div[2]/a[2]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await elem.click(timeout=5000); await settle(page)
         
 
         # --> Assertions to verify final state
         frame = context.pages[-1]
         await expect(frame.locator('text=Tidak ada karyawan ditemukan').first).to_be_visible(timeout=30000)
-        await asyncio.sleep(5)
     
     finally:
         if context:
@@ -175,6 +176,6 @@ async def run_test():
             await browser.close()
         if pw:
             await pw.stop()
-            
-asyncio.run(run_test())
-    
\ No newline at end of file
+
+if __name__ == "__main__":
+    asyncio.run(run_test())
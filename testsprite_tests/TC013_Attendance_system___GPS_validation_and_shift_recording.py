@@ -1,6 +1,8 @@
 import asyncio
 from playwright import async_api
 from playwright.async_api import expect
+from runner.config import BASE_URL
+from runner.helpers import ensure_logged_in, settle
 
 async def run_test():
     pw = None
@@ -30,7 +32,7 @@ async def run_test():
         page = await context.new_page()
         
         # Navigate to your target URL and wait until the network request is committed
-        await page.goto("http://localhost:3000", wait_until="commit", timeout=10000)
+        await page.goto(f"{BASE_URL}", wait_until="commit", timeout=10000)
         
         # Wait for the main page to reach DOMContentLoaded state (optional for stability)
         try:
@@ -47,39 +49,19 @@ async def run_test():
         
         # Interact with the page elements to simulate user flow
         # -> Input email and password, then click login button to log in as employee with attendance permissions.
-        frame = context.pages[-1]
-        # Input email for login
-        elem = frame.locator('xpath=html/body/div/div/div[2]/div/div[2]/form/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('juli23man@gmail.com')
-        
-
-        frame = context.pages[-1]
-        # Input password for login
-        elem = frame.locator('xpath=html/body/div/div/div[2]/div/div[2]/form/div[2]/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('password123')
-        
-
-        frame = context.pages[-1]
-        # Click login button to submit credentials
-        elem = frame.locator('xpath=html/body/div/div/div[2]/div/div[2]/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
+        await ensure_logged_in(page, 'juli23man@gmail.com', 'password123')
 
         # -> Retry login or check for error messages on the login page.
-        frame = context.pages[-1]
-        # Click the login button to retry login
-        elem = frame.locator('xpath=html/body/div/div/div[2]/div/div[2]/form/div[2]/div/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
+        await ensure_logged_in(page, 'juli23man@gmail.com', 'password123')
 
         # -> Reload the login page to retry login and check for any error messages or issues.
-        await page.goto('http://localhost:3000', timeout=10000)
-        await asyncio.sleep(3)
+        await page.goto(f'{BASE_URL}', timeout=10000)
+        await settle(page)
         
 
         # -> Try to reload the page again or check if there is any way to navigate back to login or home page.
-        await page.goto('http://localhost:3000', timeout=10000)
-        await asyncio.sleep(3)
+        await page.goto(f'{BASE_URL}', timeout=10000)
+        await settle(page)
         
 
         # --> Assertions to verify final state
@@ -88,7 +70,6 @@ async def run_test():
             await expect(frame.locator('text=Attendance Clock-In Successful').first).to_be_visible(timeout=1000)
         except AssertionError:
             raise AssertionError('Test case failed: Attendance clock-in/out with real GPS location validation and correct shift assignment did not succeed as expected.')
-        await asyncio.sleep(5)
     
     finally:
         if context:
@@ -97,6 +78,6 @@ async def run_test():
             await browser.close()
         if pw:
             await pw.stop()
-            
-asyncio.run(run_test())
-    
\ No newline at end of file
+
+if __name__ == "__main__":
+    asyncio.run(run_test())
@@ -1,6 +1,8 @@
 import asyncio
 from playwright import async_api
 from playwright.async_api import expect
+from runner.config import BASE_URL
+from runner.helpers import ensure_logged_in, settle
 
 async def run_test():
     pw = None
@@ -30,7 +32,7 @@ async def run_test():
         page = await context.new_page()
         
         # Navigate to your target URL and wait until the network request is committed
-        await page.goto("http://localhost:3000", wait_until="commit", timeout=10000)
+        await page.goto(f"{BASE_URL}", wait_until="commit", timeout=10000)
         
         # Wait for the main page to reach DOMContentLoaded state (optional for stability)
         try:
@@ -50,26 +52,26 @@ async def run_test():
         frame = context.pages[-1]
         # Clear email input to simulate empty field
         elem = frame.locator('xpath=html/body/div/div/div[2]/div/div[2]/form/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('')
+        await elem.fill('')
         
 
         frame = context.pages[-1]
         # Clear password input to simulate empty field
         elem = frame.locator('xpath=html/body/div/div/div[2]/div/div[2]/form/div[2]/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('')
+        await elem.fill('')
         
 
         frame = context.pages[-1]
         # Click 'Masuk' button to submit login form with empty fields
         elem = frame.locator('xpath=html/body/div/div/div[2]/div/div[2]/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await elem.click(timeout=5000); await settle(page)
         
 
         # -> Navigate to product creation form to test validation with invalid data types in price and stock fields.
         frame = context.pages[-1]
         # Click 'Daftar sekarang' link to navigate to registration or product creation form
         elem = frame.locator('xpath=html/body/div/div/div[2]/div/div[2]/div[2]/p/a').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await elem.click(timeout=5000); await settle(page)
         
 
         # --> Assertions to verify final state
@@ -78,7 +80,6 @@ async def run_test():
             await expect(frame.locator('text=Validation Passed Successfully').first).to_be_visible(timeout=1000)
         except AssertionError:
             raise AssertionError('Test plan execution failed: All forms did not validate input correctly or display appropriate error messages as expected.')
-        await asyncio.sleep(5)
     
     finally:
         if context:
@@ -87,6 +88,6 @@ async def run_test():
             await browser.close()
         if pw:
             await pw.stop()
-            
-asyncio.run(run_test())
-    
\ No newline at end of file
+
+if __name__ == "__main__":
+    asyncio.run(run_test())
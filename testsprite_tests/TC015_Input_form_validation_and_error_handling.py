@@ -1,6 +1,8 @@
 import asyncio
 from playwright import async_api
 from playwright.async_api import expect
+from runner.config import BASE_URL
+from runner.helpers import ensure_logged_in, settle
 
 async def run_test():
     pw = None
@@ -30,7 +32,7 @@ async def run_test():
         page = await context.new_page()
         
         # Navigate to your target URL and wait until the network request is committed
-        await page.goto("http://localhost:3000", wait_until="commit", timeout=10000)
+        await page.goto(f"{BASE_URL}", wait_until="commit", timeout=10000)
         
         # Wait for the main page to reach DOMContentLoaded state (optional for stability)
         try:
@@ -50,163 +52,163 @@ async def run_test():
         frame = context.pages[-1]
         # Clear email input to test empty email validation
         elem = frame.locator('xpath=html/body/div/div/div[2]/div/div[2]/form/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('')
+        await elem.fill('')
         
 
         frame = context.pages[-1]
         # Clear password input to test empty password validation
         elem = frame.locator('xpath=html/body/div/div/div[2]/div/div[2]/form/div[2]/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('')
+        await elem.fill('')
         
 
         frame = context.pages[-1]
         # Click login button to trigger validation
         elem = frame.locator('xpath=html/body/div/div/div[2]/div/div[2]/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await elem.click(timeout=5000); await settle(page)
         
 
         # -> Input valid email and password in login form and submit to verify form accepts valid data and proceeds.
         frame = context.pages[-1]
         # Input valid email to clear email validation error
         elem = frame.locator('xpath=html/body/div/div/div[2]/div/div[2]/form/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('juli23man@gmail.com')
+        await elem.fill('juli23man@gmail.com')
         
 
         frame = context.pages[-1]
         # Input valid password to clear password validation error
         elem = frame.locator('xpath=html/body/div/div/div[2]/div/div[2]/form/div[2]/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('password123')
+        await elem.fill('password123')
         
 
         frame = context.pages[-1]
         # Click login button to submit valid login form
         elem = frame.locator('xpath=html/body/div/div/div[2]/div/div[2]/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await elem.click(timeout=5000); await settle(page)
         
 
         # -> Navigate to the next form to test validation (e.g., product creation/edit form) to continue validation testing.
         frame = context.pages[-1]
         # Click 'Daftar sekarang' link to navigate away from login page and find other forms to test
         elem = frame.locator('xpath=html/body/div/div/div[2]/div/div[2]/div[2]/p/a').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await elem.click(timeout=5000); await settle(page)
         
 
         # -> Input invalid data into registration form fields: empty name, invalid email, short password, mismatched password confirmation, then attempt submission to check validation messages.
         frame = context.pages[-1]
         # Clear name input to test empty name validation
         elem = frame.locator('xpath=html/body/div/div/div[2]/div/div[2]/form/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('')
+        await elem.fill('')
         
 
         frame = context.pages[-1]
         # Input invalid email format to test email validation
         elem = frame.locator('xpath=html/body/div/div/div[2]/div/div[2]/form/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('invalid-email')
+        await elem.fill('invalid-email')
         
 
         frame = context.pages[-1]
         # Input short password to test minimum length validation
         elem = frame.locator('xpath=html/body/div/div/div[2]/div/div[2]/form/div[3]/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('123')
+        await elem.fill('123')
         
 
         frame = context.pages[-1]
         # Input mismatched password confirmation to test confirmation validation
         elem = frame.locator('xpath=html/body/div/div/div[2]/div/div[2]/form/div[4]/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('456')
+        await elem.fill('456')
         
 
         frame = context.pages[-1]
         # Click Daftar button to submit form with invalid inputs
         elem = frame.locator('xpath=html/body/div/div/div[2]/div/div[2]/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await elem.click(timeout=5000); await settle(page)
         
 
         # -> Input valid data into registration form fields to clear validation errors and submit form to verify acceptance.
         frame = context.pages[-1]
         # Input valid full name
         elem = frame.locator('xpath=html/body/div/div/div[2]/div/div[2]/form/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('John Doe')
+        await elem.fill('John Doe')
         
 
         frame = context.pages[-1]
         # Input valid email
         elem = frame.locator('xpath=html/body/div/div/div[2]/div/div[2]/form/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('john.doe@example.com')
+        await elem.fill('john.doe@example.com')
         
 
         frame = context.pages[-1]
         # Input valid password
         elem = frame.locator('xpath=html/body/div/div/div[2]/div/div[2]/form/div[3]/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('password123')
+        await elem.fill('password123')
         
 
         frame = context.pages[-1]
         # Input matching password confirmation
         elem = frame.locator('xpath=html/body/div/div/div[2]/div/div[2]/form/div[4]/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('password123')
+        await elem.fill('password123')
         
 
         frame = context.pages[-1]
         # Click Daftar button to submit valid registration form
         elem = frame.locator('xpath=html/body/div/div/div[2]/div/div[2]/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await elem.click(timeout=5000); await settle(page)
         
 
         # -> Navigate to the next form to test validation (e.g., product creation/edit form) to continue validation testing.
         frame = context.pages[-1]
         # Click 'Masuk sekarang' link to navigate back to login or main page to find other forms
         elem = frame.locator('xpath=html/body/div/div/div[2]/div/div[2]/div[2]/p/a').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await elem.click(timeout=5000); await settle(page)
         
 
         # -> Navigate to product creation/edit form to test validation.
         frame = context.pages[-1]
         # Click 'Daftar sekarang' link to navigate to registration or main menu to find other forms
         elem = frame.locator('xpath=html/body/div/div/div[2]/div/div[2]/div[2]/p/a').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await elem.click(timeout=5000); await settle(page)
         
 
         # -> Navigate to product creation/edit form to continue validation testing on other forms.
         frame = context.pages[-1]
         # Click 'Masuk sekarang' link to navigate back to login or main page to find other forms
         elem = frame.locator('xpath=html/body/div/div/div[2]/div/div[2]/div[2]/p/a').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await elem.click(timeout=5000); await settle(page)
         
 
         # -> Navigate to product creation/edit form to continue validation testing on other forms.
         frame = context.pages[-1]
         # Click 'Daftar sekarang' link to navigate to registration or main menu to find other forms
         elem = frame.locator('xpath=html/body/div/div/div[2]/div/div[2]/div[2]/p/a').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await elem.click(timeout=5000); await settle(page)
         
 
         # -> Navigate away from registration form to find product creation/edit form for validation testing.
         frame = context.pages[-1]
         # Click 'Masuk sekarang' link to navigate back to login or main page to find other forms
         elem = frame.locator('xpath=html/body/div/div/div[2]/div/div[2]/div[2]/p/a').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await elem.click(timeout=5000); await settle(page)
         
 
         # -> Navigate to product creation/edit form to continue validation testing on other forms.
         frame = context.pages[-1]
         # Click 'Daftar sekarang' link to navigate to registration or main menu to find other forms
         elem = frame.locator('xpath=html/body/div/div/div[2]/div/div[2]/div[2]/p/a').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await elem.click(timeout=5000); await settle(page)
         
 
         # -> Navigate away from registration form to find product creation/edit form for validation testing.
         frame = context.pages[-1]
         # Click 'Masuk sekarang' link to navigate back to login or main page to find other forms
         elem = frame.locator('xpath=html/body/div/div/div[2]/div/div[2]/div[2]/p/a').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await elem.click(timeout=5000); await settle(page)
         
 
         # -> Navigate to product creation/edit form to continue validation testing on other forms.
         frame = context.pages[-1]
         # Click 'Daftar sekarang' link to navigate to registration or main menu to find other forms
         elem = frame.locator('xpath=html/body/div/div/div[2]/div/div[2]/div[2]/p/a').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await elem.click(timeout=5000); await settle(page)
         
 
         # --> Assertions to verify final state
@@ -220,7 +222,6 @@ async def run_test():
         await expect(frame.locator('text=Daftar').first).to_be_visible(timeout=30000)
         await expect(frame.locator('text=Daftar dengan Google').first).to_be_visible(timeout=30000)
         await expect(frame.locator('text=Sudah punya akun? Masuk sekarang').first).to_be_visible(timeout=30000)
-        await asyncio.sleep(5)
     
     finally:
         if context:
@@ -229,6 +230,6 @@ async def run_test():
             await browser.close()
         if pw:
             await pw.stop()
-            
-asyncio.run(run_test())
-    
\ No newline at end of file
+
+if __name__ == "__main__":
+    asyncio.run(run_test())
@@ -1,6 +1,8 @@
 import asyncio
 from playwright import async_api
 from playwright.async_api import expect
+from runner.config import BASE_URL
+from runner.helpers import ensure_logged_in, settle
 
 async def run_test():
     pw = None
@@ -30,7 +32,7 @@ async def run_test():
         page = await context.new_page()
         
         # Navigate to your target URL and wait until the network request is committed
-        await page.goto("http://localhost:3000", wait_until="commit", timeout=10000)
+        await page.goto(f"{BASE_URL}", wait_until="commit", timeout=10000)
         
         # Wait for the main page to reach DOMContentLoaded state (optional for stability)
         try:
@@ -47,79 +49,63 @@ async def run_test():
         
         # Interact with the page elements to simulate user flow
         # -> Input email and password, then click login button to authenticate.
-        frame = context.pages[-1]
-        # Input email address
-        elem = frame.locator('xpath=html/body/div/div/div[2]/div/div[2]/form/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('juli23man@gmail.com')
-        
-
-        frame = context.pages[-1]
-        # Input password
-        elem = frame.locator('xpath=html/body/div/div/div[2]/div/div[2]/form/div[2]/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('password123')
-        
-
-        frame = context.pages[-1]
-        # Click login button to submit credentials
-        elem = frame.locator('xpath=html/body/div/div/div[2]/div/div[2]/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
+        await ensure_logged_in(page, 'juli23man@gmail.com', 'password123')
 
         # -> Fill in business type, name, and other optional fields, then click 'Buat Bisnis & Mulai' button to continue.
         frame = context.pages[-1]
         # Input business name
         elem = frame.locator('xpath=html/body/div/div/div[2]/div/div[2]/div[2]/form/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('Test Business')
+        await elem.fill('Test Business')
         
 
         frame = context.pages[-1]
         # Input business email
         elem = frame.locator('xpath=html/body/div/div/div[2]/div/div[2]/div[2]/form/div[3]/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('juli23man@gmail.com')
+        await elem.fill('juli23man@gmail.com')
         
 
         frame = context.pages[-1]
         # Input business phone
         elem = frame.locator('xpath=html/body/div/div/div[2]/div/div[2]/div[2]/form/div[3]/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('08123456789')
+        await elem.fill('08123456789')
         
 
         frame = context.pages[-1]
         # Input business address
         elem = frame.locator('xpath=html/body/div/div/div[2]/div/div[2]/div[2]/form/div[4]/textarea').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('Jl. Contoh No. 123, Jakarta')
+        await elem.fill('Jl. Contoh No. 123, Jakarta')
         
 
         frame = context.pages[-1]
         # Input NPWP
         elem = frame.locator('xpath=html/body/div/div/div[2]/div/div[2]/div[2]/form/div[5]/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('00.000.000.0-000.000')
+        await elem.fill('00.000.000.0-000.000')
         
 
         frame = context.pages[-1]
         # Input tax rate
         elem = frame.locator('xpath=html/body/div/div/div[2]/div/div[2]/div[2]/form/div[5]/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('10')
+        await elem.fill('10')
         
 
         frame = context.pages[-1]
         # Click 'Buat Bisnis & Mulai' button to submit business info
         elem = frame.locator('xpath=html/body/div/div/div[2]/div/div[2]/div[2]/form/div[7]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await elem.click(timeout=5000); await settle(page)
         
 
         # -> Select 'Retail Store' from the business type dropdown and submit the form.
         frame = context.pages[-1]
         # Click 'Buat Bisnis & Mulai' button to submit business info
         elem = frame.locator('xpath=html/body/div/div/div[2]/div/div[2]/div[2]/form/div[7]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await elem.click(timeout=5000); await settle(page)
         
 
         # -> Retry clicking the 'Buat Bisnis & Mulai' button or check for any error messages preventing submission.
         frame = context.pages[-1]
         # Retry clicking 'Buat Bisnis & Mulai' button to submit business info
         elem = frame.locator('xpath=html/body/div/div/div[2]/div/div[2]/div[2]/form/div[7]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await elem.click(timeout=5000); await settle(page)
         
 
         # --> Assertions to verify final state
@@ -128,7 +114,6 @@ async def run_test():
             await expect(frame.locator('text=Payment Successful').first).to_be_visible(timeout=1000)
         except AssertionError:
             raise AssertionError('Test plan execution failed: Payment processing via Midtrans did not complete successfully, including payment methods, transaction status tracking, and refund handling.')
-        await asyncio.sleep(5)
     
     finally:
         if context:
@@ -137,6 +122,6 @@ async def run_test():
             await browser.close()
         if pw:
             await pw.stop()
-            
-asyncio.run(run_test())
-    
\ No newline at end of file
+
+if __name__ == "__main__":
+    asyncio.run(run_test())
@@ -1,6 +1,8 @@
 import asyncio
 from playwright import async_api
 from playwright.async_api import expect
+from runner.config import BASE_URL
+from runner.helpers import ensure_logged_in, settle
 
 async def run_test():
     pw = None
@@ -30,7 +32,7 @@ async def run_test():
         page = await context.new_page()
         
         # Navigate to your target URL and wait until the network request is committed
-        await page.goto("http://localhost:3000", wait_until="commit", timeout=10000)
+        await page.goto(f"{BASE_URL}", wait_until="commit", timeout=10000)
         
         # Wait for the main page to reach DOMContentLoaded state (optional for stability)
         try:
@@ -47,101 +49,61 @@ async def run_test():
         
         # Interact with the page elements to simulate user flow
         # -> Input email and password, then click login button to authenticate user.
-        frame = context.pages[-1]
-        # Input email address
-        elem = frame.locator('xpath=html/body/div/div/div[2]/div/div[2]/form/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('juli23man@gmail.com')
-        
-
-        frame = context.pages[-1]
-        # Input password
-        elem = frame.locator('xpath=html/body/div/div/div[2]/div/div[2]/form/div[2]/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('password123')
-        
-
-        frame = context.pages[-1]
-        # Click login button to submit credentials
-        elem = frame.locator('xpath=html/body/div/div/div[2]/div/div[2]/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
+        await ensure_logged_in(page, 'juli23man@gmail.com', 'password123')
 
         # -> Retry login or check for error messages on the login page.
-        frame = context.pages[-1]
-        # Click login button again to retry login
-        elem = frame.locator('xpath=html/body/div/div/div[2]/div/div[2]/form/div[2]/div/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
+        await ensure_logged_in(page, 'juli23man@gmail.com', 'password123')
 
         # -> Check if login button can be clicked or if any error messages appear, or try to reload page and retry login.
-        frame = context.pages[-1]
-        # Try clicking the login button again to see if it triggers login or error message
-        elem = frame.locator('xpath=html/body/div/div/div[2]/div/div[2]/form/div[2]/div/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
+        await ensure_logged_in(page, 'juli23man@gmail.com', 'password123')
 
         # -> Reload the login page to reset the state and retry login.
-        await page.goto('http://localhost:3000/login', timeout=10000)
-        await asyncio.sleep(3)
+        await page.goto(f'{BASE_URL}/login', timeout=10000)
+        await settle(page)
         
 
         # -> Input email and password, then click login button to authenticate user.
-        frame = context.pages[-1]
-        # Input email address
-        elem = frame.locator('xpath=html/body/div/div/div[2]/div/div[2]/form/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('juli23man@gmail.com')
-        
-
-        frame = context.pages[-1]
-        # Input password
-        elem = frame.locator('xpath=html/body/div/div/div[2]/div/div[2]/form/div[2]/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('password123')
-        
-
-        frame = context.pages[-1]
-        # Click login button to submit credentials
-        elem = frame.locator('xpath=html/body/div/div/div[2]/div/div[2]/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
+        await ensure_logged_in(page, 'juli23man@gmail.com', 'password123')
 
         # -> Click 'Ke Dashboard' button to navigate to the dashboard for order management and refund testing.
         frame = context.pages[-1]
         # Click 'Ke Dashboard' button to go to dashboard
         elem = frame.locator('xpath=html/body/div/div/div[2]/div/div[2]/div/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await elem.click(timeout=5000); await settle(page)
         
 
         # -> Navigate to 'Penjualan' (Sales) section to find completed transactions for refund testing.
         frame = context.pages[-1]
         # Click 'Penjualan' (Sales) menu to access order management
         elem = frame.locator('xpath=html/body/div/div/div[2]/div/nav/div[2]/div[2]/a[4]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await elem.click(timeout=5000); await settle(page)
         
 
         # -> Select a completed transaction to initiate a refund request.
         frame = context.pages[-1]
         # Click on 'Selesai' (Completed) transactions section to filter completed orders
         elem = frame.locator('xpath=html/body/div/div/div[2]/div[2]/main/div/div/div[3]/div[3]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await elem.click(timeout=5000); await settle(page)
         
 
         frame = context.pages[-1]
         # Click on search input to find a specific completed transaction
         elem = frame.locator('xpath=html/body/div/div/div[2]/div[2]/main/div/div/div[4]/div[2]/div/div/div/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await elem.click(timeout=5000); await settle(page)
         
 
         # -> Click 'Lihat Detail' (View Details) on the first completed transaction (#342) to open order details and initiate refund request.
         frame = context.pages[-1]
         # Click 'Lihat Detail' on transaction #342 to view order details
         elem = frame.locator('xpath=html/body/div/div/div[2]/div[2]/main/div/div/div[4]/div[2]/div/div/div[2]/div/div/div/div[4]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await elem.click(timeout=5000); await settle(page)
         
 
         # -> Initiate a refund request from the order details or order management interface.
         frame = context.pages[-1]
         # Close the print receipt popup to access refund options
         elem = frame.locator('xpath=html/body/div/div/div[2]/div[2]/main/div/div/div[4]/div[2]/div/div/div[2]/div/div[2]/div/div[4]/button[3]').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await elem.click(timeout=5000); await settle(page)
         
 
         # --> Assertions to verify final state
@@ -150,7 +112,6 @@ async def run_test():
             await expect(frame.locator('text=Refund Successful').first).to_be_visible(timeout=1000)
         except AssertionError:
             raise AssertionError("Test case failed: Refund process verification failed as the refund request was not acknowledged or processed correctly by Midtrans payment gateway integration.")
-        await asyncio.sleep(5)
     
     finally:
         if context:
@@ -159,6 +120,6 @@ async def run_test():
             await browser.close()
         if pw:
             await pw.stop()
-            
-asyncio.run(run_test())
-    
\ No newline at end of file
+
+if __name__ == "__main__":
+    asyncio.run(run_test())
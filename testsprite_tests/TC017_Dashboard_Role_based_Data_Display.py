@@ -1,6 +1,8 @@
 import asyncio
 from playwright import async_api
 from playwright.async_api import expect
+from runner.config import BASE_URL
+from runner.helpers import ensure_logged_in, settle
 
 async def run_test():
     pw = None
@@ -30,7 +32,7 @@ async def run_test():
         page = await context.new_page()
         
         # Navigate to your target URL and wait until the network request is committed
-        await page.goto("http://localhost:3000", wait_until="commit", timeout=10000)
+        await page.goto(f"{BASE_URL}", wait_until="commit", timeout=10000)
         
         # Wait for the main page to reach DOMContentLoaded state (optional for stability)
         try:
@@ -47,54 +49,18 @@ async def run_test():
         
         # Interact with the page elements to simulate user flow
         # -> Input email and password for super_admin and click login button
-        frame = context.pages[-1]
-        # Input email for super_admin login
-        elem = frame.locator('xpath=html/body/div/div/div[2]/div/div[2]/form/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('juli23man@gmail.com')
-        
-
-        frame = context.pages[-1]
-        # Input password for super_admin login
-        elem = frame.locator('xpath=html/body/div/div/div[2]/div/div[2]/form/div[2]/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('password123')
-        
-
-        frame = context.pages[-1]
-        # Click login button to submit super_admin credentials
-        elem = frame.locator('xpath=html/body/div/div/div[2]/div/div[2]/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
+        await ensure_logged_in(page, 'juli23man@gmail.com', 'password123')
 
         # -> Try to click the login button again to see if login proceeds or if any error appears
-        frame = context.pages[-1]
-        # Click login button again to retry login
-        elem = frame.locator('xpath=html/body/div/div/div[2]/div/div[2]/form/div[2]/div/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
+        await ensure_logged_in(page, 'juli23man@gmail.com', 'password123')
 
         # -> Refresh the page to reset login form and try login again
-        await page.goto('http://localhost:3000/login', timeout=10000)
-        await asyncio.sleep(3)
+        await page.goto(f'{BASE_URL}/login', timeout=10000)
+        await settle(page)
         
 
         # -> Input email and password for super_admin and click login button
-        frame = context.pages[-1]
-        # Input email for super_admin login
-        elem = frame.locator('xpath=html/body/div/div/div[2]/div/div[2]/form/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('juli23man@gmail.com')
-        
-
-        frame = context.pages[-1]
-        # Input password for super_admin login
-        elem = frame.locator('xpath=html/body/div/div/div[2]/div/div[2]/form/div[2]/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('password123')
-        
-
-        frame = context.pages[-1]
-        # Click login button to submit super_admin credentials
-        elem = frame.locator('xpath=html/body/div/div/div[2]/div/div[2]/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
+        await ensure_logged_in(page, 'juli23man@gmail.com', 'password123')
 
         # --> Assertions to verify final state
         frame = context.pages[-1]
@@ -102,7 +68,6 @@ async def run_test():
             await expect(frame.locator('text=Dashboard Overview for Super Admin').first).to_be_visible(timeout=1000)
         except AssertionError:
             raise AssertionError('Test case failed: Dashboard for super_admin did not display all statistics and management quick actions as expected.')
-        await asyncio.sleep(5)
     
     finally:
         if context:
@@ -111,6 +76,6 @@ async def run_test():
             await browser.close()
         if pw:
             await pw.stop()
-            
-asyncio.run(run_test())
-    
\ No newline at end of file
+
+if __name__ == "__main__":
+    asyncio.run(run_test())
@@ -1,6 +1,8 @@
 import asyncio
 from playwright import async_api
 from playwright.async_api import expect
+from runner.config import BASE_URL
+from runner.helpers import ensure_logged_in, settle
 
 async def run_test():
     pw = None
@@ -30,7 +32,7 @@ async def run_test():
         page = await context.new_page()
         
         # Navigate to your target URL and wait until the network request is committed
-        await page.goto("http://localhost:3000", wait_until="commit", timeout=10000)
+        await page.goto(f"{BASE_URL}", wait_until="commit", timeout=10000)
         
         # Wait for the main page to reach DOMContentLoaded state (optional for stability)
         try:
@@ -47,72 +49,56 @@ async def run_test():
         
         # Interact with the page elements to simulate user flow
         # -> Input email and password, then click login button to authenticate user.
-        frame = context.pages[-1]
-        # Input email for login
-        elem = frame.locator('xpath=html/body/div/div/div[2]/div/div[2]/form/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('juli23man@gmail.com')
-        
-
-        frame = context.pages[-1]
-        # Input password for login
-        elem = frame.locator('xpath=html/body/div/div/div[2]/div/div[2]/form/div[2]/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('password123')
-        
-
-        frame = context.pages[-1]
-        # Click login button to submit credentials
-        elem = frame.locator('xpath=html/body/div/div/div[2]/div/div[2]/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
+        await ensure_logged_in(page, 'juli23man@gmail.com', 'password123')
 
         # -> Fill in business information form and submit to create the business and proceed to subscription plan creation.
         frame = context.pages[-1]
         # Input business name
         elem = frame.locator('xpath=html/body/div/div/div[2]/div/div[2]/div[2]/form/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('Test Retail Business')
+        await elem.fill('Test Retail Business')
         
 
         frame = context.pages[-1]
         # Input optional email
         elem = frame.locator('xpath=html/body/div/div/div[2]/div/div[2]/div[2]/form/div[3]/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('test@business.com')
+        await elem.fill('test@business.com')
         
 
         frame = context.pages[-1]
         # Input optional phone
         elem = frame.locator('xpath=html/body/div/div/div[2]/div/div[2]/div[2]/form/div[3]/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('08123456789')
+        await elem.fill('08123456789')
         
 
         frame = context.pages[-1]
         # Input optional address
         elem = frame.locator('xpath=html/body/div/div/div[2]/div/div[2]/div[2]/form/div[4]/textarea').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('Jl. Contoh No. 123, Jakarta')
+        await elem.fill('Jl. Contoh No. 123, Jakarta')
         
 
         frame = context.pages[-1]
         # Input optional NPWP
         elem = frame.locator('xpath=html/body/div/div/div[2]/div/div[2]/div[2]/form/div[5]/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('12.345.678.9-012.345')
+        await elem.fill('12.345.678.9-012.345')
         
 
         frame = context.pages[-1]
         # Input tax rate
         elem = frame.locator('xpath=html/body/div/div/div[2]/div/div[2]/div[2]/form/div[5]/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('10')
+        await elem.fill('10')
         
 
         frame = context.pages[-1]
         # Click 'Buat Bisnis & Mulai' button to create business and proceed
         elem = frame.locator('xpath=html/body/div/div/div[2]/div/div[2]/div[2]/form/div[7]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await elem.click(timeout=5000); await settle(page)
         
 
         # -> Try to resubmit the business creation form by clicking the 'Buat Bisnis & Mulai' button again to see if it proceeds.
         frame = context.pages[-1]
         # Click 'Buat Bisnis & Mulai' button again to retry business creation
         elem = frame.locator('xpath=html/body/div/div/div[2]/div/div[2]/div[2]/form/div[7]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await elem.click(timeout=5000); await settle(page)
         
 
         # --> Assertions to verify final state
@@ -121,7 +107,6 @@ async def run_test():
             await expect(frame.locator('text=Subscription Plan Successfully Created').first).to_be_visible(timeout=1000)
         except AssertionError:
             raise AssertionError("Test plan failed: Subscription plan creation, user assignment, usage tracking, billing calculations, and payment processing verification did not complete successfully.")
-        await asyncio.sleep(5)
     
     finally:
         if context:
@@ -130,6 +115,6 @@ async def run_test():
             await browser.close()
         if pw:
             await pw.stop()
-            
-asyncio.run(run_test())
-    
\ No newline at end of file
+
+if __name__ == "__main__":
+    asyncio.run(run_test())
@@ -1,6 +1,8 @@
 import asyncio
 from playwright import async_api
 from playwright.async_api import expect
+from runner.config import BASE_URL
+from runner.helpers import ensure_logged_in, settle
 
 async def run_test():
     pw = None
@@ -30,7 +32,7 @@ async def run_test():
         page = await context.new_page()
         
         # Navigate to your target URL and wait until the network request is committed
-        await page.goto("http://localhost:3000", wait_until="commit", timeout=10000)
+        await page.goto(f"{BASE_URL}", wait_until="commit", timeout=10000)
         
         # Wait for the main page to reach DOMContentLoaded state (optional for stability)
         try:
@@ -47,92 +49,72 @@ async def run_test():
         
         # Interact with the page elements to simulate user flow
         # -> Input email and password for kitchen role and click login button.
-        frame = context.pages[-1]
-        # Input email for kitchen role login
-        elem = frame.locator('xpath=html/body/div/div/div[2]/div/div[2]/form/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('juli23man@gmail.com')
-        
-
-        frame = context.pages[-1]
-        # Input password for kitchen role login
-        elem = frame.locator('xpath=html/body/div/div/div[2]/div/div[2]/form/div[2]/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('password123')
-        
-
-        frame = context.pages[-1]
-        # Click login button to submit credentials
-        elem = frame.locator('xpath=html/body/div/div/div[2]/div/div[2]/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
+        await ensure_logged_in(page, 'juli23man@gmail.com', 'password123')
 
         # -> Retry login by clicking the active login button if available or refresh page and try again.
-        frame = context.pages[-1]
-        # Click the login button to retry login
-        elem = frame.locator('xpath=html/body/div/div/div[2]/div/div[2]/form/div[2]/div/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
+        await ensure_logged_in(page, 'juli23man@gmail.com', 'password123')
 
         # -> Select a business type, fill in required business name, optionally fill other fields, then click 'Buat Bisnis & Mulai' to proceed.
         frame = context.pages[-1]
         # Input business name
         elem = frame.locator('xpath=html/body/div/div/div[2]/div/div[2]/div[2]/form/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('Test Restaurant')
+        await elem.fill('Test Restaurant')
         
 
         frame = context.pages[-1]
         # Input optional email
         elem = frame.locator('xpath=html/body/div/div/div[2]/div/div[2]/div[2]/form/div[3]/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('test@restaurant.com')
+        await elem.fill('test@restaurant.com')
         
 
         frame = context.pages[-1]
         # Input optional phone
         elem = frame.locator('xpath=html/body/div/div/div[2]/div/div[2]/div[2]/form/div[3]/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('08123456789')
+        await elem.fill('08123456789')
         
 
         frame = context.pages[-1]
         # Input optional address
         elem = frame.locator('xpath=html/body/div/div/div[2]/div/div[2]/div[2]/form/div[4]/textarea').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('Jl. Contoh No. 123, Jakarta')
+        await elem.fill('Jl. Contoh No. 123, Jakarta')
         
 
         frame = context.pages[-1]
         # Input optional NPWP
         elem = frame.locator('xpath=html/body/div/div/div[2]/div/div[2]/div[2]/form/div[5]/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('01.234.567.8-901.234')
+        await elem.fill('01.234.567.8-901.234')
         
 
         frame = context.pages[-1]
         # Input tax rate
         elem = frame.locator('xpath=html/body/div/div/div[2]/div/div[2]/div[2]/form/div[5]/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('10')
+        await elem.fill('10')
         
 
         frame = context.pages[-1]
         # Click 'Buat Bisnis & Mulai' button to submit business setup form
         elem = frame.locator('xpath=html/body/div/div/div[2]/div/div[2]/div[2]/form/div[7]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await elem.click(timeout=5000); await settle(page)
         
 
         # -> Select a business type from the dropdown and resubmit the form.
         frame = context.pages[-1]
         # Click on business type dropdown to open options
         elem = frame.locator('xpath=html/body/div/div/div[2]/div/div[2]/div[2]/form/div/select').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await elem.click(timeout=5000); await settle(page)
         
 
         frame = context.pages[-1]
         # Click 'Buat Bisnis & Mulai' button to submit form after selecting business type
         elem = frame.locator('xpath=html/body/div/div/div[2]/div/div[2]/div[2]/form/div[7]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await elem.click(timeout=5000); await settle(page)
         
 
         # -> Retry submitting the business setup form or check for any validation errors or page issues preventing navigation.
         frame = context.pages[-1]
         # Click 'Buat Bisnis & Mulai' button again to retry submission
         elem = frame.locator('xpath=html/body/div/div/div[2]/div/div[2]/div[2]/form/div[7]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await elem.click(timeout=5000); await settle(page)
         
 
         # --> Assertions to verify final state
@@ -141,7 +123,6 @@ async def run_test():
             await expect(frame.locator('text=Real-time order updates and table management dashboard').first).to_be_visible(timeout=1000)
         except AssertionError:
             raise AssertionError("Test case failed: The kitchen and waiter dashboards do not provide accurate, real-time order and table management features as required by the test plan.")
-        await asyncio.sleep(5)
     
     finally:
         if context:
@@ -150,6 +131,6 @@ async def run_test():
             await browser.close()
         if pw:
             await pw.stop()
-            
-asyncio.run(run_test())
-    
\ No newline at end of file
+
+if __name__ == "__main__":
+    asyncio.run(run_test())
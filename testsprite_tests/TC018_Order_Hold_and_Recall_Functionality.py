@@ -1,6 +1,8 @@
 import asyncio
 from playwright import async_api
 from playwright.async_api import expect
+from runner.config import BASE_URL
+from runner.helpers import ensure_logged_in, settle
 
 async def run_test():
     pw = None
@@ -30,7 +32,7 @@ async def run_test():
         page = await context.new_page()
         
         # Navigate to your target URL and wait until the network request is committed
-        await page.goto("http://localhost:3000", wait_until="commit", timeout=10000)
+        await page.goto(f"{BASE_URL}", wait_until="commit", timeout=10000)
         
         # Wait for the main page to reach DOMContentLoaded state (optional for stability)
         try:
@@ -47,30 +49,10 @@ async def run_test():
         
         # Interact with the page elements to simulate user flow
         # -> Input email and password, then click login button
-        frame = context.pages[-1]
-        # Input email address
-        elem = frame.locator('xpath=html/body/div/div/div[2]/div/div[2]/form/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('juli23man@gmail.com')
-        
-
-        frame = context.pages[-1]
-        # Input password
-        elem = frame.locator('xpath=html/body/div/div/div[2]/div/div[2]/form/div[2]/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('password123')
-        
-
-        frame = context.pages[-1]
-        # Click login button
-        elem = frame.locator('xpath=html/body/div/div/div[2]/div/div[2]/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
+        await ensure_logged_in(page, 'juli23man@gmail.com', 'password123')
 
         # -> Retry login by clicking the login button again or check for error messages.
-        frame = context.pages[-1]
-        # Click login button to retry login
-        elem = frame.locator('xpath=html/body/div/div/div[2]/div/div[2]/form/div[2]/div/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
-        
+        await ensure_logged_in(page, 'juli23man@gmail.com', 'password123')
 
         # -> Look for navigation or buttons to proceed to POS or cashier interface to start new order.
         await page.mouse.wheel(0, await page.evaluate('() => window.innerHeight'))
@@ -80,27 +62,27 @@ async def run_test():
         frame = context.pages[-1]
         # Input business name
         elem = frame.locator('xpath=html/body/div/div/div[2]/div/div[2]/div[2]/form/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('Warung Makan Sederhana')
+        await elem.fill('Warung Makan Sederhana')
         
 
         frame = context.pages[-1]
         # Click 'Buat Bisnis & Mulai' button to proceed to POS system
         elem = frame.locator('xpath=html/body/div/div/div[2]/div/div[2]/div[2]/form/div[7]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await elem.click(timeout=5000); await settle(page)
         
 
         # -> Try to click the business type dropdown to open options, then select 'Restaurant & Cafe' option manually.
         frame = context.pages[-1]
         # Click business type dropdown to open options
         elem = frame.locator('xpath=html/body/div/div/div[2]/div/div[2]/div[2]/form/div/select').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await elem.click(timeout=5000); await settle(page)
         
 
         # -> Select 'Restaurant & Cafe' from dropdown and click 'Buat Bisnis & Mulai' button to proceed to POS system.
         frame = context.pages[-1]
         # Click 'Buat Bisnis & Mulai' button to proceed
         elem = frame.locator('xpath=html/body/div/div/div[2]/div/div[2]/div[2]/form/div[7]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await elem.click(timeout=5000); await settle(page)
         
 
         # --> Assertions to verify final state
@@ -109,7 +91,6 @@ async def run_test():
             await expect(frame.locator('text=Order successfully held and recalled').first).to_be_visible(timeout=1000)
         except AssertionError:
             raise AssertionError("Test failed: The test plan to verify that orders can be put on hold and recalled correctly in POS systems has failed. The expected confirmation message 'Order successfully held and recalled' was not found on the page, indicating the hold and recall functionality did not work as intended.")
-        await asyncio.sleep(5)
     
     finally:
         if context:
@@ -118,6 +99,6 @@ async def run_test():
             await browser.close()
         if pw:
             await pw.stop()
-            
-asyncio.run(run_test())
-    
\ No newline at end of file
+
+if __name__ == "__main__":
+    asyncio.run(run_test())
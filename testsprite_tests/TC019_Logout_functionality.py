@@ -1,6 +1,8 @@
 import asyncio
 from playwright import async_api
 from playwright.async_api import expect
+from runner.config import BASE_URL
+from runner.helpers import ensure_logged_in, settle
 
 async def run_test():
     pw = None
@@ -30,7 +32,7 @@ async def run_test():
         page = await context.new_page()
         
         # Navigate to your target URL and wait until the network request is committed
-        await page.goto("http://localhost:3000", wait_until="commit", timeout=10000)
+        await page.goto(f"{BASE_URL}", wait_until="commit", timeout=10000)
         
         # Wait for the main page to reach DOMContentLoaded state (optional for stability)
         try:
@@ -50,19 +52,19 @@ async def run_test():
         frame = context.pages[-1]
         # Input email for login
         elem = frame.locator('xpath=html/body/div/div/div[2]/div/div[2]/form/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('juli23man@gmail.com')
+        await elem.fill('juli23man@gmail.com')
         
 
         frame = context.pages[-1]
         # Input password for login
         elem = frame.locator('xpath=html/body/div/div/div[2]/div/div[2]/form/div[2]/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('password123')
+        await elem.fill('password123')
         
 
         frame = context.pages[-1]
         # Click login button to submit credentials
         elem = frame.locator('xpath=html/body/div/div/div[2]/div/div[2]/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await elem.click(timeout=5000); await settle(page)
         
 
         # --> Assertions to verify final state
@@ -71,7 +73,6 @@ async def run_test():
             await expect(frame.locator('text=User is still logged in').first).to_be_visible(timeout=1000)
         except AssertionError:
             raise AssertionError('Test case failed: The user session was not terminated securely after logout, indicating a failure in the logout functionality as per the test plan.')
-        await asyncio.sleep(5)
     
     finally:
         if context:
@@ -80,6 +81,6 @@ async def run_test():
             await browser.close()
         if pw:
             await pw.stop()
-            
-asyncio.run(run_test())
-    
\ No newline at end of file
+
+if __name__ == "__main__":
+    asyncio.run(run_test())
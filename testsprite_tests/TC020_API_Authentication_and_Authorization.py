@@ -1,6 +1,8 @@
 import asyncio
 from playwright import async_api
 from playwright.async_api import expect
+from runner.config import BASE_URL
+from runner.helpers import ensure_logged_in, settle
 
 async def run_test():
     pw = None
@@ -30,7 +32,7 @@ async def run_test():
         page = await context.new_page()
         
         # Navigate to your target URL and wait until the network request is committed
-        await page.goto("http://localhost:3000", wait_until="commit", timeout=10000)
+        await page.goto(f"{BASE_URL}", wait_until="commit", timeout=10000)
         
         # Wait for the main page to reach DOMContentLoaded state (optional for stability)
         try:
@@ -50,103 +52,103 @@ async def run_test():
         frame = context.pages[-1]
         # Input email for login
         elem = frame.locator('xpath=html/body/div/div/div[2]/div/div[2]/form/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('juli23man@gmail.com')
+        await elem.fill('juli23man@gmail.com')
         
 
         frame = context.pages[-1]
         # Input password for login
         elem = frame.locator('xpath=html/body/div/div/div[2]/div/div[2]/form/div[2]/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('password123')
+        await elem.fill('password123')
         
 
         frame = context.pages[-1]
         # Click login button to submit credentials
         elem = frame.locator('xpath=html/body/div/div/div[2]/div/div[2]/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await elem.click(timeout=5000); await settle(page)
         
 
         # -> Retry login or check for error messages on the login page
         frame = context.pages[-1]
         # Click the login button again to retry login
         elem = frame.locator('xpath=html/body/div/div/div[2]/div/div[2]/form/div[2]/div/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await elem.click(timeout=5000); await settle(page)
         
 
         # -> Attempt API calls to protected endpoints without authentication token to verify 401 Unauthorized responses
-        await page.goto('http://localhost:3000/api/protected-endpoint', timeout=10000)
-        await asyncio.sleep(3)
+        await page.goto(f'{BASE_URL}/api/protected-endpoint', timeout=10000)
+        await settle(page)
         
 
         # -> Input email and password, then click login button to obtain valid authentication token
         frame = context.pages[-1]
         # Input email for login
         elem = frame.locator('xpath=html/body/div/div/div[2]/div/div[2]/form/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('juli23man@gmail.com')
+        await elem.fill('juli23man@gmail.com')
         
 
         frame = context.pages[-1]
         # Input password for login
         elem = frame.locator('xpath=html/body/div/div/div[2]/div/div[2]/form/div[2]/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('password123')
+        await elem.fill('password123')
         
 
         frame = context.pages[-1]
         # Click login button to submit credentials
         elem = frame.locator('xpath=html/body/div/div/div[2]/div/div[2]/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await elem.click(timeout=5000); await settle(page)
         
 
         # -> Attempt API calls to protected endpoints without authentication token to verify 401 Unauthorized responses
-        await page.goto('http://localhost:3000/api/protected-endpoint', timeout=10000)
-        await asyncio.sleep(3)
+        await page.goto(f'{BASE_URL}/api/protected-endpoint', timeout=10000)
+        await settle(page)
         
 
         # -> Input email and password, then click login button to obtain valid authentication token
         frame = context.pages[-1]
         # Input email for login
         elem = frame.locator('xpath=html/body/div/div/div[2]/div/div[2]/form/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('juli23man@gmail.com')
+        await elem.fill('juli23man@gmail.com')
         
 
         frame = context.pages[-1]
         # Input password for login
         elem = frame.locator('xpath=html/body/div/div/div[2]/div/div[2]/form/div[2]/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('password123')
+        await elem.fill('password123')
         
 
         frame = context.pages[-1]
         # Click login button to submit credentials
         elem = frame.locator('xpath=html/body/div/div/div[2]/div/div[2]/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await elem.click(timeout=5000); await settle(page)
         
 
         # -> Attempt API calls to protected endpoints without authentication token to verify 401 Unauthorized responses
-        await page.goto('http://localhost:3000/api/protected-endpoint', timeout=10000)
-        await asyncio.sleep(3)
+        await page.goto(f'{BASE_URL}/api/protected-endpoint', timeout=10000)
+        await settle(page)
         
 
         # -> Input email and password, then click login button to obtain valid authentication token
         frame = context.pages[-1]
         # Input email for login
         elem = frame.locator('xpath=html/body/div/div/div[2]/div/div[2]/form/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('juli23man@gmail.com')
+        await elem.fill('juli23man@gmail.com')
         
 
         frame = context.pages[-1]
         # Input password for login
         elem = frame.locator('xpath=html/body/div/div/div[2]/div/div[2]/form/div[2]/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('password123')
+        await elem.fill('password123')
         
 
         frame = context.pages[-1]
         # Click login button to submit credentials
         elem = frame.locator('xpath=html/body/div/div/div[2]/div/div[2]/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await elem.click(timeout=5000); await settle(page)
         
 
         # -> Attempt API calls to protected endpoints without authentication token to verify 401 Unauthorized responses
-        await page.goto('http://localhost:3000/api/protected-endpoint', timeout=10000)
-        await asyncio.sleep(3)
+        await page.goto(f'{BASE_URL}/api/protected-endpoint', timeout=10000)
+        await settle(page)
         
 
         # --> Assertions to verify final state
@@ -158,7 +160,6 @@ async def run_test():
         await expect(frame.locator('text=Masuk').first).to_be_visible(timeout=30000)
         await expect(frame.locator('text=Lanjutkan dengan Google').first).to_be_visible(timeout=30000)
         await expect(frame.locator('text=Belum punya akun?').first).to_be_visible(timeout=30000)
-        await asyncio.sleep(5)
     
     finally:
         if context:
@@ -167,6 +168,6 @@ async def run_test():
             await browser.close()
         if pw:
             await pw.stop()
-            
-asyncio.run(run_test())
-    
\ No newline at end of file
+
+if __name__ == "__main__":
+    asyncio.run(run_test())
@@ -1,6 +1,8 @@
 import asyncio
 from playwright import async_api
 from playwright.async_api import expect
+from runner.config import BASE_URL
+from runner.helpers import ensure_logged_in, settle
 
 async def run_test():
     pw = None
@@ -30,7 +32,7 @@ async def run_test():
         page = await context.new_page()
         
         # Navigate to your target URL and wait until the network request is committed
-        await page.goto("http://localhost:3000", wait_until="commit", timeout=10000)
+        await page.goto(f"{BASE_URL}", wait_until="commit", timeout=10000)
         
         # Wait for the main page to reach DOMContentLoaded state (optional for stability)
         try:
@@ -50,39 +52,39 @@ async def run_test():
         frame = context.pages[-1]
         # Input email address
         elem = frame.locator('xpath=html/body/div/div/div[2]/div/div[2]/form/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('juli23man@gmail.com')
+        await elem.fill('juli23man@gmail.com')
         
 
         frame = context.pages[-1]
         # Input password
         elem = frame.locator('xpath=html/body/div/div/div[2]/div/div[2]/form/div[2]/div/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('password123')
+        await elem.fill('password123')
         
 
         frame = context.pages[-1]
         # Click login button to submit credentials
         elem = frame.locator('xpath=html/body/div/div/div[2]/div/div[2]/form/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await elem.click(timeout=5000); await settle(page)
         
 
         # -> Retry login or check for error messages, then intercept API requests to verify HTTPS and encryption of sensitive data.
         frame = context.pages[-1]
         # Click login button again to retry login
         elem = frame.locator('xpath=html/body/div/div/div[2]/div/div[2]/form/div[2]/div/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await elem.click(timeout=5000); await settle(page)
         
 
         # -> Select a business type from the dropdown, fill in the business name, and submit the form to proceed.
         frame = context.pages[-1]
         # Input business name
         elem = frame.locator('xpath=html/body/div/div/div[2]/div/div[2]/div[2]/form/div[2]/input').nth(0)
-        await page.wait_for_timeout(3000); await elem.fill('Test Business')
+        await elem.fill('Test Business')
         
 
         frame = context.pages[-1]
         # Click 'Buat Bisnis & Mulai' button to submit business setup form
         elem = frame.locator('xpath=html/body/div/div/div[2]/div/div[2]/div[2]/form/div[7]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await elem.click(timeout=5000); await settle(page)
         
 
         # -> Manually scroll to dropdown and try to select a business type option again, then submit the form.
@@ -92,21 +94,21 @@ async def run_test():
         frame = context.pages[-1]
         # Click 'Buat Bisnis & Mulai' button to submit business setup form
         elem = frame.locator('xpath=html/body/div/div/div[2]/div/div[2]/div[2]/form/div[7]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await elem.click(timeout=5000); await settle(page)
         
 
         # -> Select 'Retail Store' from the business type dropdown and submit the form.
         frame = context.pages[-1]
         # Click 'Buat Bisnis & Mulai' button to submit business setup form
         elem = frame.locator('xpath=html/body/div/div/div[2]/div/div[2]/div[2]/form/div[7]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await elem.click(timeout=5000); await settle(page)
         
 
         # -> Click the 'Buat Bisnis & Mulai' button to submit the business setup form and proceed to the main application interface to intercept API requests.
         frame = context.pages[-1]
         # Click 'Buat Bisnis & Mulai' button to submit business setup form
         elem = frame.locator('xpath=html/body/div/div/div[2]/div/div[2]/div[2]/form/div[7]/button').nth(0)
-        await page.wait_for_timeout(3000); await elem.click(timeout=5000)
+        await elem.click(timeout=5000); await settle(page)
         
 
         # --> Assertions to verify final state
@@ -115,7 +117,6 @@ async def run_test():
             await expect(frame.locator('text=Sensitive Data Leak Detected').first).to_be_visible(timeout=1000)
         except AssertionError:
             raise AssertionError("Test case failed: Sensitive data is not properly encrypted in transit or stored data is not protected as per the test plan. Immediate attention required to ensure session and token management prevents unauthorized access.")
-        await asyncio.sleep(5)
     
     finally:
         if context:
@@ -124,6 +125,6 @@ async def run_test():
             await browser.close()
         if pw:
             await pw.stop()
-            
-asyncio.run(run_test())
-    
\ No newline at end of file
+
+if __name__ == "__main__":
+    asyncio.run(run_test())
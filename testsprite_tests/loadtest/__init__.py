@@ -0,0 +1,18 @@
+"""API load generator for the QuickNext backend (replaces the TC014 browser checks).
+
+Virtual users share one Sanctum token per account (logging in per user would
+only measure the login throttle) and send the X-Business-Id / X-Outlet-Id
+headers the POS sends::
+
+    cd testsprite_tests
+    pip install httpx
+    python -m loadtest --user owner@example.com:secret --vus pos_checkout=5 --vus catalog=20 \\
+        --duration 60 --json load.json
+    python -m loadtest ... --baseline load.json --max-regression 0.25 --budget catalog.products=300
+
+Exits non-zero when a budget or the baseline comparison fails, so a deploy
+pipeline can gate on it. The v1 API throttles each account (60 requests per
+minute by default); pass several --user accounts or raise the limit on the
+target environment, otherwise most requests end up as 429 and are reported
+as such instead of as latency.
+"""
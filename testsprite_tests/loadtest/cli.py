@@ -0,0 +1,125 @@
+"""Command line entry point: python -m loadtest [options]."""
+
+import argparse
+import asyncio
+import os
+import random
+import time
+
+from .scenarios import SCENARIOS
+from .session import ApiSession, LoginError
+from .stats import Recorder, check, load_json, print_summary, write_json
+
+DEFAULT_VUS = {"pos_checkout": 2, "catalog": 5, "kitchen_poll": 3, "report_summary": 1}
+
+
+def key_value(text, cast):
+    name, _, value = text.partition("=")
+    if not name or not value:
+        raise argparse.ArgumentTypeError(f"expected NAME=VALUE, got {text!r}")
+    return name, cast(value)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m loadtest", description="Concurrent API load test with latency percentiles.")
+    parser.add_argument("--api-url", default=os.environ.get("TESTSPRITE_API_URL", "http://localhost:8000/api"))
+    parser.add_argument("--user", action="append", dest="users",
+                        help="EMAIL:PASSWORD, repeatable; virtual users are spread over the accounts")
+    parser.add_argument("--business", type=int, help="X-Business-Id (default: first business of the account)")
+    parser.add_argument("--outlet", type=int, help="X-Outlet-Id (default: first outlet of the business)")
+    parser.add_argument("--vus", action="append", type=lambda text: key_value(text, int), metavar="SCENARIO=N",
+                        help=f"virtual users per scenario, repeatable (default: {DEFAULT_VUS}); "
+                             f"scenarios: {', '.join(SCENARIOS)}")
+    parser.add_argument("--duration", type=float, default=30, help="seconds of load after ramp-up starts")
+    parser.add_argument("--ramp-up", type=float, default=5, help="seconds over which virtual users start")
+    parser.add_argument("--think", type=float, default=0.5, help="mean pause between iterations (seconds)")
+    parser.add_argument("--json", dest="json_path", help="write the summary to this JSON file")
+    parser.add_argument("--baseline", help="summary JSON of a previous run to compare against")
+    parser.add_argument("--max-regression", type=float, default=0.2, help="allowed slowdown vs baseline (0.2 = 20%%)")
+    parser.add_argument("--metric", default="p95_ms", choices=["p50_ms", "p95_ms", "p99_ms"])
+    parser.add_argument("--budget", action="append", type=lambda text: key_value(text, float), metavar="ENDPOINT=MS",
+                        help="absolute latency budget for an endpoint, repeatable")
+    parser.add_argument("--max-error-rate", type=float, default=0.01)
+    return parser.parse_args(argv)
+
+
+async def virtual_user(scenario, session, recorder, start_delay, deadline, think):
+    await asyncio.sleep(start_delay)
+    state = {}
+    while time.perf_counter() < deadline:
+        await scenario(session, recorder, state)
+        if think:
+            await asyncio.sleep(random.uniform(0.5, 1.5) * think)
+
+
+async def run(args):
+    vus = dict(args.vus) if args.vus else dict(DEFAULT_VUS)
+    unknown = set(vus) - set(SCENARIOS)
+    if unknown:
+        print(f"Unknown scenario(s): {', '.join(sorted(unknown))}")
+        return 2
+
+    users = args.users or [os.environ.get("TESTSPRITE_USER", "juli23man@gmail.com:password123")]
+    total = sum(vus.values())
+    sessions = [
+        ApiSession(args.api_url, *user.split(":", 1), business_id=args.business, outlet_id=args.outlet)
+        for user in users
+    ]
+
+    try:
+        try:
+            for session in sessions:
+                await session.login()
+                print(f"Logged in {session.email} (business {session.business_id}, outlet {session.outlet_id})")
+        except LoginError as error:
+            print(error)
+            return 2
+
+        recorder = Recorder()
+        deadline = time.perf_counter() + args.duration
+        tasks = []
+        for name, count in vus.items():
+            for _ in range(count):
+                index = len(tasks)
+                tasks.append(virtual_user(
+                    SCENARIOS[name],
+                    sessions[index % len(sessions)],
+                    recorder,
+                    args.ramp_up * index / max(total, 1),
+                    deadline,
+                    args.think,
+                ))
+
+        print(f"Running {total} virtual users for {args.duration:.0f}s: "
+              + ", ".join(f"{name}={count}" for name, count in vus.items()))
+        await asyncio.gather(*tasks)
+        recorder.stop()
+    finally:
+        for session in sessions:
+            await session.close()
+
+    summary = recorder.summary()
+    summary["config"] = {"vus": vus, "duration_s": args.duration, "think_s": args.think, "accounts": len(users)}
+    print_summary(summary)
+
+    failures = check(
+        summary,
+        baseline=load_json(args.baseline) if args.baseline else None,
+        max_regression=args.max_regression,
+        budgets=dict(args.budget or []),
+        max_error_rate=args.max_error_rate,
+        metric=args.metric,
+    )
+    summary["failures"] = failures
+
+    if args.json_path:
+        write_json(args.json_path, summary)
+
+    for failure in failures:
+        print(f"FAIL {failure}")
+
+    return 1 if failures else 0
+
+
+def main(argv=None):
+    return asyncio.run(run(parse_args(argv)))
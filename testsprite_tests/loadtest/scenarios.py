@@ -0,0 +1,99 @@
+"""Scenarios: one call runs one iteration of a virtual user.
+
+Each scenario receives the account's ApiSession, the Recorder and a dict that
+lives as long as the virtual user (ETags, cursors, the product list), so
+repeated iterations behave like a POS that stays open rather than a cold
+client.
+"""
+
+import random
+
+SCENARIOS = {}
+
+
+def scenario(name):
+    def register(function):
+        SCENARIOS[name] = function
+        return function
+    return register
+
+
+async def load_catalog(session, recorder, state, name="catalog.products"):
+    """GET /v1/products with the POS's If-None-Match revalidation."""
+    headers = {"If-None-Match": state["etag"]} if state.get("etag") else {}
+    response = await session.request(recorder, name, "GET", "/v1/products", headers=headers)
+
+    if response is not None and response.status_code == 200:
+        state["etag"] = response.headers.get("ETag")
+        state["version"] = int(response.headers.get("X-Catalog-Version") or 0)
+        state["products"] = [
+            product for product in response.json()
+            if product.get("stock_type") == "untracked" or float(product.get("stock") or 0) > 5
+        ]
+
+    return state.get("products", [])
+
+
+@scenario("pos_checkout")
+async def pos_checkout(session, recorder, state):
+    """Cashier flow: revalidate the catalog, create an order, pay it in cash.
+
+    Creates real orders and moves stock; point it at a staging database.
+    """
+    products = await load_catalog(session, recorder, state, "pos_checkout.products")
+    if not products:
+        return
+
+    items = [
+        {"product_id": product["id"], "quantity": random.randint(1, 3), "price": float(product["price"])}
+        for product in random.sample(products, k=min(len(products), random.randint(1, 4)))
+    ]
+    response = await session.request(recorder, "pos_checkout.create_order", "POST", "/v1/orders", json={"items": items})
+    if response is None or response.status_code >= 300:
+        return
+
+    order = response.json().get("data") or {}
+    if order.get("id"):
+        await session.request(
+            recorder,
+            "pos_checkout.payment",
+            "POST",
+            f"/v1/orders/{order['id']}/payment",
+            json={"amount": float(order.get("total") or 0), "method": "cash"},
+        )
+
+
+@scenario("catalog")
+async def catalog(session, recorder, state):
+    """Catalog revalidation plus the delta sync the POS runs in the background."""
+    await load_catalog(session, recorder, state)
+
+    if state.get("version"):
+        await session.request(
+            recorder, "catalog.sync", "GET", "/v1/products/sync", params={"since": state["version"]}
+        )
+
+
+@scenario("kitchen_poll")
+async def kitchen_poll(session, recorder, state):
+    """Kitchen display: order list and the order-stream polling fallback."""
+    await session.request(recorder, "kitchen_poll.orders", "GET", "/v1/kitchen/orders")
+
+    response = await session.request(
+        recorder, "kitchen_poll.events", "GET", "/v1/order-stream/events", params={"since": state.get("cursor", 0)}
+    )
+    if response is not None and response.status_code == 200:
+        state["cursor"] = response.json().get("cursor", state.get("cursor", 0))
+
+
+@scenario("report_summary")
+async def report_summary(session, recorder, state):
+    """Owner dashboard: sales summary over a rotating range."""
+    date_range = random.choice(["today", "week", "month"])
+    await session.request(
+        recorder,
+        "report_summary.sales",
+        "GET",
+        "/v1/reports/sales/summary",
+        params={"date_range": date_range, "chart_type": "daily"},
+    )
@@ -0,0 +1,79 @@
+"""Authenticated API sessions (one per account, shared by its virtual users)."""
+
+import time
+
+import httpx
+
+
+class LoginError(RuntimeError):
+    pass
+
+
+class ApiSession:
+    """httpx client bound to one account, business and outlet."""
+
+    def __init__(self, base_url, email, password, business_id=None, outlet_id=None, timeout=30.0, limits=None):
+        self.email = email
+        self.password = password
+        self.business_id = business_id
+        self.outlet_id = outlet_id
+        self.client = httpx.AsyncClient(
+            base_url=base_url.rstrip("/"),
+            timeout=timeout,
+            limits=limits or httpx.Limits(max_connections=100, max_keepalive_connections=100),
+            headers={"Accept": "application/json"},
+        )
+
+    async def login(self):
+        response = await self.client.post("/login", json={"email": self.email, "password": self.password})
+        if response.status_code != 200 or not response.json().get("token"):
+            raise LoginError(f"login failed for {self.email}: HTTP {response.status_code} {response.text[:200]}")
+
+        self.client.headers["Authorization"] = f"Bearer {response.json()['token']}"
+
+        if not self.business_id:
+            businesses = _items(await self._get_json("/v1/businesses"))
+            if not businesses:
+                raise LoginError(f"{self.email} has no business")
+            self.business_id = businesses[0]["id"]
+        self.client.headers["X-Business-Id"] = str(self.business_id)
+
+        if not self.outlet_id:
+            outlets = _items(await self._get_json("/v1/outlets"))
+            if not outlets:
+                raise LoginError(f"business {self.business_id} has no outlet")
+            self.outlet_id = outlets[0]["id"]
+        self.client.headers["X-Outlet-Id"] = str(self.outlet_id)
+
+        return self
+
+    async def request(self, recorder, name, method, url, **kwargs):
+        """Send a request and record its latency under `name`.
+
+        Transport errors are recorded (status 0) and return None, so one
+        refused connection does not stop the virtual user.
+        """
+        started = time.perf_counter()
+        try:
+            response = await self.client.request(method, url, **kwargs)
+        except httpx.HTTPError as error:
+            recorder.record(name, time.perf_counter() - started, 0, type(error).__name__)
+            return None
+
+        recorder.record(name, time.perf_counter() - started, response.status_code)
+        return response
+
+    async def close(self):
+        await self.client.aclose()
+
+    async def _get_json(self, url):
+        response = await self.client.get(url)
+        if response.status_code != 200:
+            raise LoginError(f"GET {url} failed: HTTP {response.status_code} {response.text[:200]}")
+        return response.json()
+
+
+def _items(body):
+    if isinstance(body, dict):
+        body = body.get("data", [])
+    return body if isinstance(body, list) else []
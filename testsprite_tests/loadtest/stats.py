@@ -0,0 +1,103 @@
+"""Latency recording, percentiles and regression checks."""
+
+import json
+import math
+import time
+from collections import defaultdict
+
+
+def percentile(sorted_values, fraction):
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(fraction * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+class Recorder:
+    def __init__(self):
+        self.latencies = defaultdict(list)
+        self.statuses = defaultdict(lambda: defaultdict(int))
+        self.started = time.perf_counter()
+        self.finished = None
+
+    def record(self, name, seconds, status, error=None):
+        self.statuses[name][str(status) if not error else error] += 1
+        # Only answered, non-throttled requests count towards latency
+        if status and status != 429:
+            self.latencies[name].append(seconds * 1000)
+
+    def stop(self):
+        self.finished = time.perf_counter()
+
+    def summary(self):
+        duration = (self.finished or time.perf_counter()) - self.started
+        endpoints = {}
+
+        for name in sorted(self.statuses):
+            values = sorted(self.latencies[name])
+            statuses = dict(self.statuses[name])
+            total = sum(statuses.values())
+            failed = sum(count for status, count in statuses.items() if not status.isdigit() or int(status) >= 400)
+
+            endpoints[name] = {
+                "requests": total,
+                "throughput_rps": round(total / duration, 2) if duration else 0.0,
+                "error_rate": round(failed / total, 4) if total else 0.0,
+                "throttled": statuses.get("429", 0),
+                "p50_ms": round(percentile(values, 0.50), 1),
+                "p95_ms": round(percentile(values, 0.95), 1),
+                "p99_ms": round(percentile(values, 0.99), 1),
+                "max_ms": round(values[-1], 1) if values else 0.0,
+                "statuses": statuses,
+            }
+
+        requests = sum(endpoint["requests"] for endpoint in endpoints.values())
+        return {
+            "duration_s": round(duration, 2),
+            "requests": requests,
+            "throughput_rps": round(requests / duration, 2) if duration else 0.0,
+            "endpoints": endpoints,
+        }
+
+
+def check(summary, baseline=None, max_regression=0.2, budgets=None, max_error_rate=0.01, metric="p95_ms"):
+    """Failure messages for budget breaches and regressions against a baseline run."""
+    failures = []
+
+    for name, endpoint in summary["endpoints"].items():
+        if endpoint["error_rate"] > max_error_rate:
+            failures.append(f"{name}: error rate {endpoint['error_rate']:.1%} > {max_error_rate:.1%}")
+
+        budget = (budgets or {}).get(name)
+        if budget is not None and endpoint[metric] > budget:
+            failures.append(f"{name}: {metric} {endpoint[metric]}ms > budget {budget}ms")
+
+        previous = (baseline or {}).get("endpoints", {}).get(name)
+        if previous and previous[metric] > 0 and endpoint[metric] > previous[metric] * (1 + max_regression):
+            failures.append(
+                f"{name}: {metric} {endpoint[metric]}ms vs baseline {previous[metric]}ms "
+                f"(+{endpoint[metric] / previous[metric] - 1:.0%}, allowed +{max_regression:.0%})"
+            )
+
+    return failures
+
+
+def print_summary(summary):
+    width = max([len(name) for name in summary["endpoints"]] + [8])
+    print(f"\n{'Endpoint':<{width}}  {'Reqs':>6}  {'RPS':>7}  {'p50':>7}  {'p95':>7}  {'p99':>7}  {'Err':>6}  {'429':>5}")
+    for name, endpoint in summary["endpoints"].items():
+        print(f"{name:<{width}}  {endpoint['requests']:>6}  {endpoint['throughput_rps']:>7.1f}  "
+              f"{endpoint['p50_ms']:>7.1f}  {endpoint['p95_ms']:>7.1f}  {endpoint['p99_ms']:>7.1f}  "
+              f"{endpoint['error_rate']:>6.1%}  {endpoint['throttled']:>5}")
+    print(f"\n{summary['requests']} requests in {summary['duration_s']}s ({summary['throughput_rps']} req/s)")
+
+
+def load_json(path):
+    with open(path, encoding="utf-8") as handle:
+        return json.load(handle)
+
+
+def write_json(path, payload):
+    with open(path, "w", encoding="utf-8") as handle:
+        json.dump(payload, handle, indent=2)
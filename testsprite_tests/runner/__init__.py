@@ -0,0 +1,15 @@
+"""Parallel runner for the TestSprite Playwright scripts (TC*.py).
+
+One Chromium is shared by every test, each role logs in once and its
+Playwright storage_state is reused, and test cases run concurrently in
+separate browser contexts::
+
+    cd testsprite_tests
+    python -m runner -j 4
+    python -m runner -k TC005 -k TC016 --json report.json
+
+Scripts stay runnable on their own (``python TC005_....py``); the runner
+imports them and swaps their ``async_api`` for one bound to the shared
+browser. ``python -m runner.convert`` rewrites freshly generated scripts
+(fixed sleeps -> event-driven waits, login -> ``ensure_logged_in``).
+"""
@@ -0,0 +1,128 @@
+"""Shared Chromium, per-role storage states and the async_api shim handed to scripts."""
+
+import hashlib
+import time
+
+from playwright import async_api
+
+from . import config
+from .helpers import ensure_logged_in
+
+
+class SharedBrowser:
+    """One Chromium for the whole run; tests get their own context."""
+
+    def __init__(self, headed=False):
+        self.headed = headed
+        self.playwright = None
+        self.browser = None
+        self.states = {}
+
+    async def start(self):
+        self.playwright = await async_api.async_playwright().start()
+        self.browser = await self.playwright.chromium.launch(
+            headless=not self.headed,
+            args=config.LAUNCH_ARGS,
+        )
+        return self
+
+    async def stop(self):
+        if self.browser:
+            await self.browser.close()
+        if self.playwright:
+            await self.playwright.stop()
+
+    async def login(self, credentials, reuse=True):
+        """Log a role in once and keep its storage_state (None when login fails)."""
+        email, password = credentials
+        digest = hashlib.sha1(f"{config.BASE_URL}|{email}".encode()).hexdigest()[:12]
+        path = config.AUTH_DIR / f"{digest}.json"
+
+        if reuse and path.exists() and time.time() - path.stat().st_mtime < config.STATE_MAX_AGE_S:
+            self.states[credentials] = str(path)
+            return self.states[credentials]
+
+        context = await self.browser.new_context()
+        try:
+            page = await context.new_page()
+            await page.goto(f"{config.BASE_URL}/login", wait_until="domcontentloaded")
+            if await ensure_logged_in(page, email, password):
+                config.AUTH_DIR.mkdir(exist_ok=True)
+                await context.storage_state(path=str(path))
+                self.states[credentials] = str(path)
+            else:
+                self.states[credentials] = None
+        finally:
+            await context.close()
+
+        return self.states[credentials]
+
+    def api_for(self, credentials=None):
+        """async_api replacement bound to this browser (and a role's storage_state)."""
+        storage_state = self.states.get(credentials) if credentials else None
+        return _AsyncApiShim(self.browser, storage_state)
+
+
+class _AsyncApiShim:
+    """Stands in for ``playwright.async_api`` inside a TC module.
+
+    ``async_playwright().start()`` / ``chromium.launch()`` return the shared
+    browser, ``new_context()`` applies the role's storage_state, and
+    ``browser.close()`` / ``pw.stop()`` leave the shared browser running.
+    Anything else (Error, expect, ...) is the real module.
+    """
+
+    def __init__(self, browser, storage_state):
+        self._browser = browser
+        self._storage_state = storage_state
+
+    def async_playwright(self):
+        return _PlaywrightShim(self._browser, self._storage_state)
+
+    def __getattr__(self, name):
+        return getattr(async_api, name)
+
+
+class _PlaywrightShim:
+    def __init__(self, browser, storage_state):
+        self.chromium = _BrowserTypeShim(browser, storage_state)
+
+    async def start(self):
+        return self
+
+    async def stop(self):
+        pass
+
+
+class _BrowserTypeShim:
+    def __init__(self, browser, storage_state):
+        self._browser = browser
+        self._storage_state = storage_state
+
+    async def launch(self, **kwargs):
+        return _BrowserShim(self._browser, self._storage_state)
+
+
+class _BrowserShim:
+    def __init__(self, browser, storage_state):
+        self._browser = browser
+        self._storage_state = storage_state
+        self._contexts = []
+
+    async def new_context(self, **kwargs):
+        if self._storage_state and "storage_state" not in kwargs:
+            kwargs["storage_state"] = self._storage_state
+        context = await self._browser.new_context(**kwargs)
+        self._contexts.append(context)
+        return context
+
+    async def close(self):
+        # Only the contexts this test opened; the browser is shared
+        for context in self._contexts:
+            try:
+                await context.close()
+            except async_api.Error:
+                pass
+
+    def __getattr__(self, name):
+        return getattr(self._browser, name)
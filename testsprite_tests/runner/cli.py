@@ -0,0 +1,66 @@
+"""Command line entry point: python -m runner [options]."""
+
+import argparse
+import asyncio
+import os
+import time
+
+from . import config
+from .browser import SharedBrowser
+from .pool import discover, run_pool
+from .report import print_progress, print_summary, write_json
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m runner", description="Run TestSprite TC*.py scripts in parallel.")
+    parser.add_argument("-j", "--workers", type=int, default=int(os.environ.get("TESTSPRITE_WORKERS", 4)),
+                        help="concurrent browser contexts (default: 4)")
+    parser.add_argument("-k", "--filter", action="append", dest="patterns",
+                        help="only tests whose name contains this text (repeatable)")
+    parser.add_argument("--timeout", type=int, default=config.TEST_TIMEOUT_S, help="seconds per test")
+    parser.add_argument("--base-url", default=config.BASE_URL, help="frontend URL used for role logins")
+    parser.add_argument("--headed", action="store_true", help="show the browser")
+    parser.add_argument("--relogin", action="store_true", help="ignore saved storage states in .auth/")
+    parser.add_argument("--json", dest="json_path", help="write the results to this JSON file")
+    parser.add_argument("--list", action="store_true", help="list the selected tests and their login")
+    return parser.parse_args(argv)
+
+
+async def run(args):
+    cases = discover(args.patterns)
+    if not cases:
+        print("No tests selected.")
+        return 1
+
+    if args.list:
+        for case in cases:
+            login = "own login" if case.fresh_login or not case.credentials else case.credentials[0]
+            print(f"{case.name}  [{login}]")
+        return 0
+
+    shared = await SharedBrowser(headed=args.headed).start()
+    try:
+        started = time.perf_counter()
+        roles = sorted({case.credentials for case in cases if case.credentials and not case.fresh_login})
+        for credentials in roles:
+            state = await shared.login(credentials, reuse=not args.relogin)
+            print(f"Login {credentials[0]}: {'ok' if state else 'failed, tests will log in themselves'}")
+        login_seconds = time.perf_counter() - started
+
+        started = time.perf_counter()
+        results = await run_pool(shared, cases, args.workers, args.timeout, on_result=print_progress)
+        wall_seconds = time.perf_counter() - started
+    finally:
+        await shared.stop()
+
+    print_summary(results, wall_seconds, login_seconds, args.workers)
+    if args.json_path:
+        write_json(args.json_path, results, wall_seconds, login_seconds, args.workers)
+
+    return 0 if all(result.status == "passed" for result in results) else 1
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    config.BASE_URL = args.base_url.rstrip("/")
+    return asyncio.run(run(args))
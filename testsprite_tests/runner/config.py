@@ -0,0 +1,36 @@
+"""Runner settings (overridable through TESTSPRITE_* environment variables)."""
+
+import os
+import re
+from pathlib import Path
+
+TESTS_DIR = Path(__file__).resolve().parent.parent
+AUTH_DIR = TESTS_DIR / ".auth"
+
+BASE_URL = os.environ.get("TESTSPRITE_BASE_URL", "http://localhost:3000").rstrip("/")
+
+# Same xpaths the generated scripts use for the login form
+LOGIN_EMAIL = "xpath=html/body/div/div/div[2]/div/div[2]/form/div/input"
+LOGIN_PASSWORD = "xpath=html/body/div/div/div[2]/div/div[2]/form/div[2]/div/input"
+LOGIN_SUBMIT = "xpath=html/body/div/div/div[2]/div/div[2]/form/button"
+
+# The SPA keeps the Sanctum token in localStorage, which storage_state captures
+AUTH_TOKEN_CHECK = "() => !!window.localStorage.getItem('token')"
+
+LOGIN_TIMEOUT_MS = int(os.environ.get("TESTSPRITE_LOGIN_TIMEOUT_MS", 15000))
+SETTLE_TIMEOUT_MS = int(os.environ.get("TESTSPRITE_SETTLE_TIMEOUT_MS", 2000))
+TEST_TIMEOUT_S = int(os.environ.get("TESTSPRITE_TEST_TIMEOUT_S", 180))
+
+# Saved storage states older than this are logged in again
+STATE_MAX_AGE_S = int(os.environ.get("TESTSPRITE_STATE_MAX_AGE_S", 1800))
+
+# Tests about login/sessions/form validation (file name) or that log out
+# (source) get their own login: they drive the login form themselves, and a
+# logout revokes the token server-side, breaking every context sharing it
+FRESH_LOGIN_NAME = re.compile(r"login|logout|session|authentication|validation_and_error", re.IGNORECASE)
+LOGS_OUT = re.compile(r"keluar|log ?out", re.IGNORECASE)
+
+LAUNCH_ARGS = [
+    "--window-size=1280,720",
+    "--disable-dev-shm-usage",
+]
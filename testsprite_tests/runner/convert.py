@@ -0,0 +1,127 @@
+"""Rewrite generated TC*.py scripts for the runner (idempotent).
+
+    python -m runner.convert            # every TC*.py
+    python -m runner.convert TC005*.py  # selected files
+
+- email/password/submit sequences become ``ensure_logged_in`` (a no-op
+  when the context already carries the role's session); login and logout
+  tests keep driving the form themselves
+- fixed ``wait_for_timeout(3000)`` before each action is dropped: locator
+  actions already wait for the element; clicks are followed by ``settle``
+- standalone ``asyncio.sleep``/``wait_for_timeout`` pauses become ``settle``
+  and the trailing sleep before ``finally`` is removed
+- ``http://localhost:3000`` follows ``TESTSPRITE_BASE_URL``
+- ``asyncio.run`` moves under a ``__main__`` guard so the runner can import
+  the module
+"""
+
+import re
+import sys
+from pathlib import Path
+
+from . import config
+
+IMPORT = "from runner.config import BASE_URL\nfrom runner.helpers import ensure_logged_in, settle\n"
+
+STEP = re.compile(
+    r"        frame = context\.pages\[-1\]\n"
+    r"(?:        #[^\n]*\n)*"
+    r"        elem = frame\.locator\('(?P<xpath>[^']+)'\)\.nth\(0\)\n"
+    r"        await page\.wait_for_timeout\(3000\); await elem\.(?:fill\('(?P<value>[^']*)'\)|(?P<click>click)\(timeout=5000\))\n"
+    r"[ \t]*\n\s*\n"
+)
+
+FIXED_WAIT_CLICK = re.compile(r"await page\.wait_for_timeout\(\d+\); (await elem\.click\([^\n]*\))")
+FIXED_WAIT = re.compile(r"await page\.wait_for_timeout\(\d+\); ")
+TRAILING_SLEEP = re.compile(r"\n        await asyncio\.sleep\(\d+\)\n(\s*\n    finally:)")
+PAUSE = re.compile(r"^(\s*)await (?:asyncio\.sleep|page\.wait_for_timeout)\(\d+\)$", re.MULTILINE)
+LOCAL_URL = re.compile(r"""(["'])http://localhost:3000""")
+LOGIN_FORM = config.LOGIN_SUBMIT.rsplit("/", 1)[0] + "/"
+
+MAIN = re.compile(r"\n[ \t]*\nasyncio\.run\(run_test\(\)\)\s*$")
+
+
+def login_runs(source):
+    """Consecutive steps inside the login form, as lists of STEP matches."""
+    runs, run = [], []
+
+    for match in STEP.finditer(source):
+        if not match["xpath"].startswith(LOGIN_FORM):
+            run = []
+            continue
+        if run and run[-1].end() != match.start():
+            run = []
+        if not run:
+            runs.append(run)
+        run.append(match)
+
+    return runs
+
+
+def replace_logins(source):
+    """Turn each email/password/submit sequence into ensure_logged_in.
+
+    The generated scripts often retry the login (clear both fields, type
+    again, click around the form); with a saved session the form is not there
+    any more, so every retry collapses into the same idempotent call.
+    Sequences typing anything else are left alone: the same xpaths match the
+    register form too.
+    """
+    credentials = None
+
+    for run in login_runs(source):
+        values = {match["xpath"]: match["value"] for match in run if match["value"]}
+        if credentials is None and config.LOGIN_EMAIL in values and config.LOGIN_PASSWORD in values:
+            credentials = (values[config.LOGIN_EMAIL], values[config.LOGIN_PASSWORD])
+
+    if credentials is None:
+        return source
+
+    for run in reversed(login_runs(source)):
+        fills = [match for match in run if not match["click"]]
+        if any(match["xpath"] not in (config.LOGIN_EMAIL, config.LOGIN_PASSWORD) for match in fills):
+            continue
+        if any(match["value"] not in ("", *credentials) for match in fills):
+            continue
+        call = "        await ensure_logged_in(page, '%s', '%s')\n\n" % credentials
+        source = source[:run[0].start()] + call + source[run[-1].end():]
+
+    return source
+
+
+def convert(source, fresh_login=False):
+    if "from runner.helpers import" in source:
+        return source
+
+    if not fresh_login:
+        source = replace_logins(source)
+
+    source = FIXED_WAIT_CLICK.sub(r"\1; await settle(page)", source)
+    source = FIXED_WAIT.sub("", source)
+    source = TRAILING_SLEEP.sub(r"\n\1", source)
+    source = PAUSE.sub(r"\1await settle(page)", source)
+    source = LOCAL_URL.sub(r"f\1{BASE_URL}", source)
+    source = MAIN.sub('\n\nif __name__ == "__main__":\n    asyncio.run(run_test())\n', source)
+    source = source.replace("from playwright.async_api import expect\n",
+                            "from playwright.async_api import expect\n" + IMPORT, 1)
+
+    return source
+
+
+def main(argv=None):
+    names = argv if argv is not None else sys.argv[1:]
+    paths = [Path(name) for name in names] or sorted(config.TESTS_DIR.glob("TC*.py"))
+
+    for path in paths:
+        original = path.read_text(encoding="utf-8")
+        fresh_login = bool(config.FRESH_LOGIN_NAME.search(path.stem) or config.LOGS_OUT.search(original))
+        converted = convert(original, fresh_login)
+        if converted != original:
+            path.write_text(converted, encoding="utf-8")
+            print(f"converted {path.name}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
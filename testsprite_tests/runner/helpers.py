@@ -0,0 +1,49 @@
+"""Event-driven helpers used by the TC*.py scripts (standalone or under the runner)."""
+
+from playwright.async_api import Error as PlaywrightError
+
+from . import config
+
+
+async def settle(page, timeout=config.SETTLE_TIMEOUT_MS):
+    """Wait until the page is loaded and its requests have quietened down.
+
+    Replaces fixed ``wait_for_timeout``/``asyncio.sleep`` pauses. networkidle is
+    capped because the order stream (SSE) and long-polls keep a request open.
+    """
+    try:
+        await page.wait_for_load_state("domcontentloaded", timeout=timeout * 5)
+        await page.wait_for_load_state("networkidle", timeout=timeout)
+    except PlaywrightError:
+        pass
+
+
+async def is_logged_in(page):
+    try:
+        return await page.evaluate(config.AUTH_TOKEN_CHECK)
+    except PlaywrightError:
+        return False
+
+
+async def ensure_logged_in(page, email, password, timeout=config.LOGIN_TIMEOUT_MS):
+    """Log in through the form unless the context already carries a session.
+
+    Returns True once a token is stored. Invalid credentials (negative login
+    tests) return False after the form was submitted, as before.
+    """
+    await page.wait_for_load_state("domcontentloaded")
+
+    if await is_logged_in(page):
+        return True
+
+    await page.locator(config.LOGIN_EMAIL).nth(0).fill(email)
+    await page.locator(config.LOGIN_PASSWORD).nth(0).fill(password)
+    await page.locator(config.LOGIN_SUBMIT).nth(0).click()
+
+    try:
+        await page.wait_for_function(config.AUTH_TOKEN_CHECK, timeout=timeout)
+    except PlaywrightError:
+        return False
+
+    await settle(page)
+    return True
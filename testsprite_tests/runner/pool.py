@@ -0,0 +1,112 @@
+"""Test discovery and the concurrent worker pool."""
+
+import asyncio
+import importlib.util
+import re
+import time
+import traceback
+from dataclasses import dataclass, field
+from typing import Optional, Tuple
+
+from . import config
+
+LOGIN_CALL = re.compile(r"ensure_logged_in\(page, '([^']*)', '([^']*)'\)")
+
+
+@dataclass
+class TestCase:
+    path: object
+    credentials: Optional[Tuple[str, str]] = None
+    fresh_login: bool = False
+
+    @property
+    def name(self):
+        return self.path.stem
+
+
+@dataclass
+class TestResult:
+    case: TestCase
+    status: str = "passed"  # passed, failed, error, timeout
+    seconds: float = 0.0
+    message: str = ""
+    worker: int = 0
+    details: str = field(default="", repr=False)
+
+
+def discover(patterns=None):
+    """TC*.py scripts, optionally filtered by substrings of their name."""
+    cases = []
+
+    for path in sorted(config.TESTS_DIR.glob("TC*.py")):
+        if patterns and not any(pattern.lower() in path.stem.lower() for pattern in patterns):
+            continue
+
+        source = path.read_text(encoding="utf-8")
+        login = LOGIN_CALL.search(source)
+
+        cases.append(TestCase(
+            path=path,
+            credentials=login.groups() if login else None,
+            fresh_login=bool(config.FRESH_LOGIN_NAME.search(path.stem) or config.LOGS_OUT.search(source)),
+        ))
+
+    return cases
+
+
+def load(case, index):
+    """Import a script without running it (the __main__ guard keeps asyncio.run out)."""
+    spec = importlib.util.spec_from_file_location(f"testsprite_case_{index}", case.path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+async def run_case(shared, case, index, worker, timeout):
+    result = TestResult(case=case, worker=worker)
+    started = time.perf_counter()
+
+    try:
+        module = load(case, index)
+        if not hasattr(module, "run_test"):
+            raise RuntimeError("script has no run_test(); run python -m runner.convert first")
+
+        module.async_api = shared.api_for(None if case.fresh_login else case.credentials)
+        await asyncio.wait_for(module.run_test(), timeout=timeout)
+    except asyncio.TimeoutError:
+        result.status = "timeout"
+        result.message = f"exceeded {timeout}s"
+    except AssertionError as error:
+        result.status = "failed"
+        result.message = str(error).splitlines()[0] if str(error) else "assertion failed"
+        result.details = traceback.format_exc()
+    except Exception as error:  # noqa: BLE001 - a broken script must not stop the pool
+        result.status = "error"
+        result.message = f"{type(error).__name__}: {str(error).splitlines()[0] if str(error) else ''}"
+        result.details = traceback.format_exc()
+
+    result.seconds = time.perf_counter() - started
+    return result
+
+
+async def run_pool(shared, cases, workers, timeout, on_result=None):
+    """Run cases on `workers` concurrent contexts, in discovery order."""
+    queue = asyncio.Queue()
+    for index, case in enumerate(cases):
+        queue.put_nowait((index, case))
+
+    results = []
+
+    async def worker(number):
+        while True:
+            try:
+                index, case = queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+            result = await run_case(shared, case, index, number, timeout)
+            results.append(result)
+            if on_result:
+                on_result(result)
+
+    await asyncio.gather(*(worker(number + 1) for number in range(max(1, workers))))
+    return results
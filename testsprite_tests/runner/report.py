@@ -0,0 +1,57 @@
+"""Console and JSON reports with per-test wall time."""
+
+import json
+
+STATUS_MARK = {"passed": "PASS", "failed": "FAIL", "error": "ERR ", "timeout": "TIME"}
+
+
+def print_progress(result):
+    print(f"[{STATUS_MARK[result.status]}] {result.case.name}  {result.seconds:6.1f}s  (worker {result.worker})"
+          + (f"  - {result.message}" if result.message else ""), flush=True)
+
+
+def print_summary(results, wall_seconds, login_seconds, workers):
+    results = sorted(results, key=lambda result: result.seconds, reverse=True)
+    width = max([len(result.case.name) for result in results] + [10])
+    test_seconds = sum(result.seconds for result in results)
+
+    print()
+    print(f"{'Test':<{width}}  {'Status':<7}  {'Wall (s)':>8}")
+    print(f"{'-' * width}  {'-' * 7}  {'-' * 8}")
+    for result in results:
+        print(f"{result.case.name:<{width}}  {result.status:<7}  {result.seconds:>8.1f}")
+
+    counts = {}
+    for result in results:
+        counts[result.status] = counts.get(result.status, 0) + 1
+
+    print()
+    print("Results: " + ", ".join(f"{status} {total}" for status, total in sorted(counts.items())))
+    print(f"Logins: {login_seconds:.1f}s | Sum of test times: {test_seconds:.1f}s | "
+          f"Wall time: {wall_seconds:.1f}s with {workers} worker(s)"
+          + (f" | Speed-up x{test_seconds / wall_seconds:.1f}" if wall_seconds > 0 else ""))
+
+    for result in results:
+        if result.details:
+            print(f"\n--- {result.case.name} ---\n{result.details.rstrip()}")
+
+
+def write_json(path, results, wall_seconds, login_seconds, workers):
+    payload = {
+        "workers": workers,
+        "wall_seconds": round(wall_seconds, 3),
+        "login_seconds": round(login_seconds, 3),
+        "tests": [
+            {
+                "name": result.case.name,
+                "status": result.status,
+                "seconds": round(result.seconds, 3),
+                "worker": result.worker,
+                "role": result.case.credentials[0] if result.case.credentials and not result.case.fresh_login else None,
+                "message": result.message,
+            }
+            for result in sorted(results, key=lambda result: result.case.name)
+        ],
+    }
+    with open(path, "w", encoding="utf-8") as handle:
+        json.dump(payload, handle, indent=2)